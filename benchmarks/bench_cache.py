@@ -0,0 +1,31 @@
+"""
+Reopening a dataset: parsing the json file vs reading its binary cache (CocoDataset(..., cache=True)).
+
+    python benchmarks/bench_cache.py [num_annotations]
+"""
+import sys
+import os
+import json
+import tempfile
+
+from synthetic import make_dict, timeit
+
+from coco_orm import CocoDataset
+
+
+def main(num_annotations: int):
+    with tempfile.TemporaryDirectory() as dir_path:
+        filepath = os.path.join(dir_path, "annotations.json")
+        with open(filepath, "w") as f:
+            json.dump(make_dict(num_images=num_annotations // 8, num_annotations=num_annotations), f)
+        print(f"{num_annotations} annotations, {os.path.getsize(filepath) / 2 ** 20:.1f} MiB file")
+        print(f"json, objects             {timeit(lambda: CocoDataset(filepath), repeat=1):6.2f} s")
+        print(f"json, columnar            {timeit(lambda: CocoDataset(filepath, columnar=True), repeat=1):6.2f} s")
+        print(f"cache, first open (build) {timeit(lambda: CocoDataset(filepath, cache=True), repeat=1):6.2f} s")
+        print(f"cache, reopen             {timeit(lambda: CocoDataset(filepath, cache=True)):6.2f} s")
+        os.utime(filepath)
+        print(f"cache, reopen after touch {timeit(lambda: CocoDataset(filepath, cache=True), repeat=1):6.2f} s (file hashed)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
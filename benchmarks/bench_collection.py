@@ -0,0 +1,36 @@
+"""
+Bulk-building an AnnotationCollection with ``append``, looking entities up by id and deleting them at the head.
+Appends and lookups should take constant time per entity. A delete at the head shifts all following entities,
+their positions are refreshed in a single pass on the next lookup.
+
+    python benchmarks/bench_collection.py [max_annotations]
+"""
+import sys
+
+from synthetic import timeit
+
+from coco_orm.collections import AnnotationCollection
+from coco_orm.models import Annotation
+
+
+def build(num_annotations: int) -> AnnotationCollection:
+    collection = AnnotationCollection([])
+    for i in range(num_annotations):
+        collection.append(Annotation(image_id=i, category_id=1, bbox=[0, 0, 10, 10]))
+    return collection
+
+
+def main(max_annotations: int):
+    size = max_annotations // 8
+    while size <= max_annotations:
+        collection = [None]
+        seconds = timeit(lambda: collection.__setitem__(0, build(size)), repeat=1)
+        lookups = timeit(lambda: [collection[0].get_by_id(id) for id in range(1, size + 1, 100)], repeat=1)
+        deletes = timeit(lambda: [collection[0].delete(id) for id in range(1, 101)], repeat=1)
+        print(f"{size:8d} annotations   append: {seconds / size * 1e9:5.0f} ns/entity   get_by_id: {lookups / (size // 100) * 1e9:5.0f} ns/lookup"
+              f"   head delete: {deletes / 100 * 1e3:6.2f} ms/delete")
+        size *= 2
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,38 @@
+"""
+Columnar annotations: memory held by AnnotationCollection vs ColumnarAnnotationCollection, and the cost of a filter pass.
+
+    python benchmarks/bench_columnar.py [num_annotations]
+"""
+import sys
+import gc
+import tracemalloc
+import json
+
+from synthetic import make_dict, timeit
+
+from coco_orm.collections import AnnotationCollection, ColumnarAnnotationCollection
+from coco_orm.filters import AnnotationFilters
+
+
+def measure(factory, text):
+    # parse inside the traced block: object models keep references to the parsed lists, columns copy them
+    gc.collect()
+    tracemalloc.start()
+    collection = factory(json.loads(text))
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return collection, size
+
+
+def main(num_annotations: int):
+    text = json.dumps(make_dict(num_images=num_annotations // 10, num_annotations=num_annotations)["annotations"])
+    filters = AnnotationFilters().category_ids([1, 2, 3]).area(1000, ">")
+    for name, factory in (("objects ", AnnotationCollection), ("columnar", ColumnarAnnotationCollection)):
+        collection, size = measure(factory, text)
+        elapsed = timeit(lambda: collection.filter(filters), repeat=3)
+        print(f"{name}  {len(collection)} annotations: {size / 2 ** 20:7.1f} MiB ({size / len(collection):5.0f} B/annotation)   filter: {elapsed * 1e3:7.1f} ms")
+        del collection
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
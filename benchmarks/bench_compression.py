@@ -0,0 +1,34 @@
+"""
+Compressed annotation files: saving and streaming loading of plain, .json.gz, .json.bz2 and .json.xz files.
+Throughput is measured in MiB of uncompressed (compact) json per second.
+
+    python benchmarks/bench_compression.py [num_annotations]
+"""
+import sys
+import os
+import tempfile
+
+from synthetic import make_dict, timeit
+
+from coco_orm import CocoDataset
+
+
+def main(num_annotations: int):
+    dataset = CocoDataset.from_dict("annotations.json", make_dict(num_images=num_annotations // 8, num_annotations=num_annotations))
+    with tempfile.TemporaryDirectory() as dir_path:
+        size = None
+        for extension in (".json", ".json.gz", ".json.bz2", ".json.xz"):
+            filepath = os.path.join(dir_path, "annotations" + extension)
+            save_time = timeit(lambda: dataset.save(filepath, indent=None), repeat=1)
+            load_time = timeit(lambda: CocoDataset(filepath, streaming=True, columnar=True), repeat=1)
+            file_size = os.path.getsize(filepath)
+            size = size or file_size
+            print(
+                f"{extension:10s} file: {file_size / 2 ** 20:6.1f} MiB (ratio {size / file_size:4.1f})   "
+                f"save: {save_time:5.2f} s, {size / 2 ** 20 / save_time:6.1f} MiB/s   "
+                f"load: {load_time:5.2f} s, {size / 2 ** 20 / load_time:6.1f} MiB/s"
+            )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
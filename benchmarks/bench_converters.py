@@ -0,0 +1,73 @@
+"""
+Generated model converters: ``from_dict`` (and its trusted fast path) and ``to_dict`` (and ``drop_none``) vs the
+generic hand-written converters models had before, per entity; then loading and saving a whole file.
+
+    python benchmarks/bench_converters.py [num_annotations]
+"""
+import sys
+import gc
+import os
+import json
+import tempfile
+
+from synthetic import make_dict, timeit
+
+from coco_orm import CocoDataset
+from coco_orm.models.annotation import Model, Factory, ID, IMAGE_ID, CATEGORY_ID, SEGMENTATION, AREA, BBOX, ISCROWD
+
+
+def generic_from_dict(data):
+    """The hand-written annotation from_dict, checking every optional key twice."""
+    return Model(
+        id = int(data[ID]) if data.get(ID) is not None else 0,
+        image_id = int(data[IMAGE_ID]),
+        category_id = int(data[CATEGORY_ID]),
+        bbox = list(map(int, data[BBOX])),
+        segmentation = data[SEGMENTATION] if data.get(SEGMENTATION) is not None else None,
+        area = float(data[AREA]) if data.get(AREA) is not None else None,
+        iscrowd = int(data[ISCROWD]) if data.get(ISCROWD) is not None else 0
+    )
+
+
+def generic_to_dict(model):
+    """The generic to_dict, reading fields by name."""
+    data = {name: getattr(model, name) for name in model.fields}
+    if hasattr(model, "__dict__"):
+        data.update(vars(model))
+    return data
+
+
+def main(num_annotations: int):
+    data = make_dict(num_images=num_annotations // 8, num_annotations=num_annotations)
+    records = data["annotations"]
+    models = [Factory.from_dict(record) for record in records]
+
+    def per_entity(func) -> float:
+        # the garbage collector is paused, so that collections triggered by millions of new objects don't blur the difference
+        gc.disable()
+        try:
+            return timeit(func) / len(records) * 1e9
+        finally:
+            gc.enable()
+
+    print(f"{num_annotations} annotations, ns per annotation")
+    print(f"from_dict  generic   {per_entity(lambda: [generic_from_dict(record) for record in records]):7.0f}")
+    print(f"from_dict  generated {per_entity(lambda: [Factory.from_dict(record) for record in records]):7.0f}")
+    print(f"from_dict  trusted   {per_entity(lambda: [Factory.from_dict(record, True) for record in records]):7.0f}")
+    print(f"to_dict    generic   {per_entity(lambda: [generic_to_dict(model) for model in models]):7.0f}")
+    print(f"to_dict    generated {per_entity(lambda: [model.to_dict() for model in models]):7.0f}")
+    print(f"to_dict    drop_none {per_entity(lambda: [model.to_dict(True) for model in models]):7.0f}")
+    with tempfile.TemporaryDirectory() as dir_path:
+        filepath = os.path.join(dir_path, "annotations.json")
+        with open(filepath, "w") as f:
+            json.dump(data, f)
+        dataset = CocoDataset(filepath)
+        print(f"load                 {timeit(lambda: CocoDataset(filepath), repeat=2):7.2f} s")
+        for drop_none in (False, True):
+            output = os.path.join(dir_path, f"saved-{drop_none}.json")
+            elapsed = timeit(lambda: dataset.save(output, indent=None, drop_none=drop_none), repeat=2)
+            print(f"save drop_none={drop_none!s:5s}  {elapsed:7.2f} s   {os.path.getsize(output) / 2 ** 20:6.1f} MiB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,81 @@
+"""
+Loading a dataset from a url served by a local http.server: the first download, a revalidated download (304),
+a resumed download and parsing the response without storing it (download_dir=None).
+
+    python benchmarks/bench_download.py [num_annotations]
+"""
+import sys
+import os
+import json
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from synthetic import make_dict, timeit
+
+from coco_orm import CocoDataset
+from coco_orm.dataset.remote import download_paths
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Serves a single file with an ETag, answering conditional and Range requests. Counts bytes sent."""
+    content = b""
+    etag = '"0"'
+    sent = 0
+
+    def do_GET(self):
+        if self.headers.get("If-None-Match") == self.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        start = 0
+        if self.headers.get("Range") and self.headers.get("If-Range", self.etag) == self.etag:
+            start = int(self.headers["Range"].split("=")[1].rstrip("-"))
+        body = self.content[start:]
+        self.send_response(206 if start else 200)
+        self.send_header("ETag", self.etag)
+        self.send_header("Content-Length", str(len(body)))
+        if start: self.send_header("Content-Range", f"bytes {start}-{len(self.content) - 1}/{len(self.content)}")
+        self.end_headers()
+        self.wfile.write(body)
+        Handler.sent += len(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def main(num_annotations: int):
+    Handler.content = json.dumps(make_dict(num_images=num_annotations // 8, num_annotations=num_annotations)).encode("utf-8")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/annotations.json"
+    print(f"{num_annotations} annotations, {len(Handler.content) / 2 ** 20:.1f} MiB file")
+    with tempfile.TemporaryDirectory() as download_dir:
+        paths = download_paths(url, download_dir)
+
+        def run(name, load, repeat=1):
+            Handler.sent = 0
+            elapsed = timeit(load, repeat=repeat)
+            print(f"{name:28s} {elapsed:6.2f} s   received: {Handler.sent / repeat / 2 ** 20:6.1f} MiB")
+
+        run("first download", lambda: CocoDataset(url, streaming=True, download_dir=download_dir))
+        run("revalidated (304)", lambda: CocoDataset(url, streaming=True, download_dir=download_dir), repeat=3)
+
+        def interrupted():
+            os.remove(paths["file"])
+            with open(paths["metadata"], "w") as f:
+                json.dump({"ETag": Handler.etag, "url": url, "complete": False}, f)
+            with open(paths["partial"], "wb") as f:
+                f.write(Handler.content[:len(Handler.content) // 2])
+            return CocoDataset(url, streaming=True, download_dir=download_dir)
+
+        run("resumed from a half", interrupted)
+        Handler.etag = '"1"'
+        run("changed on the server", lambda: CocoDataset(url, streaming=True, download_dir=download_dir))
+        run("not stored, streaming", lambda: CocoDataset(url, streaming=True, download_dir=None))
+        run("not stored, json.load", lambda: CocoDataset(url, download_dir=None))
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
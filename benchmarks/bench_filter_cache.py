@@ -0,0 +1,41 @@
+"""
+Repeated filter chains, built anew for every request: uncached ``filter`` vs ``filter`` answered by the filter cache,
+and the cost of the cache lookup alone (fingerprint of the chain and positions of matching entities).
+
+    python benchmarks/bench_filter_cache.py [num_annotations]
+"""
+import sys
+
+from synthetic import make_dict, timeit
+
+from coco_orm.collections import AnnotationCollection, ColumnarAnnotationCollection
+from coco_orm.filters import AnnotationFilters
+
+
+def main(num_annotations: int):
+    records = make_dict(num_images=num_annotations // 10, num_annotations=num_annotations)["annotations"]
+    chains = {
+        "category_id == 3 or area > 50000": lambda: AnnotationFilters().category_id(3).OR.area(50000, ">"),
+        "image_ids(100 values), iscrowd == 0": lambda: AnnotationFilters().image_ids(list(range(1, 101))).iscrowd(0),
+        "area_range and iscrowd == 0": lambda: AnnotationFilters().area_range(100, 10000).iscrowd(0),
+    }
+    print(f"{num_annotations} annotations")
+    for title, collection in (("objects", AnnotationCollection(records)), ("columnar", ColumnarAnnotationCollection(records))):
+        print(title)
+        uncached = {name: [entity.id for entity in collection.filter(build())] for name, build in chains.items()}
+        cache = collection.cache_filters()
+        for name, build in chains.items():
+            assert [entity.id for entity in collection.filter(build())] == uncached[name]
+            assert [entity.id for entity in collection.filter(build())] == uncached[name]
+            matched = len(uncached[name])
+            before = timeit(lambda: build().apply(collection))
+            after = timeit(lambda: collection.filter(build()))
+            lookup = timeit(lambda: collection._cached_positions(build()))
+            print(f"  {name:40s} {matched:7d} matched   uncached: {before * 1e3:8.2f} ms   cached: {after * 1e3:7.2f} ms   lookup: {lookup * 1e6:7.1f} us")
+        collection.delete(collection[0].id)
+        collection.filter(chains["area_range and iscrowd == 0"]())
+        print(f"  {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
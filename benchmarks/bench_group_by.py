@@ -0,0 +1,74 @@
+"""
+Grouped aggregations: Python loops over annotations vs ``group_by``. Per-category counts, per-image counts of
+non-crowd objects, a per-category bbox width histogram and per-category area quartiles.
+
+    python benchmarks/bench_group_by.py [num_annotations]
+"""
+import sys
+from collections import defaultdict
+
+import numpy as np
+
+from synthetic import make_dict, timeit
+
+from coco_orm.collections import AnnotationCollection, ColumnarAnnotationCollection, SqlAnnotationCollection
+from coco_orm.filters import AnnotationFilters
+
+
+def count_loop(annotations, attr_name, predicate=lambda annotation: True):
+    counts = defaultdict(int)
+    for annotation in annotations:
+        if predicate(annotation):
+            counts[getattr(annotation, attr_name)] += 1
+    return counts
+
+
+def histogram_loop(annotations, edges):
+    widths = defaultdict(list)
+    for annotation in annotations:
+        widths[annotation.category_id].append(annotation.bbox[2])
+    return {category_id: np.histogram(values, edges)[0] for category_id, values in widths.items()}
+
+
+def quartiles_loop(annotations):
+    areas = defaultdict(list)
+    for annotation in annotations:
+        if annotation.area is not None:
+            areas[annotation.category_id].append(annotation.area)
+    return {category_id: np.quantile(values, [0.25, 0.5, 0.75]) for category_id, values in areas.items()}
+
+
+def main(num_annotations: int):
+    records = make_dict(num_images=num_annotations // 8, num_annotations=num_annotations)["annotations"]
+    print(f"{num_annotations} annotations")
+    for title, collection in (("objects", AnnotationCollection(records)), ("columnar", ColumnarAnnotationCollection(records)), ("sqlite", SqlAnnotationCollection(records))):
+        edges = collection.group_by().histogram("bbox_width", bins=20)[1]
+        cases = {
+            "count per category": (
+                lambda: count_loop(collection, "category_id"),
+                lambda: collection.group_by("category_id").count(),
+            ),
+            "non-crowd count per image": (
+                lambda: count_loop(collection, "image_id", lambda annotation: annotation.iscrowd == 0),
+                lambda: collection.group_by("image_id", filters=AnnotationFilters().iscrowd(0)).count(),
+            ),
+            "bbox width histogram": (
+                lambda: histogram_loop(collection, edges),
+                lambda: collection.group_by("category_id").histogram("bbox_width", bins=edges)[0],
+            ),
+            "area quartiles": (
+                lambda: quartiles_loop(collection),
+                lambda: collection.group_by("category_id").quantile("area", [0.25, 0.5, 0.75]),
+            ),
+        }
+        print(title)
+        for name, (loop, grouped) in cases.items():
+            expected, result = loop(), grouped()
+            assert set(expected) == set(result) and all(np.allclose(expected[key], result[key]) for key in expected)
+            before = timeit(loop, repeat=1)
+            after = timeit(grouped)
+            print(f"  {name:28s} loop: {before * 1e3:8.1f} ms   group_by: {after * 1e3:8.1f} ms   x{before / after:.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,28 @@
+"""
+Secondary index lookups: ImageCollection.get_by_file_name and equality filters should not depend on dataset size.
+
+    python benchmarks/bench_indexes.py [max_images]
+"""
+import sys
+
+from synthetic import make_dict, timeit
+
+from coco_orm.collections import ImageCollection, AnnotationCollection
+from coco_orm.filters import AnnotationFilters
+
+
+def main(max_images: int):
+    size = max_images // 8
+    while size <= max_images:
+        data = make_dict(num_images=size, num_annotations=size * 5)
+        images, annotations = ImageCollection(data["images"]), AnnotationCollection(data["annotations"])
+        names = [image["file_name"] for image in data["images"][::max(size // 1000, 1)]]
+        by_name = timeit(lambda: [images.get_by_file_name(name) for name in names]) / len(names)
+        filters = AnnotationFilters().image_id(size // 2).iscrowd(0)
+        by_filter = timeit(lambda: annotations.filter(filters))
+        print(f"{size:8d} images   get_by_file_name: {by_name * 1e9:5.0f} ns   image_id filter over {size * 5} annotations: {by_filter * 1e6:6.0f} us")
+        size *= 2
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,55 @@
+"""
+Saving after every edit: rewriting the json file with CocoDataset.save vs recording edits to a journal
+(CocoDataset(..., journal=True)), and replaying the journal when the dataset is reopened.
+
+    python benchmarks/bench_journal.py [num_annotations] [num_edits]
+"""
+import sys
+import os
+import json
+import tempfile
+
+from synthetic import make_dict, timeit
+
+from coco_orm import CocoDataset
+
+
+def edit(dataset, number: int) -> None:
+    annotation = dataset.annotations[number % len(dataset.annotations)]
+    annotation.area = float(number)
+    dataset.annotations.update(annotation)
+
+
+def main(num_annotations: int, num_edits: int):
+    with tempfile.TemporaryDirectory() as dir_path:
+        filepath = os.path.join(dir_path, "annotations.json")
+        with open(filepath, "w") as f:
+            json.dump(make_dict(num_images=num_annotations // 8, num_annotations=num_annotations), f)
+        print(f"{num_annotations} annotations, {os.path.getsize(filepath) / 2 ** 20:.1f} MiB file, {num_edits} edits")
+        dataset = CocoDataset(filepath)
+
+        def save_every_edit():
+            for number in range(num_edits):
+                edit(dataset, number)
+                dataset.save(indent=None)
+
+        elapsed = timeit(save_every_edit, repeat=1)
+        print(f"save after every edit     {elapsed / num_edits * 1000:9.2f} ms per edit")
+        dataset = CocoDataset(filepath, journal=True)
+
+        def journal_every_edit():
+            for number in range(num_edits):
+                edit(dataset, number)
+
+        elapsed = timeit(journal_every_edit, repeat=1)
+        print(f"journal every edit        {elapsed / num_edits * 1000:9.2f} ms per edit")
+        dataset.journal.sync = True
+        elapsed = timeit(journal_every_edit, repeat=1)
+        print(f"journal every edit, fsync {elapsed / num_edits * 1000:9.2f} ms per edit")
+        print(f"reopen without journal    {timeit(lambda: CocoDataset(filepath), repeat=1):9.2f} s")
+        print(f"reopen, replay {2 * num_edits:5d} edits {timeit(lambda: CocoDataset(filepath, journal=True), repeat=1):7.2f} s")
+        print(f"compact                   {timeit(lambda: dataset.compact(indent=None), repeat=1):9.2f} s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000, int(sys.argv[2]) if len(sys.argv) > 2 else 20)
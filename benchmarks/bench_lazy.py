@@ -0,0 +1,41 @@
+"""
+A metadata query on a large dataset: eager collections vs lazy collections (CocoDataset(..., lazy=True)).
+The query opens the dataset and looks a category up by name, without touching images and annotations.
+
+    python benchmarks/bench_lazy.py [num_annotations]
+"""
+import sys
+import os
+import gc
+import json
+import tempfile
+import tracemalloc
+
+from synthetic import make_dict, timeit
+
+from coco_orm import CocoDataset
+
+
+def main(num_annotations: int):
+    with tempfile.TemporaryDirectory() as dir_path:
+        filepath = os.path.join(dir_path, "annotations.json")
+        data = make_dict(num_images=num_annotations // 8, num_annotations=num_annotations)
+        name = data["categories"][-1]["name"]
+        with open(filepath, "w") as f:
+            json.dump(data, f)
+        del data
+        for label, kwargs in (("eager", {}), ("lazy", {"lazy": True}), ("lazy, streaming", {"lazy": True, "streaming": True}), ("lazy, cache", {"lazy": True, "cache": True})):
+            query = lambda: CocoDataset(filepath, **kwargs).categories.get_by_name(name)
+            elapsed = timeit(query, repeat=2)
+            gc.collect()
+            tracemalloc.start()
+            dataset = CocoDataset(filepath, **kwargs)
+            dataset.categories.get_by_name(name)
+            size = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            del dataset
+            print(f"{label:16s} open + category lookup: {elapsed:5.2f} s   retained: {size / 2 ** 20:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500000)
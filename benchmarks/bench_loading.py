@@ -0,0 +1,42 @@
+"""
+Loading an annotations file: json.load + Factory.from_dict vs the streaming loader (Factory.from_file).
+Peak memory is traced while loading, the time is measured separately without tracing.
+
+    python benchmarks/bench_loading.py [num_annotations]
+"""
+import sys
+import os
+import gc
+import json
+import tempfile
+import tracemalloc
+
+from synthetic import make_dict, timeit
+
+from coco_orm import CocoDataset
+
+
+def peak(load) -> int:
+    gc.collect()
+    tracemalloc.start()
+    dataset = load()
+    size = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del dataset
+    return size
+
+
+def main(num_annotations: int):
+    with tempfile.TemporaryDirectory() as dir_path:
+        filepath = os.path.join(dir_path, "annotations.json")
+        with open(filepath, "w") as f:
+            json.dump(make_dict(num_images=num_annotations // 8, num_annotations=num_annotations), f)
+        print(f"{num_annotations} annotations, {os.path.getsize(filepath) / 2 ** 20:.1f} MiB file")
+        for name, kwargs in (("json.load", {}), ("streaming", {"streaming": True}), ("streaming columnar", {"streaming": True, "columnar": True})):
+            load = lambda: CocoDataset(filepath, **kwargs)
+            elapsed = timeit(load, repeat=1)
+            print(f"{name:20s} peak: {peak(load) / 2 ** 20:7.1f} MiB   time: {elapsed:5.2f} s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500000)
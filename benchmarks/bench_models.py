@@ -0,0 +1,58 @@
+"""
+Memory of entity models: slot-based models vs the previous layout with an instance ``__dict__``, at COCO train2017 scale
+(118k images, 860k annotations by default).
+
+    python benchmarks/bench_models.py [num_images] [num_annotations]
+"""
+import sys
+import gc
+import tracemalloc
+
+from synthetic import make_dict
+
+from coco_orm.models import ImageFactory, AnnotationFactory
+from coco_orm.models.annotation import Model as AnnotationModel
+from coco_orm.models.image import Model as ImageModel
+
+
+class DictModel():
+    """A model storing attributes in an instance ``__dict__``, the layout models had before ``__slots__``."""
+    def to_dict(self):
+        return vars(self)
+
+
+def dict_model(name: str, fields: tuple) -> type:
+    # attributes are assigned in __init__ in the same order for every instance, so dicts share keys as they did before
+    namespace = {}
+    exec(f"def __init__(self, {', '.join(fields)}):\n" + "".join(f"    self.{field} = {field}\n" for field in fields), namespace)
+    return type(name, (DictModel,), {"__init__": namespace["__init__"]})
+
+
+def measure(build, entities) -> int:
+    gc.collect()
+    tracemalloc.start()
+    snapshot = tracemalloc.get_traced_memory()[0]
+    models = [build(entity) for entity in entities]
+    size = tracemalloc.get_traced_memory()[0] - snapshot
+    tracemalloc.stop()
+    del models
+    return size
+
+
+def main(num_images: int, num_annotations: int):
+    data = make_dict(num_images=num_images, num_annotations=num_annotations)
+    for name, entities, factory, model in (
+        ("images", data["images"], ImageFactory, ImageModel),
+        ("annotations", data["annotations"], AnnotationFactory, AnnotationModel),
+    ):
+        # models are built from already converted values, so only the models themselves are measured
+        entities = [factory.from_dict(entity).to_dict() for entity in entities]
+        legacy = dict_model(f"Dict{model.__name__}", model.fields)
+        dict_size = measure(lambda entity: legacy(**entity), entities)
+        slots_size = measure(lambda entity: model(**entity), entities)
+        print(f"{len(entities):8d} {name:12s} __dict__: {dict_size / 2 ** 20:7.1f} MiB ({dict_size / len(entities):4.0f} B each)"
+              f"   __slots__: {slots_size / 2 ** 20:7.1f} MiB ({slots_size / len(entities):4.0f} B each)")
+
+
+if __name__ == "__main__":
+    main(*(map(int, sys.argv[1:3])) if len(sys.argv) > 2 else (118287, 860001))
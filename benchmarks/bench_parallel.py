@@ -0,0 +1,38 @@
+"""
+Converting image and annotation records into collections in the main process vs in worker processes
+(CocoDataset(..., processes=N)), for object and columnar annotations. The json file is parsed up front, only
+the conversion is timed. "main process" shows the time the main process spends rebuilding entities from columns
+sent by the workers, the part that doesn't scale with the number of processes.
+
+    python benchmarks/bench_parallel.py [num_annotations] [processes ...]
+"""
+import sys
+import os
+import time
+
+from synthetic import make_dict, timeit
+
+from coco_orm.dataset.core import Factory
+from coco_orm.collections import parallel
+from coco_orm.models.annotation import Factory as AnnotationFactory
+
+
+def main(num_annotations: int, processes: list):
+    data = make_dict(num_images=num_annotations // 8, num_annotations=num_annotations)
+    records = data["annotations"]
+    print(f"{num_annotations} annotations, {len(data['images'])} images, {os.cpu_count()} CPUs")
+    for columnar in (False, True):
+        for count in processes:
+            elapsed = timeit(lambda: Factory.from_dict("", data, columnar=columnar, processes=count), repeat=1)
+            print(f"{'columnar' if columnar else 'objects':9s} processes={count:<3d} {elapsed:6.2f} s")
+    chunk = parallel._chunk_bounds(len(records), 2, parallel.PARALLEL_CHUNK_SIZE)[0]
+    parallel._init_worker(records)
+    model_class, columns = parallel._parse_chunk(AnnotationFactory, *chunk)
+    start = time.perf_counter()
+    parallel._build(model_class, columns, records[chunk[0]:chunk[1]])
+    elapsed = (time.perf_counter() - start) * len(records) / (chunk[1] - chunk[0])
+    print(f"objects   main process  {elapsed:6.2f} s   (rebuilding annotations from worker columns)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000, [int(value) for value in sys.argv[2:]] or [1, 2, 4])
@@ -0,0 +1,48 @@
+"""
+Lazy queries vs filtering the whole collection: the first 100 matches, the 100 largest matches by area,
+a count and an existence check.
+
+    python benchmarks/bench_query.py [num_annotations]
+"""
+import sys
+
+from synthetic import make_dict, timeit
+
+from coco_orm.collections import AnnotationCollection, ColumnarAnnotationCollection, SqlAnnotationCollection
+from coco_orm.filters import AnnotationFilters
+
+
+def main(num_annotations: int):
+    records = make_dict(num_images=num_annotations // 10, num_annotations=num_annotations)["annotations"]
+    filters = AnnotationFilters().iscrowd(0).bbox_width(20, ">")
+    print(f"{num_annotations} annotations")
+    for title, collection in (("objects", AnnotationCollection(records)), ("columnar", ColumnarAnnotationCollection(records)), ("sqlite", SqlAnnotationCollection(records))):
+        cases = {
+            "first 100": (
+                lambda: collection.filter(filters)[:100],
+                lambda: list(collection.query(filters).limit(100)),
+            ),
+            "100 largest by area": (
+                lambda: sorted(collection.filter(filters), key=lambda entity: entity.area, reverse=True)[:100],
+                lambda: list(collection.query(filters).order_by("area", reverse=True).limit(100)),
+            ),
+            "count": (
+                lambda: len(collection.filter(filters)),
+                lambda: collection.query(filters).count(),
+            ),
+            "exists": (
+                lambda: len(collection.filter(filters)) > 0,
+                lambda: collection.query(filters).exists(),
+            ),
+        }
+        print(title)
+        for name, (eager, lazy) in cases.items():
+            expected, result = eager(), lazy()
+            assert [entity.id for entity in expected] == [entity.id for entity in result] if isinstance(expected, list) else expected == result
+            before = timeit(eager)
+            after = timeit(lazy)
+            print(f"  {name:24s} filter: {before * 1e3:8.2f} ms   query: {after * 1e3:8.2f} ms   x{before / after:.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,47 @@
+"""
+Saving a dataset: json.dump of CocoDataset.to_dict vs the streaming writer of CocoDataset.save, in pretty and compact modes.
+Peak memory is traced while saving, the time is measured separately without tracing.
+
+    python benchmarks/bench_saving.py [num_annotations]
+"""
+import sys
+import os
+import gc
+import json
+import tempfile
+import tracemalloc
+
+from synthetic import make_dict, timeit
+
+from coco_orm import CocoDataset
+
+
+def peak(save) -> int:
+    gc.collect()
+    tracemalloc.start()
+    save()
+    size = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return size
+
+
+def main(num_annotations: int):
+    dataset = CocoDataset.from_dict("annotations.json", make_dict(num_images=num_annotations // 8, num_annotations=num_annotations))
+    with tempfile.TemporaryDirectory() as dir_path:
+        filepath = os.path.join(dir_path, "annotations.json")
+
+        def dump():
+            with open(filepath, "w", encoding="utf-8") as f:
+                json.dump(dataset.to_dict(), f, ensure_ascii=False, indent=4)
+
+        for name, save in (
+            ("to_dict + json.dump", dump),
+            ("streaming, indent=4", lambda: dataset.save(filepath)),
+            ("streaming, compact", lambda: dataset.save(filepath, indent=None)),
+        ):
+            elapsed = timeit(save, repeat=1)
+            print(f"{name:20s} peak: {peak(save) / 2 ** 20:7.1f} MiB   time: {elapsed:5.2f} s   file: {os.path.getsize(filepath) / 2 ** 20:6.1f} MiB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,35 @@
+"""
+Loading a sharded dataset (CocoDataset.save_shards) with a growing number of worker processes,
+compared to loading the same dataset from a single json file.
+
+    python benchmarks/bench_shards.py [num_annotations] [num_shards]
+"""
+import sys
+import os
+import tempfile
+
+from synthetic import make_dict, timeit
+
+from coco_orm import CocoDataset
+
+
+def main(num_annotations: int, num_shards: int):
+    dataset = CocoDataset.from_dict("annotations.json", make_dict(num_images=num_annotations // 8, num_annotations=num_annotations))
+    with tempfile.TemporaryDirectory() as dir_path:
+        filepath = os.path.join(dir_path, "annotations.json")
+        shards_path = os.path.join(dir_path, "shards")
+        dataset.save(filepath, indent=None)
+        dataset.save_shards(shards_path, num_shards)
+        print(f"{num_annotations} annotations, {num_shards} shards, {os.cpu_count()} CPUs")
+        for columnar in (False, True):
+            print(f"columnar={columnar}")
+            print(f"  single file              {timeit(lambda: CocoDataset(filepath, columnar=columnar), repeat=1):6.2f} s")
+            processes = 1
+            while processes <= min(num_shards, os.cpu_count()):
+                load = lambda: CocoDataset.from_shards(shards_path, columnar=columnar, processes=processes)
+                print(f"  shards, {processes:2d} processes     {timeit(load, repeat=1):6.2f} s")
+                processes *= 2
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000, int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count())
@@ -0,0 +1,44 @@
+"""
+Region queries within images: checking bboxes of an image one by one (annotations of the image looked up
+in the image_id index) vs region filters answered by the spatial index, and a full scan with a region filter alone.
+
+    python benchmarks/bench_spatial.py [num_annotations] [num_queries]
+"""
+import sys
+import random
+
+from synthetic import make_dict, timeit
+
+from coco_orm.collections import AnnotationCollection, ColumnarAnnotationCollection
+from coco_orm.filters import AnnotationFilters
+from coco_orm.collections.spatial import SpatialIndex
+
+
+def intersects(bbox, region):
+    return bbox[0] < region[0] + region[2] and region[0] < bbox[0] + bbox[2] and bbox[1] < region[1] + region[3] and region[1] < bbox[1] + bbox[3]
+
+
+def main(num_annotations: int, num_queries: int):
+    # about 500 annotations per image, e.g. a dense crowd or aerial imagery
+    records = make_dict(num_images=max(1, num_annotations // 500), num_annotations=num_annotations)["annotations"]
+    random.seed(0)
+    regions = [[random.uniform(0, 500), random.uniform(0, 500), random.uniform(10, 100), random.uniform(10, 100)] for _ in range(num_queries)]
+    points = [(random.uniform(0, 600), random.uniform(0, 600)) for _ in range(num_queries)]
+    image_id = records[0]["image_id"]
+    print(f"{num_annotations} annotations, {num_queries} queries of image {image_id}")
+    for title, collection in (("objects", AnnotationCollection(records)), ("columnar", ColumnarAnnotationCollection(records))):
+        annotations = collection.get_all_by("image_id", image_id)
+        loop = lambda: [[annotation.id for annotation in annotations if intersects(annotation.bbox, region)] for region in regions]
+        indexed = lambda: [[annotation.id for annotation in collection.filter(AnnotationFilters().image_id(image_id).bbox_intersects(region))] for region in regions]
+        assert loop() == indexed()
+        build = timeit(lambda: SpatialIndex(*collection._read_bboxes()))
+        before = timeit(loop, repeat=1)
+        after = timeit(indexed, repeat=1)
+        scan = timeit(lambda: collection.filter(AnnotationFilters().bbox_intersects(regions[0])))
+        nearest = timeit(lambda: [collection.filter(AnnotationFilters().image_id(image_id).bbox_nearest(x, y, k=5)) for x, y in points[:100]], repeat=1) / 100
+        print(f"  {title:10s} per query   loop: {before / num_queries * 1e6:8.1f} us   index: {after / num_queries * 1e6:8.1f} us   x{before / after:.1f}"
+              f"   (index build: {build * 1e3:.1f} ms, scan of all images: {scan * 1e3:.1f} ms, 5 nearest: {nearest * 1e6:.1f} us)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000, int(sys.argv[2]) if len(sys.argv) > 2 else 5000)
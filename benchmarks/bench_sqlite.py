@@ -0,0 +1,57 @@
+"""
+Collections kept in a SQLite database (CocoDataset(..., sqlite=...)) vs in memory: peak memory of loading,
+import time and reopening an imported database, filtering a dataset and saving the filtered dataset.
+Every variant runs in its own process, so peak memory is measured separately.
+
+    python benchmarks/bench_sqlite.py [num_annotations]
+"""
+import sys
+import os
+import json
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from synthetic import make_dict
+
+from coco_orm import CocoDataset
+
+
+def filter_dataset(dataset):
+    return dataset.filter(
+        dataset.images.filters_builder().width_range(0, 1000),
+        dataset.annotations.filters_builder().area_range(1000, 20000).AND.bbox_width_range(20, 200),
+        dataset.categories.filters_builder().ids(list(range(1, 30)))
+    )
+
+
+def run(filepath: str, database, dir_path: str):
+    start = time.perf_counter()
+    dataset = CocoDataset(filepath, sqlite=database)
+    loaded = time.perf_counter()
+    filtered = filter_dataset(dataset)
+    filtered_at = time.perf_counter()
+    filtered.save(os.path.join(dir_path, "filtered.json"), indent=None)
+    saved = time.perf_counter()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2 ** 10
+    return loaded - start, filtered_at - loaded, saved - filtered_at, len(filtered.annotations), peak
+
+
+def main(num_annotations: int):
+    with tempfile.TemporaryDirectory() as dir_path:
+        filepath = os.path.join(dir_path, "annotations.json")
+        with open(filepath, "w") as f:
+            json.dump(make_dict(num_images=num_annotations // 8, num_annotations=num_annotations), f)
+        database = os.path.join(dir_path, "annotations.db")
+        print(f"{num_annotations} annotations, {os.path.getsize(filepath) / 2 ** 20:.1f} MiB file")
+        print(f"{'':22s} {'load, s':>8s} {'filter, s':>10s} {'save, s':>8s} {'filtered':>9s} {'peak RSS, MiB':>14s}")
+        for name, path in (("in memory", None), ("sqlite, import", database), ("sqlite, reopen", database)):
+            with ProcessPoolExecutor(1) as executor:
+                load, filter, save, count, peak = executor.submit(run, filepath, path, dir_path).result()
+            print(f"{name:22s} {load:8.2f} {filter:10.2f} {save:8.2f} {count:9d} {peak:14.0f}")
+        print(f"database file: {os.path.getsize(database) / 2 ** 20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
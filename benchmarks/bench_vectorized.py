@@ -0,0 +1,31 @@
+"""
+Vectorized filters: BaseFilter.apply over a columnar collection (boolean masks) vs over model instances (entity by entity).
+
+    python benchmarks/bench_vectorized.py [num_annotations]
+"""
+import sys
+
+from synthetic import make_dict, timeit
+
+from coco_orm.collections import AnnotationCollection, ColumnarAnnotationCollection
+from coco_orm.filters import AnnotationFilters
+
+
+def main(num_annotations: int):
+    data = make_dict(num_images=num_annotations // 10, num_annotations=num_annotations)
+    objects, columnar = AnnotationCollection(data["annotations"]), ColumnarAnnotationCollection(data["annotations"])
+    chains = {
+        "category_ids & area": AnnotationFilters().category_ids(list(range(1, 20))).area(1000, ">"),
+        "bbox ranges | iscrowd": AnnotationFilters().bbox_width_range(10, 50).bbox_height_range(10, 50).OR.iscrowd(1),
+        "image_ids not in": AnnotationFilters().image_ids(list(range(0, num_annotations // 10, 2)), "not_in"),
+    }
+    for name, filters in chains.items():
+        by_entity = timeit(lambda: filters.apply(objects))
+        mask = filters.compiled_mask(columnar.column_names)
+        by_mask = timeit(lambda: mask.mask(columnar.column, len(columnar)))
+        by_apply = timeit(lambda: filters.apply(columnar))
+        print(f"{name:24s} entity by entity: {by_entity * 1e3:8.1f} ms   mask: {by_mask * 1e3:6.1f} ms   mask + copy of matches: {by_apply * 1e3:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,59 @@
+"""
+Filtered views vs filtered copies: a filter chain applied to a view of a view, with entities copied into a new collection
+at every step (as ``filter`` did before views) and with positions composed instead; then ``CocoDataset.filter``.
+
+    python benchmarks/bench_views.py [num_annotations]
+"""
+import sys
+import os
+import json
+import tempfile
+
+from synthetic import make_dict, timeit
+
+from coco_orm import CocoDataset
+from coco_orm.collections import AnnotationCollection, ColumnarAnnotationCollection
+from coco_orm.filters import AnnotationFilters, ImageFilters, CategoryFilters
+
+
+def copied(collection, chain):
+    """Filtering with a copy of matching entities at every step."""
+    for filters in chain:
+        filtered = filters.apply(collection)
+        collection = filtered if hasattr(filtered, "columns") else collection(filtered)
+    return collection
+
+
+def viewed(collection, chain):
+    """Filtering with views."""
+    for filters in chain:
+        collection = collection.filter(filters)
+    return collection
+
+
+def main(num_annotations: int):
+    data = make_dict(num_images=num_annotations // 8, num_annotations=num_annotations)
+    chain = [
+        AnnotationFilters().iscrowd(0),
+        AnnotationFilters().area_range(100, 200000),
+        AnnotationFilters().category_ids(list(range(1, 60))),
+    ]
+    print(f"{num_annotations} annotations")
+    for title, collection in (("objects", AnnotationCollection(data["annotations"])), ("columnar", ColumnarAnnotationCollection(data["annotations"]))):
+        assert [entity.id for entity in copied(collection, chain)] == [entity.id for entity in viewed(collection, chain)]
+        before = timeit(lambda: copied(collection, chain))
+        after = timeit(lambda: viewed(collection, chain))
+        print(f"  {title:10s} 3 chained filters   copies: {before * 1e3:8.1f} ms   views: {after * 1e3:8.1f} ms")
+
+    filepath = os.path.join(tempfile.mkdtemp(), "annotations.json")
+    with open(filepath, "w") as f:
+        json.dump(data, f)
+    for title, kwargs in (("objects", {}), ("columnar", {"columnar": True})):
+        dataset = CocoDataset(filepath, **kwargs)
+        elapsed = timeit(lambda: dataset.filter(ImageFilters().width(300, ">"), AnnotationFilters().iscrowd(0), CategoryFilters().ids(list(range(1, 60)))))
+        print(f"  {title:10s} CocoDataset.filter: {elapsed * 1e3:8.1f} ms")
+    os.remove(filepath)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 400000)
@@ -0,0 +1,54 @@
+"""
+Synthetic COCO-like datasets used by benchmarks.
+
+Run any benchmark from the repository root, e.g.:
+    python benchmarks/bench_filters.py
+"""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+
+def make_dict(num_images: int = 1000, num_annotations: int = 10000, num_categories: int = 80, num_licenses: int = 8, seed: int = 0) -> dict:
+    """
+    Build a dictionary with COCO dataset structure filled with random data.
+
+    Args:
+        num_images (int): a number of images.
+        num_annotations (int): a number of annotations, spread randomly across images.
+        num_categories (int): a number of categories.
+        num_licenses (int): a number of licenses.
+        seed (int): a seed of the random generator.
+
+    Returns:
+        dict: a dictionary containing COCO dataset.
+    """
+    rnd = random.Random(seed)
+    images = [
+        {"id": i, "file_name": f"{i:012d}.jpg", "width": 640, "height": 480, "license": rnd.randint(1, num_licenses),
+         "coco_url": f"http://images.cocodataset.org/train2017/{i:012d}.jpg", "date_captured": "2013-11-14 16:28:13"}
+        for i in range(1, num_images + 1)
+    ]
+    annotations = []
+    for i in range(1, num_annotations + 1):
+        x, y, w, h = rnd.randint(0, 600), rnd.randint(0, 440), rnd.randint(1, 300), rnd.randint(1, 300)
+        annotations.append({
+            "id": i, "image_id": rnd.randint(1, num_images), "category_id": rnd.randint(1, num_categories),
+            "segmentation": [[x, y, x + w, y, x + w, y + h, x, y + h]], "area": float(w * h), "bbox": [x, y, w, h], "iscrowd": 0,
+        })
+    categories = [{"id": i, "name": f"category_{i}", "supercategory": f"super_{i % 10}"} for i in range(1, num_categories + 1)]
+    licenses = [{"id": i, "name": f"license_{i}", "url": f"http://license/{i}"} for i in range(1, num_licenses + 1)]
+    return {"info": {"year": 2017, "version": "1.0"}, "images": images, "annotations": annotations, "categories": categories, "licenses": licenses}
+
+
+def timeit(func, repeat: int = 3) -> float:
+    """Return the best wall time of ``repeat`` calls of ``func``, seconds."""
+    import time
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
@@ -2,6 +2,8 @@ from .image import Collection as ImageCollectionCls
 from .annotation import Collection as AnnotationCollectionCls
 from .category import Collection as CategoryCollectionCls
 from .license import Collection as LicenseCollectionCls
+from .columnar import Collection as ColumnarAnnotationCollectionCls
+from .sqlite import Store as SqlStoreCls, ImageCollection as SqlImageCollectionCls, AnnotationCollection as SqlAnnotationCollectionCls, CategoryCollection as SqlCategoryCollectionCls, LicenseCollection as SqlLicenseCollectionCls
 
 
 """
@@ -10,4 +12,10 @@ API. Global variables holiding references to collection classes.
 ImageCollection = ImageCollectionCls
 AnnotationCollection = AnnotationCollectionCls
 CategoryCollection = CategoryCollectionCls
-LicenseCollection = LicenseCollectionCls
\ No newline at end of file
+LicenseCollection = LicenseCollectionCls
+ColumnarAnnotationCollection = ColumnarAnnotationCollectionCls
+SqlStore = SqlStoreCls
+SqlImageCollection = SqlImageCollectionCls
+SqlAnnotationCollection = SqlAnnotationCollectionCls
+SqlCategoryCollection = SqlCategoryCollectionCls
+SqlLicenseCollection = SqlLicenseCollectionCls
\ No newline at end of file
@@ -0,0 +1,304 @@
+from typing import Dict, List, Optional, Tuple, Hashable, Union, Sequence, Iterable
+from operator import attrgetter, itemgetter
+
+import numpy as np
+
+from ..filters.core import BaseFilter
+from ..filters.annotation import BBOX_WIDTH, BBOX_HEIGHT
+from ..models.annotation import BBOX, BBOX_WIDTH_IDX, BBOX_HEIGHT_IDX
+
+"""Names of values read from items of list attributes: a name maps to an attribute name and an item index."""
+_ITEMS = {
+    BBOX_WIDTH: (BBOX, BBOX_WIDTH_IDX),
+    BBOX_HEIGHT: (BBOX, BBOX_HEIGHT_IDX),
+}
+
+
+class GroupBy():
+    """
+    GroupBy aggregates values of collection entities grouped by attribute values, created with ``BaseCollection.group_by``.
+    >>> objects_per_image = annotations.group_by("image_id").count()
+    >>> mean_area = annotations.group_by("category_id", filters=AnnotationFilters().iscrowd(0)).mean("area")
+    >>> counts, edges = annotations.group_by("category_id").histogram("bbox_width", bins=20)
+    >>> quartiles = annotations.group_by().quantile("area", [0.25, 0.5, 0.75])[()]
+
+    Keys and values are read once: from columns of columnar collections, else in a single pass over entities.
+    Groups are numbered and values are aggregated with ``np.bincount`` instead of a Python loop per group.
+    Results are dictionaries mapping group keys to aggregates: a key is an attribute value if entities are grouped
+    by one attribute, a tuple of values if by several, and ``()`` (a single group) if by none. Integer keys are sorted,
+    other keys are in order of appearance.
+
+    Values are attribute values or ``bbox_width`` and ``bbox_height``. None values (e.g. missing areas) are skipped
+    by all aggregates but ``count``, which counts entities.
+
+    Args/Attributes:
+        collection (BaseCollection): a collection to aggregate entities of.
+        attr_names (tuple[str]): names of attributes to group entities by.
+        filters (Optional[BaseFilter]): filters entities have to match, all entities are aggregated if None.
+    """
+    def __init__(self, collection, attr_names: Tuple[str, ...] = (), filters: Optional[BaseFilter] = None):
+        self.collection = collection
+        self.attr_names = attr_names
+        self.filters = filters.resolve(collection) if filters else filters
+        self._groups = None # type: Optional[Tuple[List[Hashable], np.ndarray]] # group keys and group numbers of entities
+        self._version = None # version of the collection the groups are read for
+        self._source = None # type: Optional[Tuple[object, Optional[np.ndarray]]] # a collection and positions of selected entities
+
+    def count(self) -> Dict[Hashable, int]:
+        """
+        Count entities of groups.
+
+        Returns:
+            dict: a dictionary mapping group keys to numbers of entities.
+        """
+        keys, codes = self._read_groups()
+        return dict(zip(keys, np.bincount(codes, minlength=len(keys)).tolist()))
+
+    def sum(self, name: str) -> Dict[Hashable, float]:
+        """
+        Sum values of groups.
+
+        Args:
+            name (str): a name of values.
+
+        Returns:
+            dict: a dictionary mapping group keys to sums, 0 for groups without values.
+        """
+        keys, codes, values = self._read_values(name)
+        return dict(zip(keys, np.bincount(codes, weights=values, minlength=len(keys)).tolist()))
+
+    def mean(self, name: str) -> Dict[Hashable, float]:
+        """
+        Average values of groups.
+
+        Args:
+            name (str): a name of values.
+
+        Returns:
+            dict: a dictionary mapping group keys to means, NaN for groups without values.
+        """
+        keys, codes, values = self._read_values(name)
+        sums = np.bincount(codes, weights=values, minlength=len(keys))
+        counts = np.bincount(codes, minlength=len(keys))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return dict(zip(keys, (sums / counts).tolist()))
+
+    def histogram(self, name: str, bins: Union[int, Sequence[float]] = 10, range: Optional[Tuple[float, float]] = None) -> Tuple[Dict[Hashable, np.ndarray], np.ndarray]:
+        """
+        Count values of groups falling into bins, the same bins for all groups (see ``np.histogram``).
+
+        Args:
+            name (str): a name of values.
+            bins (Union[int, Sequence[float]]), default = 10: a number of equal-width bins, or bin edges.
+            range (Optional[tuple[float, float]]): the lower and the upper edge of equal-width bins,
+                the range of all values if None. Values outside edges are not counted.
+
+        Returns:
+            tuple[dict, np.ndarray]: a dictionary mapping group keys to arrays of bin counts, and bin edges.
+        """
+        keys, codes, values = self._read_values(name)
+        edges = np.histogram_bin_edges(values, bins, range)
+        num_bins = len(edges) - 1
+        # bins include their left edge, the last bin includes its right edge too
+        bin_ids = np.searchsorted(edges, values, side="right") - 1
+        bin_ids[values == edges[-1]] = num_bins - 1
+        inside = (bin_ids >= 0) & (bin_ids < num_bins)
+        counts = np.bincount(codes[inside] * num_bins + bin_ids[inside], minlength=len(keys) * num_bins)
+        return dict(zip(keys, counts.reshape(len(keys), num_bins))), edges
+
+    def quantile(self, name: str, q: Union[float, Sequence[float]]) -> Dict[Hashable, Union[float, np.ndarray]]:
+        """
+        Compute quantiles of values of groups, interpolated linearly as by ``np.quantile``.
+
+        Args:
+            name (str): a name of values.
+            q (Union[float, Sequence[float]]): a quantile or a sequence of quantiles, between 0 and 1.
+
+        Raises:
+            Exception: if a quantile is out of the [0, 1] range.
+
+        Returns:
+            dict: a dictionary mapping group keys to quantiles (an array of them if ``q`` is a sequence), NaN for groups without values.
+        """
+        quantiles = np.asarray(q, dtype=np.float64)
+        if np.any((quantiles < 0) | (quantiles > 1)):
+            raise Exception(f"Quantiles must be between 0 and 1, got {q}.")
+        keys, codes, values = self._read_values(name)
+        # values sorted within groups, groups one after another
+        order = np.lexsort((values, codes))
+        values = values[order]
+        counts = np.bincount(codes, minlength=len(keys))
+        starts = np.cumsum(counts) - counts
+        positions = np.maximum(counts - 1, 0)[:, None] * quantiles.reshape(1, -1)
+        lower = np.floor(positions).astype(np.int64)
+        upper = np.minimum(lower + 1, np.maximum(counts - 1, 0)[:, None])
+        if len(values):
+            lower_values = values[np.minimum(starts[:, None] + lower, len(values) - 1)]
+            upper_values = values[np.minimum(starts[:, None] + upper, len(values) - 1)]
+            results = lower_values + (upper_values - lower_values) * (positions - lower)
+        else:
+            results = np.empty_like(positions)
+        results[counts == 0] = np.nan
+        if quantiles.ndim == 0:
+            return dict(zip(keys, results[:, 0].tolist()))
+        return dict(zip(keys, results))
+
+    def _read_groups(self) -> Tuple[List[Hashable], np.ndarray]:
+        """
+        Private method. Read group keys of selected entities, once per version of the collection.
+
+        Returns:
+            tuple[list, np.ndarray]: keys of groups, and numbers of groups of entities.
+        """
+        version = self.collection.version
+        if self._groups is None or self._version != version:
+            self._source = self._select()
+            self._groups = self._read_keys()
+            self._version = version
+        return self._groups
+
+    def _read_values(self, name: str) -> Tuple[List[Hashable], np.ndarray, np.ndarray]:
+        """
+        Private method. Read group keys and values of selected entities, skipping None values.
+
+        Args:
+            name (str): a name of values.
+
+        Returns:
+            tuple[list, np.ndarray, np.ndarray]: keys of groups, numbers of groups of values, and float values.
+        """
+        keys, codes = self._read_groups()
+        values = self._read_column(name)
+        valid = ~np.isnan(values)
+        return keys, codes[valid], values[valid]
+
+    def _read_keys(self) -> Tuple[List[Hashable], np.ndarray]:
+        """
+        Private method. Number groups of selected entities, reading integer columns if possible.
+
+        Returns:
+            tuple[list, np.ndarray]: keys of groups, and numbers of groups of entities.
+        """
+        collection, positions = self._source
+        if not self.attr_names:
+            return [()], np.zeros(len(collection) if positions is None else len(positions), dtype=np.int64)
+        if all(_is_integer_column(collection, attr_name) for attr_name in self.attr_names):
+            columns = [collection.column(attr_name) for attr_name in self.attr_names]
+            return _factorize_columns([column if positions is None else column[positions] for column in columns])
+        return _factorize(list(map(attrgetter(*self.attr_names), _entities(collection, positions))))
+
+    def _read_column(self, name: str) -> np.ndarray:
+        """
+        Private method. Read values of selected entities, reading a column if possible.
+
+        Args:
+            name (str): a name of values.
+
+        Returns:
+            np.ndarray: float values, NaN for None values.
+        """
+        collection, positions = self._source
+        attr_name, index = _ITEMS.get(name, (name, None))
+        if attr_name in getattr(collection, "column_names", ()):
+            values = collection.column(attr_name)
+            values = (values if index is None else values[:, index]).astype(np.float64)
+            return values if positions is None else values[positions]
+        values = map(attrgetter(attr_name), _entities(collection, positions))
+        return _floats(values if index is None else map(itemgetter(index), values))
+
+    def _select(self) -> Tuple[object, Optional[np.ndarray]]:
+        """
+        Private method. Select entities matching filters.
+
+        Returns:
+            tuple: a collection and positions of selected entities in it, None if all of them are selected.
+        """
+        collection = self.collection
+        if not self.filters:
+            return collection, None
+        positions = collection._cached_positions(self.filters)
+        return collection, collection._filter_positions(self.filters) if positions is None else positions
+
+
+def _is_integer_column(collection, attr_name: str) -> bool:
+    """Private function. Check whether a collection has an integer column of attribute values."""
+    if attr_name not in getattr(collection, "column_names", ()):
+        return False
+    column = collection.column(attr_name)
+    return column.ndim == 1 and column.dtype.kind in "iu"
+
+
+def _entities(collection, positions: Optional[np.ndarray]):
+    """Private function. Iterate over entities of a collection at given positions, all of them if None."""
+    return iter(collection) if positions is None else collection._entities_at(positions)
+
+
+def _floats(values: Iterable) -> np.ndarray:
+    """Private function. Convert values into a float array, None values into NaN."""
+    values = list(values)
+    try:
+        return np.fromiter(values, dtype=np.float64, count=len(values))
+    except TypeError:
+        return np.fromiter((np.nan if value is None else value for value in values), dtype=np.float64, count=len(values))
+
+
+def _factorize(keys: List[Hashable]) -> Tuple[List[Hashable], np.ndarray]:
+    """
+    Private function. Number distinct keys.
+
+    Args:
+        keys (list): keys of entities.
+
+    Returns:
+        tuple[list, np.ndarray]: distinct keys (sorted if integers, else in order of appearance), and numbers of keys of entities.
+    """
+    # only int keys take the integer path: floats would be truncated and bools turned into 0 and 1
+    if set(map(type, keys)) == {int}:
+        try:
+            return _factorize_columns([np.fromiter(keys, dtype=np.int64, count=len(keys))])
+        except OverflowError:
+            pass
+    numbers = {} # type: Dict[Hashable, int]
+    codes = np.fromiter((numbers.setdefault(key, len(numbers)) for key in keys), dtype=np.int64, count=len(keys))
+    return list(numbers), codes
+
+
+def _factorize_columns(columns: List[np.ndarray]) -> Tuple[List[Hashable], np.ndarray]:
+    """
+    Private function. Number distinct rows of integer columns, in sorted order.
+    Values of a column within a small range are numbered with ``np.bincount``, others with ``np.unique``.
+
+    Args:
+        columns (list[np.ndarray]): integer columns of the same length.
+
+    Returns:
+        tuple[list, np.ndarray]: distinct keys (values, or tuples of values of many columns) and numbers of keys of rows.
+    """
+    uniques, codes = [], None
+    for column in columns:
+        column_uniques, column_codes = _factorize_column(column)
+        uniques.append(column_uniques)
+        codes = column_codes if codes is None else codes * len(column_uniques) + column_codes
+    if len(columns) == 1:
+        return uniques[0].tolist(), codes
+    combined, codes = np.unique(codes, return_inverse=True)
+    # decode numbers of combined keys into numbers of keys of each column
+    parts = []
+    for column_uniques in reversed(uniques):
+        combined, part = np.divmod(combined, len(column_uniques))
+        parts.append(column_uniques[part].tolist())
+    return list(zip(*reversed(parts))), codes.reshape(-1)
+
+
+def _factorize_column(column: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Private function. Number distinct values of an integer column, in sorted order."""
+    if not len(column):
+        return column[:0], np.zeros(0, dtype=np.int64)
+    low, high = int(column.min()), int(column.max())
+    if high - low > 2 * len(column) + 1024:
+        uniques, codes = np.unique(column, return_inverse=True)
+        return uniques, codes.reshape(-1)
+    offsets = column.astype(np.int64) - low
+    present = np.bincount(offsets, minlength=high - low + 1) > 0
+    numbers = np.cumsum(present) - 1
+    return np.flatnonzero(present) + low, numbers[offsets]
@@ -1,6 +1,16 @@
-from .core import BaseCollection
-from ..models.annotation import Factory
+from typing import List, Optional, Set, Hashable, Tuple
+from operator import attrgetter
+from itertools import chain
+
+import numpy as np
+
+from .core import BaseCollection, INDEX_SELECTIVITY
+from .indexes import Index
+from .spatial import SpatialIndex
+from ..operators.core import EQUAL, IN, OR
+from ..models.annotation import Factory, IMAGE_ID, CATEGORY_ID, BBOX
 from ..filters.annotation import Filters
+from ..filters.properties import BaseProperty, ValueProperty, ValuesProperty, BboxRegionProperty, BboxNearestProperty, Intersection
 
 class Collection(BaseCollection):
     """
@@ -9,10 +19,149 @@ class Collection(BaseCollection):
     To instantiate an Collection class, use following example:
     >>> from coco_orm.collections import AnnotationCollection
     >>> annotation_collection = AnnotationCollection()
+
+    Region filters of chains restricting image ids (e.g. ``AnnotationFilters().image_id(1).bbox_intersects(region)``)
+    are looked up in a spatial index over bboxes, see ``spatial_index``.
     """
+    indexes = (Index(IMAGE_ID), Index(CATEGORY_ID))
+    _spatial_index = None # type: Optional[SpatialIndex]
+    _spatial_index_version = None # type: Optional[int] # a version of the collection the spatial index has been built for
+
     def __init__(self, entities):
         super().__init__(Factory, Filters, entities)
 
     def __call__(self, entities):
         """Override. Return a Collection instance."""
-        return Collection(Factory, Filters, entities)
+        return Collection(entities)
+
+    def spatial_index(self) -> SpatialIndex:
+        """
+        Get a per-image spatial index over bboxes of annotations, see ``coco_orm.collections.spatial.SpatialIndex``.
+        The index is built on first use and rebuilt on the first use after the collection has changed.
+
+        Returns:
+            SpatialIndex: a spatial index.
+        """
+        if self._spatial_index is None or self._spatial_index_version != self.version:
+            self._spatial_index = SpatialIndex(*self._read_bboxes())
+            self._spatial_index_version = self.version
+        return self._spatial_index
+
+    def nearest_ids(self, property: BboxNearestProperty, filters: Optional[Filters] = None) -> List[int]:
+        """
+        Find ids of annotations whose bboxes are nearest to a point in each image. Used to resolve nearest bbox filters,
+        see ``coco_orm.filters.core.BaseFilter.resolve``.
+
+        Args:
+            property (BboxNearestProperty): a nearest bboxes filter.
+            filters (Optional[Filters]): a chain the filter belongs to, only images it restricts image ids to are searched.
+
+        Returns:
+            list[int]: ids of annotations, in collection order.
+        """
+        return self._ids_at(self.spatial_index().nearest(property, _image_ids(filters) if filters else None))
+
+    def _filter_positions(self, filters: Filters) -> np.ndarray:
+        """Override. Narrow annotations down with the spatial index first, if spatial filters of the chain can be looked up in it."""
+        found = self._spatial_positions(filters)
+        if found is None:
+            return self._scan_positions(filters.resolve(self))
+        positions, rest = found
+        return self._check_positions(rest, positions) if rest else positions
+
+    def _spatial_positions(self, filters: Filters) -> Optional[Tuple[np.ndarray, Filters]]:
+        """
+        Private method. Look spatial filters of a chain joined by AND up in the spatial index: nearest bbox filters are
+        looked up in images the chain restricts image ids to (all images if it doesn't), a region filter only if the chain
+        restricts image ids to images holding few enough annotations for the index to be faster than a scan.
+
+        Args:
+            filters (Filters): a filters chain.
+
+        Returns:
+            Optional[tuple[np.ndarray, Filters]]: ascending positions of candidates matching the looked up filters
+                and the rest of the chain to check candidates with, None if no filter can be looked up.
+        """
+        if OR in filters:
+            return None
+        nearest = [arg for arg in filters if isinstance(arg, BboxNearestProperty)]
+        regions = [arg for arg in filters if isinstance(arg, BboxRegionProperty)]
+        image_ids = _image_ids(filters)
+        if nearest:
+            index = self.spatial_index()
+            positions = index.nearest(nearest[0], image_ids)
+            for property in nearest[1:]:
+                positions = np.intersect1d(positions, index.nearest(property, image_ids), assume_unique=True)
+            found = nearest
+        elif regions and image_ids is not None:
+            index = self.spatial_index()
+            if index.count(image_ids) > len(self) * INDEX_SELECTIVITY:
+                return None
+            positions, found = index.search(regions[0], image_ids), regions[:1]
+        else:
+            return None
+        # candidates are annotations of the images already
+        rest = [arg for arg in filters if isinstance(arg, (BaseProperty, Intersection)) and not any(arg is property for property in found)]
+        return positions, type(filters)(arg for arg in rest if image_ids is None or not _is_image_id_filter(arg))
+
+    def _scan_positions(self, filters: Filters) -> np.ndarray:
+        """
+        Private method. Find positions of annotations matching filters without the spatial index.
+
+        Args:
+            filters (Filters): a resolved filters chain, see ``coco_orm.filters.core.BaseFilter.resolve``.
+
+        Returns:
+            np.ndarray: an ascending array of positions.
+        """
+        return super()._filter_positions(filters)
+
+    def _check_positions(self, filters: Filters, positions: np.ndarray) -> np.ndarray:
+        """
+        Private method. Check candidates found in the spatial index with the rest of a filters chain.
+
+        Args:
+            filters (Filters): a filters chain joined by AND, without spatial filters looked up in the index.
+            positions (np.ndarray): ascending positions of candidates.
+
+        Returns:
+            np.ndarray: ascending positions of candidates matching the filters.
+        """
+        return positions[np.array(filters.compiled.positions(self._entities_at(positions)), np.int64)]
+
+    def _read_bboxes(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Private method. Read image ids and bboxes of annotations, in a single pass over entities per attribute."""
+        image_ids = _image_id_array(list(map(attrgetter(IMAGE_ID), self)))
+        bboxes = np.fromiter(chain.from_iterable(map(attrgetter(BBOX), self)), np.float64, len(image_ids) * 4)
+        return image_ids, bboxes.reshape(-1, 4)
+
+
+def _image_id_array(image_ids: List[Hashable]) -> np.ndarray:
+    """Private function. Turn image ids into an int64 array, or an object array if some of them are not integers."""
+    try:
+        return np.fromiter(image_ids, np.int64, len(image_ids))
+    except (TypeError, ValueError, OverflowError):
+        array = np.empty(len(image_ids), dtype=object)
+        array[:] = image_ids
+        return array
+
+
+def _is_image_id_filter(arg) -> bool:
+    """Private function. Check whether a filters chain argument is an image id equality / membership filter."""
+    if type(arg) is ValueProperty:
+        return arg.name == IMAGE_ID and arg.comparison_operator == EQUAL
+    return type(arg) is ValuesProperty and arg.name == IMAGE_ID and arg.membership_operator == IN
+
+
+def _image_ids(filters: Filters) -> Optional[Set[Hashable]]:
+    """Private function. Get image ids a filters chain restricts annotations to with equality / membership filters, None if it doesn't."""
+    if OR in filters:
+        return None
+    image_ids = None
+    for arg in filters:
+        for property in (arg if isinstance(arg, Intersection) else (arg,)):
+            if not _is_image_id_filter(property):
+                continue
+            values = {property.value} if type(property) is ValueProperty else set(property.values)
+            image_ids = values if image_ids is None else image_ids & values
+    return image_ids
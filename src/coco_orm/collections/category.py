@@ -2,7 +2,8 @@
 from typing import Optional
 # library modules
 from .core import BaseCollection
-from ..models.category import Model, Factory
+from .indexes import Index
+from ..models.category import Model, Factory, NAME
 from ..filters.category import Filters
     
 
@@ -14,12 +15,14 @@ class Collection(BaseCollection):
     >>> from coco_orm.collections import CategoryCollection
     >>> category_collection = CategoryCollection()
     """
+    indexes = (Index(NAME, unique=True),)
+
     def __init__(self, entities):
         super().__init__(Factory, Filters, entities)
 
     def __call__(self, entities):
         """Override. Return a Collection instance."""
-        return Collection(Factory, Filters, entities)
+        return Collection(entities)
 
     def get_by_name(self, value: str) -> Optional[Model]:
         """
@@ -31,6 +34,6 @@ class Collection(BaseCollection):
         Returns:
             Optional[Model]: an instance of Model containing entity data if one is found, None if not
         """
-        return next((entity for entity in self if entity.name == value), None)
+        return self.get_by(NAME, value)
     
 
@@ -0,0 +1,881 @@
+from typing import List, Dict, Optional, Union, Iterable, Iterator, Hashable, Tuple
+from itertools import chain, repeat
+from operator import index
+
+import numpy as np
+
+from .core import INDEX_SELECTIVITY, APPEND, DELETE
+from .annotation import Collection as AnnotationCollection
+from .query import Query as BaseQuery
+from .view import LIST_READERS, reading_entities
+from ..models.core import without_none
+from ..models.annotation import Model, Factory, ID, IMAGE_ID, CATEGORY_ID, SEGMENTATION, AREA, BBOX, ISCROWD
+from ..filters.annotation import Filters
+
+
+"""Fixed-width columns and their types."""
+COLUMNS = ((ID, np.int64), (IMAGE_ID, np.int64), (CATEGORY_ID, np.int64), (ISCROWD, np.int8), (AREA, np.float64))
+_column_types = dict(COLUMNS)
+
+"""Kinds of segmentation values."""
+SEGMENTATION_NONE = 0 # no segmentation
+SEGMENTATION_POLYGONS = 1 # a list of polygons, stored in ragged arrays
+SEGMENTATION_OBJECT = 2 # anything else (e.g. RLE), stored as is
+
+"""Names of arrays storing segmentations."""
+RAGGED_ARRAYS = ("segmentation_kinds", "coords", "polygon_ends", "row_ends")
+
+"""A number of rows converted to dictionaries at once by ``Collection.iter_dicts``."""
+DICT_BATCH_SIZE = 10000
+
+
+class Buffer():
+    """
+    Buffer is a growable NumPy array. Appending is amortized O(1), other changes copy the array.
+
+    Args:
+        dtype (np.dtype): a type of array items.
+        width (Optional[int]): a number of items in a row for 2D buffers, None for 1D buffers.
+        data (Optional[np.ndarray]): an array to wrap.
+
+    Attributes:
+        data (np.ndarray): an array of at least ``size`` rows.
+        size (int): a number of rows in use.
+    """
+    def __init__(self, dtype, width: Optional[int] = None, data: Optional[np.ndarray] = None):
+        self.data = np.empty((0,) if width is None else (0, width), dtype) if data is None else data
+        self.size = len(self.data)
+
+    def view(self) -> np.ndarray:
+        """Returns an array of rows in use."""
+        return self.data[:self.size]
+
+    def extend(self, values: np.ndarray) -> None:
+        size = self.size + len(values)
+        if size > len(self.data):
+            data = np.empty((max(size, 2 * len(self.data), 16),) + self.data.shape[1:], self.data.dtype)
+            data[:self.size] = self.data[:self.size]
+            self.data = data
+        self.data[self.size:size] = values
+        self.size = size
+
+    def splice(self, start: int, stop: int, values: np.ndarray) -> None:
+        values = np.asarray(values, self.data.dtype).reshape((-1,) + self.data.shape[1:])
+        if len(values) == stop - start and self.data.flags.writeable:
+            # as many rows as replaced ones are written in place, following rows don't move
+            self.data[start:stop] = values
+            return
+        self.data = np.concatenate((self.data[:start], values, self.data[stop:self.size]))
+        self.size = len(self.data)
+
+
+class Columns():
+    """
+    Columns stores annotations column by column.
+
+    Fixed-width fields are stored in contiguous arrays, bboxes in an (N, 4) float32 array. Polygons are stored in ragged arrays:
+    ``coords`` holds coordinates of all polygons, ``polygon_ends`` holds end offsets of polygons in ``coords``,
+    ``row_ends`` holds end offsets of annotations in ``polygon_ends``. Other segmentation values (e.g. RLE) are stored as is.
+    """
+    def __init__(self):
+        self.buffers = {name: Buffer(dtype) for name, dtype in COLUMNS} # type: Dict[str, Buffer]
+        self.buffers[BBOX] = Buffer(np.float32, 4)
+        self.segmentation_kinds = Buffer(np.int8)
+        self.segmentation_objects = [] # type: List # segmentation values of SEGMENTATION_OBJECT kind, None for other rows
+        self.coords = Buffer(np.float64)
+        self.polygon_ends = Buffer(np.int64)
+        self.row_ends = Buffer(np.int64)
+
+    def __len__(self):
+        return self.buffers[ID].size
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Get a column.
+
+        Args:
+            name (str): a column name, one of fixed-width columns or ``bbox``.
+
+        Returns:
+            np.ndarray: an array of column values, changes of the array change the column.
+        """
+        return self.buffers[name].view()
+
+    def get(self, row: int, name: str):
+        return self.buffers[name].data[row]
+
+    def set(self, row: int, name: str, value) -> None:
+        self.buffers[name].data[row] = value
+
+    def get_segmentation(self, row: int):
+        kind = self.segmentation_kinds.data[row]
+        if kind == SEGMENTATION_NONE:
+            return None
+        if kind == SEGMENTATION_OBJECT:
+            return self.segmentation_objects[row]
+        row_ends = self.row_ends.data
+        first, last = (row_ends[row - 1] if row else 0), row_ends[row]
+        polygon_ends = self.polygon_ends.data
+        start = polygon_ends[first - 1] if first else 0
+        polygons = []
+        for end in polygon_ends[first:last]:
+            polygons.append([int(value) if value.is_integer() else value for value in self.coords.data[start:end].tolist()])
+            start = end
+        return polygons
+
+    def replace(self, start: int, stop: int, entities: Iterable[Union[Model, Dict]]) -> None:
+        """
+        Replace rows ``[start, stop)`` with given entities.
+
+        Args:
+            start (int): a position of the first row to replace.
+            stop (int): a position after the last row to replace.
+            entities (Iterable[Model | dict]): entities or dictionaries containing entity data.
+        """
+        rows = encode(entities)
+        if start == stop == len(self):
+            for name, buffer in self.buffers.items(): buffer.extend(rows[name])
+            self.segmentation_kinds.extend(rows[SEGMENTATION])
+            self.segmentation_objects.extend(rows["objects"])
+            self.row_ends.extend(rows["row_ends"] + self.polygon_ends.size)
+            self.polygon_ends.extend(rows["polygon_ends"] + self.coords.size)
+            self.coords.extend(rows["coords"])
+            return
+        for name, buffer in self.buffers.items(): buffer.splice(start, stop, rows[name])
+        self.segmentation_kinds.splice(start, stop, rows[SEGMENTATION])
+        self.segmentation_objects[start:stop] = rows["objects"]
+        # ragged arrays: locate replaced polygons and coordinates, shift offsets of following rows
+        row_ends, polygon_ends = self.row_ends.view(), self.polygon_ends.view()
+        first = row_ends[start - 1] if start else 0
+        last = row_ends[stop - 1] if stop else 0
+        coords_start = polygon_ends[first - 1] if first else 0
+        coords_stop = polygon_ends[last - 1] if last else 0
+        self.coords.splice(coords_start, coords_stop, rows["coords"])
+        polygons_shift = len(rows["polygon_ends"]) - (last - first)
+        coords_shift = len(rows["coords"]) - (coords_stop - coords_start)
+        self.polygon_ends.splice(first, last, rows["polygon_ends"] + coords_start)
+        if coords_shift: self.polygon_ends.data[first + len(rows["polygon_ends"]):] += coords_shift
+        self.row_ends.splice(start, stop, rows["row_ends"] + first)
+        if polygons_shift: self.row_ends.data[start + len(rows["row_ends"]):] += polygons_shift
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Get all arrays of the storage, e.g. to save them. Segmentation objects are not included, see ``objects``.
+
+        Returns:
+            dict: arrays of rows in use by their names.
+        """
+        arrays = {name: buffer.view() for name, buffer in self.buffers.items()}
+        arrays.update({name: getattr(self, name).view() for name in RAGGED_ARRAYS})
+        return arrays
+
+    def objects(self) -> Dict[int, object]:
+        """
+        Get segmentation values stored as is (e.g. RLE).
+
+        Returns:
+            dict: segmentation values by their row positions.
+        """
+        rows = np.flatnonzero(self.segmentation_kinds.view() == SEGMENTATION_OBJECT).tolist()
+        return {row: self.segmentation_objects[row] for row in rows}
+
+    @staticmethod
+    def from_arrays(arrays: Dict[str, np.ndarray], objects: Dict[int, object]) -> "Columns":
+        """
+        Create columns wrapping given arrays without copying them, so memory-mapped arrays stay memory-mapped
+        until the rows are changed.
+
+        Args:
+            arrays (dict): arrays by their names, see ``arrays``.
+            objects (dict): segmentation values stored as is by their row positions, see ``objects``.
+
+        Returns:
+            Columns: columns holding the arrays.
+        """
+        columns = Columns()
+        for name, buffer in columns.buffers.items():
+            columns.buffers[name] = Buffer(buffer.data.dtype, data=arrays[name])
+        for name in RAGGED_ARRAYS:
+            setattr(columns, name, Buffer(getattr(columns, name).data.dtype, data=arrays[name]))
+        columns.segmentation_objects = [None] * len(columns)
+        for row, value in objects.items():
+            columns.segmentation_objects[row] = value
+        return columns
+
+    def take(self, positions: np.ndarray) -> "Columns":
+        """
+        Copy rows at given positions into new columns.
+
+        Args:
+            positions (np.ndarray): an array of row positions.
+
+        Returns:
+            Columns: new columns holding the rows in the order of positions.
+        """
+        positions = np.asarray(positions, np.int64)
+        columns = Columns()
+        for name, buffer in self.buffers.items():
+            columns.buffers[name] = Buffer(buffer.data.dtype, data=buffer.view()[positions])
+        kinds = columns.segmentation_kinds = Buffer(np.int8, data=self.segmentation_kinds.view()[positions])
+        # segmentation objects are rare, copy only rows having them
+        objects = columns.segmentation_objects = [None] * len(positions)
+        for row in np.flatnonzero(kinds.view() == SEGMENTATION_OBJECT).tolist():
+            objects[row] = self.segmentation_objects[positions[row]]
+        polygons, row_ends = take_ragged(self.row_ends.view(), positions)
+        coords, polygon_ends = take_ragged(self.polygon_ends.view(), polygons)
+        columns.row_ends = Buffer(np.int64, data=row_ends)
+        columns.polygon_ends = Buffer(np.int64, data=polygon_ends)
+        columns.coords = Buffer(np.float64, data=self.coords.view()[coords])
+        return columns
+
+    @staticmethod
+    def concat(parts: Iterable["Columns"]) -> "Columns":
+        """
+        Concatenate rows of several columns into new columns.
+
+        Args:
+            parts (Iterable[Columns]): columns to concatenate, in order.
+
+        Returns:
+            Columns: new columns holding rows of all parts.
+        """
+        parts = list(parts)
+        if not parts:
+            return Columns()
+        arrays = [part.arrays() for part in parts]
+        # offsets of ragged arrays are shifted by sizes of the preceding parts
+        for name, base in (("row_ends", "polygon_ends"), ("polygon_ends", "coords")):
+            sizes = np.cumsum([0] + [len(part[base]) for part in arrays[:-1]])
+            for part, size in zip(arrays, sizes.tolist()):
+                part[name] = part[name] + size
+        objects, rows = {}, 0
+        for part in parts:
+            objects.update({rows + row: value for row, value in part.objects().items()})
+            rows += len(part)
+        return Columns.from_arrays({name: np.concatenate([part[name] for part in arrays]) for name in arrays[0]}, objects)
+
+
+def take_ragged(ends: np.ndarray, positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Select segments of a ragged array.
+
+    Args:
+        ends (np.ndarray): end offsets of segments.
+        positions (np.ndarray): positions of segments to select.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: offsets of items of selected segments, and end offsets of selected segments.
+    """
+    stops = ends[positions]
+    starts = np.where(positions > 0, ends[positions - 1], 0) if len(ends) else stops
+    lengths = stops - starts
+    new_ends = np.cumsum(lengths)
+    # items of a segment are contiguous: shift a running counter by the segment start
+    offsets = np.repeat(starts - (new_ends - lengths), lengths)
+    return np.arange(len(offsets), dtype=np.int64) + offsets, new_ends
+
+
+def encode_segmentations(segmentations: List) -> Dict[str, Union[np.ndarray, List]]:
+    """
+    Encode segmentation values into ragged arrays.
+
+    Args:
+        segmentations (list): segmentation values of annotations.
+
+    Returns:
+        dict: arrays of segmentation kinds, coordinates, polygon and row end offsets, and a list of segmentation objects.
+    """
+    kinds, objects, row_lengths, polygons = [], [], [], []
+    for segmentation in segmentations:
+        if segmentation is None:
+            kinds.append(SEGMENTATION_NONE); objects.append(None); row_lengths.append(0)
+        elif isinstance(segmentation, list) and all(isinstance(polygon, list) for polygon in segmentation):
+            kinds.append(SEGMENTATION_POLYGONS); objects.append(None); row_lengths.append(len(segmentation))
+            polygons.extend(segmentation)
+        else:
+            kinds.append(SEGMENTATION_OBJECT); objects.append(segmentation); row_lengths.append(0)
+    return {
+        SEGMENTATION: np.array(kinds, np.int8),
+        "objects": objects,
+        "coords": np.fromiter(chain.from_iterable(polygons), np.float64),
+        "polygon_ends": np.cumsum(np.fromiter(map(len, polygons), np.int64, len(polygons))),
+        "row_ends": np.cumsum(np.array(row_lengths, np.int64)),
+    }
+
+
+def encode(entities: Iterable[Union[Model, Dict]]) -> Dict[str, Union[np.ndarray, List]]:
+    """
+    Encode entities into column arrays.
+    Dictionaries are converted the same way as ``Factory.from_dict`` does, without creating Model instances.
+
+    Args:
+        entities (Iterable[Model | dict]): entities or dictionaries containing entity data.
+
+    Returns:
+        dict: arrays of column values and ragged segmentation arrays. See ``encode_segmentations``.
+    """
+    ids, image_ids, category_ids, iscrowds, areas, bboxes, segmentations = [], [], [], [], [], [], []
+    for entity in entities:
+        if isinstance(entity, dict):
+            ids.append(int(entity[ID]) if entity.get(ID) is not None else 0)
+            image_ids.append(int(entity[IMAGE_ID]))
+            category_ids.append(int(entity[CATEGORY_ID]))
+            iscrowds.append(int(entity[ISCROWD]) if entity.get(ISCROWD) is not None else 0)
+            areas.append(float(entity[AREA]) if entity.get(AREA) is not None else np.nan)
+            bboxes.append(list(map(int, entity[BBOX])))
+            segmentations.append(entity.get(SEGMENTATION))
+        else:
+            ids.append(entity.id)
+            image_ids.append(entity.image_id)
+            category_ids.append(entity.category_id)
+            iscrowds.append(entity.iscrowd)
+            areas.append(np.nan if entity.area is None else entity.area)
+            bboxes.append(entity.bbox)
+            segmentations.append(entity.segmentation)
+    rows = encode_segmentations(segmentations)
+    rows.update({
+        ID: np.array(ids, np.int64),
+        IMAGE_ID: np.array(image_ids, np.int64),
+        CATEGORY_ID: np.array(category_ids, np.int64),
+        ISCROWD: np.array(iscrowds, np.int8),
+        AREA: np.array(areas, np.float64),
+        BBOX: np.array(bboxes, np.float32).reshape(-1, 4),
+    })
+    return rows
+
+
+def _column_property(name: str, convert):
+    """Build a View property reading and writing a fixed-width column."""
+    return property(
+        lambda view: convert(view._columns.get(view._row, name)),
+        lambda view, value: view._columns.set(view._row, name, value),
+    )
+
+
+class View(Model):
+    """
+    View is a lightweight annotation Model reading and writing a row of Columns.
+
+    Views are created on demand by ``ColumnarCollection`` and hold no data by themselves.
+    A view points to a row position: it is outdated once rows before it are removed or inserted.
+    Changes of a returned bbox or segmentation list are not stored, assign a new value instead.
+    Views of the same row of the same columns are equal, as an entity of a collection of models is equal to itself.
+
+    Args:
+        columns (Columns): columns containing annotation data.
+        row (int): a row position.
+    """
+    __slots__ = ("_columns", "_row")
+
+    def __init__(self, columns: Columns, row: int):
+        self._columns = columns
+        self._row = row
+
+    def __eq__(self, other):
+        if not isinstance(other, View):
+            return NotImplemented
+        return self._columns is other._columns and self._row == other._row
+
+    def __hash__(self):
+        return hash((id(self._columns), self._row))
+
+    id = _column_property(ID, int)
+    image_id = _column_property(IMAGE_ID, int)
+    category_id = _column_property(CATEGORY_ID, int)
+    iscrowd = _column_property(ISCROWD, int)
+    area = property(
+        lambda view: None if np.isnan(view._columns.get(view._row, AREA)) else float(view._columns.get(view._row, AREA)),
+        lambda view, value: view._columns.set(view._row, AREA, np.nan if value is None else value),
+    )
+    bbox = property(
+        lambda view: [int(value) if value.is_integer() else value for value in view._columns.get(view._row, BBOX).tolist()],
+        lambda view, value: view._columns.set(view._row, BBOX, value),
+    )
+
+    @property
+    def segmentation(self):
+        return self._columns.get_segmentation(self._row)
+
+    @segmentation.setter
+    def segmentation(self, value):
+        entity = self.to_dict()
+        entity[SEGMENTATION] = value
+        self._columns.replace(self._row, self._row + 1, [entity])
+
+    def to_dict(self, drop_none: bool = False) -> Dict:
+        """Override. Get dictionarized representation of the annotation."""
+        data = {
+            ID: self.id,
+            IMAGE_ID: self.image_id,
+            CATEGORY_ID: self.category_id,
+            SEGMENTATION: self.segmentation,
+            AREA: self.area,
+            BBOX: self.bbox,
+            ISCROWD: self.iscrowd,
+        }
+        return without_none(data) if drop_none else data
+
+
+class ColumnIndex():
+    """
+    ColumnIndex is a secondary index over a column of ColumnarCollection, exposing the interface of ``coco_orm.collections.indexes.Index``.
+    Row positions are sorted by column value once, values are then looked up with binary search.
+
+    Args:
+        attr_name (str): a column name.
+        unique (bool): True if the column identifies an entity.
+        collection (ColumnarCollection): a collection to index.
+    """
+    def __init__(self, attr_name: str, unique: bool, collection: "Collection"):
+        self.attr_name = attr_name
+        self.unique = unique
+        self._collection = collection
+        column = collection.columns.column(attr_name)
+        self._order = np.argsort(column, kind="stable")
+        self._values = column[self._order]
+
+    def _range(self, value) -> Tuple[int, int]:
+        return int(np.searchsorted(self._values, value, "left")), int(np.searchsorted(self._values, value, "right"))
+
+    def positions(self, value: Hashable) -> np.ndarray:
+        """Returns row positions of entities having the value, in collection order."""
+        start, stop = self._range(value)
+        return self._order[start:stop]
+
+    def get(self, value: Hashable) -> List[Model]:
+        view = self._collection._entity_at
+        return [view(position) for position in self.positions(value).tolist()]
+
+    def first(self, value: Hashable) -> Optional[Model]:
+        positions = self.positions(value)
+        return self._collection._entity_at(int(positions[0])) if len(positions) else None
+
+    def count(self, values: Iterable[Hashable]) -> int:
+        values = np.fromiter(values, self._values.dtype)
+        return int((np.searchsorted(self._values, values, "right") - np.searchsorted(self._values, values, "left")).sum())
+
+
+class Query(BaseQuery):
+    """
+    Query is a lazy selection of ColumnarCollection annotations, see ``coco_orm.collections.query.Query``.
+
+    Filters evaluated over whole columns select row positions with a boolean mask, and annotations are ordered
+    by fixed-width columns with a stable sort of the selected positions: vectorized passes over columns are cheaper
+    than stopping a scan of views early. ``count``, ``exists`` and ``ids`` read columns only, no views are created.
+    Other filters and orders are evaluated view by view.
+    """
+    def __iter__(self) -> Iterator[Model]:
+        """Override. Create views of selected rows only."""
+        positions = self._positions()
+        if positions is None:
+            return super().__iter__()
+        return self.collection._entities_at(positions)
+
+    def all(self) -> "Collection":
+        """Override. Selected columns are copied as a whole instead of entity by entity."""
+        positions = self._positions()
+        if positions is None:
+            return super().all()
+        return self.collection.take(positions)
+
+    def count(self) -> int:
+        """Override. Count selected rows of a mask."""
+        positions = self._positions(ordered=False)
+        return super().count() if positions is None else len(positions)
+
+    def exists(self) -> bool:
+        """Override. Check selected rows of a mask."""
+        positions = self._positions(ordered=False)
+        return super().exists() if positions is None else len(positions) > 0
+
+    def ids(self) -> List[int]:
+        """Override. Read ids of selected rows from the id column."""
+        positions = self._positions()
+        return super().ids() if positions is None else self.collection.column(ID)[positions].tolist()
+
+    def _positions(self, ordered: bool = True) -> Optional[np.ndarray]:
+        """
+        Private method. Find positions of selected rows.
+
+        Args:
+            ordered (bool): order positions as the query does, else keep them in collection order.
+
+        Returns:
+            Optional[np.ndarray]: an array of positions, None if filters or the order can't be evaluated over columns.
+        """
+        collection = self.collection
+        if ordered and not set(self._order) <= set(_column_types):
+            return None
+        if not self.filters:
+            positions = np.arange(len(collection))
+        else:
+            compiled = self.filters.compiled_mask(collection.column_names)
+            if compiled is None:
+                return None
+            positions = np.flatnonzero(compiled.mask(collection.column, len(collection)))
+        if ordered and self._order:
+            # np.lexsort is stable, sorts by the last key first and places NaN (None areas) last
+            keys = [collection.column(attr_name)[positions] for attr_name in reversed(self._order)]
+            if self._reverse:
+                # a stable descending order: sort reversed positions ascending, then reverse the result
+                positions = positions[::-1][np.lexsort([key[::-1] for key in keys])][::-1]
+            else:
+                positions = positions[np.lexsort(keys)]
+        return positions[self._offset:self._stop()]
+
+
+class Collection(AnnotationCollection):
+    """
+    Collection is an AnnotationCollection storing annotations in NumPy arrays instead of Model instances.
+    See ``Columns`` for the storage layout.
+
+    Entities are returned as lightweight ``View`` instances created on demand; the collection keeps the public API of
+    AnnotationCollection (iteration, indexing, get_by_id, append, update, delete, filter, to_dict).
+    Columns are accessible with ``column`` method:
+    >>> from coco_orm.collections import ColumnarAnnotationCollection
+    >>> annotation_collection = ColumnarAnnotationCollection(annotations)
+    >>> areas = annotation_collection.column("area")
+
+    Filters on fixed-width columns and bboxes are evaluated over whole columns, see ``coco_orm.filters.core.BaseFilter.apply``.
+
+    Args:
+        entities (list[dict] | list[Model] | None): dictionaries or models containing annotations data.
+
+    Attributes:
+        columns (Columns): a columnar storage of annotations.
+        column_names (tuple[str]): names of columns available with ``column`` method.
+    """
+    column_names = tuple(_column_types) + (BBOX,)
+
+    def __init__(self, entities: Union[List[Dict], List[Model], None] = None):
+        list.__init__(self)
+        self.entity_factory = Factory
+        self.filters_builder = Filters
+        self.columns = Columns()
+        if entities:
+            self.columns.replace(0, 0, entities)
+
+    def __call__(self, entities):
+        """Override. Return a Collection instance."""
+        return Collection(entities)
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Get a column of annotation values.
+
+        Args:
+            name (str): a name of a fixed-width column (id, image_id, category_id, iscrowd, area) or bbox.
+
+        Returns:
+            np.ndarray: an array of values, changes of the array change the collection.
+        """
+        return self.columns.column(name)
+
+    @staticmethod
+    def from_columns(columns: Columns) -> "Collection":
+        """
+        Create a collection holding given columns.
+
+        Args:
+            columns (Columns): a columnar storage of annotations.
+
+        Returns:
+            Collection: a new collection.
+        """
+        collection = Collection()
+        collection.columns = columns
+        return collection
+
+    def take(self, positions: np.ndarray) -> "Collection":
+        """
+        Copy annotations at given positions into a new collection.
+
+        Args:
+            positions (np.ndarray): an array of positions.
+
+        Returns:
+            Collection: a new collection.
+        """
+        return Collection.from_columns(self.columns.take(positions))
+
+    def select(self, mask: np.ndarray) -> "Collection":
+        """
+        Copy annotations marked by a boolean mask into a new collection.
+
+        Args:
+            mask (np.ndarray): a boolean array of the collection length.
+
+        Returns:
+            Collection: a new collection.
+        """
+        return self.take(np.flatnonzero(mask))
+
+    def query(self, filters: Optional[Filters] = None) -> Query:
+        """Override. Return a Query evaluated over columns."""
+        return Query(self, filters)
+
+    def _scan_positions(self, filters: Filters) -> np.ndarray:
+        """Override. Evaluate filters over whole columns if possible."""
+        compiled = filters.compiled_mask(self.column_names)
+        if compiled is None:
+            return super()._scan_positions(filters)
+        return np.flatnonzero(compiled.mask(self.column, len(self)))
+
+    def _check_positions(self, filters: Filters, positions: np.ndarray) -> np.ndarray:
+        """Override. Evaluate filters over rows of candidates if possible."""
+        compiled = filters.compiled_mask(self.column_names)
+        if compiled is None:
+            return super()._check_positions(filters, positions)
+        return positions[compiled.mask(lambda name: self.column(name)[positions], len(positions))]
+
+    def _ids_at(self, positions: np.ndarray) -> List[int]:
+        """Override. Read ids from the id column."""
+        return self.column(ID)[positions].tolist()
+
+    def _read_bboxes(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Override. Read the image id and bbox columns."""
+        return self.column(IMAGE_ID), self.column(BBOX)
+
+    def _entity_at(self, position: int) -> View:
+        """Override. Get a view of a row."""
+        return View(self.columns, position)
+
+    def _entities_at(self, positions: np.ndarray) -> Iterator[View]:
+        """Override. Get views of rows."""
+        return map(View, repeat(self.columns), positions.tolist())
+
+    def __len__(self):
+        return len(self.columns)
+
+    def __iter__(self):
+        columns = self.columns
+        return (View(columns, position) for position in range(len(columns)))
+
+    def __reversed__(self):
+        columns = self.columns
+        return (View(columns, position) for position in reversed(range(len(columns))))
+
+    def __getitem__(self, key: Union[int, slice]):
+        if isinstance(key, slice):
+            return [View(self.columns, position) for position in range(*key.indices(len(self)))]
+        position = key + len(self) if key < 0 else key
+        if not 0 <= position < len(self):
+            raise IndexError("list index out of range")
+        return View(self.columns, position)
+
+    def __contains__(self, entity: Model) -> bool:
+        """Override. An entity is contained by the collection if an entity with the same id is."""
+        return entity.id in self._get_positions()
+
+    def __repr__(self):
+        return f'{self.to_dict()}'
+
+    def index(self, entity: Model, *args) -> int:
+        """Override. Get a position of an entity with the same id."""
+        position = self._get_positions().get(entity.id)
+        if position is None:
+            raise ValueError(f"{entity!r} is not in list")
+        return position
+
+    def delete(self, id: int) -> Optional[Model]:
+        position = self._get_positions().get(id)
+        if position is None:
+            return None
+        entity = Factory.from_dict(View(self.columns, position).to_dict(), trusted=True) # detached copy, the row is removed
+        del self[position]
+        self._record(DELETE, id)
+        return entity
+
+    def get_index(self, attr_name: str) -> Optional[ColumnIndex]:
+        """Override. Secondary indexes are built over columns. See ``ColumnIndex``."""
+        if attr_name not in _column_types:
+            return None
+        if self._indexes is None:
+            self._indexes = {}
+        index = self._indexes.get(attr_name)
+        if index is None:
+            declaration = (self._declared_indexes or {}).get(attr_name) or next((index for index in self.indexes if index.attr_name == attr_name), None)
+            if declaration is None:
+                return None
+            index = self._indexes[attr_name] = ColumnIndex(attr_name, declaration.unique, self)
+        return index
+
+    def lookup(self, attr_name: str, values: Iterable[Hashable], selectivity: float = INDEX_SELECTIVITY) -> Optional[List[Model]]:
+        """Override. Fixed-width columns are looked up with a vectorized membership test."""
+        if attr_name not in _column_types:
+            return None
+        values = np.array(list(values))
+        if values.dtype.kind not in "iufb":
+            return None
+        positions = np.flatnonzero(np.isin(self.column(attr_name), values))
+        if len(positions) > len(self) * selectivity:
+            return None
+        return [View(self.columns, position) for position in positions.tolist()]
+
+    def to_dict(self, drop_none: bool = False) -> List[Dict]:
+        return self._rows_to_dict(0, len(self), drop_none)
+
+    def iter_dicts(self, drop_none: bool = False) -> Iterator[Dict]:
+        """Override. Rows are converted in batches of ``DICT_BATCH_SIZE``."""
+        for start in range(0, len(self), DICT_BATCH_SIZE):
+            yield from self._rows_to_dict(start, min(start + DICT_BATCH_SIZE, len(self)), drop_none)
+
+    def _rows_to_dict(self, start: int, stop: int, drop_none: bool = False) -> List[Dict]:
+        """Private method. Get dictionarized representations of rows ``[start, stop)``."""
+        columns = self.columns
+        ids, image_ids, category_ids, iscrowds = (columns.column(name)[start:stop].tolist() for name in (ID, IMAGE_ID, CATEGORY_ID, ISCROWD))
+        areas = [None if area != area else area for area in columns.column(AREA)[start:stop].tolist()]
+        bboxes = [[int(value) if value.is_integer() else value for value in bbox] for bbox in columns.column(BBOX)[start:stop].tolist()]
+        rows = [
+            {ID: id, IMAGE_ID: image_id, CATEGORY_ID: category_id, SEGMENTATION: columns.get_segmentation(position), AREA: area, BBOX: bbox, ISCROWD: iscrowd}
+            for position, (id, image_id, category_id, area, bbox, iscrowd) in enumerate(zip(ids, image_ids, category_ids, areas, bboxes, iscrowds), start)
+        ]
+        return list(map(without_none, rows)) if drop_none else rows
+
+    def append(self, entity: Model) -> int:
+        self._detach_views()
+        entity.id = self.last_id + 1 if entity.id == 0 else entity.id
+        self.columns.replace(len(self), len(self), [entity])
+        self._on_replace(len(self) - 1, [], 1)
+        self._record(APPEND, entity)
+        return entity.id
+
+    def extend(self, entities: Iterable[Model]) -> None:
+        self._detach_views()
+        start = len(self)
+        self.columns.replace(start, start, list(entities))
+        self._on_replace(start, [], len(self) - start)
+
+    def insert(self, position: int, entity: Model) -> None:
+        self._detach_views()
+        size = len(self)
+        position = min(max(position + size if position < 0 else position, 0), size)
+        self.columns.replace(position, position, [entity])
+        self._reset_index()
+
+    def __setitem__(self, key: Union[int, slice], value) -> None:
+        self._detach_views()
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                self._assign_rows(np.arange(start, stop, step), list(value))
+                return
+            self.columns.replace(start, max(start, stop), list(value))
+        else:
+            position = key + len(self) if key < 0 else key
+            if not 0 <= position < len(self):
+                raise IndexError("list assignment index out of range")
+            # a view of a copy of the row, the replaced row is unindexed by its id
+            removed = View(self.columns.take(np.array([position])), 0)
+            self.columns.replace(position, position + 1, [value])
+            self._on_replace(position, [removed], 1)
+            return
+        self._reset_index()
+
+    def __delitem__(self, key: Union[int, slice]) -> None:
+        self._detach_views()
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                self._take(np.delete(np.arange(len(self)), np.arange(start, stop, step)))
+                return
+            self.columns.replace(start, max(start, stop), [])
+        else:
+            position = key + len(self) if key < 0 else key
+            self.columns.replace(position, position + 1, [])
+        self._reset_index()
+
+    def pop(self, position: int = -1) -> Model:
+        position = position + len(self) if position < 0 else position
+        entity = Factory.from_dict(self[position].to_dict(), trusted=True)
+        del self[position]
+        return entity
+
+    def remove(self, entity: Model) -> None:
+        del self[self.index(entity)]
+
+    def clear(self) -> None:
+        self._detach_views()
+        self.columns = Columns() # views of removed rows keep the previous columns
+        self._reset_index()
+
+    def sort(self, key=None, reverse: bool = False) -> None:
+        views = list(self)
+        views.sort(key=key, reverse=reverse)
+        self._take(np.fromiter((view._row for view in views), np.int64, len(views)))
+
+    def reverse(self) -> None:
+        self._take(np.arange(len(self) - 1, -1, -1))
+
+    def __imul__(self, value: int):
+        """Override. Rows are repeated with a single copy of columns."""
+        self._take(np.tile(np.arange(len(self)), max(index(value), 0)))
+        return self
+
+    def _assign_rows(self, positions: np.ndarray, entities: List[Model]) -> None:
+        """Private method. Replace rows at given positions (an extended slice) with entities, one entity per position."""
+        if len(entities) != len(positions):
+            raise ValueError(f"attempt to assign sequence of size {len(entities)} to extended slice of size {len(positions)}")
+        added = Columns()
+        added.replace(0, 0, entities)
+        order = np.arange(len(self))
+        order[positions] = len(self) + np.arange(len(positions))
+        self.columns = Columns.concat((self.columns, added)).take(order)
+        self._reset_index()
+
+    def _take(self, positions: np.ndarray) -> None:
+        """Private method. Rebuild columns from current rows in a new order."""
+        self._detach_views()
+        self.columns = self.columns.take(positions)
+        self._reset_index()
+
+    def _fill(self, source: "Collection", positions: np.ndarray) -> None:
+        """Override. Copy rows of the source columns."""
+        self.columns = source.columns.take(positions)
+
+    def _get_positions(self) -> Dict[int, int]:
+        """Override. Build the id index from the id column."""
+        if self._positions is None:
+            ids = self.column(ID).tolist()
+            # reversed, so that the first entity wins for duplicated ids
+            self._positions = dict(zip(reversed(ids), range(len(ids) - 1, -1, -1)))
+            self._has_duplicates = len(self._positions) != len(ids)
+            self._max_id = None
+        return self._positions
+
+    def _on_replace(self, start: int, removed: List, inserted: int) -> None:
+        """Override. Appended entities and rows replaced one by one are indexed incrementally, other changes reset indexes."""
+        self.version += 1
+        self._indexes = None
+        if self._positions is not None and removed and len(removed) == inserted and not self._has_duplicates:
+            self._replace_ids(start, removed)
+            return
+        if removed or start + inserted != len(self) or self._positions is None:
+            self._reset_index()
+            return
+        ids = self.column(ID)[start:].tolist()
+        for position, id in enumerate(ids, start):
+            if self._positions.setdefault(id, position) != position:
+                self._has_duplicates = True
+        if self._max_id is not None and ids:
+            self._max_id = max(self._max_id, max(ids))
+
+    def _replace_ids(self, start: int, removed: List) -> None:
+        """Private method. Move the id index from ids of removed rows to ids of rows replacing them, positions of other rows are unchanged."""
+        positions = self._positions
+        for entity in removed:
+            del positions[entity.id]
+            if entity.id == self._max_id:
+                self._max_id = None
+        ids = self.column(ID)[start:start + len(removed)].tolist()
+        if len(set(ids)) != len(ids) or any(id in positions for id in ids):
+            # an id is shared with another row, the first of them is found by a full rebuild
+            self._reset_index()
+            return
+        positions.update(zip(ids, range(start, start + len(ids))))
+        if self._max_id is not None and ids:
+            self._max_id = max(self._max_id, max(ids))
+
+
+for _name in LIST_READERS:
+    setattr(Collection, _name, reading_entities(_name))
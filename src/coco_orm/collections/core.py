@@ -1,7 +1,21 @@
-from typing import List, Dict, Optional, Union
+from typing import List, Dict, Optional, Union, Iterable, Iterator, Hashable
+from itertools import repeat
+from operator import attrgetter
 
-from ..models.core import BaseEntityModel, AbstractFactory as AbstractEntityFactory
+import numpy as np
+
+from ..models.core import BaseEntityModel, AbstractFactory as AbstractEntityFactory, ID
 from ..filters.core import BaseFilter
+from ..filters.cache import FilterCache, FILTER_CACHE_SIZE, FILTER_CACHE_BYTES
+from .indexes import Index, INDEX_SELECTIVITY
+from .query import Query
+from .aggregate import GroupBy
+from .view import View
+
+"""Kinds of changes recorded to a journal, see ``coco_orm.dataset.journal``."""
+APPEND = "append"
+UPDATE = "update"
+DELETE = "delete"
 
 class BaseCollection(list):
     """
@@ -17,6 +31,21 @@ class BaseCollection(list):
         entity_factory (AbstractEntityFactory): a reference to AbstractEntityFactory implementation.
         filters (BaseFilter): a reference to BaseFilter implementation. 
 
+    Entities are indexed by id: ``get_by_id``, ``update`` and ``last_id`` take O(1) time.
+    The index is built on first use and kept up to date by every method changing the collection, including list methods.
+    Removals and insertions shift following entities: their positions are refreshed on the next lookup, in a single pass
+    over ids, so ``delete`` takes O(1) time at the end of the collection and O(n - position) time before it.
+    Ids are expected to be unique. If they are not, the index points to the first entity with a given id,
+    and removals rebuild the index from scratch. Ids of entities should not be changed in place, use ``update`` instead.
+
+    Secondary indexes are declared with the ``indexes`` class attribute or ``create_index`` method. See ``coco_orm.collections.indexes.Index``.
+    They are built on first use, kept up to date the same way as the id index, and used by ``get_by``, ``get_all_by``
+    and equality / ``in`` filters.
+
+    ``filter`` returns zero-copy views of the collection, materialized when they or the collection are changed,
+    see ``coco_orm.collections.view.View``. Results of filters are cached once ``cache_filters`` is called,
+    see ``coco_orm.filters.cache.FilterCache``.
+
     Attributes:
         entity_factory (AbstractEntityFactory): an AbstractEntityFactory implementation reference, used to initialize entities of the collection. 
                 To initialize an entity, use the class property as follows: ``entity = collection.entity_factory(id=1)``
@@ -34,27 +63,38 @@ class BaseCollection(list):
                     2) Call ``apply`` BaseFilter method with collection object passed as an argument:
                         >>> filtered_collection = filters.apply(collection)
     """
+    _positions = None # type: Optional[Dict[int, int]] # id -> position of an entity, built on first use
+    _max_id = None # type: Optional[int] # the greatest id, None if has to be recalculated
+    _has_duplicates = False # type: bool # True if the collection contains entities sharing the same id
+    _stale_from = None # type: Optional[int] # positions of entities starting at this one are outdated in the id index
+    _indexes = None # type: Optional[Dict[str, Index]] # built secondary indexes
+    _declared_indexes = None # type: Optional[Dict[str, Index]] # secondary indexes declared on the instance
+    indexes = () # type: tuple[Index] # secondary indexes declared on the class
+    version = 0 # type: int # incremented by every change of the collection, used to invalidate data derived from it
+    journal = None # type: Optional[Journal] # records append, update and delete calls, see coco_orm.dataset.journal
+    journal_key = None # type: Optional[str] # a name of the collection in the journal
+    filter_cache = None # type: Optional[FilterCache] # results of filters by their fingerprints, see cache_filters
+    _views = None # type: Optional[WeakValueDictionary] # views of the collection by their ids, materialized before the collection is changed
+
     def __init__(self, entity_factory: AbstractEntityFactory, filters: BaseFilter, entities: Union[List[Dict], List[BaseEntityModel], None] = None):
         self.entity_factory = entity_factory # reference to AbstractEntityFactory
         self.filters_builder = filters # reference to BaseFilter 
         super().__init__(self._process_entities(entities) if entities else []) # type: list[BaseEntityModel]
 
-    def __call__(self, entities: Union[List[Dict], List[BaseEntityModel], None], entity_factory: AbstractEntityFactory, filters: BaseFilter):
+    def __call__(self, entities: Union[List[Dict], List[BaseEntityModel], None]):
         """
         Allows invoking a class instance as a function.
-        Used by filters objects to instanciate a collection with filtered entities.
-        Please, reffer to ``BaseFilter.apply_on`` method to see how filters use collection instances.
+        Used to instanciate a collection of the same type with filtered entities.
+        Please, reffer to ``BaseCollection.filter`` method to see how filtered collections are created.
 
         Args:
             entities (list[dict] | list[BaseEntityModel] | list | None): pass a list of dicts or BaseEntityModel instances to create a collection containing entities, 
                     or an empty list / None to create an empty collection.
-            entity_factory (AbstractEntityFactory): a reference to AbstractEntityFactory implementation.
-            filters (BaseFilter): a reference to BaseFilter implementation. 
 
         Returns:
             BaseCollection: a BaseCollection instance.
         """
-        return BaseCollection(entities, entity_factory, filters)
+        return BaseCollection(self.entity_factory, self.filters_builder, entities)
 
     def __str__(self):
         """
@@ -75,7 +115,110 @@ class BaseCollection(list):
         Returns:
             Optional[BaseEntityModel]: an BaseEntityModel implementation instance containing entity data if one is found, else None
         """
-        return next((entity for entity in self if entity.id == value), None)
+        position = self._get_positions().get(value)
+        return None if position is None else self._entity_at(position)
+
+    def create_index(self, attr_name: str, unique: bool = False) -> None:
+        """
+        Declare a secondary index on an entity attribute. The index is built on first use.
+
+        Args:
+            attr_name (str): an entity attribute name to index entities by.
+            unique (bool), default = False: True if the attribute identifies an entity, False if many entities may share a value.
+        """
+        if self._declared_indexes is None:
+            self._declared_indexes = {}
+        self._declared_indexes[attr_name] = Index(attr_name, unique)
+        if self._indexes:
+            self._indexes.pop(attr_name, None)
+
+    def get_index(self, attr_name: str) -> Optional[Index]:
+        """
+        Get a secondary index by attribute name, build it if it has not been built yet.
+
+        Args:
+            attr_name (str): an indexed attribute name.
+
+        Returns:
+            Optional[Index]: an Index instance if the attribute is indexed, else None.
+        """
+        if self._indexes is None:
+            self._indexes = {}
+        index = self._indexes.get(attr_name)
+        if index is None:
+            declaration = (self._declared_indexes or {}).get(attr_name)
+            if declaration is None:
+                declaration = next((index for index in self.indexes if index.attr_name == attr_name), None)
+            if declaration is None:
+                return None
+            index = self._indexes[attr_name] = declaration.new().build(self)
+        return index
+
+    def get_by(self, attr_name: str, value: Hashable) -> Optional[BaseEntityModel]:
+        """
+        Get an entity by attribute value. Indexed attributes are looked up in O(1), others are scanned.
+
+        Args:
+            attr_name (str): an attribute name.
+            value (Hashable): a value of an entity to search for.
+
+        Returns:
+            Optional[BaseEntityModel]: an BaseEntityModel implementation instance if one is found, else None
+        """
+        if attr_name == ID:
+            position = self._get_positions().get(value)
+            return None if position is None else self._entity_at(position)
+        index = self.get_index(attr_name)
+        if index is not None and index.unique and index.count((value,)) < 2:
+            return index.first(value)
+        # a value shared by several entities is looked up in collection order
+        entities = self.lookup(attr_name, (value,), selectivity=1) if index is not None else None
+        if entities is not None:
+            return entities[0] if entities else None
+        return next((entity for entity in self if getattr(entity, attr_name) == value), None)
+
+    def get_all_by(self, attr_name: str, value: Hashable) -> List[BaseEntityModel]:
+        """
+        Get all entities having an attribute value, in collection order. Indexed attributes are looked up in O(1), others are scanned.
+
+        Args:
+            attr_name (str): an attribute name.
+            value (Hashable): a value of entities to search for.
+
+        Returns:
+            list[BaseEntityModel]: a list of entities, an empty list if none found.
+        """
+        entities = self.lookup(attr_name, (value,), selectivity=1)
+        return entities if entities is not None else [entity for entity in self if getattr(entity, attr_name) == value]
+
+    def lookup(self, attr_name: str, values: Iterable[Hashable], selectivity: float = INDEX_SELECTIVITY) -> Optional[List[BaseEntityModel]]:
+        """
+        Get entities having any of given attribute values using indexes.
+        Used by filters to narrow collections down before applying filters. See ``coco_orm.filters.core.BaseFilter.apply``.
+
+        Args:
+            attr_name (str): an attribute name.
+            values (Iterable[Hashable]): values of entities to search for.
+            selectivity (float): a maximum share of collection entities the lookup may return, scanning is cheaper otherwise.
+
+        Returns:
+            Optional[list[BaseEntityModel]]: a list of entities in collection order, None if the attribute is not indexed or the lookup is not selective enough.
+        """
+        positions = self._get_positions()
+        if self._has_duplicates:
+            return None
+        limit = len(self) * selectivity
+        if attr_name == ID:
+            found = [positions[value] for value in values if value in positions]
+            if len(found) > limit:
+                return None
+        else:
+            index = self.get_index(attr_name)
+            if index is None or index.count(values) > limit:
+                return None
+            found = [positions[entity.id] for value in values for entity in index.get(value)]
+        found.sort()
+        return [self._entity_at(position) for position in found]
 
     def append(self, entity: BaseEntityModel) -> int: 
         """
@@ -87,8 +230,11 @@ class BaseCollection(list):
         Returns:
             int: id of an appended entity.
         """
+        self._detach_views()
         entity.id = self.last_id + 1 if entity.id == 0 else entity.id
         super().append(entity)
+        self._on_replace(len(self) - 1, [], 1)
+        self._record(APPEND, entity)
         return entity.id
 
     def update(self, entity: BaseEntityModel) -> Optional[int]: 
@@ -101,11 +247,12 @@ class BaseCollection(list):
         Returns:
             Optional[int]: id if an entity has been found and updated, None if not.
         """
-        for idx, item in enumerate(self):
-            if item.id == entity.id:
-                self[idx] = entity
-                return entity.id
-        return None
+        position = self._get_positions().get(entity.id)
+        if position is None:
+            return None
+        self[position] = entity
+        self._record(UPDATE, entity)
+        return entity.id
 
     def delete(self, id: int) -> Optional[BaseEntityModel]: 
         """
@@ -117,50 +264,436 @@ class BaseCollection(list):
         Returns:
             Optional[BaseEntityModel]: an instance of BaseEntityModel implementation if entity with given id is found, None if not
         """
-        for idx, item in enumerate(self):
-            if item.id == id:
-                del self[idx]
-                return item
-        return None
+        position = self._get_positions().get(id)
+        if position is None:
+            return None
+        entity = self._entity_at(position)
+        del self[position]
+        self._record(DELETE, id)
+        return entity
 
     @property
     def last_id(self) -> int:
-        """id of the last element in the collection."""
-        if self:
-            last_entity = max(self, key=lambda entity: entity.id)
-            return last_entity.id
-        return 0
+        """the greatest id of the collection entities, 0 if the collection is empty."""
+        positions = self._get_positions()
+        if self._max_id is None:
+            self._max_id = max(positions) if positions else 0
+        return self._max_id
     
     @property
     def num_of_entities(self) -> int:
         """a number of entities in the collection."""
         return len(self)
     
-    def to_dict(self) -> List[Dict]:
+    def to_dict(self, drop_none: bool = False) -> List[Dict]:
         """
         Get dictionarized representation of the collection.
+
+        Args:
+            drop_none (bool), default = False: leave out keys of None values.
         
         Returns:
             list[dict]: a list of dictionaries containing entities data.
         """
-        return [entity.to_dict() for entity in self]
+        return [entity.to_dict(drop_none) for entity in self]
+
+    def iter_dicts(self, drop_none: bool = False) -> Iterator[Dict]:
+        """
+        Iterate over dictionarized representations of entities, building each dictionary only when it is reached.
+
+        Args:
+            drop_none (bool), default = False: leave out keys of None values.
+
+        Returns:
+            Iterator[dict]: an iterator of dictionaries containing entities data.
+        """
+        return (entity.to_dict(drop_none) for entity in self)
     
     def filter(self, filters: BaseFilter, inplace: bool = False):
         """
         Filter the collection by given filters.
+        Entities are not copied: the filtered collection is a view of the collection, holding positions of matching entities.
+        Filtering a view selects positions of the view. See ``coco_orm.collections.view.View``.
 
         Args:
             filters (BaseFilter): an instance of BaseFilter implementation, containing filters.
-            inplace (bool): replace the collection with a filtered one
+            inplace (bool): keep only matching entities in the collection
+
+        Returns:
+            BaseCollection: a view of the same type containing filtered entities, the collection itself if ``inplace``.
+        """
+        positions = self._cached_positions(filters)
+        if positions is None:
+            positions = self._filter_positions(filters)
+        return self._select(positions, inplace)
+
+    def take(self, positions: np.ndarray):
+        """
+        Copy entities at given positions into a new collection.
+
+        Args:
+            positions (np.ndarray): an array of positions.
+
+        Returns:
+            BaseCollection: a new collection of the same type.
+        """
+        return self(list(self._entities_at(positions)))
+
+    def query(self, filters: Optional[BaseFilter] = None) -> Query:
+        """
+        Create a lazy query selecting entities matching given filters. Unlike ``filter``, the collection is scanned
+        only when results are consumed, and only as far as needed. See ``coco_orm.collections.query.Query``.
+        >>> annotations = collection.query(filters).order_by("area").limit(100).all()
+
+        Args:
+            filters (Optional[BaseFilter]): an instance of BaseFilter implementation, containing filters. All entities are selected if None.
+
+        Returns:
+            Query: a query, refine it with ``order_by``, ``offset`` and ``limit``.
+        """
+        return Query(self, filters)
+
+    def group_by(self, *attr_names: str, filters: Optional[BaseFilter] = None) -> GroupBy:
+        """
+        Group entities by attribute values to aggregate them. See ``coco_orm.collections.aggregate.GroupBy``.
+        >>> objects_per_image = collection.group_by("image_id", filters=AnnotationFilters().iscrowd(0)).count()
+
+        Args:
+            attr_names (str): names of attributes to group entities by, all entities form a single group if none are given.
+            filters (Optional[BaseFilter]): an instance of BaseFilter implementation, containing filters. All entities are aggregated if None.
 
         Returns:
-            BaseEntityModel: an instance of BaseEntityModel implementation.
+            GroupBy: groups, aggregate them with ``count``, ``sum``, ``mean``, ``histogram`` or ``quantile``.
+        """
+        return GroupBy(self, attr_names, filters)
+
+    def cache_filters(self, max_entries: int = FILTER_CACHE_SIZE, max_bytes: int = FILTER_CACHE_BYTES) -> FilterCache:
+        """
+        Cache results of ``filter`` calls: filters equal to ones applied before are answered with stored positions
+        of matching entities instead of checking the entities again. The cache is dropped by any change of the collection
+        made with its methods; entities changed in place are not detected, use ``update`` instead.
+
+        Args:
+            max_entries (int): a maximum number of cached results, the least recently used ones are evicted.
+            max_bytes (int): a memory budget of cached results, in bytes.
+
+        Returns:
+            FilterCache: the cache, its ``hits`` and ``misses`` counters are updated by ``filter`` calls.
+        """
+        self.filter_cache = FilterCache(max_entries, max_bytes)
+        return self.filter_cache
+
+    def extend(self, entities: Iterable[BaseEntityModel]) -> None:
+        """Override. Extend the collection with given entities, keeping the index up to date."""
+        self._detach_views()
+        start = len(self)
+        super().extend(entities)
+        self._on_replace(start, [], len(self) - start)
+
+    def __iadd__(self, entities: Iterable[BaseEntityModel]):
+        """Override. Keep the index up to date."""
+        self.extend(entities)
+        return self
+
+    def __imul__(self, value: int):
+        """Override. Keep the index up to date."""
+        self._detach_views()
+        super().__imul__(value)
+        self._reset_index()
+        return self
+
+    def insert(self, position: int, entity: BaseEntityModel) -> None:
+        """Override. Insert an entity before a given position, keeping the index up to date."""
+        self._detach_views()
+        size = len(self)
+        position = min(max(position + size if position < 0 else position, 0), size)
+        super().insert(position, entity)
+        self._on_replace(position, [], 1)
+
+    def __setitem__(self, key: Union[int, slice], value) -> None:
+        """Override. Keep the index up to date."""
+        self._detach_views()
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                super().__setitem__(key, value)
+                self._reset_index()
+                return
+            value = list(value)
+            removed = list.__getitem__(self, key)
+            super().__setitem__(key, value)
+            self._on_replace(start, removed, len(value))
+            return
+        position = key + len(self) if key < 0 else key
+        removed = list.__getitem__(self, position)
+        super().__setitem__(position, value)
+        self._on_replace(position, [removed], 1)
+
+    def __delitem__(self, key: Union[int, slice]) -> None:
+        """Override. Keep the index up to date."""
+        self._detach_views()
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            removed = list.__getitem__(self, key)
+            super().__delitem__(key)
+            if step == 1: self._on_replace(start, removed, 0)
+            else: self._reset_index()
+            return
+        position = key + len(self) if key < 0 else key
+        removed = list.__getitem__(self, position)
+        super().__delitem__(position)
+        self._on_replace(position, [removed], 0)
+
+    def pop(self, position: int = -1) -> BaseEntityModel:
+        """Override. Remove and return an entity at a given position, keeping the index up to date."""
+        self._detach_views()
+        position = position + len(self) if position < 0 else position
+        entity = super().pop(position)
+        self._on_replace(position, [entity], 0)
+        return entity
+
+    def remove(self, entity: BaseEntityModel) -> None:
+        """Override. Remove the first occurrence of an entity, keeping the index up to date."""
+        del self[self.index(entity)]
+
+    def clear(self) -> None:
+        """Override. Keep the index up to date."""
+        self._detach_views()
+        super().clear()
+        self._reset_index()
+
+    def sort(self, *args, **kwargs) -> None:
+        """Override. Keep the index up to date."""
+        self._detach_views()
+        super().sort(*args, **kwargs)
+        self._reset_index()
+
+    def reverse(self) -> None:
+        """Override. Keep the index up to date."""
+        self._detach_views()
+        super().reverse()
+        self._reset_index()
+
+    def _entity_at(self, position: int) -> BaseEntityModel:
+        """
+        Private method. Get an entity by position, bypassing overrides of item access.
+
+        Args:
+            position (int): a position of an entity.
+
+        Returns:
+            BaseEntityModel: an entity.
+        """
+        return list.__getitem__(self, position)
+
+    def _entities_at(self, positions: np.ndarray) -> Iterator[BaseEntityModel]:
+        """
+        Private method. Get entities at many positions, bypassing overrides of item access.
+
+        Args:
+            positions (np.ndarray): positions of entities.
+
+        Returns:
+            Iterator[BaseEntityModel]: an iterator of entities.
+        """
+        return map(list.__getitem__, repeat(self), positions.tolist())
+
+    def _ids_at(self, positions: np.ndarray) -> List[int]:
+        """
+        Private method. Get ids of entities at given positions.
+
+        Args:
+            positions (np.ndarray): positions of entities.
+
+        Returns:
+            list[int]: ids of the entities.
+        """
+        return list(map(attrgetter(ID), self._entities_at(positions)))
+
+    def _cached_positions(self, filters: BaseFilter) -> Optional[np.ndarray]:
+        """
+        Private method. Get positions of entities matching filters from the filter cache, find and store them on a miss.
+
+        Args:
+            filters (BaseFilter): an instance of BaseFilter implementation, containing filters.
+
+        Returns:
+            Optional[np.ndarray]: an ascending array of positions, None if results are not cached or the filters have no fingerprint.
+        """
+        cache = self.filter_cache
+        if cache is None:
+            return None
+        key = filters.fingerprint
+        if key is None:
+            return None
+        positions = cache.get(key, self.version)
+        if positions is None:
+            positions = self._filter_positions(filters)
+            cache.put(key, self.version, positions, len(self))
+        return positions
+
+    def _filter_positions(self, filters: BaseFilter) -> np.ndarray:
+        """
+        Private method. Find positions of entities matching filters, narrowing the collection down with indexes if possible.
+
+        Args:
+            filters (BaseFilter): an instance of BaseFilter implementation, containing filters.
+
+        Returns:
+            np.ndarray: an ascending array of positions.
+        """
+        filters = filters.resolve(self)
+        candidates = filters._index_candidates(self)
+        if candidates is None:
+            return np.array(filters.compiled.positions(self), np.int64)
+        positions = self._get_positions()
+        if self._has_duplicates:
+            return np.array(filters.compiled.positions(self), np.int64)
+        return np.array([positions[entity.id] for entity in filters.compiled.select(candidates)], np.int64)
+
+    def _select(self, positions: np.ndarray, inplace: bool = False):
+        """
+        Private method. Select entities at given positions, as ``filter`` does for matching entities.
+
+        Args:
+            positions (np.ndarray): an ascending array of positions.
+            inplace (bool): keep only selected entities in the collection
+
+        Returns:
+            BaseCollection: a view of the same type containing selected entities, the collection itself if ``inplace``.
         """
-        filtered_entities = filters.apply(self)
         if inplace:
-            self.clear()
-            self.extend(filtered_entities)
-        return BaseCollection(entities=filtered_entities, entity_factory=self.entity_factory, filters=self.filters_builder)
+            self._take(positions)
+            return self
+        return View.of(self, positions)
+
+    def _take(self, positions: np.ndarray) -> None:
+        """
+        Private method. Keep only entities at given positions, in the given order.
+
+        Args:
+            positions (np.ndarray): an array of positions.
+        """
+        entities = list(self._entities_at(positions))
+        self.clear()
+        self.extend(entities)
+
+    def _fill(self, source: "BaseCollection", positions: np.ndarray) -> None:
+        """
+        Private method. Fill an empty collection with entities of another collection. Used to materialize views.
+
+        Args:
+            source (BaseCollection): a collection of the same type to take entities from.
+            positions (np.ndarray): positions of entities in the source collection.
+        """
+        list.extend(self, source._entities_at(positions))
+
+    def _detach_views(self) -> None:
+        """Private method. Materialize views of the collection. Called before the collection is changed."""
+        if self._views:
+            for view in list(self._views.values()):
+                view.materialize()
+
+    def _record(self, kind: str, value: Union[BaseEntityModel, int]) -> None:
+        """
+        Private method. Record a change to the journal of the collection, if it has one.
+
+        Args:
+            kind (str): a kind of the change, one of APPEND, UPDATE and DELETE.
+            value (BaseEntityModel | int): a changed entity, an id for DELETE.
+        """
+        if self.journal is not None:
+            self.journal.record(self.journal_key, kind, value)
+
+    def _get_positions(self) -> Dict[int, int]:
+        """
+        Private method. Get the id -> position index, build it if it has not been built yet.
+
+        Returns:
+            dict[int, int]: a dictionary mapping entity ids to their positions in the collection.
+        """
+        if self._positions is None:
+            positions = {}
+            for position, entity in enumerate(self):
+                if positions.setdefault(entity.id, position) != position:
+                    self._has_duplicates = True
+            self._positions = positions
+            self._max_id = None
+        elif self._stale_from is not None:
+            stale, size = self._stale_from, len(self)
+            # ids of shifted entities are unique, see _on_replace, so the positions can be overwritten at once
+            self._positions.update(zip(self._ids_at(np.arange(stale, size)), range(stale, size)))
+        self._stale_from = None
+        return self._positions
+
+    def _reset_index(self) -> None:
+        """Private method. Drop indexes, so they are rebuilt on next use."""
+        self.version += 1
+        self._positions = None
+        self._stale_from = None
+        self._max_id = None
+        self._has_duplicates = False
+        self._indexes = None
+
+    def _on_replace(self, start: int, removed: List[BaseEntityModel], inserted: int) -> None:
+        """
+        Private method. Update the index after entities have been replaced.
+        ``removed`` entities used to occupy positions starting at ``start``, now ``inserted`` entities occupy them.
+        If the number of entities has changed, positions of following entities are marked as outdated
+        and refreshed on the next lookup, see ``_get_positions``.
+
+        Args:
+            start (int): a position of the first replaced entity.
+            removed (list[BaseEntityModel]): entities removed from the collection.
+            inserted (int): a number of entities inserted into the collection.
+        """
+        self.version += 1
+        if self._indexes:
+            for attr_name, index in list(self._indexes.items()):
+                # an entity changed in place can't be found under its new value, drop such an index
+                if not all([index.remove(entity) for entity in removed]):
+                    del self._indexes[attr_name]
+                    continue
+                for position in range(start, start + inserted):
+                    index.add(self._entity_at(position))
+        positions = self._positions
+        if positions is None:
+            return
+        if self._has_duplicates and removed:
+            self._reset_index()
+            return
+        for entity in removed:
+            positions.pop(entity.id, None)
+            if entity.id == self._max_id:
+                self._max_id = None
+        shifted = len(removed) != inserted
+        stop = start + inserted
+        if shifted and stop < len(self) or self._stale_from is not None:
+            ids = self._ids_at(np.arange(start, stop))
+            if self._has_duplicates or len(set(ids)) != len(ids) or any(id in positions for id in ids):
+                # positions of other entities with the same ids may be outdated, so the first of them is unknown
+                self._reset_index()
+                return
+            positions.update(zip(ids, range(start, stop)))
+            if self._max_id is not None and ids:
+                self._max_id = max(self._max_id, max(ids))
+            if shifted:
+                self._stale_from = stop if self._stale_from is None else min(self._stale_from, stop)
+            return
+        seen = set()
+        for position in range(start, stop):
+            id = self._entity_at(position).id
+            indexed = positions.get(id)
+            if id in seen or indexed is not None and (indexed < start or indexed >= stop):
+                # another entity with the same id is placed before or after the replaced ones
+                self._has_duplicates = True
+                if id in seen or indexed < start:
+                    continue
+            # the id is new or its position is outdated
+            positions[id] = position
+            seen.add(id)
+            if self._max_id is not None and id > self._max_id:
+                self._max_id = id
 
     def _process_entities(self, entities: Union[List[Dict], List[BaseEntityModel]]) -> List[BaseEntityModel]:
         """
@@ -4,7 +4,8 @@ from PIL import Image
 import numpy as np
 
 from .core import BaseCollection
-from ..models.image import Model, Factory
+from .indexes import Index
+from ..models.image import Model, Factory, FILE_NAME, LICENSE
 from ..filters.image import Filters
 from .image_repository import Repository as ImageRepository, Factory as ImageRepositoryFactory
 from .utils import check_and_fix_img_type
@@ -27,13 +28,15 @@ class Collection(BaseCollection):
                 >>> img = image_collection.repository.read("1.jpg")
                 >>> image_collection.repository.delete("1.jpg")
     """
+    indexes = (Index(FILE_NAME, unique=True), Index(LICENSE))
+
     def __init__(self, entities, dir_path: Optional[str] = None):
         super().__init__(Factory, Filters, entities)
         self.repository = ImageRepositoryFactory(dir_path) # type: ImageRepository
 
     def __call__(self, entities):
         """Override. Return a Collection instance."""
-        return Collection(Factory, Filters, entities)
+        return Collection(entities, self.repository.dir_path if isinstance(self.repository, ImageRepository) else None)
 
     def get_by_id(self, value: int, img: bool = False) -> Tuple[Optional[Model], Optional[Image.Image]]:
         """
@@ -69,7 +72,7 @@ class Collection(BaseCollection):
         Returns:
             Tuple[Optional[Model], Optional[Image.Image]]: a tuple containing Model and Image if ones found, else Nones.      
         """
-        annotation = next((entity for entity in self if entity.file_name == value), None) # type: Optional[Model]
+        annotation = self.get_by(FILE_NAME, value) # type: Optional[Model]
         if annotation and img:
             img = self.repository.read(annotation.file_name)
         return annotation, check_and_fix_img_type(img)
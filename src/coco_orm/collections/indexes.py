@@ -0,0 +1,137 @@
+from typing import Dict, Hashable, Iterable, List, Optional
+from operator import attrgetter
+
+from ..models.core import BaseEntityModel
+
+"""Index lookups are used by filters only if they narrow a collection down to this share of its entities."""
+INDEX_SELECTIVITY = 0.25
+
+
+class Index():
+    """
+    Index is a secondary index of collection entities by an attribute.
+
+    Indexes are declared on collection classes with the ``indexes`` class attribute, or on collection instances
+    with ``BaseCollection.create_index``. Declared indexes are built on first use and kept up to date by the collection.
+    >>> class Collection(BaseCollection):
+    ...     indexes = (Index(FILE_NAME, unique=True), Index(LICENSE))
+
+    Entities sharing the same value are kept in insertion order, keyed by their identity, so an entity is removed
+    in O(1) time however many entities share its value.
+    Values of entities should not be changed in place, use ``BaseCollection.update`` instead.
+
+    Args/Attributes:
+        attr_name (str): an entity attribute name to index entities by.
+        unique (bool), default = False: True if the attribute identifies an entity (one-to-one), False if many entities may share a value.
+
+    Attributes:
+        groups (dict): a dictionary mapping attribute values to dictionaries of entities by their ``id()``.
+    """
+    def __init__(self, attr_name: str, unique: bool = False):
+        self.attr_name = attr_name
+        self.unique = unique
+        self.groups = {} # type: Dict[Hashable, Dict[int, BaseEntityModel]]
+        self._getter = attrgetter(attr_name)
+
+    def __len__(self):
+        """Returns a number of distinct indexed values."""
+        return len(self.groups)
+
+    def new(self) -> "Index":
+        """
+        Create an empty index with the same declaration.
+
+        Returns:
+            Index: an empty Index instance.
+        """
+        return Index(self.attr_name, self.unique)
+
+    def build(self, entities: Iterable[BaseEntityModel]) -> "Index":
+        """
+        Index given entities.
+
+        Args:
+            entities (Iterable[BaseEntityModel]): entities to index.
+
+        Returns:
+            Index: self
+        """
+        groups = self.groups
+        getter = self._getter
+        for entity in entities:
+            value = getter(entity)
+            group = groups.get(value)
+            if group is None: groups[value] = {id(entity): entity}
+            else: group[id(entity)] = entity
+        return self
+
+    def add(self, entity: BaseEntityModel) -> None:
+        """
+        Add an entity to the index.
+
+        Args:
+            entity (BaseEntityModel): an entity to add.
+        """
+        value = self._getter(entity)
+        group = self.groups.get(value)
+        if group is None: self.groups[value] = {id(entity): entity}
+        else: group[id(entity)] = entity
+
+    def remove(self, entity: BaseEntityModel) -> bool:
+        """
+        Remove an entity from the index.
+
+        Args:
+            entity (BaseEntityModel): an entity to remove.
+
+        Returns:
+            bool: True if the entity has been removed, False if it is not found under its current value.
+        """
+        value = self._getter(entity)
+        group = self.groups.get(value)
+        # indexed entities are alive, so no other entity has the id() of an indexed one
+        if group is None or group.get(id(entity)) is not entity:
+            return False
+        del group[id(entity)]
+        if not group: del self.groups[value]
+        return True
+
+    def get(self, value: Hashable) -> List[BaseEntityModel]:
+        """
+        Get entities by value.
+
+        Args:
+            value (Hashable): a value to search for.
+
+        Returns:
+            list[BaseEntityModel]: a list of entities having the value in insertion order, an empty list if none found.
+        """
+        group = self.groups.get(value)
+        return list(group.values()) if group else []
+
+    def first(self, value: Hashable) -> Optional[BaseEntityModel]:
+        """
+        Get the first entity indexed under a value, in insertion order. Insertion order may differ from collection order
+        (e.g. after ``insert``), ``BaseCollection.get_by`` looks values shared by several entities up in collection order.
+
+        Args:
+            value (Hashable): a value to search for.
+
+        Returns:
+            Optional[BaseEntityModel]: an entity if one is found, else None.
+        """
+        group = self.groups.get(value)
+        return next(iter(group.values())) if group else None
+
+    def count(self, values: Iterable[Hashable]) -> int:
+        """
+        Count entities having any of given values.
+
+        Args:
+            values (Iterable[Hashable]): values to search for.
+
+        Returns:
+            int: a number of entities.
+        """
+        groups = self.groups
+        return sum(len(groups[value]) for value in values if value in groups)
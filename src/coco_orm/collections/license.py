@@ -1,8 +1,8 @@
 from typing import Optional
 
 from .core import BaseCollection
-
-from ..models.license import Model, Factory
+from .indexes import Index
+from ..models.license import Model, Factory, NAME, URL
 from ..filters.license import Filters
     
 
@@ -14,12 +14,14 @@ class Collection(BaseCollection):
     >>> from coco_orm.collections import LicenseCollection
     >>> license_collection = LicenseCollection()
     """
+    indexes = (Index(NAME, unique=True), Index(URL, unique=True))
+
     def __init__(self, entities):
         super().__init__(Factory, Filters, entities)
 
     def __call__(self, entities):
         """Override. Return a Collection instance."""
-        return Collection(Factory, Filters, entities)
+        return Collection(entities)
 
     def get_by_name(self, value: str) -> Optional[Model]:
         """
@@ -31,7 +33,7 @@ class Collection(BaseCollection):
         Returns:
             Optional[Model]: an instance of Model containing entity data if one is found, else None
         """
-        return next((entity for entity in self if entity.name == value), None)
+        return self.get_by(NAME, value)
     
     def get_by_url(self, value: str) -> Optional[Model]:
         """
@@ -43,4 +45,4 @@ class Collection(BaseCollection):
         Returns:
             Optional[Model]: an instance of Model containing entity data if one is found, else None
         """
-        return next((entity for entity in self if entity.url == value), None)
+        return self.get_by(URL, value)
@@ -0,0 +1,142 @@
+from typing import List, Dict, Optional, Union, Tuple, Any
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import chain, repeat
+import inspect
+import os
+
+import numpy as np
+
+from ..models.core import BaseEntityModel, AbstractFactory as AbstractEntityFactory
+from .columnar import Columns
+
+"""A number of records converted by a worker process at once."""
+PARALLEL_CHUNK_SIZE = 50000
+
+"""Records being converted, set in worker processes by ``_init_worker``. Forked workers inherit them without copying."""
+_records = None # type: Optional[List[Dict]]
+
+
+def parse_entities(entity_factory: AbstractEntityFactory, records: List[Dict], processes: Optional[int] = None, chunk_size: int = PARALLEL_CHUNK_SIZE) -> List[BaseEntityModel]:
+    """
+    Convert records to entities with ``entity_factory.from_dict`` in worker processes, chunk by chunk.
+
+    Workers send converted values back as columns: numbers (and lists of numbers of the same length, e.g. bboxes)
+    as NumPy arrays, values passed through by ``from_dict`` unchanged (e.g. segmentations) are not sent at all,
+    the main process takes them from its own records. Entities are then created from the columns in record order,
+    without the conversions of ``from_dict``.
+
+    Args:
+        entity_factory (AbstractEntityFactory): a factory of entities.
+        records (list[dict]): dictionaries containing entities data.
+        processes (Optional[int]): a number of worker processes, the number of CPUs by default. 1 to convert records in the main process.
+        chunk_size (int): a number of records converted by a worker at once.
+
+    Returns:
+        list[BaseEntityModel]: entities, in record order.
+    """
+    bounds = _chunk_bounds(len(records), processes, chunk_size)
+    if bounds is None:
+        return [entity_factory.from_dict(record) for record in records]
+    with ProcessPoolExecutor(min(processes or os.cpu_count(), len(bounds)), initializer=_init_worker, initargs=(records,)) as executor:
+        chunks = list(executor.map(_parse_chunk, repeat(entity_factory), *zip(*bounds)))
+    return list(chain.from_iterable(
+        _build(model_class, columns, records[start:stop]) for (model_class, columns), (start, stop) in zip(chunks, bounds)
+    ))
+
+
+def encode_columns(records: List[Dict], processes: Optional[int] = None, chunk_size: int = PARALLEL_CHUNK_SIZE) -> Columns:
+    """
+    Encode annotation records into columns in worker processes, chunk by chunk. Workers send arrays of their chunks,
+    which are concatenated in record order. See ``coco_orm.collections.columnar.Columns``.
+
+    Args:
+        records (list[dict]): dictionaries containing annotations data.
+        processes (Optional[int]): a number of worker processes, the number of CPUs by default. 1 to encode records in the main process.
+        chunk_size (int): a number of records encoded by a worker at once.
+
+    Returns:
+        Columns: a columnar storage of annotations.
+    """
+    bounds = _chunk_bounds(len(records), processes, chunk_size)
+    if bounds is None:
+        columns = Columns()
+        columns.replace(0, 0, records)
+        return columns
+    with ProcessPoolExecutor(min(processes or os.cpu_count(), len(bounds)), initializer=_init_worker, initargs=(records,)) as executor:
+        chunks = list(executor.map(_encode_chunk, *zip(*bounds)))
+    return Columns.concat(Columns.from_arrays(*chunk) for chunk in chunks)
+
+
+def _chunk_bounds(size: int, processes: Optional[int], chunk_size: int) -> Optional[List[Tuple[int, int]]]:
+    """Private function. Split records into chunks, None if they are converted in the main process."""
+    if (processes or os.cpu_count()) == 1 or size <= chunk_size:
+        return None
+    return [(start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)]
+
+
+def _init_worker(records: List[Dict]) -> None:
+    """Private function. Keep records in a worker process."""
+    global _records
+    _records = records
+
+
+def _parse_chunk(entity_factory: AbstractEntityFactory, start: int, stop: int) -> Tuple[type, Union[Dict[str, Any], List[BaseEntityModel]]]:
+    """
+    Private function. Convert a chunk of records in a worker process.
+
+    Returns:
+        tuple[type, dict | list]: a model class and columns by field names, a column is None if the main process
+                takes it from the records. Entities themselves if a model can't be created from columns.
+    """
+    records = _records[start:stop]
+    entities = [entity_factory.from_dict(record) for record in records]
+    model_class = type(entities[0])
+    if any(type(entity) is not model_class for entity in entities) or _init_fields(model_class) is None:
+        return model_class, entities
+    columns = {}
+    for name in model_class.fields:
+        values = [getattr(entity, name) for entity in entities]
+        unchanged = all(value is record.get(name) for value, record in zip(values, records))
+        columns[name] = None if unchanged else _pack(values)
+    return model_class, columns
+
+
+def _encode_chunk(start: int, stop: int) -> Tuple[Dict[str, np.ndarray], Dict[int, object]]:
+    """Private function. Encode a chunk of annotation records in a worker process, returning picklable arrays."""
+    columns = Columns()
+    columns.replace(0, 0, _records[start:stop])
+    return columns.arrays(), columns.objects()
+
+
+def _pack(values: List) -> Union[np.ndarray, List]:
+    """Private function. Pack a column into an array if the array converts back to equal values, else keep it a list."""
+    types = set(map(type, values))
+    try:
+        if types == {int}:
+            return np.array(values, np.int64)
+        if types == {float}:
+            return np.array(values, np.float64)
+        if types == {list} and len(set(map(len, values))) == 1 and set(map(type, chain.from_iterable(values))) == {int}:
+            return np.array(values, np.int64)
+    except OverflowError:
+        pass
+    return values
+
+
+def _build(model_class: type, columns: Union[Dict[str, Any], List[BaseEntityModel]], records: List[Dict]) -> List[BaseEntityModel]:
+    """Private function. Create entities of a chunk from columns sent by a worker process."""
+    if isinstance(columns, list):
+        return columns
+    values = {
+        name: [record.get(name) for record in records] if column is None else column.tolist() if isinstance(column, np.ndarray) else column
+        for name, column in columns.items()
+    }
+    return list(map(model_class, *(values[name] for name in _init_fields(model_class))))
+
+
+@lru_cache(maxsize=None)
+def _init_fields(model_class: type) -> Optional[Tuple[str]]:
+    """Private function. Get fields in the order of model constructor arguments, None if arguments are not the fields."""
+    arguments = tuple(inspect.signature(model_class.__init__).parameters)[1:]
+    return arguments if set(arguments) == set(model_class.fields) else None
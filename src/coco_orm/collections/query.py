@@ -0,0 +1,183 @@
+from typing import List, Optional, Iterator, Callable, Tuple
+from itertools import islice
+from operator import attrgetter
+import heapq
+
+from ..models.core import BaseEntityModel
+from ..filters.core import BaseFilter
+
+
+class Query():
+    """
+    Query is a lazy selection of collection entities, created with ``BaseCollection.query``.
+
+    Nothing is filtered until a terminal method is called: entities are checked one by one as they are consumed,
+    so a query with a limit (or ``first`` and ``exists``) stops scanning the collection as soon as enough entities
+    match. Ordered queries with a limit keep only ``offset + limit`` entities in a heap instead of sorting all matches.
+    ``count``, ``exists`` and ``ids`` never build collections.
+    >>> query = collection.query(AnnotationFilters().category_id(3)).order_by("area", reverse=True).limit(100)
+    >>> largest = query.all()
+    >>> count = collection.query(AnnotationFilters().iscrowd(1)).count()
+
+    Methods building the query return self, so they can be chained like filters.
+    Entities are ordered by attribute values, None values are placed after other values (before them if ``reverse``).
+    Entities with equal values keep the collection order.
+
+    Args/Attributes:
+        collection (BaseCollection): a collection to select entities from.
+        filters (Optional[BaseFilter]): filters entities have to match, all entities are selected if None.
+    """
+    def __init__(self, collection, filters: Optional[BaseFilter] = None):
+        self.collection = collection
+        self.filters = filters.resolve(collection) if filters else filters
+        self._order = () # type: Tuple[str] # names of attributes to order entities by
+        self._reverse = False # type: bool
+        self._offset = 0 # type: int
+        self._limit = None # type: Optional[int]
+
+    def order_by(self, *attr_names: str, reverse: bool = False) -> "Query":
+        """
+        Order entities by attribute values.
+
+        Args:
+            attr_names (str): names of attributes, entities with equal values of an attribute are ordered by the next one.
+            reverse (bool): order entities in descending order.
+
+        Returns:
+            self
+        """
+        self._order = attr_names
+        self._reverse = reverse
+        return self
+
+    def offset(self, value: int) -> "Query":
+        """
+        Skip a number of first entities.
+
+        Args:
+            value (int): a number of entities to skip.
+
+        Returns:
+            self
+        """
+        if value < 0:
+            raise Exception(f"Offset must be non-negative, got {value}.")
+        self._offset = value
+        return self
+
+    def limit(self, value: Optional[int]) -> "Query":
+        """
+        Select at most a number of entities.
+
+        Args:
+            value (Optional[int]): a maximum number of entities, None to select all of them.
+
+        Returns:
+            self
+        """
+        if value is not None and value < 0:
+            raise Exception(f"Limit must be non-negative, got {value}.")
+        self._limit = value
+        return self
+
+    def __iter__(self) -> Iterator[BaseEntityModel]:
+        """
+        Iterate over selected entities. Unordered queries yield entities while the collection is being scanned.
+
+        Returns:
+            Iterator[BaseEntityModel]: an iterator of entities.
+        """
+        matches = self._matches()
+        stop = self._stop()
+        if not self._order:
+            return islice(matches, self._offset, stop)
+        key = self._sort_key()
+        if stop is None:
+            ordered = sorted(matches, key=key, reverse=self._reverse)
+        else:
+            # equivalent to sorted(...)[:stop], keeping only stop entities at once
+            ordered = (heapq.nlargest if self._reverse else heapq.nsmallest)(stop, matches, key=key)
+        return islice(ordered, self._offset, None)
+
+    def all(self):
+        """
+        Get selected entities as a collection.
+
+        Returns:
+            BaseCollection: a collection of the same type containing selected entities.
+        """
+        return self.collection(list(self))
+
+    def first(self) -> Optional[BaseEntityModel]:
+        """
+        Get the first selected entity.
+
+        Returns:
+            Optional[BaseEntityModel]: an entity, None if no entity is selected.
+        """
+        return next(iter(self), None)
+
+    def count(self) -> int:
+        """
+        Count selected entities. The order of entities is ignored.
+
+        Returns:
+            int: a number of entities.
+        """
+        if not self.filters:
+            return len(range(len(self.collection))[self._offset:self._stop()])
+        if self._limit is None:
+            return max(self.filters.compiled.count(self._candidates()) - self._offset, 0)
+        return sum(1 for _ in islice(self._matches(), self._offset, self._stop()))
+
+    def exists(self) -> bool:
+        """
+        Check whether any entity is selected. Scanning stops at the first selected entity.
+
+        Returns:
+            bool: True if at least one entity is selected.
+        """
+        if self._limit == 0:
+            return False
+        return any(True for _ in islice(self._matches(), self._offset, self._offset + 1))
+
+    def ids(self) -> List[int]:
+        """
+        Get ids of selected entities.
+
+        Returns:
+            list[int]: ids, in the order of entities.
+        """
+        return [entity.id for entity in self]
+
+    def _stop(self) -> Optional[int]:
+        """Private method. Get a number of ordered matches to keep, None if all of them are kept."""
+        return None if self._limit is None else self._offset + self._limit
+
+    def _matches(self) -> Iterator[BaseEntityModel]:
+        """
+        Private method. Lazily find entities matching filters, in collection order.
+        If the collection has indexes on properties filtered by equality or membership, it is narrowed down with them first.
+
+        Returns:
+            Iterator[BaseEntityModel]: an iterator of matching entities.
+        """
+        if not self.filters:
+            return iter(self.collection)
+        return self.filters.compiled.iterate(self._candidates())
+
+    def _candidates(self):
+        """Private method. Narrow the collection down to entities found in indexes, if possible. See ``BaseFilter._index_candidates``."""
+        candidates = self.filters._index_candidates(self.collection)
+        return self.collection if candidates is None else candidates
+
+    def _sort_key(self) -> Callable:
+        """Private method. Build a key function ordering entities by attribute values, None values after others."""
+        getters = [attrgetter(attr_name) for attr_name in self._order]
+        if len(getters) == 1:
+            getter = getters[0]
+            def key(entity):
+                value = getter(entity)
+                return (value is None, value)
+            return key
+        return lambda entity: tuple((value is None, value) for value in (getter(entity) for getter in getters))
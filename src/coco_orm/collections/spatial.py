@@ -0,0 +1,192 @@
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ..operators.core import INTERSECTS
+from ..filters.properties import BboxRegionProperty, BboxNearestProperty
+
+"""Bboxes of images having fewer of them are checked one array at a time, a grid is built for images having more."""
+GRID_MIN_BOXES = 64
+
+"""An average number of bboxes per grid cell."""
+GRID_CELL_BOXES = 4
+
+"""Bboxes covering more grid cells are not registered in cells, they are checked by every query of an image."""
+GRID_MAX_CELLS = 16
+
+
+class Grid():
+    """
+    Grid is a uniform grid over bboxes of an image, in CSR form: bboxes registered in each cell are stored
+    in a single array, cell after cell, so the bboxes of a row of cells are one slice of it.
+    The grid spans the extent of the bboxes and has about ``GRID_CELL_BOXES`` bboxes per cell. A bbox is registered
+    in every cell it covers, unless it covers more than ``GRID_MAX_CELLS`` cells.
+
+    Args:
+        corners (np.ndarray): an (N, 4) float64 array of left, top, right and bottom edges of bboxes.
+
+    Attributes:
+        size (int): a number of cells along each axis.
+        large (np.ndarray): indices of bboxes not registered in cells.
+    """
+    def __init__(self, corners: np.ndarray):
+        self.size = size = max(1, int(np.sqrt(len(corners) / GRID_CELL_BOXES)))
+        self._num_boxes = len(corners)
+        self._origin = corners[:, :2].min(axis=0)
+        extent = corners[:, 2:].max(axis=0) - self._origin
+        self._cell = np.where(extent > 0, extent / size, 1.0)
+        first, last = self._cells(corners[:, :2]), self._cells(corners[:, 2:])
+        spans = last - first + 1
+        counts = spans[:, 0] * spans[:, 1]
+        large = counts > GRID_MAX_CELLS
+        self.large = np.flatnonzero(large)
+        boxes = np.flatnonzero(~large)
+        first, spans, counts = first[boxes], spans[boxes], counts[boxes]
+        # offsets of covered cells within the span of each bbox, row by row
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        widths = np.repeat(spans[:, 0], counts)
+        cells = (np.repeat(first[:, 1], counts) + offsets // widths) * size + np.repeat(first[:, 0], counts) + offsets % widths
+        order = np.argsort(cells, kind="stable")
+        self._boxes = np.repeat(boxes, counts)[order]
+        self._starts = np.concatenate(([0], np.cumsum(np.bincount(cells, minlength=size * size)))).tolist()
+
+    def candidates(self, corners: Tuple[float, float, float, float]) -> np.ndarray:
+        """
+        Find bboxes which may intersect or be within a region.
+
+        Args:
+            corners (tuple[float, float, float, float]): the left, the top, the right and the bottom edge of a region.
+
+        Returns:
+            np.ndarray: an ascending array of bbox indices, a superset of matching bboxes.
+        """
+        (left, top), (right, bottom) = self._cells(np.array(corners).reshape(2, 2)).tolist()
+        starts, boxes, size = self._starts, self._boxes, self.size
+        # bboxes covering several cells are registered more than once, marking them is cheaper than np.unique
+        marked = np.zeros(self._num_boxes, np.bool_)
+        for row in range(top, bottom + 1):
+            marked[boxes[starts[row * size + left]:starts[row * size + right + 1]]] = True
+        marked[self.large] = True
+        return np.flatnonzero(marked)
+
+    def _cells(self, points: np.ndarray) -> np.ndarray:
+        """Private method. Get columns and rows of cells containing points, points outside of the grid are moved to its border cells."""
+        return np.clip((points - self._origin) // self._cell, 0, self.size - 1).astype(np.int64)
+
+
+class SpatialIndex():
+    """
+    SpatialIndex is a per-image index over annotation bboxes, see ``coco_orm.collections.annotation.Collection.spatial_index``.
+
+    Bboxes are sorted by image once, so bboxes of an image are a slice of a single array of their corners.
+    A uniform grid (see ``Grid``) is built on the first region query of an image having at least ``GRID_MIN_BOXES`` bboxes,
+    bboxes of smaller images are checked as a whole. A region query costs a few array operations over the bboxes
+    of nearby cells, so an image can be queried thousands of times without scanning the collection.
+
+    Args:
+        image_ids (np.ndarray): image ids of annotations, in collection order.
+        bboxes (np.ndarray): an (N, 4) array of annotation bboxes: x, y, width, height.
+    """
+    def __init__(self, image_ids: np.ndarray, bboxes: np.ndarray):
+        keys, codes = _factorize(image_ids)
+        self._order = np.argsort(codes, kind="stable") # positions of annotations, image by image
+        bboxes = np.asarray(bboxes, np.float64).reshape(-1, 4)[self._order]
+        self._corners = np.concatenate((bboxes[:, :2], bboxes[:, :2] + bboxes[:, 2:]), axis=1)
+        self._starts = np.concatenate(([0], np.cumsum(np.bincount(codes, minlength=len(keys))))).astype(np.int64)
+        self._groups = dict(zip(keys, range(len(keys)))) # type: Dict[Hashable, int]
+        self._grids = {} # type: Dict[int, Grid]
+
+    def __len__(self):
+        return len(self._order)
+
+    def count(self, image_ids: Iterable[Hashable]) -> int:
+        """
+        Count annotations of images.
+
+        Args:
+            image_ids (Iterable[Hashable]): image ids.
+
+        Returns:
+            int: a number of annotations.
+        """
+        groups = self._find(image_ids)
+        return int((self._starts[groups + 1] - self._starts[groups]).sum())
+
+    def search(self, property: BboxRegionProperty, image_ids: Iterable[Hashable]) -> np.ndarray:
+        """
+        Find annotations of images whose bboxes intersect or are within a region, see ``coco_orm.filters.properties.BboxRegionProperty``.
+
+        Args:
+            property (BboxRegionProperty): a region filter.
+            image_ids (Iterable[Hashable]): ids of images to search in.
+
+        Returns:
+            np.ndarray: an ascending array of positions of annotations.
+        """
+        corners, check = property.corners, _intersect if property.spatial_operator == INTERSECTS else _within
+        found = []
+        for group in self._find(image_ids).tolist():
+            start, stop = int(self._starts[group]), int(self._starts[group + 1])
+            if stop - start < GRID_MIN_BOXES:
+                found.append(start + np.flatnonzero(check(self._corners[start:stop], corners)))
+                continue
+            grid = self._grids.get(group)
+            if grid is None:
+                grid = self._grids[group] = Grid(self._corners[start:stop])
+            candidates = start + grid.candidates(corners)
+            found.append(candidates[check(self._corners[candidates], corners)])
+        return np.sort(self._order[np.concatenate(found)]) if found else np.empty(0, np.int64)
+
+    def nearest(self, property: BboxNearestProperty, image_ids: Optional[Iterable[Hashable]] = None) -> np.ndarray:
+        """
+        Find annotations of each image whose bboxes are nearest to a point, see ``coco_orm.filters.properties.BboxNearestProperty``.
+
+        Args:
+            property (BboxNearestProperty): a nearest bboxes filter.
+            image_ids (Optional[Iterable[Hashable]]): ids of images to search in, all images if None.
+
+        Returns:
+            np.ndarray: an ascending array of positions of annotations.
+        """
+        if image_ids is None:
+            groups = np.arange(len(self._groups))
+            rows = np.arange(len(self._order))
+        else:
+            groups = self._find(image_ids)
+            rows = np.concatenate([np.arange(self._starts[group], self._starts[group + 1]) for group in groups.tolist()] + [np.empty(0, np.int64)])
+        counts = self._starts[groups + 1] - self._starts[groups]
+        corners = self._corners[rows]
+        x, y = property.point
+        dx = np.maximum(np.maximum(corners[:, 0] - x, x - corners[:, 2]), 0)
+        dy = np.maximum(np.maximum(corners[:, 1] - y, y - corners[:, 3]), 0)
+        # rows stay grouped by image, within an image they are ordered by distance, then by position
+        order = np.lexsort((rows, dx * dx + dy * dy, np.repeat(np.arange(len(groups)), counts)))
+        ranks = np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+        return np.sort(self._order[rows[order[ranks < property.k]]])
+
+    def _find(self, image_ids: Iterable[Hashable]) -> np.ndarray:
+        """Private method. Get ascending numbers of image groups having given image ids, ids of images without annotations are skipped."""
+        groups = self._groups
+        return np.array(sorted({groups[image_id] for image_id in image_ids if image_id in groups}), np.int64)
+
+
+def _factorize(image_ids: np.ndarray) -> Tuple[List[Hashable], np.ndarray]:
+    """Private function. Number distinct image ids, get the ids and a number of each annotation."""
+    if image_ids.dtype != object:
+        keys, codes = np.unique(image_ids, return_inverse=True)
+        return keys.tolist(), codes.reshape(-1)
+    numbers = {}
+    codes = np.fromiter((numbers.setdefault(image_id, len(numbers)) for image_id in image_ids.tolist()), np.int64, len(image_ids))
+    return list(numbers), codes
+
+
+def _intersect(corners: np.ndarray, region: Tuple[float, float, float, float]) -> np.ndarray:
+    """Private function. Mark bboxes overlapping the interior of a region, see ``coco_orm.filters.compiler.bbox_intersects``."""
+    left, top, right, bottom = region
+    return (corners[:, 0] < right) & (left < corners[:, 2]) & (corners[:, 1] < bottom) & (top < corners[:, 3])
+
+
+def _within(corners: np.ndarray, region: Tuple[float, float, float, float]) -> np.ndarray:
+    """Private function. Mark bboxes contained by a region, see ``coco_orm.filters.compiler.bbox_within``."""
+    left, top, right, bottom = region
+    return (left <= corners[:, 0]) & (corners[:, 2] <= right) & (top <= corners[:, 1]) & (corners[:, 3] <= bottom)
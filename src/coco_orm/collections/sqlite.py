@@ -0,0 +1,913 @@
+from typing import List, Dict, Optional, Union, Iterable, Iterator, Hashable, Tuple, Any
+from itertools import count, islice
+from operator import index
+import json
+import sqlite3
+import weakref
+
+import numpy as np
+
+from .core import BaseCollection, INDEX_SELECTIVITY, APPEND, UPDATE, DELETE
+from .query import Query as BaseQuery
+from .view import LIST_READERS, reading_entities
+from .aggregate import GroupBy as BaseGroupBy, _ITEMS, _factorize, _floats
+from .image import Collection as BaseImageCollection
+from .image_repository import Repository as ImageRepository
+from .annotation import Collection as BaseAnnotationCollection, _image_id_array
+from .category import Collection as BaseCategoryCollection
+from .license import Collection as BaseLicenseCollection
+from ..models.core import BaseEntityModel, ID, without_none
+from ..models.image import Model as ImageModel
+from ..models.annotation import Model as AnnotationModel, IMAGE_ID, SEGMENTATION, BBOX
+from ..models.category import Model as CategoryModel
+from ..models.license import Model as LicenseModel
+from ..filters.sql import CompiledQuery
+from ..filters.cache import FILTER_CACHE_SIZE, FILTER_CACHE_BYTES
+
+"""A number of rows fetched from a cursor or inserted at once."""
+SQL_BATCH_SIZE = 10000
+
+"""A table of a store keeping its metadata, e.g. a version of the json file its collections have been imported from."""
+META_TABLE = "meta"
+
+"""Schemas of tables: persistent tables of a store file and temporary tables of derived collections."""
+MAIN = "main"
+TEMP = "temp"
+
+
+class Store():
+    """
+    Store is a SQLite database keeping tables of SQL collections. Collections of a store share its connection, so
+    tables of filtered collections are filled by the database from tables of source collections, rows don't pass through Python.
+
+    Named tables persist in the database file. Tables of collections created by filtering (and other derived collections)
+    are temporary: they are dropped when a collection is garbage-collected or the connection is closed.
+
+    Args/Attributes:
+        filepath (str), default = "": path to the database file, created if needed. An empty string creates a private
+                temporary database, kept on disk and removed when the connection is closed.
+
+    Attributes:
+        connection (sqlite3.Connection): a connection to the database.
+    """
+    def __init__(self, filepath: str = ""):
+        self.filepath = filepath
+        self.connection = sqlite3.connect(filepath)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.execute(f'CREATE TABLE IF NOT EXISTS "{META_TABLE}" (key TEXT PRIMARY KEY, value TEXT)')
+        self.connection.commit()
+        self._names = count()
+
+    def temporary_name(self, prefix: str) -> str:
+        """
+        Get a name of a new temporary table.
+
+        Args:
+            prefix (str): a prefix of the name, e.g. a name of the source table.
+
+        Returns:
+            str: a table name unique within the connection.
+        """
+        return f"{prefix}_{next(self._names)}"
+
+    def get(self, key: str) -> Any:
+        """
+        Get a metadata value.
+
+        Args:
+            key (str): a metadata key.
+
+        Returns:
+            mixed: a json value, None if the key is not set.
+        """
+        row = self.connection.execute(f'SELECT value FROM "{META_TABLE}" WHERE key = ?', (key,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Set a metadata value.
+
+        Args:
+            key (str): a metadata key.
+            value (mixed): a json serializable value.
+        """
+        with self.connection:
+            self.connection.execute(f'INSERT OR REPLACE INTO "{META_TABLE}" (key, value) VALUES (?, ?)', (key, json.dumps(value)))
+
+    def drop(self, schema: str, name: str) -> None:
+        """
+        Drop a table if it exists.
+
+        Args:
+            schema (str): a schema of the table, MAIN or TEMP.
+            name (str): a table name.
+        """
+        try:
+            with self.connection:
+                self.connection.execute(f'DROP TABLE IF EXISTS "{schema}"."{name}"')
+        except sqlite3.ProgrammingError: # the connection is closed, temporary tables are gone
+            pass
+
+    def close(self) -> None:
+        """Close the connection. Collections of the store can't be used afterwards."""
+        self.connection.close()
+
+
+class SqlIndex():
+    """
+    SqlIndex is a secondary index of an SQL collection, exposing the interface of ``coco_orm.collections.indexes.Index``.
+    Values are looked up with an index of the table, created along with the table.
+
+    Args:
+        attr_name (str): a column name.
+        unique (bool): True if the column identifies an entity.
+        collection (Collection): an indexed collection.
+    """
+    def __init__(self, attr_name: str, unique: bool, collection: "Collection"):
+        self.attr_name = attr_name
+        self.unique = unique
+        self._collection = collection
+
+    def __len__(self):
+        return len(self._collection)
+
+    def get(self, value: Hashable) -> List[BaseEntityModel]:
+        return self._collection.get_all_by(self.attr_name, value)
+
+    def first(self, value: Hashable) -> Optional[BaseEntityModel]:
+        return self._collection.get_by(self.attr_name, value)
+
+    def count(self, values: Iterable[Hashable]) -> int:
+        where, parameters = self._collection._where_in(self.attr_name, values)
+        return self._collection._count(where, parameters)
+
+
+def _limit_clause(limit: Optional[int], offset: int = 0) -> str:
+    """Private function. Build a LIMIT clause, an empty string if all rows are selected."""
+    if limit is None and not offset:
+        return ""
+    return f"LIMIT {-1 if limit is None else int(limit)} OFFSET {int(offset)}"
+
+
+class Query(BaseQuery):
+    """
+    Query is a lazy selection of rows of an SQL collection, see ``coco_orm.collections.query.Query``.
+
+    Filters, the order, the offset and the limit are translated into a single statement, so the database stops reading
+    rows as soon as enough of them are selected. ``count``, ``exists`` and ``ids`` read no entities.
+    Other filters and orders (e.g. by bboxes, stored as json) are evaluated entity by entity.
+    """
+    def __iter__(self) -> Iterator[BaseEntityModel]:
+        """Override. Stream selected rows."""
+        statement = self._statement()
+        if statement is None:
+            return super().__iter__()
+        where, parameters, order = statement
+        return self.collection._entities(where, parameters, order, self._limit, self._offset)
+
+    def count(self) -> int:
+        """Override. Count selected rows in the database."""
+        statement = self._statement(ordered=False)
+        if statement is None:
+            return super().count()
+        where, parameters, _ = statement
+        if self._limit is None and not self._offset:
+            return self.collection._count(where, parameters)
+        return self._execute(f"SELECT COUNT(*) FROM (SELECT 1 FROM {self.collection._from} {where} {_limit_clause(self._limit, self._offset)})", parameters)[0][0]
+
+    def exists(self) -> bool:
+        """Override. Check selected rows in the database."""
+        statement = self._statement(ordered=False)
+        if statement is None:
+            return super().exists()
+        if self._limit == 0:
+            return False
+        where, parameters, _ = statement
+        return bool(self._execute(f"SELECT EXISTS (SELECT 1 FROM {self.collection._from} {where} {_limit_clause(1, self._offset)})", parameters)[0][0])
+
+    def ids(self) -> List[int]:
+        """Override. Read the id column of selected rows."""
+        statement = self._statement()
+        if statement is None:
+            return super().ids()
+        where, parameters, order = statement
+        rows = self._execute(f"SELECT id FROM {self.collection._from} {where} ORDER BY {order} {_limit_clause(self._limit, self._offset)}", parameters)
+        return [row[0] for row in rows]
+
+    def _execute(self, statement: str, parameters: Dict) -> List[Tuple]:
+        """Private method. Run a statement and fetch all rows."""
+        return self.collection.store.connection.execute(statement, parameters).fetchall()
+
+    def _statement(self, ordered: bool = True) -> Optional[Tuple[str, Dict, str]]:
+        """
+        Private method. Translate filters and the order of the query.
+
+        Args:
+            ordered (bool): translate the order, else rows are selected in collection order.
+
+        Returns:
+            Optional[tuple[str, dict, str]]: a WHERE clause, its parameters and an ORDER BY expression,
+                None if filters or the order can't be translated.
+        """
+        collection = self.collection
+        where, parameters = "", {}
+        if self.filters:
+            compiled = self.filters.compiled_query(collection.sql_columns)
+            if compiled is None:
+                return None
+            where, parameters = f"WHERE {compiled.source}", compiled.parameters
+        if not ordered or not self._order:
+            return where, parameters, "seq"
+        if any(attr_name not in collection.sql_columns or attr_name in collection.json_fields for attr_name in self._order):
+            return None
+        direction = " DESC" if self._reverse else ""
+        # NULL values are placed after other values (before them if reversed), rows with equal values keep their positions
+        order = ", ".join(f'"{attr_name}" IS NULL{direction}, "{attr_name}"{direction}' for attr_name in self._order)
+        return where, parameters, f"{order}, seq"
+
+
+class GroupBy(BaseGroupBy):
+    """
+    GroupBy aggregates rows of an SQL collection, see ``coco_orm.collections.aggregate.GroupBy``.
+
+    ``count``, ``sum`` and ``mean`` of columns are computed by the database with a single GROUP BY statement.
+    Other aggregates read only keys and values of selected rows, bbox sizes are extracted from json by the database.
+    Filters the database can't evaluate are applied to a copy of the collection first.
+    """
+    _source_where = "", {} # type: Tuple[str, Dict] # a WHERE clause selecting rows of the source collection
+    def count(self) -> Dict[Hashable, int]:
+        """Override. Count rows in the database."""
+        counts = self._aggregate("COUNT(*)")
+        return super().count() if counts is None else counts
+
+    def sum(self, name: str) -> Dict[Hashable, float]:
+        """Override. Sum a column in the database."""
+        sums = self._aggregate("TOTAL({})", name)
+        return super().sum(name) if sums is None else sums
+
+    def mean(self, name: str) -> Dict[Hashable, float]:
+        """Override. Average a column in the database."""
+        means = self._aggregate("AVG({})", name)
+        if means is None:
+            return super().mean(name)
+        return {key: float("nan") if mean is None else mean for key, mean in means.items()}
+
+    def _aggregate(self, function: str, name: Optional[str] = None) -> Optional[Dict[Hashable, Any]]:
+        """
+        Private method. Aggregate groups of selected rows in the database.
+
+        Args:
+            function (str): an SQL aggregate expression, ``{}`` is replaced with an expression of values.
+            name (Optional[str]): a name of aggregated values.
+
+        Returns:
+            Optional[dict]: a dictionary mapping group keys to aggregates, None if filters, keys or values can't be translated.
+        """
+        collection = self.collection
+        where = self._where()
+        expression = None if name is None else self._expression(name)
+        if where is None or (name is not None and expression is None) or not self._are_columns(self.attr_names):
+            return None
+        where, parameters = where
+        function = function.format(expression)
+        if not self.attr_names:
+            return {(): collection.store.connection.execute(f"SELECT {function} FROM {collection._from} {where}", parameters).fetchone()[0]}
+        keys = ", ".join(f'"{attr_name}"' for attr_name in self.attr_names)
+        rows = collection.store.connection.execute(f"SELECT {keys}, {function} FROM {collection._from} {where} GROUP BY {keys} ORDER BY {keys}", parameters)
+        if len(self.attr_names) == 1:
+            return {row[0]: row[1] for row in rows}
+        return {row[:-1]: row[-1] for row in rows}
+
+    def _read_keys(self) -> Tuple[List[Hashable], np.ndarray]:
+        """Override. Read key columns of selected rows only."""
+        if not self._are_columns(self.attr_names):
+            self._copy_selected()
+            return super()._read_keys()
+        collection = self._source[0]
+        where, parameters = self._source_where
+        if not self.attr_names:
+            return [()], np.zeros(collection._count(where, parameters), dtype=np.int64)
+        keys = ", ".join(f'"{attr_name}"' for attr_name in self.attr_names)
+        rows = collection.store.connection.execute(f"SELECT {keys} FROM {collection._from} {where} ORDER BY seq", parameters).fetchall()
+        return _factorize([row[0] for row in rows] if len(self.attr_names) == 1 else rows)
+
+    def _read_column(self, name: str) -> np.ndarray:
+        """Override. Read a column (or a bbox item) of selected rows only."""
+        expression = self._expression(name)
+        if expression is None:
+            self._copy_selected()
+            return super()._read_column(name)
+        collection = self._source[0]
+        where, parameters = self._source_where
+        rows = collection.store.connection.execute(f"SELECT {expression} FROM {collection._from} {where} ORDER BY seq", parameters)
+        return _floats(row[0] for row in rows)
+
+    def _select(self) -> Tuple[BaseCollection, None]:
+        """Override. Rows matching filters are selected by the database, or copied if filters can't be translated."""
+        where = self._where()
+        if where is None:
+            self._source_where = "", {}
+            return self.collection.filter(self.filters), None
+        self._source_where = where
+        return self.collection, None
+
+    def _copy_selected(self) -> None:
+        """Private method. Copy rows selected by the database, before they are read entity by entity."""
+        if self._source_where[0]:
+            self._source = self.collection.filter(self.filters), None
+            self._source_where = "", {}
+
+    def _where(self) -> Optional[Tuple[str, Dict]]:
+        """Private method. Translate filters into a WHERE clause and its parameters, None if they can't be translated."""
+        if not self.filters:
+            return "", {}
+        compiled = self.filters.compiled_query(self.collection.sql_columns)
+        return None if compiled is None else (f"WHERE {compiled.source}", compiled.parameters)
+
+    def _are_columns(self, attr_names: Tuple[str, ...]) -> bool:
+        """Private method. Check whether attributes are columns the database can compare."""
+        collection = self.collection
+        return all(attr_name in collection.sql_columns and attr_name not in collection.json_fields for attr_name in attr_names)
+
+    def _expression(self, name: str) -> Optional[str]:
+        """Private method. Translate a name of values into an SQL expression, None if values are not stored in columns."""
+        attr_name, index = _ITEMS.get(name, (name, None))
+        if index is None:
+            return f'"{attr_name}"' if self._are_columns((attr_name,)) else None
+        if attr_name not in self.collection.json_fields:
+            return None
+        return f"json_extract(\"{attr_name}\", '$[{index}]')"
+
+
+class Collection(BaseCollection):
+    """
+    Collection is a BaseCollection keeping entities in a table of a SQLite database instead of memory, so collections
+    larger than memory can be processed. Every entity field is a column, lists and dictionaries (e.g. annotation
+    segmentations) are stored as json. Ids and indexed attributes (``indexes`` class attribute) are indexed by the database.
+
+    The collection keeps the public API of BaseCollection. Entities are read from the table on access: iteration streams
+    rows from a cursor, and returned entities are detached copies, changes of an entity are stored with ``update``.
+    Filters are translated to SQL and evaluated by the database, see ``coco_orm.filters.sql.SqlCompiler``;
+    a filtered collection is a temporary table of the same store.
+    Positional changes (insert, slice assignment) shift positions of following rows and take O(n) time; ``sort`` reads
+    all entities into memory.
+
+    Args:
+        entity_factory (AbstractEntityFactory): a reference to AbstractEntityFactory implementation.
+        filters (BaseFilter): a reference to BaseFilter implementation.
+        entities (list[dict] | list[BaseEntityModel] | None): entities to insert into the table.
+
+    Attributes:
+        store (Store): a database keeping the table. Set by ``bind`` before the collection is initialized.
+        table (str): a name of the table.
+        sql_columns (tuple[str]): names of columns filters may be translated over.
+    """
+    model = BaseEntityModel # type: type # a model class, fields of the model are columns of the table
+    json_fields = () # type: tuple[str] # fields stored as json
+    store = None # type: Optional[Store]
+    table = None # type: Optional[str]
+    schema = TEMP # type: str
+
+    def __init__(self, entity_factory, filters, entities: Union[List[Dict], List[BaseEntityModel], None] = None):
+        list.__init__(self)
+        self.entity_factory = entity_factory
+        self.filters_builder = filters
+        if self.store is None:
+            self.bind(None, None)
+        self.sql_columns = self.model.fields
+        self._create()
+        if entities:
+            self.extend(entities)
+
+    def bind(self, store: Optional[Store], table: Optional[str]) -> None:
+        """
+        Set a table keeping the collection. Called by child classes before the collection is initialized.
+
+        Args:
+            store (Optional[Store]): a database keeping the table, None to create a private temporary database.
+            table (Optional[str]): a name of a table persisting in the database, created if needed.
+                    None to create a temporary table, dropped with the collection.
+        """
+        self.store = store if store is not None else Store()
+        self.schema = MAIN if table else TEMP
+        self.table = table or self.store.temporary_name(self.model.__module__.rsplit(".", 1)[-1])
+        if self.schema == TEMP:
+            weakref.finalize(self, self.store.drop, TEMP, self.table)
+
+    def _create(self) -> None:
+        """Private method. Create the table and its indexes if they don't exist, count its rows."""
+        columns = ", ".join(f'"{name}"' for name in self.model.fields)
+        self._from = f'"{self.schema}"."{self.table}"'
+        self._select = f"SELECT {columns} FROM {self._from}"
+        self._insert = f"INSERT INTO {self._from} (seq, {columns}) VALUES ({', '.join('?' * (len(self.model.fields) + 1))})"
+        with self.store.connection as connection:
+            # seq is a position of a row, kept dense
+            connection.execute(f"CREATE TABLE IF NOT EXISTS {self._from} (seq INTEGER PRIMARY KEY, {columns})")
+            for attr_name in (ID,) + tuple(index.attr_name for index in self.indexes):
+                self._create_sql_index(attr_name)
+        self._size = self._count()
+
+    def _create_sql_index(self, attr_name: str) -> None:
+        """Private method. Create an index of a column if it doesn't exist."""
+        self.store.connection.execute(f'CREATE INDEX IF NOT EXISTS "{self.schema}"."{self.table}_{attr_name}" ON "{self.table}" ("{attr_name}")')
+
+    def _row(self, entity: Union[BaseEntityModel, Dict]) -> Tuple:
+        """Private method. Convert an entity to column values, dictionaries are normalized by the entity factory first."""
+        data = (self.entity_factory.from_dict(entity) if isinstance(entity, dict) else entity).to_dict()
+        return tuple(
+            json.dumps(data[name]) if name in self.json_fields and data[name] is not None else data[name]
+            for name in self.model.fields
+        )
+
+    def _dict(self, row: Tuple) -> Dict:
+        """Private method. Convert column values to a dictionarized entity."""
+        data = dict(zip(self.model.fields, row))
+        for name in self.json_fields:
+            if data[name] is not None:
+                data[name] = json.loads(data[name])
+        return data
+
+    def _rows(self, where: str = "", parameters: Union[Tuple, Dict] = (), order: str = "seq", limit: Optional[int] = None, offset: int = 0) -> Iterator[Tuple]:
+        """Private method. Stream rows from a cursor, fetching them in batches of ``SQL_BATCH_SIZE``."""
+        limit = _limit_clause(limit, offset)
+        cursor = self.store.connection.execute(f"{self._select} {where} ORDER BY {order} {limit}", parameters)
+        while True:
+            rows = cursor.fetchmany(SQL_BATCH_SIZE)
+            if not rows:
+                return
+            yield from rows
+
+    def _entities(self, where: str = "", parameters: Union[Tuple, Dict] = (), order: str = "seq", limit: Optional[int] = None, offset: int = 0) -> Iterator[BaseEntityModel]:
+        """Private method. Stream entities of matching rows."""
+        from_dict = self.entity_factory.from_dict
+        return (from_dict(self._dict(row), trusted=True) for row in self._rows(where, parameters, order, limit, offset))
+
+    def _count(self, where: str = "", parameters: Union[Tuple, Dict] = ()) -> int:
+        """Private method. Count matching rows."""
+        return self.store.connection.execute(f"SELECT COUNT(*) FROM {self._from} {where}", parameters).fetchone()[0]
+
+    def _where_equal(self, attr_name: str, value: Hashable) -> Tuple[str, Tuple]:
+        """Private method. Build a condition matching a column value, None matches NULL."""
+        if value is None:
+            return f'WHERE "{attr_name}" IS NULL', ()
+        return f'WHERE "{attr_name}" = ?', (value,)
+
+    def _where_in(self, attr_name: str, values: Iterable[Hashable]) -> Tuple[str, Tuple]:
+        """Private method. Build a condition matching any of column values, passed as a json array."""
+        return f'WHERE "{attr_name}" IN (SELECT value FROM json_each(?))', (json.dumps([value for value in values if value is not None]),)
+
+    def _column(self, attr_name: str) -> bool:
+        """Private method. Check whether entities are looked up by a column."""
+        return attr_name in self.model.fields and attr_name not in self.json_fields
+
+    def _seq(self, id: int) -> Optional[int]:
+        """Private method. Get a position of the first entity with an id."""
+        row = self.store.connection.execute(f"SELECT seq FROM {self._from} WHERE id = ? ORDER BY seq LIMIT 1", (id,)).fetchone()
+        return None if row is None else row[0]
+
+    def _entity_at(self, position: int) -> BaseEntityModel:
+        """Override. Read an entity from a row."""
+        return next(self._entities("WHERE seq = ?", (position,), limit=1))
+
+    def _replace(self, start: int, stop: int, entities: Iterable[Union[BaseEntityModel, Dict]]) -> None:
+        """
+        Private method. Replace rows ``[start, stop)`` with given entities, shifting positions of following rows.
+
+        Args:
+            start (int): a position of the first replaced row.
+            stop (int): a position following the last replaced row.
+            entities (Iterable[BaseEntityModel | dict]): entities to insert.
+        """
+        rows = [self._row(entity) for entity in entities]
+        shift = len(rows) - (stop - start)
+        with self.store.connection as connection:
+            connection.execute(f"DELETE FROM {self._from} WHERE seq >= ? AND seq < ?", (start, stop))
+            if shift:
+                # rows are moved through negative positions, so shifted positions never collide
+                connection.execute(f"UPDATE {self._from} SET seq = -1 - (seq + ?) WHERE seq >= ?", (shift, stop))
+                connection.execute(f"UPDATE {self._from} SET seq = -1 - seq WHERE seq < 0")
+            connection.executemany(self._insert, ((position,) + row for position, row in enumerate(rows, start)))
+        self._size += shift
+        self._on_replace(start, [], len(rows))
+
+    def filter(self, filters, inplace: bool = False) -> "Collection":
+        """Override. Filtered rows are copied by the database."""
+        filtered = filters.apply(self)
+        if not isinstance(filtered, Collection):
+            filtered = self(filtered)
+        if inplace:
+            with self.store.connection as connection:
+                connection.execute(f"DELETE FROM {self._from}")
+                connection.execute(f"INSERT INTO {self._from} SELECT * FROM {filtered._from}")
+            self._size = len(filtered)
+            self._reset_index()
+            return self
+        return filtered
+
+    def query(self, filters=None) -> Query:
+        """Override. Return a Query translated to SQL."""
+        return Query(self, filters)
+
+    def group_by(self, *attr_names: str, filters=None) -> GroupBy:
+        """Override. Return a GroupBy aggregating rows in the database."""
+        return GroupBy(self, attr_names, filters)
+
+    def cache_filters(self, max_entries: int = FILTER_CACHE_SIZE, max_bytes: int = FILTER_CACHE_BYTES):
+        """Override. SQL collections are filtered by the database, their results are not cached."""
+        raise Exception("Filter results of SQL collections are not cached, filters are evaluated by the database")
+
+    def select_where(self, compiled: CompiledQuery) -> "Collection":
+        """
+        Copy rows matching an SQL condition into a new collection of the same store.
+
+        Args:
+            compiled (CompiledQuery): a condition compiled from filters, see ``coco_orm.filters.sql.SqlCompiler``.
+
+        Returns:
+            Collection: a new collection.
+        """
+        selected = self([])
+        columns = ", ".join(f'"{name}"' for name in self.model.fields)
+        with self.store.connection as connection:
+            connection.execute(
+                f"INSERT INTO {selected._from} (seq, {columns}) "
+                f"SELECT row_number() OVER (ORDER BY seq) - 1, {columns} FROM {self._from} WHERE {compiled.source}",
+                compiled.parameters
+            )
+        selected._size = selected._count()
+        return selected
+
+    def distinct(self, attr_name: str) -> frozenset:
+        """
+        Get distinct values of a column.
+
+        Args:
+            attr_name (str): a column name.
+
+        Returns:
+            frozenset: distinct values.
+        """
+        if not self._column(attr_name):
+            raise Exception(f"{attr_name!r} is not a column of {type(self).__name__}.")
+        return frozenset(row[0] for row in self.store.connection.execute(f'SELECT DISTINCT "{attr_name}" FROM {self._from}'))
+
+    def get_by_id(self, value: int) -> Optional[BaseEntityModel]:
+        return self.get_by(ID, value)
+
+    def get_by(self, attr_name: str, value: Hashable) -> Optional[BaseEntityModel]:
+        """Override. Columns are looked up by the database."""
+        if not self._column(attr_name):
+            return super().get_by(attr_name, value)
+        where, parameters = self._where_equal(attr_name, value)
+        return next(self._entities(where, parameters, limit=1), None)
+
+    def get_all_by(self, attr_name: str, value: Hashable) -> List[BaseEntityModel]:
+        """Override. Columns are looked up by the database."""
+        if not self._column(attr_name):
+            return super().get_all_by(attr_name, value)
+        return list(self._entities(*self._where_equal(attr_name, value)))
+
+    def create_index(self, attr_name: str, unique: bool = False) -> None:
+        """Override. Create an index of the table as well."""
+        super().create_index(attr_name, unique)
+        if self._column(attr_name):
+            with self.store.connection:
+                self._create_sql_index(attr_name)
+
+    def get_index(self, attr_name: str) -> Optional[SqlIndex]:
+        """Override. Secondary indexes are indexes of the table. See ``SqlIndex``."""
+        if not self._column(attr_name):
+            return None
+        declaration = (self._declared_indexes or {}).get(attr_name) or next((index for index in self.indexes if index.attr_name == attr_name), None)
+        return None if declaration is None else SqlIndex(attr_name, declaration.unique, self)
+
+    def lookup(self, attr_name: str, values: Iterable[Hashable], selectivity: float = INDEX_SELECTIVITY) -> Optional[List[BaseEntityModel]]:
+        """Override. Columns are looked up by the database."""
+        if not self._column(attr_name):
+            return None
+        values = list(values)
+        if None in values or not all(isinstance(value, (int, float, str)) for value in values):
+            return None
+        where, parameters = self._where_in(attr_name, values)
+        if self._count(where, parameters) > len(self) * selectivity:
+            return None
+        return list(self._entities(where, parameters))
+
+    @property
+    def last_id(self) -> int:
+        """the greatest id of the collection entities, 0 if the collection is empty."""
+        return self.store.connection.execute(f"SELECT MAX(id) FROM {self._from}").fetchone()[0] or 0
+
+    def append(self, entity: BaseEntityModel) -> int:
+        entity.id = self.last_id + 1 if entity.id == 0 else entity.id
+        with self.store.connection as connection:
+            connection.execute(self._insert, (self._size,) + self._row(entity))
+        self._size += 1
+        self._on_replace(self._size - 1, [], 1)
+        self._record(APPEND, entity)
+        return entity.id
+
+    def update(self, entity: BaseEntityModel) -> Optional[int]:
+        position = self._seq(entity.id)
+        if position is None:
+            return None
+        assignments = ", ".join(f'"{name}" = ?' for name in self.model.fields)
+        with self.store.connection as connection:
+            connection.execute(f"UPDATE {self._from} SET {assignments} WHERE seq = ?", self._row(entity) + (position,))
+        self._on_replace(position, [], 1)
+        self._record(UPDATE, entity)
+        return entity.id
+
+    def delete(self, id: int) -> Optional[BaseEntityModel]:
+        position = self._seq(id)
+        if position is None:
+            return None
+        entity = self._entity_at(position)
+        del self[position]
+        self._record(DELETE, id)
+        return entity
+
+    def to_dict(self, drop_none: bool = False) -> List[Dict]:
+        return list(self.iter_dicts(drop_none))
+
+    def iter_dicts(self, drop_none: bool = False) -> Iterator[Dict]:
+        """Override. Rows are streamed from a cursor."""
+        dicts = map(self._dict, self._rows())
+        return map(without_none, dicts) if drop_none else dicts
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        return self._entities()
+
+    def __reversed__(self):
+        return self._entities(order="seq DESC")
+
+    def __getitem__(self, key: Union[int, slice]):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step == 1:
+                return list(self._entities("WHERE seq >= ? AND seq < ?", (start, stop)))
+            return [self._entity_at(position) for position in range(start, stop, step)]
+        position = key + len(self) if key < 0 else key
+        if not 0 <= position < len(self):
+            raise IndexError("list index out of range")
+        return self._entity_at(position)
+
+    def __contains__(self, entity: BaseEntityModel) -> bool:
+        """Override. An entity is contained by the collection if an entity with the same id is."""
+        return self._seq(entity.id) is not None
+
+    def __repr__(self):
+        return f'{self.to_dict()}'
+
+    def index(self, entity: BaseEntityModel, *args) -> int:
+        """Override. Get a position of an entity with the same id."""
+        position = self._seq(entity.id)
+        if position is None:
+            raise ValueError(f"{entity!r} is not in list")
+        return position
+
+    def extend(self, entities: Iterable[Union[BaseEntityModel, Dict]]) -> None:
+        """Override. Entities are inserted in batches of ``SQL_BATCH_SIZE``, generators are consumed lazily."""
+        start = self._size
+        entities = iter(entities)
+        with self.store.connection as connection:
+            while True:
+                rows = [self._row(entity) for entity in islice(entities, SQL_BATCH_SIZE)]
+                if not rows:
+                    break
+                connection.executemany(self._insert, ((position,) + row for position, row in enumerate(rows, self._size)))
+                self._size += len(rows)
+        self._on_replace(start, [], self._size - start)
+
+    def insert(self, position: int, entity: BaseEntityModel) -> None:
+        size = len(self)
+        position = min(max(position + size if position < 0 else position, 0), size)
+        self._replace(position, position, [entity])
+
+    def __setitem__(self, key: Union[int, slice], value) -> None:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                self._assign_rows(range(start, stop, step), list(value))
+                return
+            self._replace(start, max(start, stop), value)
+            return
+        position = key + len(self) if key < 0 else key
+        if not 0 <= position < len(self):
+            raise IndexError("list assignment index out of range")
+        self._replace(position, position + 1, [value])
+
+    def __delitem__(self, key: Union[int, slice]) -> None:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                self._delete_rows(range(start, stop, step))
+                return
+            self._replace(start, max(start, stop), [])
+            return
+        position = key + len(self) if key < 0 else key
+        if not 0 <= position < len(self):
+            raise IndexError("list assignment index out of range")
+        self._replace(position, position + 1, [])
+
+    def pop(self, position: int = -1) -> BaseEntityModel:
+        position = position + len(self) if position < 0 else position
+        entity = self[position]
+        del self[position]
+        return entity
+
+    def remove(self, entity: BaseEntityModel) -> None:
+        del self[self.index(entity)]
+
+    def clear(self) -> None:
+        with self.store.connection as connection:
+            connection.execute(f"DELETE FROM {self._from}")
+        self._size = 0
+        self._reset_index()
+
+    def sort(self, key=None, reverse: bool = False) -> None:
+        """Override. Entities are read into memory, sorted and written back."""
+        entities = list(self)
+        entities.sort(key=key, reverse=reverse)
+        self.clear()
+        self.extend(entities)
+
+    def reverse(self) -> None:
+        with self.store.connection as connection:
+            connection.execute(f"UPDATE {self._from} SET seq = -1 - seq")
+            connection.execute(f"UPDATE {self._from} SET seq = seq + ?", (len(self),))
+        self._reset_index()
+
+    def __imul__(self, value: int):
+        """Override. Rows are copied by the database."""
+        times, size = index(value), self._size
+        if times <= 0:
+            self.clear()
+            return self
+        columns = ", ".join(f'"{name}"' for name in self.model.fields)
+        with self.store.connection as connection:
+            for copy in range(1, times):
+                connection.execute(f"INSERT INTO {self._from} (seq, {columns}) SELECT seq + ?, {columns} FROM {self._from} WHERE seq < ?", (copy * size, size))
+        self._size = size * times
+        self._reset_index()
+        return self
+
+    def __eq__(self, other):
+        """Override. Entities are detached copies, so collections are equal if their entities are equal as dictionaries."""
+        if not isinstance(other, list):
+            return NotImplemented
+        if len(self) != len(other):
+            return False
+        return all(isinstance(entity, BaseEntityModel) and data == entity.to_dict() for data, entity in zip(self.iter_dicts(), other))
+
+    def __ne__(self, other):
+        """Override. See ``__eq__``."""
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def count(self, entity: BaseEntityModel) -> int:
+        """Override. Count entities with the same id, see ``__contains__``."""
+        return self._count("WHERE id = ?", (entity.id,))
+
+    def _assign_rows(self, positions: range, entities: List[Union[BaseEntityModel, Dict]]) -> None:
+        """Private method. Replace rows at given positions (an extended slice) with entities, one entity per position."""
+        if len(entities) != len(positions):
+            raise ValueError(f"attempt to assign sequence of size {len(entities)} to extended slice of size {len(positions)}")
+        assignments = ", ".join(f'"{name}" = ?' for name in self.model.fields)
+        with self.store.connection as connection:
+            connection.executemany(f"UPDATE {self._from} SET {assignments} WHERE seq = ?", (self._row(entity) + (position,) for position, entity in zip(positions, entities)))
+        self._reset_index()
+
+    def _delete_rows(self, positions: range) -> None:
+        """Private method. Delete rows at given positions (an extended slice), shifting positions of following rows."""
+        if not positions:
+            return
+        first, last, step = min(positions), max(positions), abs(positions.step)
+        with self.store.connection as connection:
+            connection.execute(f"DELETE FROM {self._from} WHERE seq >= ? AND seq <= ? AND (seq - ?) % ? = 0", (first, last, first, step))
+            # a row is moved back by the number of deleted rows before it, through negative positions as in _replace
+            connection.execute(
+                f"UPDATE {self._from} SET seq = -1 - (seq - MIN(?, (seq - ? + ? - 1) / ?)) WHERE seq > ?",
+                (len(positions), first, step, step, first),
+            )
+            connection.execute(f"UPDATE {self._from} SET seq = -1 - seq WHERE seq < 0")
+        self._size -= len(positions)
+        self._reset_index()
+
+    def _get_positions(self) -> Dict[int, int]:
+        """Override. Build the id index from the id column, for methods of BaseCollection relying on it."""
+        rows = self.store.connection.execute(f"SELECT id, seq FROM {self._from} ORDER BY seq DESC")
+        # reversed, so that the first entity wins for duplicated ids
+        return dict(rows)
+
+    def _reset_index(self) -> None:
+        """Override. Indexes are maintained by the database."""
+        self.version += 1
+
+    def _on_replace(self, start: int, removed: List, inserted: int) -> None:
+        """Override. Indexes are maintained by the database."""
+        self.version += 1
+
+
+for _name in LIST_READERS:
+    if _name not in vars(Collection): # count and equality are overridden
+        setattr(Collection, _name, reading_entities(_name))
+
+
+class ImageCollection(BaseImageCollection, Collection):
+    """
+    ImageCollection is an ImageCollection keeping images in a SQLite table. See ``Collection``.
+
+    Args:
+        entities (list[dict] | list[Model] | None): entities to insert into the table.
+        dir_path (Optional[str]): a path to directory containing COCO dataset images.
+        store (Optional[Store]): a database keeping the table, None to create a private temporary database.
+        table (Optional[str]): a name of a table persisting in the database, None to create a temporary table.
+    """
+    model = ImageModel
+
+    def __init__(self, entities=None, dir_path: Optional[str] = None, store: Optional[Store] = None, table: Optional[str] = None):
+        self.bind(store, table)
+        super().__init__(entities, dir_path)
+
+    def __call__(self, entities):
+        """Override. Return a collection of the same store."""
+        return ImageCollection(entities, self.repository.dir_path if isinstance(self.repository, ImageRepository) else None, self.store)
+
+
+class AnnotationCollection(BaseAnnotationCollection, Collection):
+    """
+    AnnotationCollection is an AnnotationCollection keeping annotations in a SQLite table, segmentations and bboxes
+    are stored as json. See ``Collection``.
+
+    Args:
+        entities (list[dict] | list[Model] | None): entities to insert into the table.
+        store (Optional[Store]): a database keeping the table, None to create a private temporary database.
+        table (Optional[str]): a name of a table persisting in the database, None to create a temporary table.
+    """
+    model = AnnotationModel
+    json_fields = (SEGMENTATION, BBOX)
+
+    def __init__(self, entities=None, store: Optional[Store] = None, table: Optional[str] = None):
+        self.bind(store, table)
+        super().__init__(entities)
+
+    def __call__(self, entities):
+        """Override. Return a collection of the same store."""
+        return AnnotationCollection(entities, self.store)
+
+    def _ids_at(self, positions: np.ndarray) -> List[int]:
+        """Override. Read ids of rows at ascending positions with the database."""
+        query = f"SELECT id FROM {self._from} WHERE seq IN (SELECT value FROM json_each(?)) ORDER BY seq"
+        return [row[0] for row in self.store.connection.execute(query, (json.dumps(positions.tolist()),))]
+
+    def _read_bboxes(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Override. Read image ids and bbox items with the database, no entities are created."""
+        items = ", ".join(f"json_extract(\"{BBOX}\", '$[{idx}]')" for idx in range(4))
+        rows = self.store.connection.execute(f'SELECT "{IMAGE_ID}", {items} FROM {self._from} ORDER BY seq').fetchall()
+        bboxes = np.array([row[1:] for row in rows], np.float64).reshape(-1, 4)
+        return _image_id_array([row[0] for row in rows]), bboxes
+
+
+class CategoryCollection(BaseCategoryCollection, Collection):
+    """
+    CategoryCollection is a CategoryCollection keeping categories in a SQLite table. See ``Collection``.
+
+    Args:
+        entities (list[dict] | list[Model] | None): entities to insert into the table.
+        store (Optional[Store]): a database keeping the table, None to create a private temporary database.
+        table (Optional[str]): a name of a table persisting in the database, None to create a temporary table.
+    """
+    model = CategoryModel
+
+    def __init__(self, entities=None, store: Optional[Store] = None, table: Optional[str] = None):
+        self.bind(store, table)
+        super().__init__(entities)
+
+    def __call__(self, entities):
+        """Override. Return a collection of the same store."""
+        return CategoryCollection(entities, self.store)
+
+
+class LicenseCollection(BaseLicenseCollection, Collection):
+    """
+    LicenseCollection is a LicenseCollection keeping licenses in a SQLite table. See ``Collection``.
+
+    Args:
+        entities (list[dict] | list[Model] | None): entities to insert into the table.
+        store (Optional[Store]): a database keeping the table, None to create a private temporary database.
+        table (Optional[str]): a name of a table persisting in the database, None to create a temporary table.
+    """
+    model = LicenseModel
+
+    def __init__(self, entities=None, store: Optional[Store] = None, table: Optional[str] = None):
+        self.bind(store, table)
+        super().__init__(entities)
+
+    def __call__(self, entities):
+        """Override. Return a collection of the same store."""
+        return LicenseCollection(entities, self.store)
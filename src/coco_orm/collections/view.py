@@ -0,0 +1,224 @@
+from typing import Hashable, Iterable, Iterator, List, Optional, Union
+from functools import lru_cache
+import weakref
+
+import numpy as np
+
+from ..models.core import BaseEntityModel
+from .indexes import INDEX_SELECTIVITY
+
+"""Instance attributes of a collection that hold its entities or depend on them, they are not shared with its views."""
+_OWN_ATTRIBUTES = frozenset(("columns", "version", "journal", "journal_key", "filter_cache"))
+
+"""Methods changing a collection. A view is materialized before any of them is called."""
+_MUTATIONS = (
+    "append", "update", "delete", "extend", "__iadd__", "__imul__", "insert",
+    "__setitem__", "__delitem__", "pop", "remove", "clear", "sort", "reverse",
+)
+
+"""Methods of list reading its storage besides item access, iteration and search. Views and collections keeping
+entities elsewhere (columnar, SQL) leave the storage empty, so these methods are called with a list of their entities.
+``__radd__`` is not a list method: a list subclass defining it is added to a list by it instead of ``list.__add__``."""
+LIST_READERS = (
+    "copy", "count", "__add__", "__radd__", "__mul__", "__rmul__",
+    "__eq__", "__ne__", "__lt__", "__le__", "__gt__", "__ge__",
+)
+
+
+class View():
+    """
+    View is a mixin turning a collection into a zero-copy view of entities of another (parent) collection, selected
+    by an array of positions. ``BaseCollection.filter`` returns views: entities are not copied, the view reads them
+    from the parent. A view is an instance of the parent collection class (see ``view_class``), so it keeps the whole API
+    of the collection; filtering a view composes positions, so views never nest.
+
+    A view is materialized, i.e. becomes a regular collection holding a copy of its entities, when it is changed,
+    when the parent is about to change, or when the collection needs its storage (e.g. columnar annotations are saved).
+    Entities changed in place are shared with the parent, as they are by copied collections of entities;
+    changes of columnar annotation views are written to the parent columns.
+
+    Attributes:
+        positions (Optional[np.ndarray]): positions of entities in the parent collection, None once the view is materialized.
+    """
+    _parent = None # the parent collection, None once the view is materialized
+    positions = None # type: Optional[np.ndarray]
+
+    @staticmethod
+    def of(collection, positions: np.ndarray):
+        """
+        Create a view of entities of a collection.
+
+        Args:
+            collection (BaseCollection): a parent collection, a view is composed with its parent.
+            positions (np.ndarray): positions of entities in the collection.
+
+        Returns:
+            BaseCollection: a view, an instance of a subclass of the collection class.
+        """
+        if isinstance(collection, View) and collection._parent is not None:
+            collection, positions = collection._parent, collection.positions[positions]
+        view = list.__new__(view_class(type(collection)))
+        for name, value in vars(collection).items():
+            if not name.startswith("_") and name not in _OWN_ATTRIBUTES:
+                setattr(view, name, value)
+        view._parent = collection
+        view.positions = positions
+        if collection._views is None:
+            collection._views = weakref.WeakValueDictionary()
+        collection._views[id(view)] = view
+        return view
+
+    def materialize(self) -> None:
+        """Copy entities of the view from the parent collection, the view becomes a regular collection."""
+        parent, positions = self._parent, self.positions
+        if parent is None:
+            return
+        self._parent = self.positions = None
+        parent._views.pop(id(self), None)
+        self._fill(parent, positions)
+
+    def __getattr__(self, name: str):
+        # attributes holding entities of the parent (e.g. columns) are created by materializing
+        parent = self._parent
+        if parent is None or name not in vars(parent):
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        self.materialize()
+        return getattr(self, name)
+
+    def __len__(self):
+        return super().__len__() if self._parent is None else len(self.positions)
+
+    def __iter__(self) -> Iterator[BaseEntityModel]:
+        if self._parent is None:
+            return super().__iter__()
+        return self._parent._entities_at(self.positions)
+
+    def __reversed__(self) -> Iterator[BaseEntityModel]:
+        if self._parent is None:
+            return super().__reversed__()
+        return self._parent._entities_at(self.positions[::-1])
+
+    def __getitem__(self, key: Union[int, slice]):
+        if self._parent is None:
+            return super().__getitem__(key)
+        if isinstance(key, slice):
+            return list(self._parent._entities_at(self.positions[key]))
+        return self._parent._entity_at(int(self.positions[key]))
+
+    def __contains__(self, entity: BaseEntityModel) -> bool:
+        if self._parent is None or not self._is_list_method("__contains__"):
+            return super().__contains__(entity)
+        return any(item is entity or item == entity for item in self)
+
+    def __repr__(self):
+        return super().__repr__() if self._parent is None else repr(list(self))
+
+    def index(self, entity: BaseEntityModel, *args) -> int:
+        if self._parent is None or not self._is_list_method("index"):
+            return super().index(entity, *args)
+        return list(self).index(entity, *args)
+
+    def column(self, name: str) -> np.ndarray:
+        """Override. Get values of a column at positions of the view, a copy of the parent column values."""
+        if self._parent is None:
+            return super().column(name)
+        return self._parent.column(name)[self.positions]
+
+    def take(self, positions: np.ndarray):
+        """Override. Copy entities of the parent at given positions of the view."""
+        if self._parent is None:
+            return super().take(positions)
+        return self._parent.take(self.positions[positions])
+
+    def lookup(self, attr_name: str, values: Iterable[Hashable], selectivity: float = INDEX_SELECTIVITY) -> Optional[List[BaseEntityModel]]:
+        """Override. Views are not indexed, filters check their entities one by one."""
+        if self._parent is None:
+            return super().lookup(attr_name, values, selectivity)
+        return None
+
+    def _entity_at(self, position: int) -> BaseEntityModel:
+        if self._parent is None:
+            return super()._entity_at(position)
+        return self._parent._entity_at(int(self.positions[position]))
+
+    def _entities_at(self, positions: np.ndarray) -> Iterator[BaseEntityModel]:
+        if self._parent is None:
+            return super()._entities_at(positions)
+        return self._parent._entities_at(self.positions[positions])
+
+    def _take(self, positions: np.ndarray) -> None:
+        """Override. Keeping entities of a view composes positions, the parent is not changed."""
+        if self._parent is None:
+            return super()._take(positions)
+        self.positions = self.positions[positions]
+        self._reset_index()
+
+    def _is_list_method(self, name: str) -> bool:
+        """Private method. Check whether the collection class inherits a method reading the list storage, which a view leaves empty."""
+        return getattr(type(self).__bases__[1], name, None) is getattr(list, name, None)
+
+
+def _materializing(name: str):
+    """Private function. Build a View method materializing the view before calling the collection method."""
+    def method(self, *args, **kwargs):
+        self.materialize()
+        return getattr(super(View, self), name)(*args, **kwargs)
+    method.__name__ = name
+    method.__doc__ = f"Override. Materialize the view before calling ``{name}``."
+    return method
+
+
+def reading_entities(name: str):
+    """
+    Build a method calling a list method with a list of entities of a collection instead of its storage,
+    other collections passed as arguments are converted to lists of their entities as well.
+
+    Args:
+        name (str): a name of a list method, see ``LIST_READERS``.
+
+    Returns:
+        Callable: a method.
+    """
+    def method(self, *args):
+        args = [list(arg) if isinstance(arg, list) else arg for arg in args]
+        if name == "__radd__":
+            return args[0] + list(self) if isinstance(args[0], list) else NotImplemented
+        return getattr(list, name)(list(self), *args)
+    method.__name__ = name
+    method.__doc__ = f"Override. Apply ``{name}`` of list to a list of entities, the list storage is not used."
+    return method
+
+
+def _reading(name: str):
+    """Private function. Build a View method reading entities of the parent, unless the collection class overrides the list method."""
+    reading = reading_entities(name)
+    def method(self, *args):
+        if self._parent is None or not self._is_list_method(name):
+            return getattr(super(View, self), name)(*args)
+        return reading(self, *args)
+    method.__name__ = name
+    method.__doc__ = f"Override. Apply ``{name}`` of list to a list of entities of the view."
+    return method
+
+
+for _name in _MUTATIONS:
+    setattr(View, _name, _materializing(_name))
+
+for _name in LIST_READERS:
+    setattr(View, _name, _reading(_name))
+
+
+@lru_cache(maxsize=None)
+def view_class(collection_class: type) -> type:
+    """
+    Get a class of views of a collection class: a subclass of the collection class with the View mixin.
+
+    Args:
+        collection_class (type): a collection class.
+
+    Returns:
+        type: a view class.
+    """
+    if issubclass(collection_class, View):
+        return collection_class
+    return type(f"{collection_class.__name__}View", (View, collection_class), {"__module__": collection_class.__module__})
@@ -0,0 +1,157 @@
+from typing import Dict, Optional, Any, Iterable, Tuple
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from .utils import open_atomic
+from .streaming import write_json_items
+from ..collections.columnar import Columns
+
+"""A version of the cache layout. Caches of other versions are rebuilt."""
+CACHE_VERSION = 1
+
+"""A suffix of a cache directory, created next to the json file."""
+CACHE_SUFFIX = ".cache"
+
+"""Names of files in a cache directory."""
+MANIFEST = "manifest.json"
+ENTITIES = "entities.json"
+OBJECTS = "segmentation_objects.json"
+
+"""A number of bytes read at once while hashing a file."""
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def cache_dir_path(filepath: str) -> str:
+    """
+    Get a path to the cache directory of a json file.
+
+    Args:
+        filepath (str): path to the json file.
+
+    Returns:
+        str: path to the cache directory.
+    """
+    return filepath + CACHE_SUFFIX
+
+
+def hash_file(filepath: str) -> str:
+    """
+    Hash a file.
+
+    Args:
+        filepath (str): path to the file.
+
+    Returns:
+        str: a hex digest of the file content.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_key(filepath: str) -> Dict[str, Any]:
+    """
+    Get a key identifying a version of a file.
+
+    Args:
+        filepath (str): path to the file.
+
+    Returns:
+        dict: a cache version, the file size, mtime and content hash.
+    """
+    stat = os.stat(filepath)
+    return {
+        "version": CACHE_VERSION,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "hash": hash_file(filepath),
+    }
+
+
+def is_fresh(filepath: str, manifest: Dict[str, Any]) -> bool:
+    """
+    Check whether a cache built with a manifest matches the current version of a json file.
+    A file of the same size and mtime is not hashed again. If only the mtime has changed, the file is hashed:
+    the cache is still fresh if the content is the same, and its manifest is updated.
+
+    Args:
+        filepath (str): path to the json file.
+        manifest (dict): a manifest of the cache, see ``file_key``.
+
+    Returns:
+        bool: True if the cache can be used.
+    """
+    stat = os.stat(filepath)
+    if manifest.get("version") != CACHE_VERSION or manifest.get("size") != stat.st_size:
+        return False
+    if manifest.get("mtime_ns") == stat.st_mtime_ns:
+        return True
+    key = file_key(filepath)
+    if key["hash"] != manifest.get("hash"):
+        return False
+    with open_atomic(os.path.join(cache_dir_path(filepath), MANIFEST)) as f:
+        json.dump(dict(manifest, **key), f)
+    return True
+
+
+def read_cache(filepath: str, mmap_mode: Optional[str] = "c") -> Optional[Tuple[Dict[str, Any], Columns]]:
+    """
+    Read the cache of a json file.
+    Annotation arrays are memory-mapped: they are read from disk on access, and their pages are shared by processes
+    through the page cache. Changes of mapped arrays stay in memory of the process (copy-on-write, ``mmap_mode="c"``).
+
+    Args:
+        filepath (str): path to the json file.
+        mmap_mode (Optional[str]): a memory-mapping mode, see ``numpy.load``. None to read arrays into memory.
+
+    Returns:
+        Optional[tuple[dict, Columns]]: dataset items other than annotations and annotation columns, None if there is no fresh cache.
+    """
+    dir_path = cache_dir_path(filepath)
+    try:
+        with open(os.path.join(dir_path, MANIFEST)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not is_fresh(filepath, manifest):
+        return None
+    with open(os.path.join(dir_path, ENTITIES), encoding='utf-8') as f:
+        data = json.load(f)
+    with open(os.path.join(dir_path, OBJECTS), encoding='utf-8') as f:
+        objects = json.load(f)
+    arrays = {name: np.load(os.path.join(dir_path, name + ".npy"), mmap_mode=mmap_mode) for name in manifest["arrays"]}
+    return data, Columns.from_arrays(arrays, dict(zip(objects["rows"], objects["values"])))
+
+
+def write_cache(filepath: str, key: Dict[str, Any], columns: Columns, items: Iterable[Tuple[str, Any]]) -> None:
+    """
+    Write the cache of a json file.
+    Every file is replaced atomically, the manifest is removed first and written last, so a cache is never read
+    while it is being written. Processes having the previous cache mapped keep reading the previous files.
+
+    Args:
+        filepath (str): path to the json file.
+        key (dict): a key of the json file version the dataset has been read from, see ``file_key``.
+        columns (Columns): annotation columns.
+        items (Iterable[tuple[str, mixed]]): other dataset items, see ``coco_orm.dataset.core.CocoDataset.iter_items``.
+    """
+    dir_path = cache_dir_path(filepath)
+    os.makedirs(dir_path, exist_ok=True)
+    manifest_filepath = os.path.join(dir_path, MANIFEST)
+    if os.path.exists(manifest_filepath): os.remove(manifest_filepath)
+    arrays = columns.arrays()
+    for name, array in arrays.items():
+        with open_atomic(os.path.join(dir_path, name + ".npy"), binary=True) as f:
+            np.save(f, np.ascontiguousarray(array), allow_pickle=False)
+    objects = columns.objects()
+    with open_atomic(os.path.join(dir_path, OBJECTS)) as f:
+        json.dump({"rows": list(objects), "values": list(objects.values())}, f)
+    with open_atomic(os.path.join(dir_path, ENTITIES)) as f:
+        write_json_items(f, items)
+    with open_atomic(manifest_filepath) as f:
+        json.dump(dict(key, arrays=list(arrays)), f)
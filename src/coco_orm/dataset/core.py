@@ -1,10 +1,34 @@
-from typing import List, Dict, Optional, Union
-from .utils import write_json_file, read_json_file, is_url, is_file_exists, download
+from typing import List, Dict, Optional, Union, Iterable, Iterator, Tuple, Any, TextIO
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, repeat
+import json
+import os
+
+import numpy as np
+
+from .utils import open_atomic, open_file, read_json_file, is_url, is_file_exists
+from .remote import download, open_url, DOWNLOAD_CACHE_DIR
+from .relationships import Relationships
+from .join import semi_join
+from .streaming import iter_json_items, index_json_items, write_json_items
+from .cache import read_cache, write_cache, file_key
+from .lazy import Lazy, LazyRange, LazyAttribute, file_version
+from .shards import is_sharded, read_manifest, shard_filepaths, write_shards
+from .journal import Journal
+from ..models.core import ID
 from ..models.info import Model as InfoModel, Factory as InfoFactory
+from ..models.image import Model as ImageModel, Factory as ImageFactory, LICENSE
+from ..models.annotation import Model as AnnotationModel, Factory as AnnotationFactory, IMAGE_ID, CATEGORY_ID
+from ..models.category import Model as CategoryModel, Factory as CategoryFactory
+from ..models.license import Factory as LicenseFactory
 from ..collections.image import Collection as ImageCollection
 from ..collections.annotation import Collection as AnnotationCollection
 from ..collections.category import Collection as CategoryCollection
 from ..collections.license import Collection as LicenseCollection
+from ..collections.columnar import Collection as ColumnarAnnotationCollection, Columns
+from ..collections.core import BaseCollection
+from ..collections.parallel import parse_entities, encode_columns
+from ..collections.sqlite import Store, SQL_BATCH_SIZE, MAIN, ImageCollection as SqlImageCollection, AnnotationCollection as SqlAnnotationCollection, CategoryCollection as SqlCategoryCollection, LicenseCollection as SqlLicenseCollection
 from ..filters.image import Filters as ImageFilters
 from ..filters.annotation import Filters as AnnotationFilters
 from ..filters.category import Filters as CategoryFilters
@@ -17,6 +41,16 @@ ANNOTATIONS = "annotations"
 CATEGORIES = "categories"
 LICENSES = "licenses"
 
+"""Metadata keys of a SQLite store: the json file collections have been imported from, and the dataset info."""
+SQL_SOURCE = "source"
+SQL_INFO = "info"
+
+"""A number of annotations encoded into columns at once by the streaming loader."""
+COLUMNAR_BATCH_SIZE = 10000
+
+"""Factories of entities read by the streaming loader, by dictionary keys."""
+_entity_factories = {IMAGES: ImageFactory, ANNOTATIONS: AnnotationFactory, CATEGORIES: CategoryFactory, LICENSES: LicenseFactory}
+
 class CocoDataset():
     """
     COCO image object-oriented model.
@@ -28,14 +62,26 @@ class CocoDataset():
         category (CategoryCollection): an instance of CategoryCollection clas
         license (Optional[LicenseCollection]): an instance of LicenseCollection class
         info (Optional[InfoModel]): an instance of InfoModel class
+
+    Collections may be given as ``Lazy`` instances holding raw records: such collections are built on first access.
+    See ``Factory.from_collections``.
+
+    Attributes:
+        journal (Optional[Journal]): a journal recording changes of collections, see ``Factory.with_journal``.
     """
+    images = LazyAttribute()
+    annotations = LazyAttribute()
+    categories = LazyAttribute()
+    licenses = LazyAttribute()
+    journal = None # type: Optional[Journal]
+
     def __init__(
         self,
         filepath: str,
-        images: ImageCollection,
-        annotations: AnnotationCollection,
-        categories: CategoryCollection,
-        licenses: Optional[LicenseCollection] = None,
+        images: Union[ImageCollection, Lazy],
+        annotations: Union[AnnotationCollection, Lazy],
+        categories: Union[CategoryCollection, Lazy],
+        licenses: Union[LicenseCollection, Lazy, None] = None,
         info: Optional[InfoModel] = None,
     ):
         self.filepath = filepath
@@ -43,25 +89,110 @@ class CocoDataset():
         self.images = images
         self.annotations = annotations
         self.categories = categories
-        self.licenses = licenses if licenses else LicenseCollection
+        self.licenses = licenses if licenses is not None else LicenseCollection([])
+        self._relationships = Relationships()
+
+    def annotations_of(self, image_id: int) -> List[AnnotationModel]:
+        """
+        Get annotations of an image.
+
+        Args:
+            image_id (int): an image id.
+
+        Returns:
+            list[AnnotationModel]: a list of annotations, an empty list if none found.
+        """
+        return list(self.annotations.get_index(IMAGE_ID).get(image_id))
+
+    def annotations_with(self, category_id: int) -> List[AnnotationModel]:
+        """
+        Get annotations of a category.
+
+        Args:
+            category_id (int): a category id.
+
+        Returns:
+            list[AnnotationModel]: a list of annotations, an empty list if none found.
+        """
+        return list(self.annotations.get_index(CATEGORY_ID).get(category_id))
+
+    def images_with(self, category_id: int) -> List[ImageModel]:
+        """
+        Get images containing annotations of a category.
+
+        Args:
+            category_id (int): a category id.
+
+        Returns:
+            list[ImageModel]: a list of images, an empty list if none found.
+        """
+        image_ids = self._relationships.image_ids_by_category(self.annotations).get(category_id, [])
+        images = (self.images.get_by(ID, image_id) for image_id in image_ids)
+        return [image for image in images if image is not None]
+
+    def images_under(self, license_id: int) -> List[ImageModel]:
+        """
+        Get images distributed under a license.
+
+        Args:
+            license_id (int): a license id.
+
+        Returns:
+            list[ImageModel]: a list of images, an empty list if none found.
+        """
+        return list(self.images.get_index(LICENSE).get(license_id))
+
+    def categories_of(self, image_id: int) -> List[CategoryModel]:
+        """
+        Get categories of annotations of an image.
+
+        Args:
+            image_id (int): an image id.
+
+        Returns:
+            list[CategoryModel]: a list of unique categories in order of appearance, an empty list if none found.
+        """
+        category_ids = dict.fromkeys(annotation.category_id for annotation in self.annotations.get_index(IMAGE_ID).get(image_id))
+        categories = (self.categories.get_by(ID, category_id) for category_id in category_ids)
+        return [category for category in categories if category is not None]
 
-    def to_dict(self):
+    def to_dict(self, drop_none: bool = False):
         """
         Transform class object to dictionary.
 
+        Args:
+            drop_none (bool), default = False: leave out keys of None values of entities and info.
+
         Returns:
             dict: a dictionary containing COCO dataset.
         """
         return {
-            INFO: self.info.to_dict(),
-            IMAGES: self.images.to_dict(),
-            ANNOTATIONS: self.annotations.to_dict(),
-            CATEGORIES: self.categories.to_dict(),
-            LICENSES: self._handle_licenses(),
+            INFO: self.info.to_dict(drop_none),
+            IMAGES: self.images.to_dict(drop_none),
+            ANNOTATIONS: self.annotations.to_dict(drop_none),
+            CATEGORIES: self.categories.to_dict(drop_none),
+            LICENSES: self._handle_licenses(drop_none),
         }
     
-    def _handle_licenses(self):
-        try: return self.licenses.to_dict()
+    def iter_items(self, drop_none: bool = False) -> Iterator[Tuple[str, Any]]:
+        """
+        Iterate over items of the dictionarized representation of the dataset.
+        Collections are given as iterators of entity dictionaries, building each dictionary only when it is reached.
+
+        Args:
+            drop_none (bool), default = False: leave out keys of None values of entities and info.
+
+        Returns:
+            Iterator[tuple[str, mixed]]: pairs of a key and a value, in the order of ``to_dict`` keys.
+        """
+        yield INFO, self.info.to_dict(drop_none)
+        yield IMAGES, self.images.iter_dicts(drop_none)
+        yield ANNOTATIONS, self.annotations.iter_dicts(drop_none)
+        yield CATEGORIES, self.categories.iter_dicts(drop_none)
+        yield LICENSES, iter(self._handle_licenses(drop_none))
+
+    def _handle_licenses(self, drop_none: bool = False):
+        try: return self.licenses.to_dict(drop_none)
         except: return []
 
     def __str__(self):
@@ -73,21 +204,89 @@ class CocoDataset():
         """
         return f'{self.to_dict()}'
 
-    def save(self, filepath: str = None, images_dir_path: str = None) -> None:
+    def save(self, filepath: str = None, images_dir_path: str = None, indent: Optional[int] = 4, drop_none: bool = False) -> None:
         """
         Save COCO dataset in .json file.
+        Entities are written one by one into a temporary file, which replaces the json file once it is complete.
+        See ``coco_orm.dataset.streaming.write_json_items``. Saving to the file of a journaled dataset empties its journal.
 
         Args:
             filepath (str): path to the json file to store COCO dataset.
             images_dir_path(Optional[str]): path to yhe directory containing dataset images.
+            indent (Optional[int]), default = 4: a number of spaces to indent the json with, None to write compact json.
+            drop_none (bool), default = False: leave out keys of None values, e.g. missing image urls, to write smaller files.
         """
-        write_json_file(self.to_dict(), filepath if filepath else self.filepath)
+        with open_atomic(filepath if filepath else self.filepath) as f:
+            write_json_items(f, self.iter_items(drop_none), indent)
+        if self.journal is not None and os.path.abspath(filepath or self.filepath) == os.path.abspath(self.journal.filepath):
+            self.journal.reset()
         if images_dir_path:
             self.images.copy_to_dir(images_dir_path)
-            
+
+    def compact(self, indent: Optional[int] = 4) -> None:
+        """
+        Write the dataset into its json file and empty its journal, see ``Factory.with_journal``.
+
+        Args:
+            indent (Optional[int]), default = 4: a number of spaces to indent the json with, None to write compact json.
+        """
+        self.save(indent=indent)
+
+    def shard(self, num_shards: int) -> List["CocoDataset"]:
+        """
+        Split the dataset into datasets of disjoint parts of images: an image (and its annotations) goes to shard
+        ``image_id % num_shards``. Every shard holds all categories, licenses and info.
+        Shards share entities with the dataset, columnar annotations are copied.
+
+        Args:
+            num_shards (int): a number of shards.
+
+        Raises:
+            Exception: if the number of shards is less than 1.
+
+        Returns:
+            list[CocoDataset]: datasets of the shards.
+        """
+        if num_shards < 1:
+            raise Exception(f"A dataset is split into at least 1 shard, got {num_shards}.")
+        image_shards = np.fromiter((image.id for image in self.images), np.int64, len(self.images)) % num_shards
+        if isinstance(self.annotations, ColumnarAnnotationCollection):
+            annotation_shards = self.annotations.column(IMAGE_ID) % num_shards
+            annotations = [self.annotations.take(np.flatnonzero(annotation_shards == index)) for index in range(num_shards)]
+        else:
+            annotation_shards = np.fromiter((annotation.image_id for annotation in self.annotations), np.int64, len(self.annotations)) % num_shards
+            annotations = [self.annotations([self.annotations[position] for position in np.flatnonzero(annotation_shards == index).tolist()]) for index in range(num_shards)]
+        return [
+            CocoDataset(
+                self.filepath,
+                self.images([self.images[position] for position in np.flatnonzero(image_shards == index).tolist()]),
+                annotations[index],
+                self.categories,
+                self.licenses,
+                self.info
+            )
+            for index in range(num_shards)
+        ]
+
+    def save_shards(self, dir_path: str, num_shards: int, indent: Optional[int] = None) -> None:
+        """
+        Save COCO dataset as a sharded dataset: a directory of ``num_shards`` json files and a manifest,
+        which can be loaded in parallel. See ``shard`` and ``coco_orm.dataset.shards.write_shards``.
+
+        Args:
+            dir_path (str): path to the directory to store the dataset.
+            num_shards (int): a number of shard files.
+            indent (Optional[int]), default = None: a number of spaces to indent the json with, None to write compact json.
+
+        Raises:
+            Exception: if the number of shards is less than 1, the directory is not changed.
+        """
+        write_shards(dir_path, self.shard(num_shards), indent)
+
     def filter(self, image_filters: ImageFilters, annotation_filters: AnnotationFilters, category_filters: CategoryFilters, license_filters: Optional[LicenseFilters] = None, images_dir_path: Optional[str] = None, inplace: bool = False):
         """
         Applies filters to the dataset.
+        Filtered collections are narrowed down to a consistent subset by semi-joins, see ``coco_orm.dataset.join.semi_join``.
 
         Args:
             image_filters (ImageFilters): filters for image collection.
@@ -104,18 +303,29 @@ class CocoDataset():
         filtered_images = self.images.filter(image_filters, inplace) # type: ImageCollection
         filtered_categories = self.categories.filter(category_filters, inplace) # type: CategoryCollection
         filtered_licenses = self.licenses.filter(license_filters, inplace) if license_filters else None
-        # apply intersection filters
-        filtered_annotations = self.annotations.filter(annotation_filters.intersection(filtered_images, filtered_categories, filtered_licenses), inplace)
-        filtered_categories = filtered_categories.filter(filtered_categories.filters_builder().intersection(filtered_annotations), inplace)
-        filtered_images = filtered_images.filter(filtered_images.filters_builder().intersection(filtered_annotations), inplace)
-        filtered_licenses = filtered_licenses.filter(filtered_licenses.filters_builder().intersection(filtered_images), inplace) if license_filters else None
+        if isinstance(self.annotations, SqlAnnotationCollection):
+            # apply intersection filters to the filtered annotations, evaluated by the database; appended to the user chain,
+            # the intersection would change it and be bound to its last OR alternative only
+            filtered_annotations = self.annotations.filter(annotation_filters, inplace)
+            filtered_annotations = filtered_annotations.filter(
+                filtered_annotations.filters_builder().intersection(filtered_images, filtered_categories, filtered_licenses), inplace
+            )
+            filtered_categories = filtered_categories.filter(filtered_categories.filters_builder().intersection(filtered_annotations), inplace)
+            filtered_images = filtered_images.filter(filtered_images.filters_builder().intersection(filtered_annotations), inplace)
+            filtered_licenses = filtered_licenses.filter(filtered_licenses.filters_builder().intersection(filtered_images), inplace) if license_filters else None
+        else:
+            # narrow filtered collections down to a consistent subset
+            filtered_annotations = self.annotations.filter(annotation_filters, inplace)
+            filtered_images, filtered_annotations, filtered_categories, filtered_licenses = semi_join(
+                filtered_images, filtered_annotations, filtered_categories, filtered_licenses, inplace
+            )
         dataset = CocoDataset(
+            self.filepath,
             filtered_images,
             filtered_annotations,
             filtered_categories,
-            filtered_licenses if filtered_licenses else self.licenses,
-            self.info,
-            images_dir_path if images_dir_path else self.images.repository.dir_path
+            filtered_licenses if filtered_licenses is not None else self.licenses,
+            self.info
         )
         if images_dir_path: dataset.images.copy_to_dir(images_dir_path)
         if inplace: self = dataset
@@ -124,42 +334,109 @@ class CocoDataset():
 
     
 class Factory():
-    def __new__(cls, annotations_filepath: str, images_dir_path: Optional[str] = None) -> CocoDataset:
+    def __new__(
+        cls,
+        annotations_filepath: str,
+        images_dir_path: Optional[str] = None,
+        columnar: bool = False,
+        streaming: bool = False,
+        cache: bool = False,
+        lazy: bool = False,
+        download_dir: Optional[str] = DOWNLOAD_CACHE_DIR,
+        journal: bool = False,
+        sqlite: Optional[str] = None,
+        processes: Optional[int] = 1
+    ) -> CocoDataset:
         """
         Static method. Returns a new object of the class while being instantiated.
 
         Args:
             annotations_filepath (str): path to the json file containing (or will containt) COCO dataset.
             images_dir_path(Optional[str]): path to yhe directory containing dataset images.
+            columnar (bool): store annotations in NumPy arrays. See ``coco_orm.collections.columnar.Collection``.
+            streaming (bool): read a local file entity by entity, see ``from_file``.
+            cache (bool): reuse a binary cache of a local file, see ``from_cache``. Annotations of cached datasets are columnar.
+            lazy (bool): build collections on first access, see ``from_collections`` and ``from_file``.
+                Options other than ``columnar`` don't apply to sharded datasets, see ``from_shards``.
+            download_dir (Optional[str]): a directory keeping files downloaded from urls, see ``coco_orm.dataset.remote.download``.
+                Downloaded files are read as local files. None to parse responses as they are received, without storing them.
+            journal (bool): replay the journal of a local json file and record further changes to it, see ``with_journal``.
+            sqlite (Optional[str]): path to a SQLite database keeping collections out of memory, see ``from_sqlite``.
+                Options other than ``images_dir_path`` don't apply to such datasets.
+            processes (Optional[int]), default = 1: a number of worker processes converting images and annotations of a
+                local json file loaded as a whole, None for the number of CPUs. See ``from_collections``.
+
+        Raises:
+            Exception: if a journal is requested for a url, a sharded dataset or a SQLite database.
 
         Returns:
             CocoDataset: a new instance of CocoDataset class.
         """
-        if is_url(annotations_filepath): 
-            return Factory.from_dict(annotations_filepath, download(annotations_filepath), images_dir_path)
+        if journal:
+            if is_url(annotations_filepath) or is_sharded(annotations_filepath) or sqlite is not None:
+                raise Exception(f"Journals are supported by datasets of local json files, {annotations_filepath} is not one.")
+            return Factory.with_journal(Factory(annotations_filepath, images_dir_path, columnar, streaming, cache, lazy, processes=processes))
+        if is_url(annotations_filepath):
+            return Factory.from_url(annotations_filepath, images_dir_path, columnar, streaming, cache, lazy, download_dir)
+        if is_sharded(annotations_filepath):
+            return Factory.from_shards(annotations_filepath, images_dir_path, columnar)
+        if sqlite is not None:
+            return Factory.from_sqlite(annotations_filepath, sqlite, images_dir_path)
         if is_file_exists(annotations_filepath):
-            return Factory.from_dict(annotations_filepath, read_json_file(annotations_filepath), images_dir_path)
-        return Factory.new(annotations_filepath, images_dir_path)
+            if cache:
+                return Factory.from_cache(annotations_filepath, images_dir_path, streaming, lazy)
+            if streaming:
+                return Factory.from_file(annotations_filepath, images_dir_path, columnar, lazy)
+            return Factory.from_dict(annotations_filepath, read_json_file(annotations_filepath), images_dir_path, columnar, lazy, processes)
+        return Factory.new(annotations_filepath, images_dir_path, columnar)
 
     @staticmethod
-    def new(filepath: str, images_dir_path: Optional[str] = None) -> CocoDataset:
+    def with_journal(dataset: CocoDataset, sync: bool = False) -> CocoDataset:
+        """
+        Static method.
+        Replays the journal of a dataset json file over the dataset, and makes the dataset record further ``append``,
+        ``update`` and ``delete`` calls of its collections to the journal instead of rewriting the json file.
+        ``CocoDataset.compact`` (or ``save`` to the same file) writes the json file and empties the journal.
+        See ``coco_orm.dataset.journal.Journal``.
+
+        Args:
+            dataset (CocoDataset): a dataset read from its json file.
+            sync (bool): fsync the journal after every change.
+
+        Returns:
+            CocoDataset: the dataset.
+        """
+        journal = Journal(dataset.filepath, sync)
+        keys = (IMAGES, ANNOTATIONS, CATEGORIES, LICENSES)
+        collections = {key: getattr(CocoDataset, key).peek(dataset) for key in keys}
+        journal.replay(collections)
+        for key in keys:
+            setattr(dataset, key, collections[key])
+        dataset.journal = journal
+        return dataset
+
+    @staticmethod
+    def new(filepath: str, images_dir_path: Optional[str] = None, columnar: bool = False) -> CocoDataset:
         return CocoDataset(
             filepath, 
             ImageCollection([], images_dir_path), 
-            AnnotationCollection([]), 
+            ColumnarAnnotationCollection([]) if columnar else AnnotationCollection([]), 
             CategoryCollection([]), 
             LicenseCollection([]), 
             InfoFactory()
         )
 
     @staticmethod
-    def from_dict(filepath: str, data: Dict, images_dir_path: Optional[str] = None) -> CocoDataset:
+    def from_dict(filepath: str, data: Dict, images_dir_path: Optional[str] = None, columnar: bool = False, lazy: bool = False, processes: Optional[int] = 1) -> CocoDataset:
         """
         Static method.
         Builds an object-oriented COCO dataset model from dictionary data.
 
         Args:
             data: (dict): a dictionary containing COCO dataset.
+            columnar (bool): store annotations in NumPy arrays.
+            lazy (bool): build collections on first access.
+            processes (Optional[int]): a number of worker processes converting images and annotations, see ``from_collections``.
 
         Returns:
             CocoDataset: an instance of CocoDataset class.
@@ -171,9 +448,263 @@ class Factory():
             categories = data[CATEGORIES],
             licenses = data[LICENSES] if LICENSES in data else None,
             info = data[INFO] if INFO in data else None,
-            images_dir_path = images_dir_path
+            images_dir_path = images_dir_path,
+            columnar = columnar,
+            lazy = lazy,
+            processes = processes
         )
     
+    @staticmethod
+    def from_url(
+        url: str,
+        images_dir_path: Optional[str] = None,
+        columnar: bool = False,
+        streaming: bool = False,
+        cache: bool = False,
+        lazy: bool = False,
+        download_dir: Optional[str] = DOWNLOAD_CACHE_DIR
+    ) -> CocoDataset:
+        """
+        Static method.
+        Builds an object-oriented COCO dataset model from a json file available by a url.
+        The file is downloaded into ``download_dir`` (or revalidated there) and read like a local file, see ``__new__``.
+        Without a download directory the response is parsed as it is received, and ``cache`` and ``lazy`` (with ``streaming``)
+        are not applicable.
+
+        Args:
+            url (str): a url of the json file containing COCO dataset.
+            download_dir (Optional[str]): a directory keeping downloaded files, None to parse the response without storing it.
+
+        Returns:
+            CocoDataset: an instance of CocoDataset class, its filepath is the url.
+        """
+        if download_dir is None:
+            with open_url(url) as f:
+                if streaming:
+                    return Factory.from_stream(url, f, images_dir_path, columnar)
+                return Factory.from_dict(url, json.load(f), images_dir_path, columnar, lazy)
+        dataset = Factory(download(url, download_dir), images_dir_path, columnar, streaming, cache, lazy)
+        dataset.filepath = url
+        return dataset
+
+    @staticmethod
+    def from_file(filepath: str, images_dir_path: Optional[str] = None, columnar: bool = False, lazy: bool = False) -> CocoDataset:
+        """
+        Static method.
+        Builds an object-oriented COCO dataset model from a json file, reading it entity by entity.
+        Each image, annotation, category and license is turned into a model as soon as it is parsed,
+        so dictionaries of the whole file are never held in memory at once. See ``coco_orm.dataset.streaming``.
+
+        Args:
+            filepath (str): path to the json file containing COCO dataset.
+            images_dir_path (Optional[str]): path to the directory containing dataset images.
+            columnar (bool): store annotations in NumPy arrays, encoding them in batches of ``COLUMNAR_BATCH_SIZE``.
+            lazy (bool): only locate collections in the file, reading each of them on its first access.
+                The file is scanned without holding any of the collections in memory.
+
+        Returns:
+            CocoDataset: an instance of CocoDataset class.
+        """
+        if lazy:
+            return Factory._from_file_index(filepath, images_dir_path, columnar, _entity_factories)
+        with open_file(filepath) as f:
+            return Factory.from_stream(filepath, f, images_dir_path, columnar)
+
+    @staticmethod
+    def from_stream(filepath: str, file: TextIO, images_dir_path: Optional[str] = None, columnar: bool = False) -> CocoDataset:
+        """
+        Static method.
+        Builds an object-oriented COCO dataset model from a text stream containing a json file, reading it entity by entity.
+        See ``from_file``.
+
+        Args:
+            filepath (str): path to the json file (or a url) the dataset is identified by.
+            file (TextIO): a text stream of the json file, e.g. an HTTP response.
+
+        Returns:
+            CocoDataset: an instance of CocoDataset class.
+        """
+        factories = _entity_factories
+        entities = {key: [] for key in factories}
+        annotations = ColumnarAnnotationCollection([]) if columnar else None
+        info = None
+        for key, value in iter_json_items(file, factories):
+            if key == INFO:
+                info = value
+            elif key not in factories or value is None:
+                continue
+            elif annotations is not None and key == ANNOTATIONS:
+                batch = entities[ANNOTATIONS]
+                batch.append(value)
+                if len(batch) == COLUMNAR_BATCH_SIZE:
+                    annotations.extend(batch)
+                    batch.clear()
+            else:
+                entities[key].append(factories[key].from_dict(value))
+        if annotations is not None:
+            annotations.extend(entities[ANNOTATIONS])
+        return Factory.from_collections(
+            filepath = filepath,
+            images = entities[IMAGES],
+            annotations = annotations if annotations is not None else entities[ANNOTATIONS],
+            categories = entities[CATEGORIES],
+            licenses = entities[LICENSES],
+            info = info,
+            images_dir_path = images_dir_path
+        )
+
+    @staticmethod
+    def _from_file_index(filepath: str, images_dir_path: Optional[str], columnar: bool, keys: Iterable[str]) -> CocoDataset:
+        """Private method. Build a dataset of collections located in a json file, see ``from_file``."""
+        version = file_version(filepath)
+        ranges, info = {}, None
+        with open_file(filepath, newline='') as f:
+            for key, value in index_json_items(f, keys):
+                if key == INFO: info = value
+                elif key in keys and isinstance(value, tuple): ranges[key] = value
+        collection = lambda key, factory, *args: LazyRange(factory, filepath, version, *ranges[key], *args) if key in ranges else factory([], *args)
+        return Factory.from_collections(
+            filepath = filepath,
+            images = collection(IMAGES, ImageCollection, images_dir_path),
+            annotations = collection(ANNOTATIONS, ColumnarAnnotationCollection if columnar else AnnotationCollection),
+            categories = collection(CATEGORIES, CategoryCollection),
+            licenses = collection(LICENSES, LicenseCollection),
+            info = info,
+            images_dir_path = images_dir_path
+        )
+
+    @staticmethod
+    def from_sqlite(filepath: str, database: str, images_dir_path: Optional[str] = None) -> CocoDataset:
+        """
+        Static method.
+        Builds an object-oriented COCO dataset model keeping its collections in a SQLite database instead of memory.
+        See ``coco_orm.collections.sqlite.Collection``.
+
+        The json file is imported into the database entity by entity (see ``coco_orm.dataset.streaming``) on first use,
+        and imported again when the file changes. Otherwise the database is opened as it is, without reading the file:
+        changes of collections persist in the database. Datasets filtered from the dataset are kept in temporary tables.
+
+        Args:
+            filepath (str): path to the json file containing COCO dataset, it may not exist yet.
+            database (str): path to the database file, created if needed.
+            images_dir_path (Optional[str]): path to the directory containing dataset images.
+
+        Returns:
+            CocoDataset: an instance of CocoDataset class.
+        """
+        store = Store(database)
+        source = {"filepath": os.path.abspath(filepath), "version": list(file_version(filepath)) if is_file_exists(filepath) else None}
+        imported = store.get(SQL_SOURCE) == source
+        if not imported:
+            for key in _entity_factories: store.drop(MAIN, key)
+        collections = {
+            IMAGES: SqlImageCollection(None, images_dir_path, store, IMAGES),
+            ANNOTATIONS: SqlAnnotationCollection(None, store, ANNOTATIONS),
+            CATEGORIES: SqlCategoryCollection(None, store, CATEGORIES),
+            LICENSES: SqlLicenseCollection(None, store, LICENSES),
+        }
+        if not imported:
+            info = None
+            if source["version"] is not None:
+                batches = {key: [] for key in collections}
+                with open_file(filepath) as f:
+                    for key, value in iter_json_items(f, collections):
+                        if key == INFO:
+                            info = value
+                        elif key in collections and value is not None:
+                            batch = batches[key]
+                            batch.append(value)
+                            if len(batch) == SQL_BATCH_SIZE:
+                                collections[key].extend(batch)
+                                batch.clear()
+                for key, batch in batches.items():
+                    collections[key].extend(batch)
+            store.set(SQL_INFO, info)
+            store.set(SQL_SOURCE, source)
+        info = store.get(SQL_INFO)
+        return CocoDataset(
+            filepath,
+            collections[IMAGES],
+            collections[ANNOTATIONS],
+            collections[CATEGORIES],
+            collections[LICENSES],
+            InfoFactory.from_dict(info) if info else None
+        )
+
+    @staticmethod
+    def from_shards(dir_path: str, images_dir_path: Optional[str] = None, columnar: bool = False, processes: Optional[int] = None) -> CocoDataset:
+        """
+        Static method.
+        Builds an object-oriented COCO dataset model from a sharded dataset, reading shards in parallel processes
+        and merging them. Images and annotations are ordered shard by shard; categories, licenses and info
+        are taken from the first shard. See ``CocoDataset.save_shards``.
+
+        Args:
+            dir_path (str): path to the sharded dataset directory.
+            images_dir_path (Optional[str]): path to the directory containing dataset images.
+            columnar (bool): store annotations in NumPy arrays, shards send their arrays to the main process.
+            processes (Optional[int]): a number of worker processes, the number of CPUs by default. 1 to read shards in the main process.
+
+        Returns:
+            CocoDataset: an instance of CocoDataset class, its filepath is the directory.
+        """
+        filepaths = shard_filepaths(dir_path, read_manifest(dir_path))
+        if processes == 1 or len(filepaths) < 2:
+            shards = list(map(_read_shard, filepaths, repeat(columnar)))
+        else:
+            with ProcessPoolExecutor(min(processes or os.cpu_count(), len(filepaths))) as executor:
+                shards = list(executor.map(_read_shard, filepaths, repeat(columnar)))
+        if columnar:
+            annotations = ColumnarAnnotationCollection.from_columns(Columns.concat(Columns.from_arrays(*shard[ANNOTATIONS]) for shard in shards))
+        else:
+            annotations = AnnotationCollection(list(chain.from_iterable(shard[ANNOTATIONS] for shard in shards)))
+        first = shards[0] if shards else {}
+        return Factory.from_collections(
+            filepath = dir_path,
+            images = list(chain.from_iterable(shard[IMAGES] for shard in shards)),
+            annotations = annotations,
+            categories = first.get(CATEGORIES, []),
+            licenses = first.get(LICENSES, []),
+            info = first.get(INFO),
+            images_dir_path = images_dir_path
+        )
+
+    @staticmethod
+    def from_cache(filepath: str, images_dir_path: Optional[str] = None, streaming: bool = False, lazy: bool = False) -> CocoDataset:
+        """
+        Static method.
+        Builds an object-oriented COCO dataset model from a binary cache of a json file, stored next to the file.
+        The cache is built on first use and rebuilt when the json file is changed. See ``coco_orm.dataset.cache``.
+        Annotations are stored in memory-mapped NumPy arrays, shared by processes reading the same cache.
+
+        Args:
+            filepath (str): path to the json file containing COCO dataset.
+            images_dir_path (Optional[str]): path to the directory containing dataset images.
+            streaming (bool): read the json file entity by entity when the cache is built.
+            lazy (bool): build collections read from the cache on first access.
+
+        Returns:
+            CocoDataset: an instance of CocoDataset class with columnar annotations.
+        """
+        cached = read_cache(filepath)
+        if cached is None:
+            key = file_key(filepath) # before reading, so a file changed while being read is not cached as its previous version
+            if streaming: dataset = Factory.from_file(filepath, images_dir_path, columnar=True)
+            else: dataset = Factory.from_dict(filepath, read_json_file(filepath), images_dir_path, columnar=True)
+            write_cache(filepath, key, dataset.annotations.columns, ((name, value) for name, value in dataset.iter_items() if name != ANNOTATIONS))
+            return dataset
+        data, columns = cached
+        return Factory.from_collections(
+            filepath = filepath,
+            images = data[IMAGES],
+            annotations = ColumnarAnnotationCollection.from_columns(columns),
+            categories = data[CATEGORIES],
+            licenses = data[LICENSES],
+            info = data[INFO],
+            images_dir_path = images_dir_path,
+            lazy = lazy
+        )
+
     @staticmethod
     def from_collections(
         filepath: str,
@@ -182,7 +713,10 @@ class Factory():
         categories: Union[CategoryCollection, List[Dict]],
         licenses: Union[LicenseCollection, List[Dict], None] = None,
         info: Union[InfoModel, Dict, None] = None,
-        images_dir_path: Optional[str] = None
+        images_dir_path: Optional[str] = None,
+        columnar: bool = False,
+        lazy: bool = False,
+        processes: Optional[int] = 1
     ) -> CocoDataset:
         """
         Static method.
@@ -195,14 +729,27 @@ class Factory():
             licenses: Union[LicenseCollection, List[Dict], None]
             info: Union[InfoModel, Dict, None]
             images_dir_path: Optional[str]
+            columnar (bool): store annotations given as a list in NumPy arrays.
+            lazy (bool): keep collections given as lists as raw records, building each collection on its first access.
+                Useful for jobs touching only some of the collections, e.g. categories of a large dataset.
+            processes (Optional[int]), default = 1: a number of worker processes converting images and annotations
+                given as lists, None for the number of CPUs. Lists are split into chunks converted in parallel,
+                see ``coco_orm.collections.parallel``. Doesn't apply to lazy collections.
 
         Returns:
             CocoDataset: an instance of CocoDataset class.
         """
-        if isinstance(images, list): images = ImageCollection(images, images_dir_path)
-        if isinstance(annotations, list): annotations = AnnotationCollection(annotations)
-        if isinstance(categories, list): categories = CategoryCollection(categories)
-        if isinstance(licenses, list): licenses = LicenseCollection(licenses)
+        collection = Lazy if lazy else lambda factory, *args: factory(*args)
+        if processes != 1 and not lazy:
+            if isinstance(images, list) and images and isinstance(images[0], dict):
+                images = parse_entities(ImageFactory, images, processes)
+            if isinstance(annotations, list) and not isinstance(annotations, BaseCollection) and annotations and isinstance(annotations[0], dict):
+                annotations = ColumnarAnnotationCollection.from_columns(encode_columns(annotations, processes)) if columnar else parse_entities(AnnotationFactory, annotations, processes)
+        if isinstance(images, list): images = collection(ImageCollection, images, images_dir_path)
+        if isinstance(annotations, list) and not isinstance(annotations, BaseCollection):
+            annotations = collection(ColumnarAnnotationCollection if columnar else AnnotationCollection, annotations)
+        if isinstance(categories, list): categories = collection(CategoryCollection, categories)
+        if isinstance(licenses, list): licenses = collection(LicenseCollection, licenses)
         if isinstance(info, dict): info = InfoFactory.from_dict(info)
         return CocoDataset(filepath, images, annotations, categories, licenses, info)
     
@@ -227,4 +774,17 @@ class Factory():
             dataset.annotations,
             dataset.info,
             images_dir_path if images_dir_path else dataset.images.repository.dir_path
-        )
\ No newline at end of file
+        )
+
+
+def _read_shard(filepath: str, columnar: bool) -> Dict[str, Any]:
+    """Private function. Read a shard in a worker process of ``Factory.from_shards``, returning picklable entities."""
+    dataset = Factory.from_dict(filepath, read_json_file(filepath), columnar=columnar)
+    annotations = dataset.annotations
+    return {
+        INFO: dataset.info,
+        IMAGES: list(dataset.images),
+        ANNOTATIONS: (annotations.columns.arrays(), annotations.columns.objects()) if columnar else list(annotations),
+        CATEGORIES: list(dataset.categories),
+        LICENSES: list(dataset.licenses),
+    }
\ No newline at end of file
@@ -0,0 +1,118 @@
+from typing import Optional, Tuple
+from itertools import chain
+from operator import attrgetter
+
+import numpy as np
+
+from ..models.core import ID
+from ..models.image import LICENSE
+from ..models.annotation import IMAGE_ID, CATEGORY_ID
+from ..collections.core import BaseCollection
+
+"""A key of entities without a value of a foreign key (e.g. images without a license), never equal to an id."""
+_NULL = np.iinfo(np.int64).min
+
+
+def semi_join(
+    images: BaseCollection,
+    annotations: BaseCollection,
+    categories: BaseCollection,
+    licenses: Optional[BaseCollection] = None,
+    inplace: bool = False
+) -> Tuple[BaseCollection, BaseCollection, BaseCollection, Optional[BaseCollection]]:
+    """
+    Narrow filtered dataset collections down to a consistent subset, see ``CocoDataset.filter``.
+
+    Constraints are propagated in a fixed order, each step is a semi-join keeping entities whose key is found among keys
+    of another collection:
+        1. images are narrowed down to images of the licenses (if licenses are given);
+        2. annotations to annotations of the images and the categories;
+        3. categories and images to those having annotations;
+        4. licenses to licenses of the images.
+    Keys of each collection are read once, from columns of columnar collections or in a single pass over entities,
+    and matched with ``np.isin``; keys other than integers are matched with a hash set.
+
+    Args:
+        images (BaseCollection): an image collection.
+        annotations (BaseCollection): an annotation collection.
+        categories (BaseCollection): a category collection.
+        licenses (Optional[BaseCollection]): a license collection, images are not narrowed down by licenses if None.
+        inplace (bool): keep only joined entities in the collections, else return views of them.
+
+    Returns:
+        tuple: images, annotations, categories and licenses (None if not given) of the consistent subset.
+    """
+    if licenses is not None:
+        image_ids, image_licenses = keys(images, ID, LICENSE)
+        mask = is_in(image_licenses, keys(licenses, ID)[0])
+        images, image_ids, image_licenses = _select(images, mask, inplace), image_ids[mask], image_licenses[mask]
+    else:
+        image_ids = keys(images, ID)[0]
+
+    annotation_image_ids, annotation_category_ids = keys(annotations, IMAGE_ID, CATEGORY_ID)
+    category_ids = keys(categories, ID)[0]
+    mask = is_in(annotation_image_ids, image_ids) & is_in(annotation_category_ids, category_ids)
+    annotations = _select(annotations, mask, inplace)
+    annotation_image_ids, annotation_category_ids = annotation_image_ids[mask], annotation_category_ids[mask]
+
+    categories = _select(categories, is_in(category_ids, annotation_category_ids), inplace)
+    mask = is_in(image_ids, annotation_image_ids)
+    images = _select(images, mask, inplace)
+
+    if licenses is not None:
+        licenses = _select(licenses, is_in(keys(licenses, ID)[0], image_licenses[mask]), inplace)
+    return images, annotations, categories, licenses
+
+
+def keys(collection: BaseCollection, *attr_names: str) -> Tuple[np.ndarray, ...]:
+    """
+    Read values of entity attributes used as keys, in a single pass over entities.
+
+    Args:
+        collection (BaseCollection): a collection.
+        attr_names (str): attribute names.
+
+    Returns:
+        tuple[np.ndarray]: an array of values per attribute, in the order of entities; an int64 array
+            (None values replaced with ``_NULL``) if all values are integers, else an object array.
+    """
+    columns = getattr(collection, "column_names", ())
+    if all(attr_name in columns for attr_name in attr_names):
+        return tuple(collection.column(attr_name) for attr_name in attr_names)
+    size, getter = len(collection), attrgetter(*attr_names)
+    values = lambda: map(getter, collection) if len(attr_names) == 1 else chain.from_iterable(map(getter, collection))
+    try:
+        array = np.fromiter(values(), dtype=np.int64, count=size * len(attr_names))
+    except (TypeError, ValueError, OverflowError):
+        # None or non-integer keys, read once more
+        values = [_NULL if value is None else value for value in values()]
+        try:
+            array = np.fromiter(values, dtype=np.int64, count=len(values))
+        except (TypeError, ValueError, OverflowError):
+            array = np.empty(len(values), dtype=object)
+            array[:] = values
+    return tuple(array.reshape(size, len(attr_names)).T)
+
+
+def is_in(values: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """
+    Semi-join values with target keys.
+
+    Args:
+        values (np.ndarray): values to look up.
+        targets (np.ndarray): keys to look values up in.
+
+    Returns:
+        np.ndarray: a boolean mask of values found among target keys.
+    """
+    if values.dtype != object and targets.dtype != object:
+        return np.isin(values, targets)
+    found = frozenset(targets.tolist())
+    return np.fromiter((value in found for value in values.tolist()), dtype=np.bool_, count=len(values))
+
+
+def _select(collection: BaseCollection, mask: np.ndarray, inplace: bool) -> BaseCollection:
+    """Private function. Keep entities of a collection selected by a mask, the collection is returned as is if all of them are."""
+    if mask.all():
+        return collection
+    return collection._select(np.flatnonzero(mask), inplace)
@@ -0,0 +1,164 @@
+from typing import Dict, List, Optional, Tuple, Union, BinaryIO
+from functools import partial
+import json
+import os
+
+from ..collections.core import BaseCollection, APPEND, UPDATE, DELETE
+from ..models.core import BaseEntityModel
+from .utils import open_atomic
+from .lazy import Lazy
+
+"""A suffix of a journal file, created next to the json file."""
+JOURNAL_SUFFIX = ".journal"
+
+"""A version of the journal format. Journals of other versions are not replayed."""
+JOURNAL_VERSION = 1
+
+
+class Journal():
+    """
+    Journal is an append-only log of changes of dataset collections (a write-ahead log), stored next to the json file.
+    ``append``, ``update`` and ``delete`` calls of collections are recorded as json lines, so a change costs a write
+    of one line instead of rewriting the json file. The json file with the journal replayed over it is the current
+    state of the dataset; ``CocoDataset.compact`` writes the state into the json file and empties the journal.
+
+    The first line of a journal holds the version (size and mtime) of the json file the changes are based on.
+    A journal based on another version of the json file is not replayed: the file has been written since, e.g. by
+    ``compact`` interrupted before emptying the journal. A line torn by an interrupted write is dropped.
+    Other changes of collections (e.g. ``extend``, ``filter(inplace=True)``, entities changed in place)
+    are not recorded, save such changes with ``compact``.
+
+    Args/Attributes:
+        filepath (str): path to the json file.
+        sync (bool): fsync the journal after every change, so changes survive an OS crash, not only a process crash.
+
+    Attributes:
+        journal_filepath (str): path to the journal file.
+    """
+    def __init__(self, filepath: str, sync: bool = False):
+        self.filepath = filepath
+        self.journal_filepath = filepath + JOURNAL_SUFFIX
+        self.sync = sync
+        self._file = None # type: Optional[BinaryIO]
+
+    def _base(self) -> Optional[Tuple[int, int]]:
+        """Private method. Get a version of the json file, None if there is no file."""
+        try:
+            stat = os.stat(self.filepath)
+        except FileNotFoundError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def _header(self) -> bytes:
+        """Private method. Build the first line of a journal."""
+        return json.dumps({"journal": JOURNAL_VERSION, "base": self._base()}).encode('utf-8') + b"\n"
+
+    def read(self) -> List[Dict]:
+        """
+        Read changes recorded to the journal. A torn last line is cut off the journal file.
+
+        Returns:
+            list[dict]: changes, an empty list if there is no journal or it is based on another version of the json file.
+        """
+        if not self.is_current():
+            return []
+        records = []
+        with open(self.journal_filepath, 'rb') as f:
+            end = len(f.readline())
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"): raise ValueError("incomplete line")
+                    records.append(json.loads(line))
+                except ValueError:
+                    break
+                end += len(line)
+        if end < os.path.getsize(self.journal_filepath):
+            os.truncate(self.journal_filepath, end)
+        return records
+
+    def replay(self, collections: Dict[str, Union[BaseCollection, Lazy]]) -> int:
+        """
+        Apply recorded changes to collections, and record further changes of the collections.
+        Lazy collections are built when a change is applied to them, others record changes once they are built.
+
+        Args:
+            collections (dict): collections by their names in the journal, e.g. ``images``. Lazy instances are accepted,
+                built ones are replaced in the dictionary.
+
+        Returns:
+            int: a number of applied changes.
+        """
+        records = self.read()
+        built = {}
+        for record in records:
+            key = record["collection"]
+            collection = built.get(key)
+            if collection is None:
+                collection = collections[key]
+                collection = built[key] = collection() if isinstance(collection, Lazy) else collection
+            if record["kind"] == DELETE:
+                collection.delete(record["id"])
+            elif record["kind"] == APPEND:
+                collection.append(collection.entity_factory.from_dict(record["entity"], trusted=True))
+            elif record["kind"] == UPDATE:
+                collection.update(collection.entity_factory.from_dict(record["entity"], trusted=True))
+        for key, collection in collections.items():
+            collection = built.get(key, collection)
+            if isinstance(collection, Lazy):
+                collection.build = partial(_attach, collection.build, self, key)
+            else:
+                collections[key] = _attach(lambda: collection, self, key)
+        return len(records)
+
+    def record(self, key: str, kind: str, value: Union[BaseEntityModel, int]) -> None:
+        """
+        Record a change. The journal file is opened (and created if needed) on the first change.
+
+        Args:
+            key (str): a name of the changed collection.
+            kind (str): a kind of the change, one of APPEND, UPDATE and DELETE.
+            value (BaseEntityModel | int): a changed entity, an id for DELETE.
+        """
+        if self._file is None:
+            if not self.is_current():
+                self.reset()
+            self._file = open(self.journal_filepath, 'ab')
+        record = {"collection": key, "kind": kind}
+        if kind == DELETE: record["id"] = value
+        else: record["entity"] = value.to_dict()
+        self._file.write(json.dumps(record, ensure_ascii=False).encode('utf-8') + b"\n")
+        self._file.flush()
+        if self.sync:
+            os.fsync(self._file.fileno())
+
+    def is_current(self) -> bool:
+        """
+        Check whether the journal is based on the current version of the json file.
+
+        Returns:
+            bool: True if the journal exists and its changes apply to the json file.
+        """
+        if not os.path.exists(self.journal_filepath):
+            return False
+        with open(self.journal_filepath, 'rb') as f:
+            return f.readline() == self._header()
+
+    def reset(self) -> None:
+        """Empty the journal, basing it on the current version of the json file. Call after the json file is written."""
+        self.close()
+        with open_atomic(self.journal_filepath, binary=True) as f:
+            f.write(self._header())
+
+    def close(self) -> None:
+        """Close the journal file, it is reopened on the next change."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def _attach(build, journal: Journal, key: str) -> BaseCollection:
+    """Private function. Build a collection and make it record its changes to a journal."""
+    collection = build()
+    collection.journal = journal
+    collection.journal_key = key
+    return collection
@@ -0,0 +1,113 @@
+from typing import Callable, Tuple
+from functools import partial
+import os
+
+from ..collections.core import BaseCollection
+from .streaming import read_json_range
+
+
+class Lazy():
+    """
+    Lazy holds raw records of a collection and builds the collection on demand.
+    Arguments are kept until the collection is built, then released together with the Lazy instance.
+
+    Args:
+        factory (Callable[..., BaseCollection]): a collection class or a function building a collection.
+        *args: arguments of the factory, e.g. a list of dictionaries containing entities data.
+    """
+    def __init__(self, factory: Callable[..., BaseCollection], *args):
+        self.build = partial(factory, *args) # type: Callable[[], BaseCollection]
+
+    def __call__(self) -> BaseCollection:
+        """Build the collection."""
+        return self.build()
+
+
+class LazyRange(Lazy):
+    """
+    LazyRange holds a location of raw records of a collection in a json file, and reads them when the collection is built.
+    See ``coco_orm.dataset.streaming.index_json_items``.
+
+    Args:
+        factory (Callable[..., BaseCollection]): a collection class or a function building a collection from a list of records.
+        filepath (str): path to the json file.
+        version (tuple[int, int]): a version of the file the location has been found in, see ``file_version``.
+        start (int): an offset of the first byte of the records array.
+        stop (int): an offset after the last byte of the records array.
+        *args: other arguments of the factory, passed after the records.
+    """
+    def __init__(self, factory: Callable[..., BaseCollection], filepath: str, version: Tuple[int, int], start: int, stop: int, *args):
+        self.build = lambda: factory(read_json_range(filepath, start, stop), *args)
+        self.filepath = filepath
+        self.version = version
+
+    def __call__(self) -> BaseCollection:
+        """
+        Override. Build the collection.
+
+        Raises:
+            Exception: if the file has been changed since the location was found.
+        """
+        if file_version(self.filepath) != self.version:
+            raise Exception(f"File {self.filepath} has been changed since it was opened, the collection can't be read.")
+        return self.build()
+
+
+def file_version(filepath: str) -> Tuple[int, int]:
+    """
+    Get a version of a file.
+
+    Args:
+        filepath (str): path to the file.
+
+    Returns:
+        tuple[int, int]: the file size and modification time, ns.
+    """
+    stat = os.stat(filepath)
+    return stat.st_size, stat.st_mtime_ns
+
+
+class LazyAttribute():
+    """
+    LazyAttribute is a descriptor of an attribute holding a collection, which may be given as a Lazy instance.
+    The collection is built on first access and replaces the Lazy instance.
+    >>> class CocoDataset():
+    ...     images = LazyAttribute()
+    """
+    def __set_name__(self, owner, name: str):
+        self.name = f"_{name}"
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = instance.__dict__[self.name]
+        if isinstance(value, Lazy):
+            value = instance.__dict__[self.name] = value()
+        return value
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.name] = value
+
+    def peek(self, instance):
+        """
+        Get a value of the attribute without building the collection.
+
+        Args:
+            instance (object): an instance holding the attribute.
+
+        Returns:
+            BaseCollection | Lazy | None: the collection or the Lazy instance holding it.
+        """
+        return instance.__dict__.get(self.name)
+
+    def is_built(self, instance) -> bool:
+        """
+        Check whether the collection of an instance has been built.
+
+        Args:
+            instance (object): an instance holding the attribute.
+
+        Returns:
+            bool: False if the collection is still held by a Lazy instance.
+        """
+        return not isinstance(instance.__dict__.get(self.name), Lazy)
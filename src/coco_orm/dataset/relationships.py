@@ -0,0 +1,38 @@
+from typing import Dict, List, Optional
+
+from ..collections.annotation import Collection as AnnotationCollection
+
+
+class Relationships():
+    """
+    Relationships holds inverted indexes between dataset collections that are not covered by a single collection index.
+
+    Direct foreign keys are served by collection indexes (``annotation.image_id``, ``annotation.category_id``, ``image.license``),
+    see ``coco_orm.collections.indexes.Index``. Relationships maps category ids to ids of images containing them.
+    The mapping is built in one pass over annotations on first use and rebuilt after annotations have been changed.
+    """
+    def __init__(self):
+        self._annotations = None # type: Optional[AnnotationCollection] # the collection the mapping is built for
+        self._version = None # type: Optional[int] # the version of the collection the mapping is built for
+        self._image_ids_by_category = {} # type: Dict[int, List[int]]
+
+    def image_ids_by_category(self, annotations: AnnotationCollection) -> Dict[int, List[int]]:
+        """
+        Get a mapping of category ids to ids of images containing annotations of the category.
+
+        Args:
+            annotations (AnnotationCollection): an annotation collection.
+
+        Returns:
+            dict[int, list[int]]: a dictionary mapping category ids to lists of unique image ids in order of appearance.
+        """
+        # the collection itself is kept: an id of a freed collection may be reused by a new one
+        if annotations is not self._annotations or annotations.version != self._version:
+            groups = {} # type: Dict[int, Dict[int, None]]
+            for annotation in annotations:
+                group = groups.get(annotation.category_id)
+                if group is None: groups[annotation.category_id] = {annotation.image_id: None}
+                else: group[annotation.image_id] = None
+            self._image_ids_by_category = {category_id: list(image_ids) for category_id, image_ids in groups.items()}
+            self._annotations, self._version = annotations, annotations.version
+        return self._image_ids_by_category
@@ -0,0 +1,150 @@
+from typing import Dict, TextIO, BinaryIO
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+from urllib.parse import urlparse
+import hashlib
+import io
+import json
+import os
+import secrets
+import shutil
+
+from .utils import MAGIC_NUMBERS, open_atomic
+
+"""A directory keeping downloaded files, may be set with the COCO_ORM_CACHE_DIR environment variable."""
+DOWNLOAD_CACHE_DIR = os.environ.get("COCO_ORM_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "coco_orm"))
+
+"""A number of bytes read from a response at once."""
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+"""A timeout of HTTP requests, seconds."""
+DOWNLOAD_TIMEOUT = 60
+
+"""Response headers validating a downloaded file, and request headers revalidating it."""
+ETAG = "ETag"
+LAST_MODIFIED = "Last-Modified"
+_conditional_headers = {ETAG: "If-None-Match", LAST_MODIFIED: "If-Modified-Since"}
+
+
+def download_paths(url: str, cache_dir: str) -> Dict[str, str]:
+    """
+    Get paths of files keeping a download of a url: the downloaded file, its metadata and a partial download.
+    Files are named by a hash of the url, followed by the url file name.
+
+    Args:
+        url (str): a url of the file.
+        cache_dir (str): path to the download cache directory.
+
+    Returns:
+        dict: paths by names "file", "metadata" and "partial".
+    """
+    name = hashlib.blake2b(url.encode("utf-8"), digest_size=16).hexdigest()
+    basename = os.path.basename(urlparse(url).path)
+    filepath = os.path.join(cache_dir, f"{name}-{basename}" if basename else name)
+    return {"file": filepath, "metadata": filepath + ".metadata.json", "partial": filepath + ".part"}
+
+
+def download(url: str, cache_dir: str = DOWNLOAD_CACHE_DIR, timeout: float = DOWNLOAD_TIMEOUT) -> str:
+    """
+    Download a file into a local cache, reusing previous downloads.
+
+    A downloaded file is revalidated with a conditional GET (``If-None-Match`` / ``If-Modified-Since``) and downloaded
+    again only if it has been changed. An interrupted download is kept and resumed with a ``Range`` request,
+    provided the file is still the same (``If-Range``); otherwise it is downloaded from the beginning.
+    The response is streamed to disk chunk by chunk. Concurrent processes download into their own temporary files,
+    which replace the cached file atomically. If the server can't be reached, a previously downloaded file is used;
+    error responses of the server (e.g. 404, 500) are raised.
+
+    Args:
+        url (str): a url of the file.
+        cache_dir (str): path to the download cache directory, created if needed.
+        timeout (float): a timeout of the request, seconds.
+
+    Raises:
+        urllib.error.HTTPError: if the server responds with an error status.
+        urllib.error.URLError: if the server can't be reached and there is no previous download.
+
+    Returns:
+        str: path to the downloaded file.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    paths = download_paths(url, cache_dir)
+    metadata = _read_metadata(paths["metadata"])
+    validators = {name: metadata[name] for name in _conditional_headers if metadata.get(name)}
+    exists = os.path.isfile(paths["file"]) and metadata.get("complete", False)
+    # an interrupted download is claimed by renaming it, so only one process resumes it
+    partial_filepath = f"{paths['partial']}.{secrets.token_hex(4)}"
+    try:
+        os.rename(paths["partial"], partial_filepath)
+        resume = not exists and bool(validators)
+    except OSError:
+        resume = False
+    headers = {}
+    if exists:
+        headers.update({_conditional_headers[name]: value for name, value in validators.items()})
+    elif resume:
+        headers["Range"] = f"bytes={os.path.getsize(partial_filepath)}-"
+        headers["If-Range"] = validators.get(ETAG, validators.get(LAST_MODIFIED))
+    try:
+        try:
+            response = urlopen(Request(url, headers=headers), timeout=timeout)
+        except HTTPError as error:
+            if error.code == 304 and exists:
+                if os.path.exists(partial_filepath): os.remove(partial_filepath)
+                return paths["file"]
+            if error.code != 416 or not resume:
+                raise
+            # the partial download is not a prefix of the file any more
+            response = urlopen(Request(url), timeout=timeout)
+    except HTTPError:
+        # the server has answered, an error is not hidden by a previous download
+        if os.path.exists(partial_filepath): os.replace(partial_filepath, paths["partial"])
+        raise
+    except URLError:
+        if os.path.exists(partial_filepath): os.replace(partial_filepath, paths["partial"])
+        if os.path.isfile(paths["file"]):
+            return paths["file"]
+        raise
+    with response:
+        append = resume and response.status == 206
+        validators = {name: response.headers[name] for name in _conditional_headers if response.headers.get(name)}
+        with open_atomic(paths["metadata"]) as f:
+            json.dump(dict(validators, url=url, complete=False), f)
+        try:
+            with open(partial_filepath, "ab" if append else "wb") as f:
+                shutil.copyfileobj(response, f, DOWNLOAD_CHUNK_SIZE)
+        except BaseException:
+            if os.path.exists(partial_filepath): os.replace(partial_filepath, paths["partial"])
+            raise
+    os.replace(partial_filepath, paths["file"])
+    with open_atomic(paths["metadata"]) as f:
+        json.dump(dict(validators, url=url, complete=True), f)
+    return paths["file"]
+
+
+def open_url(url: str, timeout: float = DOWNLOAD_TIMEOUT) -> TextIO:
+    """
+    Open a url for reading, without storing the response on disk. Compressed responses are decompressed on the fly,
+    see ``coco_orm.dataset.utils.MAGIC_NUMBERS``.
+
+    Args:
+        url (str): a url of the file.
+        timeout (float): a timeout of the request, seconds.
+
+    Returns:
+        TextIO: a text stream of the response, UTF-8 decoded.
+    """
+    response = io.BufferedReader(urlopen(Request(url), timeout=timeout), DOWNLOAD_CHUNK_SIZE)
+    head = response.peek(max(map(len, MAGIC_NUMBERS)))
+    codec = next((codec for magic_number, codec in MAGIC_NUMBERS.items() if head.startswith(magic_number)), None)
+    stream = codec.open(response, "rb") if codec else response # type: BinaryIO
+    return io.TextIOWrapper(stream, encoding="utf-8")
+
+
+def _read_metadata(filepath: str) -> Dict:
+    """Private function. Read metadata of a download, an empty dictionary if there is none."""
+    try:
+        with open(filepath, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
@@ -0,0 +1,100 @@
+from typing import Dict, Any, List, Sequence, Optional
+import json
+import os
+
+from .utils import open_atomic
+from .streaming import write_json_items
+
+"""A version of the sharded dataset layout."""
+SHARDS_VERSION = 1
+
+"""A name of the manifest file of a sharded dataset directory, and a name pattern of its shard files."""
+SHARDS_MANIFEST = "manifest.json"
+SHARD_FILENAME = "shard-{index:05d}-of-{count:05d}.json"
+
+
+def is_sharded(path: str) -> bool:
+    """
+    Check whether a path is a directory of a sharded dataset.
+
+    Args:
+        path (str): path to check.
+
+    Returns:
+        bool: True if the directory contains a shards manifest.
+    """
+    return os.path.isfile(os.path.join(path, SHARDS_MANIFEST))
+
+
+def read_manifest(dir_path: str) -> Dict[str, Any]:
+    """
+    Read the manifest of a sharded dataset.
+
+    Args:
+        dir_path (str): path to the sharded dataset directory.
+
+    Raises:
+        Exception: if the manifest is of another layout version.
+
+    Returns:
+        dict: the manifest, see ``write_shards``.
+    """
+    with open(os.path.join(dir_path, SHARDS_MANIFEST), encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get("version") != SHARDS_VERSION:
+        raise Exception(f"Sharded dataset {dir_path} has an unsupported version {manifest.get('version')!r}.")
+    return manifest
+
+
+def shard_filepaths(dir_path: str, manifest: Dict[str, Any]) -> List[str]:
+    """
+    Get paths to shard files of a sharded dataset.
+
+    Args:
+        dir_path (str): path to the sharded dataset directory.
+        manifest (dict): the manifest of the dataset.
+
+    Returns:
+        list[str]: paths to shard files, in order.
+    """
+    return [os.path.join(dir_path, shard["filename"]) for shard in manifest["shards"]]
+
+
+def write_shards(dir_path: str, shards: Sequence, indent: Optional[int] = None) -> None:
+    """
+    Write a sharded dataset: every shard is a complete COCO json file holding a part of images and their annotations,
+    along with all categories, licenses and info. A manifest lists the shards.
+    The manifest is removed first and written last, so a directory is never read while it is being written.
+    Shard files of the previous version of the directory are removed.
+
+    Manifest:
+        version (int): ``SHARDS_VERSION``.
+        partition (str): how images are assigned to shards, ``image_id % num_shards``.
+        shards (list[dict]): a file name and numbers of images and annotations of every shard.
+
+    Args:
+        dir_path (str): path to the directory, created if needed.
+        shards (Sequence[CocoDataset]): datasets of the shards, see ``coco_orm.dataset.core.CocoDataset.shard``.
+        indent (Optional[int]): a number of spaces to indent the json with, None to write compact json.
+
+    Raises:
+        Exception: if there are no shards, the directory is not changed.
+    """
+    if not shards:
+        raise Exception(f"A sharded dataset has at least 1 shard, none given for {dir_path}.")
+    os.makedirs(dir_path, exist_ok=True)
+    manifest_filepath = os.path.join(dir_path, SHARDS_MANIFEST)
+    previous = read_manifest(dir_path)["shards"] if is_sharded(dir_path) else []
+    if os.path.exists(manifest_filepath): os.remove(manifest_filepath)
+    entries = []
+    for index, shard in enumerate(shards):
+        filename = SHARD_FILENAME.format(index=index, count=len(shards))
+        with open_atomic(os.path.join(dir_path, filename)) as f:
+            write_json_items(f, shard.iter_items(), indent)
+        entries.append({"filename": filename, "images": len(shard.images), "annotations": len(shard.annotations)})
+    with open_atomic(manifest_filepath) as f:
+        json.dump({"version": SHARDS_VERSION, "partition": "image_id % num_shards", "shards": entries}, f, indent=4)
+    filenames = {entry["filename"] for entry in entries}
+    for entry in previous:
+        filepath = os.path.join(dir_path, entry["filename"])
+        if entry["filename"] not in filenames and os.path.exists(filepath): os.remove(filepath)
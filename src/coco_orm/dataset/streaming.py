@@ -0,0 +1,235 @@
+from typing import Any, Iterable, Iterator, Optional, TextIO, Tuple
+import json
+import re
+
+from .utils import open_file
+
+"""A number of characters read from a file at once."""
+CHUNK_SIZE = 1 << 20
+
+_whitespace = re.compile(r"[ \t\n\r]*")
+
+"""Characters continuing a number after its integer part, a number followed by one of them may be cut by a chunk boundary."""
+_number_continuation = frozenset(".eE+-")
+
+
+class JsonStream():
+    """
+    JsonStream reads JSON values from a text file one by one, keeping only a small window of the file in memory.
+
+    Values are decoded by ``json.JSONDecoder.raw_decode`` from a buffer refilled as it is consumed. A value is accepted
+    only if it is followed by another character (or the end of the file) which can't continue a number, e.g. ``1234``
+    of ``1234.5`` split after the dot is not. So values split between chunks are never decoded partially.
+    A buffer grows geometrically while a value doesn't fit in it.
+
+    Args/Attributes:
+        file (TextIO): a file opened in text mode. Byte offsets (see ``tell``) are valid for UTF-8 files opened with ``newline=''``.
+        chunk_size (int): a number of characters read from the file at once.
+
+    Attributes:
+        offset (int): a number of bytes of characters dropped from the buffer.
+    """
+    def __init__(self, file: TextIO, chunk_size: int = CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.position = 0
+        self.offset = 0
+        self.eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self, size: int) -> bool:
+        """Private method. Drop consumed characters and read more. Returns False at the end of the file."""
+        chunk = self.file.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.offset += len(self.buffer[:self.position].encode('utf-8'))
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        return True
+
+    def peek(self) -> str:
+        """
+        Skip whitespace.
+
+        Returns:
+            str: the next character, an empty string at the end of the file.
+        """
+        while True:
+            self.position = _whitespace.match(self.buffer, self.position).end()
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self._fill(self.chunk_size):
+                return ""
+
+    def tell(self) -> int:
+        """
+        Get a byte offset of the current position in the file.
+
+        Returns:
+            int: a number of bytes before the position.
+        """
+        return self.offset + len(self.buffer[:self.position].encode('utf-8'))
+
+    def expect(self, characters: str) -> str:
+        """
+        Consume a structural character.
+
+        Args:
+            characters (str): characters allowed at the position.
+
+        Raises:
+            Exception: if the next character is not one of given characters.
+
+        Returns:
+            str: the consumed character.
+        """
+        character = self.peek()
+        if not character or character not in characters:
+            raise Exception(f"Invalid JSON: expected one of {characters!r}, got {character or 'end of file'!r}.")
+        self.position += 1
+        return character
+
+    def value(self) -> Any:
+        """
+        Decode the next value.
+
+        Raises:
+            json.JSONDecodeError: if the value is not a valid JSON.
+
+        Returns:
+            mixed: a decoded value.
+        """
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buffer, self.position)
+                if self.eof or end < len(self.buffer) and self.buffer[end] not in _number_continuation:
+                    self.position = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill(size)
+            size = max(size, len(self.buffer))
+
+
+def iter_json_items(file: TextIO, keys: Iterable[str], chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[str, Any]]:
+    """
+    Iterate over items of a JSON object stored in a file, without loading the file as a whole.
+    Arrays stored under given keys are iterated element by element, each element is decoded only when it is reached.
+
+    Args:
+        file (TextIO): a file containing a JSON object, opened in text mode.
+        keys (Iterable[str]): keys of arrays to iterate element by element.
+        chunk_size (int): a number of characters read from the file at once.
+
+    Raises:
+        Exception: if the file doesn't contain a JSON object.
+
+    Returns:
+        Iterator[tuple[str, mixed]]: pairs of a key and an array element for given keys, pairs of a key and a value for other keys.
+    """
+    return _iter_items(JsonStream(file, chunk_size), frozenset(keys), False)
+
+
+def index_json_items(file: TextIO, keys: Iterable[str], chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[str, Any]]:
+    """
+    Iterate over items of a JSON object stored in a file, locating arrays stored under given keys instead of returning them.
+    Arrays are skipped element by element, so neither the file nor an array is held in memory as a whole.
+    A located array can be read later with ``read_json_range``.
+
+    Args:
+        file (TextIO): a file containing a JSON object, opened in text mode with ``encoding='utf-8', newline=''``.
+        keys (Iterable[str]): keys of arrays to locate.
+        chunk_size (int): a number of characters read from the file at once.
+
+    Raises:
+        Exception: if the file doesn't contain a JSON object.
+
+    Returns:
+        Iterator[tuple[str, mixed]]: pairs of a key and a (start, stop) range of array bytes for given keys,
+            pairs of a key and a value for other keys.
+    """
+    return _iter_items(JsonStream(file, chunk_size), frozenset(keys), True)
+
+
+def read_json_range(filepath: str, start: int, stop: int) -> Any:
+    """
+    Read a JSON value stored in a range of file bytes.
+    Offsets of compressed files are offsets in decompressed data: such files are decompressed from the beginning.
+
+    Args:
+        filepath (str): path to the file.
+        start (int): an offset of the first byte of the value.
+        stop (int): an offset after the last byte of the value.
+
+    Returns:
+        mixed: a decoded value.
+    """
+    with open_file(filepath, 'rb') as f:
+        f.seek(start)
+        return json.loads(f.read(stop - start))
+
+
+def _iter_items(stream: JsonStream, keys: frozenset, index: bool) -> Iterator[Tuple[str, Any]]:
+    """Private function. See ``iter_json_items`` and ``index_json_items``."""
+    stream.expect("{")
+    if stream.peek() == "}":
+        return
+    while True:
+        key = stream.value()
+        if not isinstance(key, str):
+            raise Exception(f"Invalid JSON: object keys must be strings, got {key!r}.")
+        stream.expect(":")
+        if key in keys and stream.peek() == "[":
+            start = stream.tell() if index else None
+            stream.expect("[")
+            if stream.peek() == "]":
+                stream.expect("]")
+            else:
+                while True:
+                    element = stream.value()
+                    if not index:
+                        yield key, element
+                    if stream.expect(",]") == "]":
+                        break
+            if index:
+                yield key, (start, stream.tell())
+        else:
+            yield key, stream.value()
+        if stream.expect(",}") == "}":
+            return
+
+
+def write_json_items(file: TextIO, items: Iterable[Tuple[str, Any]], indent: Optional[int] = None) -> None:
+    """
+    Write a JSON object to a file item by item. Values given as iterators are written as arrays element by element,
+    so only one element is held in memory at once. Non-ASCII characters are written as they are.
+    With an ``indent`` the output is the same as of ``json.dump(obj, file, indent=indent, ensure_ascii=False)``.
+    Without one, compact JSON is written: there is no whitespace after ``,`` and ``:``, unlike the default output of ``json.dump``.
+
+    Args:
+        file (TextIO): a file opened in text mode.
+        items (Iterable[tuple[str, mixed]]): pairs of a key and a value. Iterator values are written as arrays.
+        indent (Optional[int]): a number of spaces to indent nested values with, None to write compact JSON.
+    """
+    encode = json.JSONEncoder(ensure_ascii=False, indent=indent, separators=(",", ": " if indent is not None else ":")).encode
+    newlines = ["", "", ""] if indent is None else ["\n" + " " * (indent * level) for level in range(3)]
+    key_separator = ": " if indent is not None else ":"
+    file.write("{")
+    empty = True
+    for key, value in items:
+        file.write(("{0}" if empty else ",{0}").format(newlines[1]) + encode(key) + key_separator)
+        empty = False
+        if isinstance(value, Iterator):
+            elements = 0
+            for element in value:
+                file.write(("[" if not elements else ",") + newlines[2] + encode(element).replace("\n", newlines[2]))
+                elements += 1
+            file.write(newlines[1] + "]" if elements else "[]")
+        else:
+            file.write(encode(value).replace("\n", newlines[1]))
+    file.write("}" if empty else newlines[0] + "}")
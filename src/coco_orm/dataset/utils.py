@@ -1,15 +1,106 @@
-from typing import Dict
+from typing import Dict, Iterator, TextIO, BinaryIO, Union, Optional
+from contextlib import contextmanager
+import io
 import json
 import os
+import secrets
+import gzip
+import bz2
+import lzma
 from urllib.parse import urlparse
-from urllib.request import urlretrieve
+
+"""Compression codecs by file extensions. Files are written compressed if their names end with one of the extensions."""
+COMPRESSIONS = {".gz": gzip, ".bz2": bz2, ".xz": lzma}
+
+"""Compression codecs by magic numbers. Compressed files are detected by their content, whatever their names are."""
+MAGIC_NUMBERS = {b"\x1f\x8b": gzip, b"BZh": bz2, b"\xfd7zXZ\x00": lzma}
+
+"""Compression levels used to write files: defaults of the codec command line tools (gzip.open defaults to the slower level 9)."""
+COMPRESSION_LEVELS = {gzip: {"compresslevel": 6}, bz2: {"compresslevel": 9}, lzma: {"preset": 6}}
+
+"""A size of the buffer of files written by ``open_atomic``."""
+WRITE_BUFFER_SIZE = 1 << 20
+
+def detect_compression(filepath: str, read: bool = True):
+    """
+    Detect a compression codec of a file.
+
+    Args:
+        filepath (str): path to the file.
+        read (bool): detect the codec by the file content if True, by the file extension otherwise.
+
+    Returns:
+        Optional[module]: a module of the codec (gzip, bz2 or lzma), None for not compressed files.
+    """
+    if not read:
+        return COMPRESSIONS.get(os.path.splitext(filepath)[1].lower())
+    with open(filepath, 'rb') as f:
+        head = f.read(max(map(len, MAGIC_NUMBERS)))
+    return next((codec for magic_number, codec in MAGIC_NUMBERS.items() if head.startswith(magic_number)), None)
+
+def open_file(filepath: str, mode: str = 'rt', newline: Optional[str] = None) -> Union[TextIO, BinaryIO]:
+    """
+    Open a file, compressed files are decompressed (or compressed) on the fly.
+    Files are read compressed if their content is compressed, and written compressed if their extension is one of ``COMPRESSIONS``.
+
+    Args:
+        filepath (str): path to the file.
+        mode (str): a mode of the file, see ``open``. Text files are UTF-8 encoded.
+        newline (Optional[str]): a newline mode of text files, see ``open``.
+
+    Returns:
+        TextIO | BinaryIO: a file object.
+    """
+    codec = detect_compression(filepath, read='r' in mode)
+    text = {'encoding': 'utf-8', 'newline': newline} if 'b' not in mode else {}
+    if codec is None:
+        return open(filepath, mode, **text)
+    return codec.open(filepath, mode, **text, **(COMPRESSION_LEVELS[codec] if 'r' not in mode else {}))
 
 def write_json_file(data, filepath: str):
-    with open(filepath, 'w', encoding='utf-8') as f:
+    with open_file(filepath, 'wt') as f:
         json.dump(data, f, ensure_ascii=False, indent=4)
-        
+
+@contextmanager
+def open_atomic(filepath: str, binary: bool = False) -> Iterator[Union[TextIO, BinaryIO]]:
+    """
+    Open a file for writing atomically: data is written into a temporary file in the same directory,
+    which replaces the file only once it is written completely. The temporary file is removed on errors.
+    Files having one of ``COMPRESSIONS`` extensions are compressed on the fly.
+
+    Args:
+        filepath (str): path to the file to write.
+        binary (bool): open the file in binary mode.
+
+    Returns:
+        Iterator[TextIO | BinaryIO]: a context manager providing a buffered file.
+    """
+    dir_path, filename = os.path.split(os.path.abspath(filepath))
+    temp_filepath = os.path.join(dir_path, f".{filename}.{secrets.token_hex(4)}.tmp")
+    codec = detect_compression(filepath, read=False)
+    try:
+        with open(temp_filepath, 'xb', buffering=WRITE_BUFFER_SIZE) as raw:
+            # codec files don't close file objects they are given, text wrappers are detached for the same reason
+            if codec is gzip: # the gzip header stores the name of the file, not of the temporary file
+                stream = gzip.GzipFile(filename, 'wb', fileobj=raw, **COMPRESSION_LEVELS[codec])
+            else:
+                stream = codec.open(raw, 'wb', **COMPRESSION_LEVELS[codec]) if codec else raw
+            f = stream if binary else io.TextIOWrapper(stream, encoding='utf-8')
+            yield f
+            if not binary:
+                f.flush()
+                f.detach()
+            if codec:
+                stream.close()
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(temp_filepath, filepath)
+    except BaseException:
+        if os.path.exists(temp_filepath): os.remove(temp_filepath)
+        raise
+
 def read_json_file(filepath: str) -> Dict:
-    with open(filepath) as f:
+    with open_file(filepath) as f:
         json_data = json.load(f)
     return json_data
 
@@ -23,11 +114,4 @@ def is_url(value: str) -> bool:
 
 def is_file_exists(filepath: str):
     return os.path.isfile(filepath)
-    
-def download(url: str) -> Dict:
-    filepath = os.path.join(os.path.dirname(os.path.realpath(__file__)), "temp.json")
-    urlretrieve(url, filepath) # download file from a given url
-    data = read_json_file(filepath) # read json file as dict
-    os.remove(filepath) # remove file from filesystem
-    return data
     
\ No newline at end of file
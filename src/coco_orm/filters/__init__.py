@@ -6,4 +6,4 @@ from .license import Filters as LicenseFiltersCls
 ImageFilters = ImageFiltersCls
 AnnotationFilters = AnnotationFiltersCls
 CategoryFilters = CategoryFiltersCls
-CategoryFilters = LicenseFiltersCls
+LicenseFilters = LicenseFiltersCls
@@ -1,9 +1,9 @@
-from typing import List, Optional
-from ..operators.core import EQUAL, IN, LESS_THAN_OR_EQUAL_TO, GREATER_THAN_OR_EQUAL_TO
+from typing import List, Optional, Sequence
+from ..operators.core import EQUAL, IN, LESS_THAN_OR_EQUAL_TO, GREATER_THAN_OR_EQUAL_TO, INTERSECTS, WITHIN
 from .core import BaseFilter
-from .properties import ValueProperty, ValuesProperty, RangeProperty, BboxProperty, BboxRangeProperty, Intersection
+from .properties import ValueProperty, ValuesProperty, RangeProperty, BboxProperty, BboxRangeProperty, BboxRegionProperty, BboxNearestProperty, Intersection
 from .utils import extract_unique_attr_values, filter_collection
-from ..models.annotation import ID, IMAGE_ID, CATEGORY_ID, AREA, ISCROWD, BBOX_WIDTH_IDX, BBOX_HEIGHT_IDX
+from ..models.annotation import ID, IMAGE_ID, CATEGORY_ID, AREA, ISCROWD, BBOX, BBOX_WIDTH_IDX, BBOX_HEIGHT_IDX
 from ..models.image import LICENSE
 
 
@@ -57,6 +57,18 @@ class Filters(BaseFilter):
         self.append(ValueProperty(value, comparison_operator, name=ISCROWD))
         return self
 
+    def bbox_intersects(self, region: Sequence[float]):
+        self.append(BboxRegionProperty(region, INTERSECTS, name=BBOX))
+        return self
+
+    def bbox_within(self, region: Sequence[float]):
+        self.append(BboxRegionProperty(region, WITHIN, name=BBOX))
+        return self
+
+    def bbox_nearest(self, x: float, y: float, k: int = 1):
+        self.append(BboxNearestProperty((x, y), k, name=BBOX))
+        return self
+
     def intersection(
         self, 
         image_collection = None, 
@@ -67,8 +79,8 @@ class Filters(BaseFilter):
         if image_collection:
             if license_collection:
                 image_collection = filter_collection(image_collection, attr_name=LICENSE, attr_values=extract_unique_attr_values(license_collection, ID))
-            intersection.append(self.image_ids(extract_unique_attr_values(image_collection, ID)))
+            intersection.append(ValuesProperty(extract_unique_attr_values(image_collection, ID), IN, name=IMAGE_ID))
         if category_collection: 
-            intersection.append(self.category_ids(extract_unique_attr_values(category_collection, ID)))
+            intersection.append(ValuesProperty(extract_unique_attr_values(category_collection, ID), IN, name=CATEGORY_ID))
         self.append(intersection)
         return self
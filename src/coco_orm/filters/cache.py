@@ -0,0 +1,162 @@
+from typing import Dict, Hashable, Optional, Tuple
+from collections import OrderedDict
+
+import numpy as np
+
+from .properties import BaseProperty, Intersection
+
+"""A default number of filter results kept by a cache."""
+FILTER_CACHE_SIZE = 128
+
+"""A default memory budget of a cache, in bytes of stored positions and bitmaps."""
+FILTER_CACHE_BYTES = 64 * 2 ** 20
+
+"""The greatest position stored as a 32-bit integer."""
+_MAX_INT32 = 2 ** 31 - 1
+
+
+def fingerprint(filters) -> Optional[Hashable]:
+    """
+    Build a canonical fingerprint of a filters chain: chains built the same way (e.g. by separate requests)
+    have equal fingerprints, while any difference of properties, values or operators makes them differ.
+    Values of ``ValuesProperty`` are frozensets, so the order of given values doesn't matter.
+
+    Args:
+        filters (BaseFilter): a filters chain.
+
+    Returns:
+        Optional[Hashable]: a hashable fingerprint, None if some of the filter values are not hashable.
+    """
+    try:
+        key = tuple(_fingerprint(arg) for arg in filters)
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _fingerprint(arg) -> Hashable:
+    """Private function. Build a fingerprint of a logical operator, a filter property or an intersection."""
+    if isinstance(arg, Intersection):
+        return (Intersection.__name__,) + tuple(_fingerprint(property) for property in arg)
+    if isinstance(arg, BaseProperty):
+        return (type(arg).__name__,) + tuple(sorted((name, _freeze(value)) for name, value in vars(arg).items()))
+    return arg
+
+
+def _freeze(value) -> Hashable:
+    """Private function. Turn lists into tuples tagged with their type, so ``[1, 2]`` and ``(1, 2)`` values differ."""
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__,) + tuple(map(_freeze, value))
+    return value
+
+
+class FilterCache():
+    """
+    FilterCache is an LRU cache of filter results of a collection, see ``coco_orm.collections.core.BaseCollection.cache_filters``.
+
+    Results are stored by fingerprints of filter chains (see ``fingerprint``) as positions of matching entities:
+    an array of positions, or a bitmap of the collection length if the bitmap is smaller (for 32-bit positions,
+    once more than 1/32 of the entities match). The least recently used results are evicted once the cache holds
+    more than ``max_entries`` results or more than ``max_bytes`` bytes. A result larger than ``max_bytes`` is not stored.
+
+    The cache is bound to a version of the collection: results are dropped as soon as a lookup is made
+    with another version, i.e. after any change of the collection.
+
+    Args/Attributes:
+        max_entries (int): a maximum number of stored results.
+        max_bytes (int): a maximum total size of stored results, in bytes.
+
+    Attributes:
+        hits (int): a number of lookups answered by the cache.
+        misses (int): a number of lookups not answered by the cache.
+        invalidations (int): a number of times the cache has been dropped because the collection has changed.
+        nbytes (int): a total size of stored results, in bytes.
+    """
+    def __init__(self, max_entries: int = FILTER_CACHE_SIZE, max_bytes: int = FILTER_CACHE_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.nbytes = 0
+        self._version = None # type: Optional[int]
+        self._entries = OrderedDict() # type: OrderedDict[Hashable, Tuple[np.ndarray, Optional[int]]]
+
+    def __len__(self):
+        """Returns a number of stored results."""
+        return len(self._entries)
+
+    def get(self, key: Hashable, version: int) -> Optional[np.ndarray]:
+        """
+        Get stored positions of entities matching filters.
+
+        Args:
+            key (Hashable): a fingerprint of filters.
+            version (int): the current version of the collection.
+
+        Returns:
+            Optional[np.ndarray]: an array of positions, None if there is no result of the filters for the version.
+        """
+        if version != self._version:
+            self._invalidate(version)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        data, size = entry
+        return data if size is None else np.flatnonzero(np.unpackbits(data, count=size).view(np.bool_))
+
+    def put(self, key: Hashable, version: int, positions: np.ndarray, size: int) -> None:
+        """
+        Store positions of entities matching filters, evicting the least recently used results if needed.
+
+        Args:
+            key (Hashable): a fingerprint of filters.
+            version (int): a version of the collection the positions have been found in.
+            positions (np.ndarray): an ascending array of positions.
+            size (int): a number of entities in the collection.
+        """
+        if version != self._version:
+            self._invalidate(version)
+        data, stored_size = positions.astype(np.int32 if size <= _MAX_INT32 else np.int64), None
+        if (size + 7) // 8 < data.nbytes:
+            mask = np.zeros(size, np.bool_)
+            mask[positions] = True
+            data, stored_size = np.packbits(mask), size
+        if data.nbytes > self.max_bytes:
+            return
+        self._pop(key)
+        self._entries[key] = (data, stored_size)
+        self.nbytes += data.nbytes
+        while len(self._entries) > self.max_entries or self.nbytes > self.max_bytes:
+            self._pop(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        """Drop all stored results."""
+        self._entries.clear()
+        self.nbytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get counters of the cache.
+
+        Returns:
+            dict[str, int]: hits, misses, invalidations, a number of stored results and their total size in bytes.
+        """
+        return {"hits": self.hits, "misses": self.misses, "invalidations": self.invalidations, "entries": len(self), "nbytes": self.nbytes}
+
+    def _pop(self, key: Hashable) -> None:
+        """Private method. Drop a stored result if there is one."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.nbytes -= entry[0].nbytes
+
+    def _invalidate(self, version: int) -> None:
+        """Private method. Drop results found in another version of the collection."""
+        if self._entries:
+            self.invalidations += 1
+            self.clear()
+        self._version = version
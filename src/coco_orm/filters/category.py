@@ -36,7 +36,7 @@ class Filters(BaseFilter):
             if license_collection:
                 image_collection = filter_collection(image_collection, attr_name=LICENSE, attr_values=extract_unique_attr_values(license_collection, ID))
             annotation_collection = filter_collection(annotation_collection, attr_name=IMAGE_ID, attr_values=extract_unique_attr_values(image_collection, ID))
-        intersection.append(self.ids(extract_unique_attr_values(annotation_collection, CATEGORY_ID)))
+        intersection.append(ValuesProperty(extract_unique_attr_values(annotation_collection, CATEGORY_ID), IN, name=ID))
         self.append(intersection)
         return self
     
\ No newline at end of file
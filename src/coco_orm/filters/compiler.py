@@ -0,0 +1,317 @@
+from typing import Callable, Dict, Iterable, Iterator, List
+from functools import lru_cache
+from types import CodeType
+
+from ..operators.core import AND, OR, NOT_IN, GREATER_THAN, GREATER_THAN_OR_EQUAL_TO, LESS_THAN, LESS_THAN_OR_EQUAL_TO, INTERSECTS, WITHIN
+from .properties import ValueProperty, ValuesProperty, RangeProperty, BboxProperty, BboxRangeProperty, BboxRegionProperty, BboxNearestProperty, Intersection
+from .utils import check_logical_operator
+
+ENTITY = "entity"
+ENTITIES = "entities"
+POSITION = "position"
+
+"""Python spelling of operators that are not valid Python syntax as they are."""
+_python_operators = {NOT_IN: "not in"}
+
+"""Mirrored min comparison operators. Used to build chained comparisons: ``min_value <= entity.attr <= max_value``."""
+_mirrored_operators = {GREATER_THAN: LESS_THAN, GREATER_THAN_OR_EQUAL_TO: LESS_THAN_OR_EQUAL_TO}
+
+"""A number of compiled expressions kept for reuse: values are bound by name, so chains built the same way share their code."""
+COMPILED_CACHE_SIZE = 256
+
+
+def bbox_intersects(bbox, corners) -> bool:
+    """Check whether a bbox (x, y, width, height) overlaps the interior of a region given by corners (left, top, right, bottom)."""
+    left, top, right, bottom = corners
+    return bbox[0] < right and left < bbox[0] + bbox[2] and bbox[1] < bottom and top < bbox[1] + bbox[3]
+
+
+def bbox_within(bbox, corners) -> bool:
+    """Check whether a bbox (x, y, width, height) is contained by a region given by corners (left, top, right, bottom)."""
+    left, top, right, bottom = corners
+    return left <= bbox[0] and bbox[0] + bbox[2] <= right and top <= bbox[1] and bbox[1] + bbox[3] <= bottom
+
+
+"""Functions checking bboxes against regions, by spatial operator."""
+_region_predicates = {INTERSECTS: bbox_intersects, WITHIN: bbox_within}
+
+
+class CompiledFilter():
+    """
+    CompiledFilter holds Python callables compiled once from a filters chain.
+
+    Values of filter properties are bound to the compiled code as variables instead of being written into the source as literals,
+    so the callables can be reused for any number of entities without parsing or compiling the expression again.
+
+    Args/Attributes:
+        source (str): a Python expression built from the filters chain, evaluated against an ``entity`` variable.
+        namespace (dict): a namespace holding filter values referenced by the expression.
+
+    Attributes:
+        predicate (Callable[[BaseEntityModel], bool]): returns True if a given entity matches the filters.
+        select (Callable[[Iterable], list]): returns a list of entities matching the filters.
+        positions (Callable[[Iterable], list[int]]): returns a list of positions of entities matching the filters.
+        iterate (Callable[[Iterable], Iterator]): lazily yields entities matching the filters.
+        count (Callable[[Iterable], int]): returns a number of entities matching the filters.
+    """
+    def __init__(self, source: str, namespace: Dict):
+        self.source = source
+        self.namespace = namespace
+        code = _compile(source)
+        scope = dict(namespace, __builtins__={"enumerate": enumerate})
+        exec(code, scope)
+        self.predicate = scope["predicate"] # type: Callable
+        self.select = scope["select"] # type: Callable[[Iterable], List]
+        self.positions = scope["positions"] # type: Callable[[Iterable], List[int]]
+        self.iterate = scope["iterate"] # type: Callable[[Iterable], Iterator]
+        self.count = scope["count"] # type: Callable[[Iterable], int]
+
+    def __str__(self):
+        return self.source
+
+
+@lru_cache(maxsize=COMPILED_CACHE_SIZE)
+def _compile(source: str) -> CodeType:
+    """Private function. Compile callables of a CompiledFilter evaluating an expression."""
+    return compile(
+        f"def predicate({ENTITY}):\n"
+        f"    return {source}\n"
+        f"def select({ENTITIES}):\n"
+        f"    return [{ENTITY} for {ENTITY} in {ENTITIES} if {source}]\n"
+        f"def positions({ENTITIES}):\n"
+        f"    return [{POSITION} for {POSITION}, {ENTITY} in enumerate({ENTITIES}) if {source}]\n"
+        f"def iterate({ENTITIES}):\n"
+        f"    for {ENTITY} in {ENTITIES}:\n"
+        f"        if {source}: yield {ENTITY}\n"
+        f"def count({ENTITIES}):\n"
+        f"    {POSITION} = 0\n"
+        f"    for {ENTITY} in {ENTITIES}:\n"
+        f"        if {source}: {POSITION} += 1\n"
+        f"    return {POSITION}\n",
+        "<coco_orm filter>",
+        "exec"
+    )
+
+
+class FilterCompiler():
+    """
+    FilterCompiler turns a filters chain into a CompiledFilter.
+
+    The produced expression keeps the semantics of ``ExpressionBuilder``: properties are joined by AND unless
+    an OR operator is given explicitly, and AND binds tighter than OR.
+    FilterCompiler is used by ``BaseFilter`` to filter collections. See ``coco_orm.filters.core.BaseFilter.apply``.
+
+    Child classes compile the same chain into other kinds of code by overriding ``property`` and the class attributes below.
+    See ``coco_orm.filters.vectorized.MaskCompiler``.
+
+    Attributes:
+        logical_operators (dict): spelling of logical operators in the produced expression.
+        everything (str): an expression an empty filters chain compiles to.
+        compiled_class (type): a class the expression is compiled with.
+    """
+    logical_operators = {AND: AND, OR: OR}
+    everything = "True"
+    compiled_class = CompiledFilter
+
+    def __new__(cls, filters) -> CompiledFilter:
+        """
+        Compile given filters.
+
+        Args:
+            filters (BaseFilter): an instance of BaseFilter implementation containing filters.
+
+        Raises:
+            Exception: if a logical operator is not placed between two filters.
+
+        Returns:
+            CompiledFilter: an object holding compiled callables, None if a child class can't compile one of the filters.
+        """
+        namespace = {}
+        expressions = []
+        for arg in filters:
+            if isinstance(arg, str): # arg type: logical operator
+                check_logical_operator(arg)
+                if not expressions:
+                    raise Exception(f"Logical operator {arg} must be placed between two filters.")
+                # replace last None element (or a preceding logical operator) with given logical operator
+                expressions[-1] = cls.logical_operators[arg]
+            else:
+                expression = cls.property(arg, namespace)
+                if expression is None:
+                    return None
+                ## add None to the end of each property to further replace it with AND operator if not specified by user.
+                expressions.extend((f"({expression})", None))
+        if expressions:
+            if expressions[-1] is not None:
+                raise Exception(f"Logical operator {expressions[-1]} must be placed between two filters.")
+            del expressions[-1]
+        # an empty filters chain matches every entity
+        source = " ".join(cls.logical_operators[AND] if elem is None else elem for elem in expressions) if expressions else cls.everything
+        return cls.compiled_class(source, namespace)
+
+    @staticmethod
+    def property(property, namespace: Dict) -> str:
+        """
+        Build an expression for a single filter property.
+        The most specific property types are checked first, since bbox properties inherit value/range properties.
+
+        Args:
+            property (BaseProperty | Intersection): a filter property.
+            namespace (dict): a namespace the property values are bound to.
+
+        Raises:
+            Exception: if the property type is not supported.
+
+        Returns:
+            str: an expression string.
+        """
+        if isinstance(property, BboxProperty): return FilterCompiler.bbox(property, namespace)
+        if isinstance(property, BboxRangeProperty): return FilterCompiler.bbox_range(property, namespace)
+        if isinstance(property, BboxRegionProperty): return FilterCompiler.region(property, namespace)
+        if isinstance(property, ValueProperty): return FilterCompiler.value(property, namespace)
+        if isinstance(property, ValuesProperty): return FilterCompiler.values(property, namespace)
+        if isinstance(property, RangeProperty): return FilterCompiler.range(property, namespace)
+        if isinstance(property, Intersection): return FilterCompiler.intersection(property, namespace)
+        if isinstance(property, BboxNearestProperty):
+            raise Exception(f"Nearest {property.name} filters depend on a collection, resolve them with BaseFilter.resolve first.")
+        raise Exception(f"Unsupported filter property: {property!r}")
+
+    @staticmethod
+    def bind(value, namespace: Dict) -> str:
+        """
+        Bind a value to the namespace.
+
+        Args:
+            value (mixed): a filter value.
+            namespace (dict): a namespace the value is bound to.
+
+        Returns:
+            str: a variable name referencing the value.
+        """
+        name = f"_{len(namespace)}"
+        namespace[name] = value
+        return name
+
+    @staticmethod
+    def attribute(name: str) -> str:
+        """
+        Build an attribute access expression.
+
+        Args:
+            name (str): an entity attribute name.
+
+        Raises:
+            Exception: if the name is not a valid attribute name.
+
+        Returns:
+            str: an attribute access expression.
+        """
+        if not name.isidentifier():
+            raise Exception(f"Invalid property name: {name}")
+        return f"{ENTITY}.{name}"
+
+    @staticmethod
+    def value(property: ValueProperty, namespace: Dict) -> str:
+        """
+        Build an expression string for value-based filtering.
+
+        Args:
+            property (ValueProperty): an instance of ValueProperty containing filter data.
+            namespace (dict): a namespace the filter values are bound to.
+
+        Returns:
+            str: an expression string used for value-based filtering.
+        """
+        return f"{FilterCompiler.attribute(property.name)} {property.comparison_operator} {FilterCompiler.bind(property.value, namespace)}"
+
+    @staticmethod
+    def values(property: ValuesProperty, namespace: Dict) -> str:
+        """
+        Build an expression string for values-based filtering.
+
+        Args:
+            property (ValuesProperty): an instance of ValuesProperty containing filter data.
+            namespace (dict): a namespace the filter values are bound to.
+
+        Returns:
+            str: an expression string used for values-based filtering.
+        """
+        operator = _python_operators.get(property.membership_operator, property.membership_operator)
+        return f"{FilterCompiler.attribute(property.name)} {operator} {FilterCompiler.bind(property.values, namespace)}"
+
+    @staticmethod
+    def range(property: RangeProperty, namespace: Dict, attribute: str = None) -> str:
+        """
+        Build a chained comparison expression string for range-based filtering.
+
+        Args:
+            property (RangeProperty): an instance of RangeProperty containing filter data.
+            namespace (dict): a namespace the filter values are bound to.
+            attribute (Optional[str]): an expression the range is applied to, the property attribute if not provided.
+
+        Returns:
+            str: an expression string used for range-based filtering.
+        """
+        attribute = attribute if attribute else FilterCompiler.attribute(property.name)
+        min_value = FilterCompiler.bind(property.min_value, namespace)
+        max_value = FilterCompiler.bind(property.max_value, namespace)
+        return f"{min_value} {_mirrored_operators[property.min_comparison_operator]} {attribute} {property.max_comparison_operator} {max_value}"
+
+    @staticmethod
+    def bbox(property: BboxProperty, namespace: Dict) -> str:
+        """
+        Build an expression string for bbox-based filtering.
+
+        Args:
+            property (BboxProperty): an instance of BboxProperty containing filter data.
+            namespace (dict): a namespace the filter values are bound to.
+
+        Returns:
+            str: an expression string used for bbox-based filtering.
+        """
+        return f"{ENTITY}.bbox[{int(property.idx)}] {property.comparison_operator} {FilterCompiler.bind(property.value, namespace)}"
+
+    @staticmethod
+    def bbox_range(property: BboxRangeProperty, namespace: Dict) -> str:
+        """
+        Build an expression string for bbox_range-based filtering.
+
+        Args:
+            property (BboxRangeProperty): an instance of BboxRangeProperty containing filter data.
+            namespace (dict): a namespace the filter values are bound to.
+
+        Returns:
+            str: an expression string used for bbox_range-based filtering.
+        """
+        return FilterCompiler.range(property, namespace, attribute=f"{ENTITY}.bbox[{int(property.idx)}]")
+
+    @staticmethod
+    def region(property: BboxRegionProperty, namespace: Dict) -> str:
+        """
+        Build an expression string for region-based bbox filtering.
+
+        Args:
+            property (BboxRegionProperty): an instance of BboxRegionProperty containing filter data.
+            namespace (dict): a namespace the filter values are bound to.
+
+        Returns:
+            str: an expression string used for region-based filtering.
+        """
+        predicate = FilterCompiler.bind(_region_predicates[property.spatial_operator], namespace)
+        return f"{predicate}({FilterCompiler.attribute(property.name)}, {FilterCompiler.bind(property.corners, namespace)})"
+
+    @staticmethod
+    def intersection(intersection: Intersection, namespace: Dict) -> str:
+        """
+        Build an expression string for intersection-based filtering.
+
+        Args:
+            intersection (Intersection): an instance of Intersection containing filter data.
+            namespace (dict): a namespace the filter values are bound to.
+
+        Returns:
+            str: an expression string used for intersection-based filtering.
+        """
+        if not intersection:
+            return "True"
+        return f" {AND} ".join(FilterCompiler.values(property, namespace) for property in intersection)
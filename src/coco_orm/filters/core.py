@@ -1,9 +1,12 @@
-from typing import List
+from typing import List, Optional, Iterable, Hashable
 
-from ..operators.core import IN, AND, OR
+from ..operators.core import EQUAL, IN, AND, OR
 from ..models.core import ID
-from .properties import ValuesProperty
-from .expression import ExpressionBuilder, ENTITY
+from .properties import ValueProperty, ValuesProperty, BboxNearestProperty, Intersection
+from .compiler import FilterCompiler, CompiledFilter
+from .vectorized import MaskCompiler, CompiledMask
+from .sql import SqlCompiler, CompiledQuery
+from .cache import fingerprint
 from ..models.core import BaseEntityModel
 
 
@@ -69,17 +72,141 @@ class BaseFilter(list):
         """
         pass
 
+    @property
+    def compiled(self) -> CompiledFilter:
+        """
+        Filters compiled into Python callables. See ``coco_orm.filters.compiler.FilterCompiler``.
+        Filters are compiled once and recompiled only if the chain (or a value of its properties) has been changed
+        since the last call. Chains without a fingerprint are compiled on every call.
+        """
+        key = self.fingerprint
+        if key is None or getattr(self, "_compiled_key", None) != key:
+            self._compiled = FilterCompiler(self) # type: CompiledFilter
+            self._compiled_key = key
+        return self._compiled
+
+    @property
+    def fingerprint(self) -> Optional[Hashable]:
+        """
+        A canonical fingerprint of the filters, used to cache filter results and compiled filters. See ``coco_orm.filters.cache.fingerprint``.
+        The fingerprint is built on every call from the current properties: properties may be replaced or changed in place,
+        and ids of replaced properties may be reused by new ones.
+        """
+        return fingerprint(self)
+
+    def compiled_mask(self, names: Iterable[str]) -> Optional[CompiledMask]:
+        """
+        Filters compiled into a function evaluating them over whole columns. See ``coco_orm.filters.vectorized.MaskCompiler``.
+
+        Args:
+            names (Iterable[str]): names of columns available to the filters.
+
+        Returns:
+            Optional[CompiledMask]: a compiled mask, None if some of the filters can't be evaluated over given columns.
+        """
+        key = (self.fingerprint, frozenset(names))
+        if key[0] is None or getattr(self, "_compiled_mask_key", None) != key:
+            compiled = MaskCompiler(self)
+            self._compiled_mask = compiled if compiled is not None and compiled.names <= key[1] else None # type: Optional[CompiledMask]
+            self._compiled_mask_key = key
+        return self._compiled_mask
+
+    def compiled_query(self, names: Iterable[str]) -> Optional[CompiledQuery]:
+        """
+        Filters compiled into an SQL condition evaluated by a database. See ``coco_orm.filters.sql.SqlCompiler``.
+
+        Args:
+            names (Iterable[str]): names of table columns available to the filters.
+
+        Returns:
+            Optional[CompiledQuery]: a compiled condition, None if some of the filters can't be translated over given columns.
+        """
+        key = (self.fingerprint, frozenset(names))
+        if key[0] is None or getattr(self, "_compiled_query_key", None) != key:
+            compiled = SqlCompiler(self)
+            self._compiled_query = compiled if compiled is not None and compiled.names <= key[1] else None # type: Optional[CompiledQuery]
+            self._compiled_query_key = key
+        return self._compiled_query
+
     def apply(self, collection: List[BaseEntityModel]) -> List:
         """
         Apply filters to a given collection.
+        Columnar collections (having ``column_names``, ``column`` and ``select`` members, see ``coco_orm.collections.columnar.Collection``)
+        are filtered with boolean masks over whole columns. SQL collections (having ``sql_columns`` and ``select_where`` members,
+        see ``coco_orm.collections.sqlite.Collection``) are filtered by the database. Otherwise filters are checked entity by entity:
+        if the collection has indexes on properties filtered by equality or membership, it is narrowed down with them first.
+
+        Args:
+            collection (list[BaseEntityModel]): a list of BaseEntityModel implementation instances.
+
+        Returns:
+            list[BaseEntityModel]: a list (or a collection) of entities matching the filters.
+        """
+        resolved = self.resolve(collection)
+        if resolved is not self:
+            return resolved.apply(collection)
+        names = getattr(collection, "sql_columns", None)
+        if names is not None:
+            compiled = self.compiled_query(names)
+            if compiled is not None:
+                return collection.select_where(compiled)
+        names = getattr(collection, "column_names", None)
+        if names is not None:
+            compiled = self.compiled_mask(names)
+            if compiled is not None:
+                return collection.select(compiled.mask(collection.column, len(collection)))
+        candidates = self._index_candidates(collection)
+        return self.compiled.select(collection if candidates is None else candidates)
+
+    def resolve(self, collection: List[BaseEntityModel]) -> "BaseFilter":
+        """
+        Resolve filters depending on other entities of a collection (see ``coco_orm.filters.properties.BboxNearestProperty``)
+        into filters by ids of entities they select in the collection, so the chain can be compiled.
+
+        Args:
+            collection (list[BaseEntityModel]): a collection the filters are going to be applied to.
+                See ``coco_orm.collections.annotation.Collection.nearest_ids``.
+
+        Raises:
+            Exception: if the collection can't resolve the filters.
+
+        Returns:
+            BaseFilter: filters of the same type without such filters, self if there are none.
+        """
+        if not any(isinstance(arg, BboxNearestProperty) for arg in self):
+            return self
+        nearest_ids = getattr(collection, "nearest_ids", None)
+        if nearest_ids is None:
+            raise Exception(f"Nearest bbox filters can't be applied to {type(collection).__name__}.")
+        return type(self)(
+            ValuesProperty(nearest_ids(arg, self), IN, name=ID) if isinstance(arg, BboxNearestProperty) else arg
+            for arg in self
+        )
+
+    def _index_candidates(self, collection: List[BaseEntityModel]) -> Optional[List[BaseEntityModel]]:
+        """
+        Private method. Look up entities matching one of equality / membership filters in collection indexes.
+        Only filters joined by AND are looked up, since every matching entity has to satisfy each of them.
 
         Args:
-            collection (list[Dict]): a list of dicts containing entities data.
+            collection (list[BaseEntityModel]): a collection to look entities up in. See ``coco_orm.collections.core.BaseCollection.lookup``.
 
         Returns:
-            List[Dict]: a list of dicts containing filtered entities data.
+            Optional[list[BaseEntityModel]]: the smallest list of candidates in collection order, None if indexes can't be used.
         """
-        expression = ExpressionBuilder(self)
-        # filter collection by built expression
-        # return a new collection object containing queried entities, None if no entities are found.
-        return [entity for entity in collection if eval(expression, {ENTITY: entity})]
+        lookup = getattr(collection, "lookup", None)
+        if lookup is None or OR in self:
+            return None
+        candidates = None
+        for arg in self:
+            for property in (arg if isinstance(arg, Intersection) else (arg,)):
+                if type(property) is ValueProperty and property.comparison_operator == EQUAL:
+                    values = (property.value,)
+                elif type(property) is ValuesProperty and property.membership_operator == IN:
+                    values = property.values
+                else:
+                    continue
+                entities = lookup(property.name, values)
+                if entities is not None and (candidates is None or len(entities) < len(candidates)):
+                    candidates = entities
+        return candidates
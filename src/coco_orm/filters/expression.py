@@ -8,8 +8,9 @@ class ExpressionBuilder():
     """
     ExpressionBuilder used to build expressions for filtering using user-defined property collection.
 
-    ExpressionBuilder is used by ``BaseFilter`` to build expression for filtering based on user-defined filters.
-    See ``coco_orm.filters.core.BaseFilter.apply``.
+    Filters are no longer evaluated with these expressions: ``BaseFilter`` compiles them with
+    ``coco_orm.filters.compiler.FilterCompiler``, which keeps the semantics of the expressions.
+    The builder is kept as the eval() baseline of ``benchmarks/bench_filters.py``.
     """
     def __new__(cls, filters) -> str:
         """
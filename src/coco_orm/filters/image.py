@@ -56,9 +56,9 @@ class Filters(BaseFilter):
     ):
         intersection = Intersection()
         if license_collection: 
-            intersection.append(self.licenses(extract_unique_attr_values(license_collection, ID)))
+            intersection.append(ValuesProperty(extract_unique_attr_values(license_collection, ID), IN, name=LICENSE))
         if category_collection: # if True - filter annotation_collection by category_ids contained in category_collection
             annotation_collection = filter_collection(annotation_collection, attr_name=CATEGORY_ID, attr_values=extract_unique_attr_values(category_collection, ID))
-        intersection.append(self.ids(extract_unique_attr_values(annotation_collection, IMAGE_ID)))
+        intersection.append(ValuesProperty(extract_unique_attr_values(annotation_collection, IMAGE_ID), IN, name=ID))
         self.append(intersection)
         return self
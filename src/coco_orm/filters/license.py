@@ -3,7 +3,7 @@ from ..operators.core import EQUAL, IN
 from .core import BaseFilter
 from .properties import ValueProperty, ValuesProperty, Intersection
 from .utils import extract_unique_attr_values
-from ..models.license import NAME, URL
+from ..models.license import ID, NAME, URL
 from ..models.image import LICENSE
 
 
@@ -26,6 +26,6 @@ class Filters(BaseFilter):
 
     def intersection(self, image_collection):
         intersection = Intersection()
-        intersection.append(self.ids(extract_unique_attr_values(image_collection, LICENSE)))
+        intersection.append(ValuesProperty(extract_unique_attr_values(image_collection, LICENSE), IN, name=ID))
         self.append(intersection)
         return self
\ No newline at end of file
@@ -1,6 +1,6 @@
-from typing import List
+from typing import Iterable, Sequence, Tuple
 
-from .utils import check_comparison_operator, check_membership_operator, check_range_comparison_operator
+from .utils import check_comparison_operator, check_membership_operator, check_range_comparison_operator, check_spatial_operator
 
 
 class BaseProperty():
@@ -8,8 +8,8 @@ class BaseProperty():
     BaseProperty contain common properties shared by child instances.
     All filter property classes must inherit that class in order to work properly in the COCO environment.
 
-    Instances of the class are used by ExpressionBuilder to build filter expressions. 
-    See: ``coco_orm.filters.core.expression.ExpressionBuilder``
+    Instances of the class are compiled by FilterCompiler into filter functions.
+    See: ``coco_orm.filters.compiler.FilterCompiler``
 
     Args/Attributes:
         name (str): a name of a property.
@@ -36,15 +36,16 @@ class ValueProperty(BaseProperty):
 class ValuesProperty(BaseProperty):
     """
     ValuesProperty represents a filter constructed for multiple values filtering.
+    Values are stored as a frozenset, so membership of an entity property is tested in O(1).
 
     Args/Attributes:
-        values (list[mixed]): a list of values to be filtered.
+        values (frozenset[mixed]): values to be filtered.
         membership_operator (str): a type of a membership operator applied by the filter.
         name (str): a name of a property to be filtered by.
     """
-    def __init__(self, values: List, membership_operator: str, name):
+    def __init__(self, values: Iterable, membership_operator: str, name):
         super().__init__(name)
-        self.values = values
+        self.values = values if isinstance(values, frozenset) else frozenset(values)
         self.membership_operator = check_membership_operator(name, membership_operator)
 
 
@@ -54,12 +55,12 @@ class RangeProperty(BaseProperty):
 
     Args/Attributes:
         min_value (float): a minimal value of the range.
-        min_comparison_operator (str): a type of a comparison operator applied to the min_value.
         max_value (float): a maximum value of the range.
+        min_comparison_operator (str): a type of a comparison operator applied to the min_value.
         max_comparison_operator (str): a type of a comparison operator applied to the max_value.
         name (str): a name of a property to be filtered by.
     """
-    def __init__(self, min_value: float, min_comparison_operator: str, max_value: float, max_comparison_operator: str, name):
+    def __init__(self, min_value: float, max_value: float, min_comparison_operator: str, max_comparison_operator: str, name):
         super().__init__(name)
         self.min_value = min_value
         self.max_value = max_value
@@ -87,17 +88,72 @@ class BboxRangeProperty(RangeProperty):
 
     Args/Attributes:
         min_value (float): a minimal value of the range.
-        min_comparison_operator (str): a type of a comparison operator applied to the min_value.
         max_value (float): a maximum value of the range.
+        min_comparison_operator (str): a type of a comparison operator applied to the min_value.
         max_comparison_operator (str): a type of a comparison operator applied to the max_value.
         name (str): a name of a property to be filtered by.
         idx (int): an index of an item of the bbox list.
     """
-    def __init__(self, min_value: float, min_comparison_operator: str, max_value: float, max_comparison_operator: str, name, idx: int):
-        super().__init__(min_value, min_comparison_operator, max_value, max_comparison_operator, name)
+    def __init__(self, min_value: float, max_value: float, min_comparison_operator: str, max_comparison_operator: str, name, idx: int):
+        super().__init__(min_value, max_value, min_comparison_operator, max_comparison_operator, name)
         self.idx = idx
 
 
+class BboxRegionProperty(BaseProperty):
+    """
+    BboxRegionProperty represents a filter selecting bboxes by their position relative to a region.
+    Bboxes intersect a region if they overlap its interior: ``x < region_x + region_width and region_x < x + width``
+    (the same for y), bboxes are within a region if they are contained by it, borders included.
+
+    Args/Attributes:
+        region (tuple[float, float, float, float]): a region in COCO bbox format: x, y, width, height.
+        spatial_operator (str): a type of a spatial operator applied by the filter.
+        name (str): a name of a property to be filtered by.
+    """
+    def __init__(self, region: Sequence[float], spatial_operator: str, name):
+        super().__init__(name)
+        self.region = _region(name, region)
+        self.spatial_operator = check_spatial_operator(name, spatial_operator)
+
+    @property
+    def corners(self) -> Tuple[float, float, float, float]:
+        """the left, the top, the right and the bottom edge of the region."""
+        x, y, width, height = self.region
+        return x, y, x + width, y + height
+
+
+class BboxNearestProperty(BaseProperty):
+    """
+    BboxNearestProperty represents a filter selecting, in each image, a number of bboxes nearest to a point.
+    A distance between a point and a bbox is 0 if the point is inside the bbox, bboxes at equal distances keep collection order.
+    Unlike other properties, it depends on other entities of a collection, so it is resolved against the filtered collection
+    into ids of nearest bboxes before filters are compiled, see ``coco_orm.filters.core.BaseFilter.resolve``.
+
+    Args/Attributes:
+        point (tuple[float, float]): x and y of a point.
+        k (int): a number of nearest bboxes selected in each image.
+        name (str): a name of a property to be filtered by.
+    """
+    def __init__(self, point: Sequence[float], k: int, name):
+        super().__init__(name)
+        if len(point) != 2:
+            raise Exception(f"A point of {name} property must have 2 coordinates, got {point}.")
+        if k < 1:
+            raise Exception(f"A number of nearest bboxes of {name} property must be positive, got {k}.")
+        self.point = tuple(map(float, point))
+        self.k = int(k)
+
+
+def _region(property_name: str, region: Sequence[float]) -> Tuple[float, float, float, float]:
+    """Private function. Check a region given as x, y, width, height."""
+    if len(region) != 4:
+        raise Exception(f"A region of {property_name} property must be given as [x, y, width, height], got {region}.")
+    region = tuple(map(float, region))
+    if region[2] < 0 or region[3] < 0:
+        raise Exception(f"A region of {property_name} property must have non-negative width and height, got {region}.")
+    return region
+
+
 # 
 class Intersection(list): # type: list[ValuesProperty]
     """
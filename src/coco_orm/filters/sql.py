@@ -0,0 +1,227 @@
+from typing import Dict, Optional
+
+from ..operators.core import AND, OR, EQUAL, NOT_EQUAL, NOT_IN, INTERSECTS
+from ..models.annotation import BBOX
+from .properties import ValueProperty, ValuesProperty, RangeProperty, BboxProperty, BboxRangeProperty, BboxRegionProperty, Intersection
+from .compiler import FilterCompiler, _mirrored_operators
+import json
+
+"""A namespace key collecting names of columns referenced by a compiled query."""
+_NAMES = "__names__"
+
+"""A range of integers SQLite stores."""
+_MIN_INTEGER = -2 ** 63
+_MAX_INTEGER = 2 ** 63 - 1
+
+
+class CompiledQuery():
+    """
+    CompiledQuery holds an SQL condition built once from a filters chain, evaluated by SQLite over a whole table.
+
+    Args/Attributes:
+        source (str): an SQL expression usable in a WHERE clause, filter values are referenced as named parameters.
+        namespace (dict): a namespace holding filter values referenced by the expression.
+
+    Attributes:
+        names (frozenset[str]): names of columns the expression reads.
+        parameters (dict): values of named parameters of the expression.
+    """
+    def __init__(self, source: str, namespace: Dict):
+        self.source = source
+        self.names = frozenset(namespace.pop(_NAMES, ()))
+        self.parameters = namespace
+
+    def __str__(self):
+        return self.source
+
+
+class SqlCompiler(FilterCompiler):
+    """
+    SqlCompiler turns a filters chain into a CompiledQuery: properties become SQL conditions joined by AND and OR,
+    which have the same precedence in SQL as in Python.
+    Conditions keep Python semantics of None: ``==`` and ``!=`` compare None values as equal, ``in`` matches None
+    if it is one of the values. Properties with values SQLite doesn't store (e.g. lists) make the whole chain
+    non-compilable, and it is compiled by FilterCompiler instead. See ``coco_orm.filters.core.BaseFilter.apply``.
+    """
+    logical_operators = {AND: "AND", OR: "OR"}
+    everything = "1"
+    compiled_class = CompiledQuery
+
+    @staticmethod
+    def property(property, namespace: Dict) -> Optional[str]:
+        """
+        Override. Build an SQL condition for a single filter property.
+
+        Returns:
+            Optional[str]: an SQL expression, None if the property can't be translated.
+        """
+        if isinstance(property, BboxProperty): return SqlCompiler.value(property, namespace, SqlCompiler.bbox(property, namespace))
+        if isinstance(property, BboxRangeProperty): return SqlCompiler.range(property, namespace, SqlCompiler.bbox(property, namespace))
+        if isinstance(property, BboxRegionProperty): return SqlCompiler.region(property, namespace)
+        if isinstance(property, ValueProperty): return SqlCompiler.value(property, namespace)
+        if isinstance(property, ValuesProperty): return SqlCompiler.values(property, namespace)
+        if isinstance(property, RangeProperty): return SqlCompiler.range(property, namespace)
+        if isinstance(property, Intersection): return SqlCompiler.intersection(property, namespace)
+        return None
+
+    @staticmethod
+    def column(name: str, namespace: Dict) -> str:
+        """
+        Build a column reference.
+
+        Args:
+            name (str): a column name.
+            namespace (dict): a namespace the column name is recorded to.
+
+        Returns:
+            str: a quoted column name.
+        """
+        FilterCompiler.attribute(name) # validates the name
+        namespace.setdefault(_NAMES, set()).add(name)
+        return f'"{name}"'
+
+    @staticmethod
+    def bbox(property, namespace: Dict) -> str:
+        """
+        Build an expression selecting an item of the bbox column, stored as a json array.
+
+        Args:
+            property (BboxProperty | BboxRangeProperty): a bbox filter property.
+            namespace (dict): a namespace the column name is recorded to.
+
+        Returns:
+            str: an SQL expression.
+        """
+        return f"json_extract({SqlCompiler.column(BBOX, namespace)}, '$[{int(property.idx)}]')"
+
+    @staticmethod
+    def parameter(value, namespace: Dict) -> Optional[str]:
+        """
+        Bind a value as a named parameter.
+
+        Args:
+            value (mixed): a filter value.
+            namespace (dict): a namespace the value is bound to.
+
+        Returns:
+            Optional[str]: a parameter reference, None if SQLite can't store the value.
+        """
+        if not SqlCompiler.is_storable(value):
+            return None
+        return f":{FilterCompiler.bind(value, namespace)}"
+
+    @staticmethod
+    def is_storable(value) -> bool:
+        """
+        Check whether SQLite stores a value as is.
+
+        Args:
+            value (mixed): a value.
+
+        Returns:
+            bool: True for None, strings, floats and 64-bit integers.
+        """
+        if isinstance(value, int):
+            return _MIN_INTEGER <= value <= _MAX_INTEGER
+        return value is None or isinstance(value, (str, float))
+
+    @staticmethod
+    def value(property: ValueProperty, namespace: Dict, column: Optional[str] = None) -> Optional[str]:
+        """
+        Override. Build a comparison condition.
+
+        Args:
+            property (ValueProperty): an instance of ValueProperty containing filter data.
+            namespace (dict): a namespace the filter values are bound to.
+            column (Optional[str]): an expression the comparison is applied to, the property column if not provided.
+
+        Returns:
+            Optional[str]: an SQL expression, None if the value can't be bound.
+        """
+        value = SqlCompiler.parameter(property.value, namespace)
+        if value is None:
+            return None
+        column = column or SqlCompiler.column(property.name, namespace)
+        # IS / IS NOT compare NULL as a value, like Python compares None
+        operator = {EQUAL: "IS", NOT_EQUAL: "IS NOT"}.get(property.comparison_operator, property.comparison_operator)
+        return f"{column} {operator} {value}"
+
+    @staticmethod
+    def values(property: ValuesProperty, namespace: Dict) -> Optional[str]:
+        """
+        Override. Build a membership condition. Values are bound as a single json array, so the number of values
+        is not limited by the number of SQL parameters.
+
+        Args:
+            property (ValuesProperty): an instance of ValuesProperty containing filter data.
+            namespace (dict): a namespace the filter values are bound to.
+
+        Returns:
+            Optional[str]: an SQL expression, None if values can't be bound.
+        """
+        if not all(SqlCompiler.is_storable(value) for value in property.values):
+            return None
+        values = [value for value in property.values if value is not None]
+        has_none = len(values) != len(property.values)
+        column = SqlCompiler.column(property.name, namespace)
+        values = f"(SELECT value FROM json_each({SqlCompiler.parameter(json.dumps(values), namespace)}))"
+        if property.membership_operator == NOT_IN:
+            return f"{column} IS NOT NULL AND {column} NOT IN {values}" if has_none else f"{column} IS NULL OR {column} NOT IN {values}"
+        return f"{column} IS NULL OR {column} IN {values}" if has_none else f"{column} IN {values}"
+
+    @staticmethod
+    def range(property: RangeProperty, namespace: Dict, column: Optional[str] = None) -> Optional[str]:
+        """
+        Override. Build a range condition: ``min_value <= column AND column <= max_value``.
+
+        Args:
+            property (RangeProperty): an instance of RangeProperty containing filter data.
+            namespace (dict): a namespace the filter values are bound to.
+            column (Optional[str]): an expression the range is applied to, the property column if not provided.
+
+        Returns:
+            Optional[str]: an SQL expression, None if range bounds can't be bound.
+        """
+        if property.min_value is None or property.max_value is None:
+            return None
+        min_value = SqlCompiler.parameter(property.min_value, namespace)
+        max_value = SqlCompiler.parameter(property.max_value, namespace)
+        if min_value is None or max_value is None:
+            return None
+        column = column or SqlCompiler.column(property.name, namespace)
+        return f"{min_value} {_mirrored_operators[property.min_comparison_operator]} {column} AND {column} {property.max_comparison_operator} {max_value}"
+
+    @staticmethod
+    def region(property: BboxRegionProperty, namespace: Dict) -> str:
+        """
+        Override. Build a region condition over items of the bbox column, see ``coco_orm.filters.compiler.bbox_intersects``
+        and ``coco_orm.filters.compiler.bbox_within``.
+
+        Args:
+            property (BboxRegionProperty): an instance of BboxRegionProperty containing filter data.
+            namespace (dict): a namespace the filter values are bound to.
+
+        Returns:
+            str: an SQL expression.
+        """
+        column = SqlCompiler.column(BBOX, namespace)
+        x, y, width, height = (f"json_extract({column}, '$[{idx}]')" for idx in range(4))
+        left, top, right, bottom = (SqlCompiler.parameter(corner, namespace) for corner in property.corners)
+        if property.spatial_operator == INTERSECTS:
+            return f"{x} < {right} AND {left} < {x} + {width} AND {y} < {bottom} AND {top} < {y} + {height}"
+        return f"{left} <= {x} AND {x} + {width} <= {right} AND {top} <= {y} AND {y} + {height} <= {bottom}"
+
+    @staticmethod
+    def intersection(intersection: Intersection, namespace: Dict) -> Optional[str]:
+        """
+        Override. Build an intersection condition.
+
+        Returns:
+            Optional[str]: an SQL expression, None if one of the properties can't be translated.
+        """
+        if not intersection:
+            return SqlCompiler.everything
+        expressions = [SqlCompiler.values(property, namespace) for property in intersection]
+        if None in expressions:
+            return None
+        return " AND ".join(f"({expression})" for expression in expressions)
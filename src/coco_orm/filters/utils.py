@@ -1,5 +1,9 @@
-from typing import List, Tuple
-from ..operators.core import _logical_operators, _comparison_operators, _membership_operators, _min_comparison_operators, _max_comparison_operators, IN
+from typing import List, Tuple, FrozenSet, Iterable
+from operator import attrgetter
+
+import numpy as np
+
+from ..operators.core import _logical_operators, _comparison_operators, _membership_operators, _min_comparison_operators, _max_comparison_operators, _spatial_operators, IN
 
 
 """Strings containing valid operators. Used by checker methods for exception message generation."""
@@ -8,6 +12,7 @@ _min_comparison_ops_str = ', '.join(_min_comparison_operators)
 _max_comparison_ops_str = ', '.join(_max_comparison_operators)
 _membership_ops_str = ', '.join(_membership_operators)
 _logical_ops_str = ', '.join(_logical_operators)
+_spatial_ops_str = ', '.join(_spatial_operators)
 
 
 def check_comparison_operator(property_name: str, operator: str) -> str:
@@ -80,31 +85,65 @@ def check_logical_operator(operator: str) -> None:
     if operator not in _logical_operators:
         raise Exception(f"Invalid logical operator: {operator}. Supported logical operators: {_logical_ops_str}")
 
+def check_spatial_operator(property_name: str, operator: str) -> str:
+    """
+    Check spatial operator.
 
-def filter_collection(collection: List, attr_name: str, attr_values: List) -> List:
+    Args:
+        property_name (str): a name of a property a given operator is going to be applied to.
+        operator (str): an operator type.
+
+    Raises:
+        Exception: if given operator is not valid.
+
+    Returns:
+        str: an operator type.
+    """
+    if operator not in _spatial_operators:
+        raise Exception(f"Invalid spatial operator of {property_name} property_name. Supported spatial operators: {_spatial_ops_str}")
+    return operator
+
+
+def filter_collection(collection: List, attr_name: str, attr_values: Iterable) -> List:
     """
     Filter collection by attribute values.
 
     Args:
         collection (BaseCollection): an instance of BaseCollection implementation to filter.
         attr_name (str): an attribute name to filter collection by.
-        attr_values (List): a list attribute values to filter collection by.
+        attr_values (Iterable): attribute values to filter collection by.
 
     Returns:
         list: a list containing filtered collection entities.
     """
-    return [entity for entity in collection if getattr(entity, attr_name) in attr_values]
-
-def extract_unique_attr_values(collection: List, attr_name: str) -> List:
+    attr_values = attr_values if isinstance(attr_values, (set, frozenset)) else frozenset(attr_values)
+    column = _integer_column(collection, attr_name)
+    if column is not None:
+        return collection.take(np.flatnonzero(np.isin(column, np.fromiter(attr_values, dtype=np.int64, count=len(attr_values)))))
+    getter = attrgetter(attr_name)
+    return [entity for entity in collection if getter(entity) in attr_values]
+
+def extract_unique_attr_values(collection: List, attr_name: str) -> FrozenSet:
     """
     Extract unique attribute values from the collection.
-    Get all attribute values -> leave unique ones.
 
     Args:
         collection (BaseCollection): an instance of BaseCollection implementation to filter.
         attr_name (str): an attribute name to extract unique values from.
 
     Returns:
-        list: a list containing unique attribute va;lues.
+        frozenset: a set containing unique attribute values.
     """
-    return list(set([getattr(entity, attr_name) for entity in collection]))
\ No newline at end of file
+    if attr_name in getattr(collection, "sql_columns", ()):
+        return collection.distinct(attr_name)
+    column = _integer_column(collection, attr_name)
+    if column is not None:
+        return frozenset(np.unique(column).tolist())
+    return frozenset(map(attrgetter(attr_name), collection))
+
+def _integer_column(collection: List, attr_name: str):
+    """Private function. Get values of an integer column of a columnar collection (or view), None if the collection has no such column."""
+    if attr_name not in getattr(collection, "column_names", ()):
+        return None
+    column = collection.column(attr_name)
+    return column if column.ndim == 1 and column.dtype.kind in "iu" else None
@@ -0,0 +1,235 @@
+from typing import Callable, Dict, Optional, Tuple
+from numbers import Number
+from functools import lru_cache
+from types import CodeType
+
+import numpy as np
+
+from ..operators.core import AND, OR, NOT_IN, INTERSECTS, WITHIN
+from ..models.annotation import BBOX
+from .properties import ValueProperty, ValuesProperty, RangeProperty, BboxProperty, BboxRangeProperty, BboxRegionProperty, Intersection
+from .compiler import FilterCompiler, COMPILED_CACHE_SIZE, _mirrored_operators
+
+COLUMN = "column"
+SIZE = "size"
+
+"""A namespace key collecting names of columns referenced by a compiled mask."""
+_NAMES = "__names__"
+
+
+def bboxes_intersect(bboxes: np.ndarray, corners: Tuple[float, float, float, float]) -> np.ndarray:
+    """Mark bboxes of an (N, 4) array overlapping the interior of a region given by corners, see ``coco_orm.filters.compiler.bbox_intersects``."""
+    left, top, right, bottom = corners
+    x, y = bboxes[:, 0].astype(np.float64), bboxes[:, 1].astype(np.float64)
+    return (x < right) & (left < x + bboxes[:, 2]) & (y < bottom) & (top < y + bboxes[:, 3])
+
+
+def bboxes_within(bboxes: np.ndarray, corners: Tuple[float, float, float, float]) -> np.ndarray:
+    """Mark bboxes of an (N, 4) array contained by a region given by corners, see ``coco_orm.filters.compiler.bbox_within``."""
+    left, top, right, bottom = corners
+    x, y = bboxes[:, 0].astype(np.float64), bboxes[:, 1].astype(np.float64)
+    return (left <= x) & (x + bboxes[:, 2] <= right) & (top <= y) & (y + bboxes[:, 3] <= bottom)
+
+
+"""Functions checking arrays of bboxes against regions, by spatial operator."""
+_region_masks = {INTERSECTS: bboxes_intersect, WITHIN: bboxes_within}
+
+
+class CompiledMask():
+    """
+    CompiledMask holds a function compiled once from a filters chain, evaluating the filters over whole columns at once.
+
+    Args/Attributes:
+        source (str): a NumPy expression built from the filters chain, evaluated against a ``column`` callable.
+        namespace (dict): a namespace holding filter values referenced by the expression.
+
+    Attributes:
+        names (frozenset[str]): names of columns the expression reads.
+        mask (Callable[[Callable[[str], np.ndarray], int], np.ndarray]): returns a boolean array marking rows matching the filters,
+            given a function returning a column by its name and a number of rows.
+    """
+    def __init__(self, source: str, namespace: Dict):
+        self.source = source
+        self.names = frozenset(namespace.pop(_NAMES, ()))
+        self.namespace = namespace
+        code = _compile(source)
+        scope = dict(namespace, isin=np.isin, ones=np.ones, __builtins__={"bool": bool})
+        exec(code, scope)
+        self.mask = scope["mask"] # type: Callable[[Callable[[str], np.ndarray], int], np.ndarray]
+
+    def __str__(self):
+        return self.source
+
+
+@lru_cache(maxsize=COMPILED_CACHE_SIZE)
+def _compile(source: str) -> CodeType:
+    """Private function. Compile a mask function of a CompiledMask evaluating an expression."""
+    return compile(
+        f"def mask({COLUMN}, {SIZE}):\n"
+        f"    return {source}\n",
+        "<coco_orm mask>",
+        "exec"
+    )
+
+
+class MaskCompiler(FilterCompiler):
+    """
+    MaskCompiler turns a filters chain into a CompiledMask: properties become boolean arrays joined by ``&`` and ``|``,
+    which keep the precedence of AND and OR.
+    Properties that can't be evaluated over numeric columns (e.g. non-numeric or None values) make the whole chain
+    non-vectorizable, and it is compiled by FilterCompiler instead. See ``coco_orm.filters.core.BaseFilter.apply``.
+    """
+    logical_operators = {AND: "&", OR: "|"}
+    everything = f"ones({SIZE}, bool)"
+    compiled_class = CompiledMask
+
+    @staticmethod
+    def property(property, namespace: Dict) -> Optional[str]:
+        """
+        Override. Build a mask expression for a single filter property.
+
+        Returns:
+            Optional[str]: an expression string, None if the property can't be vectorized.
+        """
+        if isinstance(property, BboxProperty): return MaskCompiler.value(property, namespace, MaskCompiler.bbox(property, namespace))
+        if isinstance(property, BboxRangeProperty): return MaskCompiler.range(property, namespace, MaskCompiler.bbox(property, namespace))
+        if isinstance(property, BboxRegionProperty): return MaskCompiler.region(property, namespace)
+        if isinstance(property, ValueProperty): return MaskCompiler.value(property, namespace)
+        if isinstance(property, ValuesProperty): return MaskCompiler.values(property, namespace)
+        if isinstance(property, RangeProperty): return MaskCompiler.range(property, namespace)
+        if isinstance(property, Intersection): return MaskCompiler.intersection(property, namespace)
+        return None
+
+    @staticmethod
+    def column(name: str, namespace: Dict) -> str:
+        """
+        Build a column access expression.
+
+        Args:
+            name (str): a column name.
+            namespace (dict): a namespace the column name is recorded to.
+
+        Returns:
+            str: a column access expression.
+        """
+        FilterCompiler.attribute(name) # validates the name
+        namespace.setdefault(_NAMES, set()).add(name)
+        return f"{COLUMN}({name!r})"
+
+    @staticmethod
+    def bbox(property, namespace: Dict) -> str:
+        """
+        Build an expression selecting an item of the bbox column.
+
+        Args:
+            property (BboxProperty | BboxRangeProperty): a bbox filter property.
+            namespace (dict): a namespace the column name is recorded to.
+
+        Returns:
+            str: an expression string.
+        """
+        return f"{MaskCompiler.column(BBOX, namespace)}[:, {int(property.idx)}]"
+
+    @staticmethod
+    def scalar(value, namespace: Dict) -> Optional[str]:
+        """
+        Bind a numeric value. Values are bound as float64 / int64 scalars, so narrower columns are compared at full precision.
+
+        Args:
+            value (mixed): a filter value.
+            namespace (dict): a namespace the value is bound to.
+
+        Returns:
+            Optional[str]: a variable name referencing the value, None if the value is not numeric.
+        """
+        if not isinstance(value, Number) or isinstance(value, complex):
+            return None
+        return FilterCompiler.bind(np.asarray(value)[()], namespace)
+
+    @staticmethod
+    def value(property: ValueProperty, namespace: Dict, column: Optional[str] = None) -> Optional[str]:
+        """
+        Override. Build a comparison mask expression.
+
+        Args:
+            property (ValueProperty): an instance of ValueProperty containing filter data.
+            namespace (dict): a namespace the filter values are bound to.
+            column (Optional[str]): an expression the comparison is applied to, the property column if not provided.
+
+        Returns:
+            Optional[str]: an expression string, None if the value is not numeric.
+        """
+        value = MaskCompiler.scalar(property.value, namespace)
+        if value is None:
+            return None
+        return f"{column or MaskCompiler.column(property.name, namespace)} {property.comparison_operator} {value}"
+
+    @staticmethod
+    def values(property: ValuesProperty, namespace: Dict) -> Optional[str]:
+        """
+        Override. Build a membership mask expression.
+
+        Args:
+            property (ValuesProperty): an instance of ValuesProperty containing filter data.
+            namespace (dict): a namespace the filter values are bound to.
+
+        Returns:
+            Optional[str]: an expression string, None if values are not numeric.
+        """
+        if not all(isinstance(value, Number) and not isinstance(value, complex) for value in property.values):
+            return None
+        values = np.array(list(property.values))
+        if values.dtype.kind not in "iufb": # e.g. integers out of int64 range
+            return None
+        invert = property.membership_operator == NOT_IN
+        return f"isin({MaskCompiler.column(property.name, namespace)}, {FilterCompiler.bind(values, namespace)}, invert={invert})"
+
+    @staticmethod
+    def range(property: RangeProperty, namespace: Dict, column: Optional[str] = None) -> Optional[str]:
+        """
+        Override. Build a range mask expression: ``(min_value <= column) & (column <= max_value)``.
+
+        Args:
+            property (RangeProperty): an instance of RangeProperty containing filter data.
+            namespace (dict): a namespace the filter values are bound to.
+            column (Optional[str]): an expression the range is applied to, the property column if not provided.
+
+        Returns:
+            Optional[str]: an expression string, None if range bounds are not numeric.
+        """
+        min_value = MaskCompiler.scalar(property.min_value, namespace)
+        max_value = MaskCompiler.scalar(property.max_value, namespace)
+        if min_value is None or max_value is None:
+            return None
+        column = column or MaskCompiler.column(property.name, namespace)
+        return f"({min_value} {_mirrored_operators[property.min_comparison_operator]} {column}) & ({column} {property.max_comparison_operator} {max_value})"
+
+    @staticmethod
+    def region(property: BboxRegionProperty, namespace: Dict) -> str:
+        """
+        Override. Build a region mask expression over the bbox column.
+
+        Args:
+            property (BboxRegionProperty): an instance of BboxRegionProperty containing filter data.
+            namespace (dict): a namespace the filter values are bound to.
+
+        Returns:
+            str: an expression string.
+        """
+        mask = FilterCompiler.bind(_region_masks[property.spatial_operator], namespace)
+        return f"{mask}({MaskCompiler.column(property.name, namespace)}, {FilterCompiler.bind(property.corners, namespace)})"
+
+    @staticmethod
+    def intersection(intersection: Intersection, namespace: Dict) -> Optional[str]:
+        """
+        Override. Build an intersection mask expression.
+
+        Returns:
+            Optional[str]: an expression string, None if one of the properties can't be vectorized.
+        """
+        if not intersection:
+            return MaskCompiler.everything
+        expressions = [MaskCompiler.values(property, namespace) for property in intersection]
+        if None in expressions:
+            return None
+        return " & ".join(expressions)
@@ -1,5 +1,5 @@
-from typing import List, Dict, Optional
-from .core import BaseEntityModel, AbstractFactory, ID
+from typing import List, Optional
+from .core import BaseEntityModel, AbstractFactory, Field, compile_from_dict, ID
 
 
 """Constants defining dictionary keys."""
@@ -31,6 +31,8 @@ class Model(BaseEntityModel):
         segmentation (Optional[List]): a list of polygons
         area (Optional[float]): an area of bbox, px
     """
+    __slots__ = (IMAGE_ID, CATEGORY_ID, SEGMENTATION, AREA, BBOX, ISCROWD)
+
     def __init__(
         self,
         id: int, 
@@ -92,24 +94,12 @@ class Factory(AbstractFactory):
         return Model(id, image_id, category_id, bbox, iscrowd, segmentation, area)
 
 
-    @staticmethod
-    def from_dict(data: Dict) -> Model:
-        """
-        Implementation of the abstract method.
-        Builds an object-oriented entity model from dictionary data.
-
-        Args:
-            data: (dict): a dictionary containing entity data.
-
-        Returns:
-            Model: a instance of Model class containing entity data.
-        """
-        return Model(
-            id = int(data[ID]) if data.get(ID) is not None else 0,
-            image_id = int(data[IMAGE_ID]),
-            category_id = int(data[CATEGORY_ID]),
-            bbox = list(map(int, data[BBOX])),
-            segmentation = data[SEGMENTATION] if data.get(SEGMENTATION) is not None else None,
-            area = float(data[AREA]) if data.get(AREA) is not None else None,
-            iscrowd = int(data[ISCROWD]) if data.get(ISCROWD) is not None else 0
-        )
\ No newline at end of file
+    from_dict = staticmethod(compile_from_dict(Model, (
+        Field(ID, int, default=0),
+        Field(IMAGE_ID, int, required=True),
+        Field(CATEGORY_ID, int, required=True),
+        Field(SEGMENTATION),
+        Field(AREA, float),
+        Field(BBOX, int, required=True, items=True),
+        Field(ISCROWD, int, default=0),
+    )))
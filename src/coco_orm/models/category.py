@@ -1,5 +1,5 @@
-from typing import Dict, Optional
-from .core import BaseEntityModel, AbstractFactory, ID
+from typing import Optional
+from .core import BaseEntityModel, AbstractFactory, Field, compile_from_dict, ID
 
 """Constants defining dictionary keys."""
 ID = ID
@@ -16,6 +16,8 @@ class Model(BaseEntityModel):
         name: (str): category name
         supercategory (Optional[str]): supercategory name
     """
+    __slots__ = (NAME, SUPERCATEGORY)
+
     def __init__(
         self,
         id: int, 
@@ -60,20 +62,8 @@ class Factory(AbstractFactory):
         """
         return Model(id, name, supercategory)
 
-    @staticmethod
-    def from_dict(data: Dict) -> Model:
-        """
-        Implementation of the abstract method.
-        Builds an object-oriented entity model from dictionary data.
-
-        Args:
-            data: (dict): a dictionary containing entity data.
-
-        Returns:
-            Model: a instance of Model class containing entity data.
-        """
-        return Model(
-            id = int(data[ID]) if data.get(ID) is not None else 0,
-            name = str(data[NAME]),
-            supercategory = str(data[SUPERCATEGORY]) if data.get(SUPERCATEGORY) is not None else None
-        )
\ No newline at end of file
+    from_dict = staticmethod(compile_from_dict(Model, (
+        Field(ID, int, default=0),
+        Field(NAME, str, required=True),
+        Field(SUPERCATEGORY, str),
+    )))
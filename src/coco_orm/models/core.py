@@ -1,14 +1,145 @@
 from abc import ABC, abstractmethod
-from typing import Dict
+from typing import Dict, Callable, Iterable, Optional, Any
 
 ID = "id"
 
+
+class Field():
+    """
+    Field describes how a dictionary value is converted into a model attribute by a generated ``from_dict``.
+    See ``compile_from_dict``.
+
+    Args/Attributes:
+        name (str): a dictionary key and a model attribute name.
+        convert (Optional[Callable]): a conversion of the value, e.g. ``int``, None to keep the value as it is.
+        required (bool), default = False: the key must be present and its value is converted even if it is None.
+        default (mixed), default = None: an attribute value of an optional field whose key is missing or None.
+        items (bool), default = False: convert every item of the value (a list) instead of the value itself.
+    """
+    def __init__(self, name: str, convert: Optional[Callable] = None, required: bool = False, default: Any = None, items: bool = False):
+        if not name.isidentifier():
+            raise Exception(f"Invalid field name: {name!r}.")
+        self.name = name
+        self.convert = convert
+        self.required = required
+        self.default = default
+        self.items = items
+
+
+def compile_from_dict(model_class: type, fields: Iterable[Field]) -> Callable:
+    """
+    Generate a function building models from dictionaries. The function is compiled once, with every key,
+    conversion and default written out, so a call does no generic checks. Models are created without calling
+    their constructors. Model modules generate ``Factory.from_dict`` with it at import time, so the cost of
+    generating and compiling the source is paid once per process rather than per call.
+
+    The generated function takes ``(data, trusted=False)``. Trusted data are dictionaries already holding
+    converted values (e.g. produced by ``to_dict``): conversions are skipped, and defaults are only used for missing keys.
+
+    Args:
+        model_class (type): a model class with ``__slots__`` named after the fields.
+        fields (Iterable[Field]): conversions of all the model fields.
+
+    Returns:
+        Callable: a ``from_dict(data: dict, trusted: bool = False) -> model_class`` function.
+    """
+    fields = tuple(fields)
+    namespace = {"new": object.__new__, "model_class": model_class}
+    trusted, untrusted = [], []
+    for field in fields:
+        name = field.name
+        namespace[f"convert_{name}"] = field.convert
+        namespace[f"default_{name}"] = field.default
+        if field.convert is None: value = "{}"
+        elif field.items: value = f"list(map(convert_{name}, {{}}))"
+        else: value = f"convert_{name}({{}})"
+        if field.required:
+            trusted.append(f"entity.{name} = data[{name!r}]")
+            untrusted.append(f"entity.{name} = " + value.format(f"data[{name!r}]"))
+        else:
+            trusted.append(f"entity.{name} = data.get({name!r}, default_{name})")
+            if field.convert is None and field.default is None:
+                untrusted.append(f"entity.{name} = data.get({name!r})")
+            else:
+                untrusted.append(f"value = data.get({name!r})")
+                untrusted.append(f"entity.{name} = default_{name} if value is None else " + value.format("value"))
+    source = "\n".join([
+        "def from_dict(data, trusted=False):",
+        "    entity = new(model_class)",
+        "    if trusted:",
+        *(f"        {line}" for line in trusted),
+        "        return entity",
+        *(f"    {line}" for line in untrusted),
+        "    return entity",
+    ])
+    from_dict = _compile(source, "from_dict", namespace, f"{model_class.__module__}.from_dict")
+    from_dict.__doc__ = f"Build a {model_class.__module__}.{model_class.__name__} instance from dictionary data, see ``compile_from_dict``."
+    return from_dict
+
+
+def _compile_to_dict(model_class: type) -> Callable:
+    """Private function. Generate ``to_dict`` of a model class, reading its fields one by one."""
+    items = ", ".join(f"{name!r}: self.{name}" for name in model_class.fields)
+    lines = ["def to_dict(self, drop_none=False):", "    if drop_none:", "        data = {}"]
+    for name in model_class.fields:
+        lines += [f"        value = self.{name}", f"        if value is not None: data[{name!r}] = value"]
+    lines += ["    else:", f"        data = {{{items}}}"]
+    if model_class.__dictoffset__:
+        # attributes of child classes that don't declare __slots__, except private ones
+        lines.append("    data.update((key, value) for key, value in vars(self).items() if not key.startswith('_') and not (drop_none and value is None))")
+    lines.append("    return data")
+    to_dict = _compile("\n".join(lines), "to_dict", {}, f"{model_class.__module__}.{model_class.__name__}.to_dict")
+    to_dict.__doc__ = BaseModel.to_dict.__doc__
+    return to_dict
+
+
+def without_none(data: Dict) -> Dict:
+    """
+    Leave out keys of None values of a dictionarized model.
+
+    Args:
+        data (dict): a dictionary containing model data.
+
+    Returns:
+        dict: a new dictionary without None values.
+    """
+    return {key: value for key, value in data.items() if value is not None}
+
+
+def _compile(source: str, name: str, namespace: Dict, filename: str) -> Callable:
+    """Private function. Compile generated source defining a function, and return the function."""
+    exec(compile(source, f"<generated {filename}>", "exec"), namespace)
+    return namespace[name]
+
 class BaseModel():
     """
     BaseModel contains all common implementations shared by child classes.
     All models must inherit that class in order to work properly in the COCO environment.
 
+    Models declare their attributes with ``__slots__``, so instances don't carry a ``__dict__``.
+    Public slots of a model and its parents are collected into the ``fields`` class attribute in declaration order,
+    which is the order of keys returned by ``to_dict``. ``to_dict`` of every model class is generated once, when the class is created.
+    >>> class Model(BaseEntityModel):
+    ...     __slots__ = ("name", "supercategory")
+
+    Attributes:
+        fields (tuple[str]): names of model attributes.
     """
+    __slots__ = ()
+    fields = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        fields = []
+        for base in reversed(cls.__mro__):
+            slots = base.__dict__.get("__slots__", ())
+            for name in ((slots,) if isinstance(slots, str) else slots):
+                if not name.startswith("_") and name not in fields:
+                    fields.append(name)
+        cls.fields = tuple(fields)
+        if "to_dict" not in cls.__dict__:
+            cls.to_dict = _compile_to_dict(cls)
+
     def __str__(self):
         """
         Returns a string representation of an model.
@@ -18,14 +149,24 @@ class BaseModel():
         """
         return f'{self.to_dict()}'
 
-    def to_dict(self) -> Dict:
+    def to_dict(self, drop_none: bool = False) -> Dict:
         """
         Get dictionarized representation of a model.
+        A new dict is built on every call, changes of the dict don't change the model.
+        Public attributes of child classes that don't declare ``__slots__`` are included as well.
+
+        Args:
+            drop_none (bool), default = False: leave out keys of None values.
 
         Returns:
             dict: a dict containing model data.
         """
-        return vars(self)
+        data = {name: getattr(self, name) for name in self.fields}
+        if hasattr(self, "__dict__"):
+            data.update((key, value) for key, value in vars(self).items() if not key.startswith("_"))
+        if drop_none:
+            return {key: value for key, value in data.items() if value is not None}
+        return data
 
 
 class BaseEntityModel(BaseModel):
@@ -36,6 +177,8 @@ class BaseEntityModel(BaseModel):
     Args/Attributes:
         id (in): an id of an entity represented by the model.
     """
+    __slots__ = (ID,)
+
     def __init__(self, id: int):
         self.id = id
 
@@ -58,12 +201,14 @@ class AbstractFactory(ABC):
 
     @staticmethod
     @abstractmethod
-    def from_dict(data: Dict) -> BaseModel:
+    def from_dict(data: Dict, trusted: bool = False) -> BaseModel:
         """
         Create an instance of BaseModel implementation from dictionary data.
+        Implementations are usually generated, see ``compile_from_dict``.
 
         Args:
             data: (dict): a dictionary containing entity data.
+            trusted (bool): data hold converted values (e.g. produced by ``to_dict``), skip conversions.
 
         Returns:
             BaseModel: an instance of BaseModel implementation containing entity data.
@@ -1,5 +1,5 @@
-from typing import Dict, Optional
-from .core import BaseEntityModel, AbstractFactory, ID
+from typing import Optional
+from .core import BaseEntityModel, AbstractFactory, Field, compile_from_dict, ID
 
 
 """Constants defining dictionary keys."""
@@ -28,6 +28,8 @@ class Model(BaseEntityModel):
         date_captured (Optional[str]): date captured
 
     """
+    __slots__ = (FILE_NAME, WIDTH, HEIGHT, LICENSE, FLICKR_URL, COCO_URL, DATE_CAPTURED)
+
     def __init__(
         self,
         id: int, 
@@ -93,25 +95,13 @@ class Factory(AbstractFactory):
         """
         return Model(id, file_name, width, height, license, flickr_url, coco_url, date_captured)
 
-    @staticmethod
-    def from_dict(data: Dict) -> Model:
-        """
-        Implementation of the abstract method.
-        Builds an object-oriented entity model from dictionary data.
-
-        Args:
-            data: (dict): a dictionary containing entity data.
-
-        Returns:
-            Model: a instance of Model class containing entity data.
-        """
-        return Model(
-            id = int(data[ID]) if data.get(ID) is not None else 0,
-            file_name = str(data[FILE_NAME]),
-            width = int(data[WIDTH]) if data.get(WIDTH) is not None else None,
-            height = int(data[HEIGHT]) if data.get(HEIGHT) is not None else None,
-            license = int(data[LICENSE]) if data.get(LICENSE) is not None else None,
-            flickr_url = str(data[FLICKR_URL]) if data.get(FLICKR_URL) is not None else None,
-            coco_url = str(data[COCO_URL]) if data.get(COCO_URL) is not None else None,
-            date_captured = str(data[DATE_CAPTURED]) if data.get(DATE_CAPTURED) is not None else None
-        )
\ No newline at end of file
+    from_dict = staticmethod(compile_from_dict(Model, (
+        Field(ID, int, default=0),
+        Field(FILE_NAME, str, required=True),
+        Field(WIDTH, int),
+        Field(HEIGHT, int),
+        Field(LICENSE, int),
+        Field(FLICKR_URL, str),
+        Field(COCO_URL, str),
+        Field(DATE_CAPTURED, str),
+    )))
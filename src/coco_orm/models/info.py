@@ -1,5 +1,5 @@
-from typing import Dict, Optional
-from .core import BaseModel, AbstractFactory
+from typing import Optional
+from .core import BaseModel, AbstractFactory, Field, compile_from_dict
 
 
 """Constants defining dictionary keys."""
@@ -23,6 +23,8 @@ class Model(BaseModel):
         url (Optional[str]): url
         date_created (Optional[str]): date_created
     """
+    __slots__ = (YEAR, VERSION, DESCRIPTION, CONTRIBUTOR, URL, DATE_CREATED)
+
     def __init__(
         self,
         year: Optional[int] = None, 
@@ -74,23 +76,11 @@ class Factory(AbstractFactory):
         """
         return Model(year, version, description, contributor, url, date_created)
 
-    @staticmethod
-    def from_dict(data: Dict) -> Model:
-        """
-        Implementation of the abstract method.
-        Builds an object-oriented info model from dictionary data.
-
-        Args:
-            data: (dict): a dictionary containing info data.
-
-        Returns:
-            Model: a instance of Model class containing info data.
-        """
-        return Model(
-            year = int(data[YEAR]) if data.get(YEAR) is not None else None,
-            version = str(data[VERSION]) if data.get(VERSION) is not None else None,
-            description = str(data[DESCRIPTION]) if data.get(DESCRIPTION) is not None else None,
-            contributor = str(data[CONTRIBUTOR]) if data.get(CONTRIBUTOR) is not None else None,
-            url = str(data[URL]) if data.get(URL) is not None else None,
-            date_created = str(data[DATE_CREATED]) if data.get(DATE_CREATED) is not None else None
-        )
\ No newline at end of file
+    from_dict = staticmethod(compile_from_dict(Model, (
+        Field(YEAR, int),
+        Field(VERSION, str),
+        Field(DESCRIPTION, str),
+        Field(CONTRIBUTOR, str),
+        Field(URL, str),
+        Field(DATE_CREATED, str),
+    )))
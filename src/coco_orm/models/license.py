@@ -1,5 +1,5 @@
-from typing import Dict, Optional
-from .core import BaseEntityModel, AbstractFactory, ID
+from typing import Optional
+from .core import BaseEntityModel, AbstractFactory, Field, compile_from_dict, ID
 
 
 """Constants defining dictionary keys."""
@@ -17,6 +17,8 @@ class Model(BaseEntityModel):
         name: (str): file name
         url (Optional[str]): url
     """
+    __slots__ = (NAME, URL)
+
     def __init__(
         self,
         id: int, 
@@ -61,20 +63,8 @@ class Factory(AbstractFactory):
         """
         return Model(id, name, url)
 
-    @staticmethod
-    def from_dict(data: Dict) -> Model:
-        """
-        Implementation of the abstract method.
-        Builds an object-oriented entity model from dictionary data.
-
-        Args:
-            data: (dict): a dictionary containing entity data.
-
-        Returns:
-            Model: a instance of Model class containing entity data.
-        """
-        return Model(
-            id = int(data[ID]) if data.get(ID) is not None else 0,
-            name = str(data[NAME]),
-            url = str(data[URL]) if data.get(URL) is not None else None
-        )
\ No newline at end of file
+    from_dict = staticmethod(compile_from_dict(Model, (
+        Field(ID, int, default=0),
+        Field(NAME, str, required=True),
+        Field(URL, str),
+    )))
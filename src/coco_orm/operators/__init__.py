@@ -1,6 +1,7 @@
-from .core import ComparisonOperators, MembershipOperators, LogicalOperators, Operators
+from .core import ComparisonOperators, MembershipOperators, LogicalOperators, SpatialOperators, Operators
 
 comparison_operators = ComparisonOperators()
 membership_operators = MembershipOperators()
 logical_operators = LogicalOperators()
+spatial_operators = SpatialOperators()
 operators = Operators()
\ No newline at end of file
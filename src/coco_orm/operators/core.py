@@ -19,6 +19,11 @@ AND = "and"
 OR = "or"
 _logical_operators = [AND, OR]
 
+# Spatial Operators
+INTERSECTS = "intersects"
+WITHIN = "within"
+_spatial_operators = [INTERSECTS, WITHIN]
+
 class ComparisonOperators():
     EQUAL = EQUAL
     NOT_EQUAL = NOT_EQUAL
@@ -35,5 +40,9 @@ class LogicalOperators():
     AND = AND
     OR = OR
 
-class Operators(ComparisonOperators, MembershipOperators, LogicalOperators):
+class SpatialOperators():
+    INTERSECTS = INTERSECTS
+    WITHIN = WITHIN
+
+class Operators(ComparisonOperators, MembershipOperators, LogicalOperators, SpatialOperators):
     pass
\ No newline at end of file
@@ -0,0 +1,45 @@
+"""
+Small COCO-like datasets used by tests.
+"""
+import json
+import random
+
+
+def make_dict(num_images: int = 20, num_annotations: int = 200, num_categories: int = 5, num_licenses: int = 3, seed: int = 0) -> dict:
+    """
+    Build a dictionary with COCO dataset structure filled with random data.
+
+    Args:
+        num_images (int): a number of images.
+        num_annotations (int): a number of annotations, spread randomly across images.
+        num_categories (int): a number of categories.
+        num_licenses (int): a number of licenses.
+        seed (int): a seed of the random generator.
+
+    Returns:
+        dict: a dictionary containing COCO dataset.
+    """
+    rnd = random.Random(seed)
+    images = [
+        {"id": i, "file_name": f"{i:012d}.jpg", "width": 640, "height": 480, "license": rnd.randint(1, num_licenses),
+         "coco_url": f"http://images.cocodataset.org/train2017/{i:012d}.jpg", "date_captured": "2013-11-14 16:28:13"}
+        for i in range(1, num_images + 1)
+    ]
+    annotations = []
+    for i in range(1, num_annotations + 1):
+        x, y, w, h = rnd.randint(0, 600), rnd.randint(0, 440), rnd.randint(1, 300), rnd.randint(1, 300)
+        annotations.append({
+            "id": i, "image_id": rnd.randint(1, num_images), "category_id": rnd.randint(1, num_categories),
+            "segmentation": [[x, y, x + w, y, x + w, y + h, x, y + h]], "area": float(w * h), "bbox": [x, y, w, h],
+            "iscrowd": int(rnd.random() < 0.1),
+        })
+    categories = [{"id": i, "name": f"category_{i}", "supercategory": f"super_{i % 2}"} for i in range(1, num_categories + 1)]
+    licenses = [{"id": i, "name": f"license_{i}", "url": f"http://license/{i}"} for i in range(1, num_licenses + 1)]
+    return {"info": {"year": 2017, "version": "1.0"}, "images": images, "annotations": annotations, "categories": categories, "licenses": licenses}
+
+
+def write_json(path, data: dict) -> str:
+    """Write a dataset dictionary to a json file, return its path as a string."""
+    with open(path, "w") as file:
+        json.dump(data, file)
+    return str(path)
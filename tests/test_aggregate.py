@@ -0,0 +1,120 @@
+from collections import defaultdict
+
+import numpy as np
+import pytest
+
+from coco_orm.collections import AnnotationCollection, ColumnarAnnotationCollection, SqlAnnotationCollection
+from coco_orm.collections.aggregate import _factorize
+from coco_orm.filters import AnnotationFilters
+
+from .data import make_dict
+
+COLLECTIONS = (AnnotationCollection, ColumnarAnnotationCollection, SqlAnnotationCollection)
+
+KEYS = [(), ("category_id",), ("image_id", "category_id")]
+
+FILTERS = [
+    (lambda: None, lambda record: True),
+    (lambda: AnnotationFilters().iscrowd(0), lambda record: record["iscrowd"] == 0),
+    (lambda: AnnotationFilters().category_ids([1, 2]).area(20000, ">"), lambda record: record["category_id"] in (1, 2) and record["area"] > 20000),
+]
+
+VALUES = {
+    "area": lambda record: record["area"],
+    "bbox_width": lambda record: record["bbox"][2],
+    "bbox_height": lambda record: record["bbox"][3],
+}
+
+
+@pytest.fixture
+def records():
+    return make_dict(num_images=8, num_annotations=300, num_categories=4)["annotations"]
+
+
+def brute_force_groups(records, attr_names, predicate):
+    groups = defaultdict(list)
+    for record in records:
+        if predicate(record):
+            key = tuple(record[name] for name in attr_names)
+            groups[key[0] if len(attr_names) == 1 else key].append(record)
+    return groups
+
+
+@pytest.mark.parametrize("collection_class", COLLECTIONS)
+@pytest.mark.parametrize("attr_names", KEYS)
+@pytest.mark.parametrize("filters,predicate", FILTERS)
+def test_aggregates_equal_brute_force(records, collection_class, attr_names, filters, predicate):
+    groups = brute_force_groups(records, attr_names, predicate)
+    group_by = collection_class(records).group_by(*attr_names, filters=filters())
+    counts = group_by.count()
+    assert counts == {key: len(group) for key, group in groups.items()}
+    if len(attr_names) == 1:
+        assert list(counts) == sorted(counts)
+    for name, value in VALUES.items():
+        assert group_by.sum(name) == pytest.approx({key: sum(map(value, group)) for key, group in groups.items()})
+        assert group_by.mean(name) == pytest.approx({key: np.mean(list(map(value, group))) for key, group in groups.items()})
+        quantiles = group_by.quantile(name, [0, 0.25, 0.5, 0.9, 1])
+        assert quantiles.keys() == groups.keys()
+        for key, group in groups.items():
+            assert quantiles[key] == pytest.approx(np.quantile(list(map(value, group)), [0, 0.25, 0.5, 0.9, 1]))
+
+
+@pytest.mark.parametrize("collection_class", COLLECTIONS)
+@pytest.mark.parametrize("bins,range", [(10, None), (7, (100, 200)), ([0, 50, 100, 300], None)])
+def test_histograms_equal_brute_force(records, collection_class, bins, range):
+    groups = brute_force_groups(records, ("category_id",), lambda record: True)
+    counts, edges = collection_class(records).group_by("category_id").histogram("bbox_width", bins, range)
+    expected_edges = np.histogram_bin_edges([record["bbox"][2] for record in records], bins, range)
+    assert edges == pytest.approx(expected_edges)
+    assert counts.keys() == groups.keys()
+    for key, group in groups.items():
+        assert counts[key].tolist() == np.histogram([record["bbox"][2] for record in group], expected_edges)[0].tolist()
+
+
+@pytest.mark.parametrize("collection_class", COLLECTIONS)
+def test_single_quantile_and_empty_selection(records, collection_class):
+    group_by = collection_class(records).group_by()
+    assert group_by.quantile("area", 0.5)[()] == pytest.approx(np.median([record["area"] for record in records]))
+    empty = collection_class(records).group_by("category_id", filters=AnnotationFilters().category_id(10))
+    assert empty.count() == {} and empty.mean("area") == {} and empty.quantile("area", [0.5]) == {}
+
+
+@pytest.mark.parametrize("collection_class", (AnnotationCollection, SqlAnnotationCollection))
+def test_none_values_are_skipped(records, collection_class):
+    for record in records[::4]:
+        record["area"] = None
+    groups = brute_force_groups(records, ("category_id",), lambda record: True)
+    group_by = collection_class(records).group_by("category_id")
+    assert group_by.count() == {key: len(group) for key, group in groups.items()}
+    areas = {key: [record["area"] for record in group if record["area"] is not None] for key, group in groups.items()}
+    assert group_by.mean("area") == pytest.approx({key: np.mean(values) for key, values in areas.items()})
+    assert group_by.quantile("area", 0.5) == pytest.approx({key: np.median(values) for key, values in areas.items()})
+
+
+@pytest.mark.parametrize("collection_class", COLLECTIONS)
+def test_aggregates_follow_changes_of_the_collection(records, collection_class):
+    collection = collection_class(records)
+    group_by = collection.group_by("category_id")
+    expected = group_by.count()
+    collection.delete(records[0]["id"])
+    expected[records[0]["category_id"]] -= 1
+    assert group_by.count() == expected
+
+
+def test_quantiles_out_of_range_are_rejected(records):
+    with pytest.raises(Exception):
+        AnnotationCollection(records).group_by().quantile("area", [0.5, 1.5])
+
+
+@pytest.mark.parametrize("collection_class", COLLECTIONS)
+def test_float_keys_are_not_truncated(records, collection_class):
+    for record, area in zip(records, [10.25, 10.5, 10.75, 11.0, 11.9, 12.0] * 50):
+        record["area"] = area
+    groups = brute_force_groups(records, ("area",), lambda record: True)
+    assert collection_class(records).group_by("area").count() == {key: len(group) for key, group in groups.items()}
+    assert len(collection_class(records).group_by("area").count()) == 6
+
+
+def test_bool_keys_stay_bools():
+    keys, codes = _factorize([True, False, True])
+    assert [type(key) for key in keys] == [bool, bool] and keys == [True, False] and codes.tolist() == [0, 1, 0]
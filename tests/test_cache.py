@@ -0,0 +1,61 @@
+import json
+import os
+
+import pytest
+
+from coco_orm import CocoDataset
+from coco_orm.dataset.cache import cache_dir_path, read_cache
+
+from .data import make_dict, write_json
+
+
+def summary(dataset):
+    return dataset.to_dict()
+
+
+@pytest.fixture
+def data():
+    data = make_dict(num_images=10, num_annotations=60)
+    # an RLE segmentation is kept as an object, not as polygon coordinates
+    data["annotations"][3]["segmentation"] = {"counts": [1, 2, 3], "size": [480, 640]}
+    return data
+
+
+@pytest.mark.parametrize("options", [{}, {"streaming": True}, {"lazy": True}])
+def test_cached_datasets_match_the_file(tmp_path, data, options):
+    filepath = write_json(tmp_path / "annotations.json", data)
+    expected = summary(CocoDataset(filepath))
+    assert read_cache(filepath) is None
+    assert summary(CocoDataset(filepath, cache=True, **options)) == expected
+    assert read_cache(filepath) is not None
+    reopened = CocoDataset(filepath, cache=True, **options)
+    assert summary(reopened) == expected
+    assert reopened.annotations.column("bbox").shape == (60, 4)
+
+
+def test_caches_are_rebuilt_when_the_file_changes(tmp_path, data):
+    filepath = write_json(tmp_path / "annotations.json", data)
+    CocoDataset(filepath, cache=True)
+    data["annotations"] = data["annotations"][:10]
+    write_json(filepath, data)
+    assert read_cache(filepath) is None
+    assert len(CocoDataset(filepath, cache=True).annotations) == 10
+    assert len(CocoDataset(filepath, cache=True).annotations) == 10
+
+
+def test_touched_files_keep_their_cache(tmp_path, data):
+    filepath = write_json(tmp_path / "annotations.json", data)
+    CocoDataset(filepath, cache=True)
+    stat = os.stat(filepath)
+    os.utime(filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert read_cache(filepath) is not None
+    with open(os.path.join(cache_dir_path(filepath), "manifest.json")) as file:
+        assert json.load(file)["mtime_ns"] == stat.st_mtime_ns + 10 ** 9
+
+
+def test_changes_of_mapped_columns_stay_in_memory(tmp_path, data):
+    filepath = write_json(tmp_path / "annotations.json", data)
+    CocoDataset(filepath, cache=True)
+    dataset = CocoDataset(filepath, cache=True)
+    dataset.annotations.column("area")[:] = 0
+    assert CocoDataset(filepath, cache=True).annotations.column("area")[0] == data["annotations"][0]["area"]
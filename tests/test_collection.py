@@ -0,0 +1,73 @@
+import random
+
+import pytest
+
+from coco_orm.collections import AnnotationCollection
+from coco_orm.models import Annotation
+
+from .data import make_dict
+
+
+def assert_indexed(collection):
+    expected = {}
+    for position, entity in enumerate(list.__iter__(collection)):
+        expected.setdefault(entity.id, position)
+    assert collection._get_positions() == expected
+    assert collection.last_id == max(expected, default=0)
+    for id, position in expected.items():
+        assert collection.get_by_id(id) is list.__getitem__(collection, position)
+
+
+def annotation(id):
+    return Annotation(id=id, image_id=1, category_id=1, bbox=[0, 0, 1, 1])
+
+
+def test_head_deletes_keep_the_index_up_to_date():
+    collection = AnnotationCollection(make_dict()["annotations"])
+    assert_indexed(collection)
+    for id in range(1, 51):
+        assert collection.delete(id).id == id
+        assert collection.get_by_id(id) is None
+    assert_indexed(collection)
+    del collection[0]
+    collection.pop(0)
+    del collection[:3]
+    assert_indexed(collection)
+
+
+def test_random_changes_keep_the_index_up_to_date():
+    rnd = random.Random(0)
+    collection = AnnotationCollection(make_dict()["annotations"])
+    collection.get_by_id(1)
+    next_id = 1000
+    for step in range(300):
+        kind = rnd.randrange(6)
+        if kind == 0:
+            collection.insert(rnd.randint(0, len(collection)), annotation(next_id))
+            next_id += 1
+        elif kind == 1 and collection:
+            del collection[rnd.randrange(len(collection))]
+        elif kind == 2 and collection:
+            collection.pop(rnd.randrange(len(collection)))
+        elif kind == 3:
+            start = rnd.randint(0, len(collection))
+            collection[start:start + rnd.randint(0, 3)] = [annotation(next_id + i) for i in range(rnd.randint(0, 3))]
+            next_id += 3
+        elif kind == 4:
+            collection.append(annotation(next_id))
+            next_id += 1
+        elif collection:
+            # ids of earlier and later entities are reused
+            collection.insert(rnd.randint(0, len(collection)), annotation(list.__getitem__(collection, rnd.randrange(len(collection))).id))
+        if step % 7 == 0:
+            assert_indexed(collection)
+    assert_indexed(collection)
+
+
+@pytest.mark.parametrize("position", [0, 5, -1])
+def test_duplicated_ids_point_to_the_first_entity(position):
+    collection = AnnotationCollection(make_dict(num_annotations=10)["annotations"])
+    collection.get_by_id(1)
+    collection.insert(position, annotation(3))
+    del collection[0]
+    assert_indexed(collection)
@@ -0,0 +1,101 @@
+import pytest
+
+from coco_orm.collections import AnnotationCollection, ColumnarAnnotationCollection
+from coco_orm.collections.columnar import Columns
+from coco_orm.filters import AnnotationFilters
+from coco_orm.models import Annotation
+
+from .data import make_dict
+
+
+@pytest.fixture
+def records():
+    return make_dict(num_annotations=40)["annotations"]
+
+
+def dicts(entities):
+    return [entity.to_dict() for entity in entities]
+
+
+def annotations(ids):
+    return [Annotation(id=id, image_id=1, category_id=1, bbox=[id, id, 2, 2], segmentation=[[0, 0, 1, 0, 1, 1]]) for id in ids]
+
+
+def test_columns_round_trip(records):
+    collection = ColumnarAnnotationCollection(records)
+    assert collection.to_dict() == AnnotationCollection(records).to_dict()
+    assert collection.column("bbox").shape == (len(records), 4)
+    assert collection.get_by_id(7).to_dict() == AnnotationCollection(records).get_by_id(7).to_dict()
+
+
+def test_updates_patch_the_id_index(records):
+    columnar, reference = ColumnarAnnotationCollection(records), AnnotationCollection(records)
+    positions = columnar._get_positions()
+    for collection in (columnar, reference):
+        collection.update(annotations([5])[0])
+        collection[9] = annotations([1000])[0] # the id of the row changes
+        collection[-1] = annotations([1001])[0]
+    assert columnar._positions is positions
+    assert columnar.to_dict() == reference.to_dict()
+    assert [columnar.get_by_id(id) is None for id in (10, 40, 1000, 1001)] == [True, True, False, False]
+    assert columnar.index(columnar.get_by_id(1000)) == 9 and columnar.last_id == reference.last_id
+    # an id shared with another row resolves to the first of them
+    for collection in (columnar, reference):
+        collection[20] = annotations([3])[0]
+        collection[2] = annotations([7])[0]
+    assert columnar.get_by_id(3).to_dict() == reference.get_by_id(3).to_dict()
+    assert columnar.get_by_id(7).to_dict() == reference.get_by_id(7).to_dict()
+    assert columnar.index(columnar.get_by_id(7)) == reference.index(reference.get_by_id(7))
+
+
+def test_read_only_columns_are_copied_on_update(records):
+    source = ColumnarAnnotationCollection(records)
+    arrays = {name: array.copy() for name, array in source.columns.arrays().items()}
+    for array in arrays.values():
+        array.setflags(write=False)
+    collection = ColumnarAnnotationCollection.from_columns(Columns.from_arrays(arrays, source.columns.objects()))
+    collection.update(annotations([5])[0])
+    assert collection.get_by_id(5).to_dict() == annotations([5])[0].to_dict()
+    assert arrays["bbox"][4].tolist() == records[4]["bbox"]
+
+
+@pytest.mark.parametrize("key", [slice(None, None, 2), slice(1, 30, 3), slice(None, None, -4), slice(35, 5, -7)])
+def test_extended_slices_match_lists(records, key):
+    columnar, reference = ColumnarAnnotationCollection(records), AnnotationCollection(records)
+    size = len(range(*key.indices(len(records))))
+    columnar[key] = annotations(range(1000, 1000 + size))
+    reference[key] = annotations(range(1000, 1000 + size))
+    assert columnar.to_dict() == reference.to_dict()
+    assert columnar.get_by_id(1000).to_dict() == reference.get_by_id(1000).to_dict()
+    del columnar[key]
+    del reference[key]
+    assert columnar.to_dict() == reference.to_dict()
+    assert [entity.id for entity in columnar] == list(columnar.column("id"))
+    with pytest.raises(ValueError):
+        columnar[::2] = annotations([1])
+
+
+@pytest.mark.parametrize("times", [3, 1, 0, -1])
+def test_repeating_matches_lists(records, times):
+    columnar, reference = ColumnarAnnotationCollection(records[:5]), AnnotationCollection(records[:5])
+    columnar *= times
+    reference *= times
+    assert columnar.to_dict() == reference.to_dict()
+
+
+def test_list_methods_read_columns(records):
+    collection = ColumnarAnnotationCollection(records)
+    entities = list(collection)
+    assert dicts(collection.copy()) == records
+    assert collection.count(entities[3]) == 1
+    assert collection == collection.copy() and not collection != entities
+    # entities of other collections are other objects, as they are for collections of models
+    assert collection != ColumnarAnnotationCollection(records) and collection != AnnotationCollection(records)
+    assert not ColumnarAnnotationCollection() != ColumnarAnnotationCollection()
+    assert dicts(collection + entities[:2]) == records + records[:2]
+    assert dicts(entities[:2] + collection) == records[:2] + records
+    assert dicts(collection * 2) == records * 2 and dicts(2 * collection) == records * 2
+    view = collection.filter(AnnotationFilters().category_id(2))
+    expected = [record for record in records if record["category_id"] == 2]
+    assert dicts(view.copy()) == expected and view.count(view[0]) == 1 and view == list(view)
+    assert view._parent is collection
@@ -0,0 +1,35 @@
+import bz2
+import gzip
+import json
+import lzma
+
+import pytest
+
+from coco_orm import CocoDataset
+from coco_orm.dataset.utils import detect_compression
+
+from .data import make_dict, write_json
+
+CODECS = {".gz": gzip, ".bz2": bz2, ".xz": lzma}
+
+
+@pytest.mark.parametrize("extension", list(CODECS))
+@pytest.mark.parametrize("options", [{}, {"streaming": True}, {"streaming": True, "lazy": True}, {"columnar": True}])
+def test_compressed_files_are_read_and_written(tmp_path, extension, options):
+    data = make_dict(num_annotations=50)
+    expected = CocoDataset(write_json(tmp_path / "annotations.json", data)).to_dict()
+    filepath = str(tmp_path / f"annotations.json{extension}")
+    CocoDataset(str(tmp_path / "annotations.json")).save(filepath, indent=None)
+    assert detect_compression(filepath) is CODECS[extension]
+    with CODECS[extension].open(filepath, "rt", encoding="utf-8") as file:
+        assert json.load(file) == expected
+    assert CocoDataset(filepath, **options).to_dict() == expected
+
+
+def test_compression_is_detected_by_content(tmp_path):
+    data = make_dict(num_annotations=10)
+    filepath = tmp_path / "annotations.json"
+    with gzip.open(filepath, "wt", encoding="utf-8") as file:
+        json.dump(data, file)
+    assert detect_compression(str(filepath)) is gzip and detect_compression(str(filepath), read=False) is None
+    assert len(CocoDataset(str(filepath), streaming=True).annotations) == 10
@@ -0,0 +1,56 @@
+import pytest
+
+from coco_orm import CocoDataset
+from coco_orm.filters import AnnotationFilters, CategoryFilters, ImageFilters, LicenseFilters
+
+from .data import make_dict, write_json
+
+
+def chains():
+    return (
+        ImageFilters().ids(list(range(1, 30))),
+        AnnotationFilters().area(2000, ">").OR.category_id(3),
+        CategoryFilters().ids([1, 3]),
+        LicenseFilters().ids([1]),
+    )
+
+
+def summary(dataset):
+    return tuple(sorted(entity.id for entity in collection) for collection in (dataset.images, dataset.annotations, dataset.categories, dataset.licenses))
+
+
+@pytest.fixture
+def filepath(tmp_path):
+    return write_json(tmp_path / "annotations.json", make_dict(num_images=40, num_annotations=300))
+
+
+def expected(data):
+    images = {image["id"]: image for image in data["images"] if image["id"] < 30 and image["license"] == 1}
+    annotations = [
+        annotation for annotation in data["annotations"]
+        if (annotation["area"] > 2000 or annotation["category_id"] == 3)
+        and annotation["image_id"] in images and annotation["category_id"] in (1, 3)
+    ]
+    image_ids = sorted({annotation["image_id"] for annotation in annotations})
+    return (
+        image_ids,
+        sorted(annotation["id"] for annotation in annotations),
+        sorted({annotation["category_id"] for annotation in annotations}),
+        sorted({images[id]["license"] for id in image_ids}),
+    )
+
+
+@pytest.mark.parametrize("options", [{}, {"columnar": True}, {"streaming": True, "lazy": True}, {"sqlite": "annotations.db"}])
+@pytest.mark.parametrize("inplace", [False, True])
+def test_filters_are_equivalent_across_backends(tmp_path, filepath, options, inplace):
+    if "sqlite" in options:
+        options = {"sqlite": str(tmp_path / options["sqlite"])}
+    dataset = CocoDataset(filepath, **options)
+    image_filters, annotation_filters, category_filters, license_filters = chains()
+    size = len(annotation_filters)
+    filtered = dataset.filter(image_filters, annotation_filters, category_filters, license_filters, inplace=inplace)
+    assert summary(filtered) == expected(make_dict(num_images=40, num_annotations=300))
+    if inplace:
+        assert filtered.images is dataset.images and summary(dataset) == summary(filtered)
+    # the chain of the caller is not changed
+    assert len(annotation_filters) == size
@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+
+from coco_orm.collections import AnnotationCollection, ColumnarAnnotationCollection
+from coco_orm.filters import AnnotationFilters
+from coco_orm.filters.cache import FilterCache
+from coco_orm.models import Annotation
+
+from .data import make_dict
+
+COLLECTIONS = (AnnotationCollection, ColumnarAnnotationCollection)
+
+CHAINS = [
+    lambda: AnnotationFilters().category_id(1),
+    lambda: AnnotationFilters().category_ids([2, 3]).OR.iscrowd(1),
+    lambda: AnnotationFilters().area(10000, ">"),
+    lambda: AnnotationFilters().ids([5, 10, 15]),
+]
+
+
+@pytest.fixture
+def records():
+    return make_dict(num_annotations=300)["annotations"]
+
+
+def ids(collection):
+    return [entity.id for entity in collection]
+
+
+@pytest.mark.parametrize("collection_class", COLLECTIONS)
+def test_cached_results_equal_uncached(records, collection_class):
+    collection = collection_class(records)
+    expected = [ids(collection.filter(chain())) for chain in CHAINS]
+    cache = collection.cache_filters()
+    for _ in range(2):
+        assert [ids(collection.filter(chain())) for chain in CHAINS] == expected
+    assert (cache.misses, cache.hits, len(cache)) == (len(CHAINS), len(CHAINS), len(CHAINS))
+
+
+@pytest.mark.parametrize("collection_class", COLLECTIONS)
+@pytest.mark.parametrize("mutate", [
+    lambda collection: collection.append(Annotation(image_id=1, category_id=1, bbox=[0, 0, 1, 1], area=1.0)),
+    lambda collection: collection.delete(collection[0].id),
+    lambda collection: collection.update(Annotation(id=collection[1].id, image_id=1, category_id=1, bbox=[0, 0, 1, 1], area=1.0)),
+    lambda collection: collection.pop(0),
+    lambda collection: collection.insert(0, Annotation(image_id=1, category_id=1, bbox=[0, 0, 1, 1], area=1.0)),
+])
+def test_cache_is_dropped_by_changes(records, collection_class, mutate):
+    collection = collection_class(records)
+    cache = collection.cache_filters()
+    filters = AnnotationFilters().category_id(1)
+    collection.filter(filters)
+    mutate(collection)
+    assert ids(collection.filter(filters)) == [entity.id for entity in collection if entity.category_id == 1]
+    assert (cache.misses, cache.hits, cache.invalidations) == (2, 0, 1)
+
+
+def test_views_are_not_cached_by_their_parent(records):
+    collection = AnnotationCollection(records)
+    cache = collection.cache_filters()
+    view = collection.filter(AnnotationFilters().iscrowd(0))
+    assert ids(view.filter(AnnotationFilters().category_id(1))) == [r["id"] for r in records if r["iscrowd"] == 0 and r["category_id"] == 1]
+    assert (cache.misses, len(cache)) == (1, 1)
+
+
+def test_group_by_uses_the_cache(records):
+    collection = AnnotationCollection(records)
+    cache = collection.cache_filters()
+    filters = AnnotationFilters().iscrowd(0)
+    counts = collection.group_by("category_id", filters=filters).count()
+    assert collection.group_by("category_id", filters=AnnotationFilters().iscrowd(0)).count() == counts
+    assert (cache.misses, cache.hits) == (1, 1)
+
+
+def test_dense_results_are_stored_as_bitmaps():
+    cache = FilterCache()
+    sparse, dense = np.array([3, 700, 999]), np.flatnonzero(np.arange(1000) % 3 == 0)
+    cache.put("sparse", 0, sparse, 1000)
+    cache.put("dense", 0, dense, 1000)
+    assert cache.nbytes == sparse.size * 4 + 1000 // 8
+    assert cache.get("sparse", 0).tolist() == sparse.tolist()
+    assert cache.get("dense", 0).tolist() == dense.tolist()
+
+
+def test_least_recently_used_results_are_evicted():
+    cache = FilterCache(max_entries=2)
+    for key in "abc":
+        cache.put(key, 0, np.array([1]), 1000)
+        cache.get("a", 0)
+    assert cache.get("b", 0) is None and cache.get("a", 0) is not None and cache.get("c", 0) is not None
+
+    cache = FilterCache(max_bytes=100)
+    cache.put("large", 0, np.arange(100), 10000)
+    assert len(cache) == 0
+    for key in range(4):
+        cache.put(key, 0, np.arange(10), 10000)
+    assert cache.nbytes <= 100 and [cache.get(key, 0) is not None for key in range(4)] == [False, False, True, True]
+
+
+def test_filters_without_fingerprint_are_not_cached(records):
+    collection = AnnotationCollection(records)
+    cache = collection.cache_filters()
+    filters = AnnotationFilters().category_id(1)
+    filters[0].value = {1: 1} # unhashable
+    assert filters.fingerprint is None
+    assert collection._cached_positions(filters) is None
+    assert (cache.hits, cache.misses, len(cache)) == (0, 0, 0)
@@ -0,0 +1,103 @@
+import pytest
+
+from coco_orm.collections import AnnotationCollection, ColumnarAnnotationCollection, SqlAnnotationCollection, ImageCollection, CategoryCollection
+from coco_orm.filters import AnnotationFilters, ImageFilters, CategoryFilters
+
+from .data import make_dict
+
+COLLECTIONS = (AnnotationCollection, ColumnarAnnotationCollection, SqlAnnotationCollection)
+
+
+@pytest.fixture
+def records():
+    return make_dict()["annotations"]
+
+
+def expected_ids(records, predicate):
+    return [record["id"] for record in records if predicate(record)]
+
+
+@pytest.mark.parametrize("collection_class", COLLECTIONS)
+def test_compiled_filters_follow_replaced_properties(records, collection_class):
+    collection = collection_class(records)
+    filters = AnnotationFilters().category_id(1)
+    assert [entity.id for entity in collection.filter(filters)] == expected_ids(records, lambda record: record["category_id"] == 1)
+    for category_id in (3, 2, 4):
+        # a popped property is freed, its id may be reused by the next one
+        filters.pop()
+        filters.category_id(category_id)
+        assert [entity.id for entity in collection.filter(filters)] == expected_ids(records, lambda record: record["category_id"] == category_id)
+
+
+@pytest.mark.parametrize("collection_class", COLLECTIONS)
+def test_compiled_filters_follow_values_changed_in_place(records, collection_class):
+    collection = collection_class(records)
+    filters = AnnotationFilters().category_id(1)
+    collection.filter(filters)
+    filters[0].value = 2
+    assert [entity.id for entity in collection.filter(filters)] == expected_ids(records, lambda record: record["category_id"] == 2)
+
+
+@pytest.mark.parametrize("collection_class", (AnnotationCollection, ColumnarAnnotationCollection))
+def test_filter_cache_follows_replaced_properties(records, collection_class):
+    collection = collection_class(records)
+    cache = collection.cache_filters()
+    filters = AnnotationFilters().category_id(1)
+    collection.filter(filters)
+    filters.pop()
+    filters.category_id(3)
+    assert [entity.id for entity in collection.filter(filters)] == expected_ids(records, lambda record: record["category_id"] == 3)
+    assert cache.misses == 2
+    assert [entity.id for entity in collection.filter(AnnotationFilters().category_id(3))] == expected_ids(records, lambda record: record["category_id"] == 3)
+    assert cache.hits == 1
+
+
+def test_fingerprints_of_equal_chains_are_equal():
+    assert AnnotationFilters().category_ids([1, 2]).OR.area(10, ">").fingerprint == AnnotationFilters().category_ids([2, 1]).OR.area(10, ">").fingerprint
+    assert AnnotationFilters().category_ids([1, 2]).fingerprint != AnnotationFilters().category_ids([1, 3]).fingerprint
+
+
+MEMBERSHIP = [
+    (lambda: AnnotationFilters().category_ids([1, 3]), lambda record: record["category_id"] in (1, 3)),
+    (lambda: AnnotationFilters().category_ids([1, 3], "not_in"), lambda record: record["category_id"] not in (1, 3)),
+    (lambda: AnnotationFilters().ids(range(1, 200, 7)), lambda record: record["id"] % 7 == 1),
+    (lambda: AnnotationFilters().image_ids([]), lambda record: False),
+    (lambda: AnnotationFilters().image_ids([2, 4, 6]).OR.iscrowd(1), lambda record: record["image_id"] in (2, 4, 6) or record["iscrowd"] == 1),
+]
+
+
+@pytest.mark.parametrize("collection_class", COLLECTIONS)
+@pytest.mark.parametrize("filters, predicate", MEMBERSHIP)
+def test_membership_filters(records, collection_class, filters, predicate):
+    collection = collection_class(records)
+    assert [entity.id for entity in collection.filter(filters())] == expected_ids(records, predicate)
+
+
+@pytest.mark.parametrize("collection_class", COLLECTIONS)
+def test_intersection_filters(collection_class):
+    data = make_dict()
+    images = ImageCollection(data["images"]).filter(ImageFilters().ids([1, 2, 3, 5, 8]))
+    categories = CategoryCollection(data["categories"]).filter(CategoryFilters().ids([2, 4]))
+    collection = collection_class(data["annotations"])
+    filtered = collection.filter(AnnotationFilters().intersection(images, categories))
+    expected = expected_ids(data["annotations"], lambda record: record["image_id"] in (1, 2, 3, 5, 8) and record["category_id"] in (2, 4))
+    assert [entity.id for entity in filtered] == expected
+
+
+VECTORIZED = [
+    lambda: AnnotationFilters().area_range(1000, 20000),
+    lambda: AnnotationFilters().area(5000, ">").category_id(2, "!="),
+    lambda: AnnotationFilters().bbox_width_range(10, 100, ">", "<").OR.bbox_height(50, "<="),
+    lambda: AnnotationFilters().iscrowd(1).OR.category_ids([1, 2], "not_in").image_id(3, ">="),
+    lambda: AnnotationFilters().ids([5, 10, 15]).OR.area(1000, "<"),
+]
+
+
+@pytest.mark.parametrize("filters", VECTORIZED)
+def test_vectorized_filters_match_predicates(records, filters):
+    columnar, memory = ColumnarAnnotationCollection(records), AnnotationCollection(records)
+    assert filters().compiled_mask(columnar.column_names) is not None
+    expected = [entity.id for entity in memory.filter(filters())]
+    assert [entity.id for entity in columnar.filter(filters())] == expected
+    assert list(columnar.query(filters()).ids()) == expected
+    assert columnar.query(filters()).count() == len(expected)
@@ -0,0 +1,80 @@
+import pytest
+
+from coco_orm.collections import (
+    AnnotationCollection, ColumnarAnnotationCollection, SqlAnnotationCollection,
+    ImageCollection, SqlImageCollection, CategoryCollection, LicenseCollection,
+)
+from coco_orm.models import Annotation, Image
+
+from .data import make_dict
+
+
+@pytest.fixture
+def data():
+    return make_dict(num_images=30, num_annotations=200)
+
+
+def by(entities, attr_name, value):
+    return [entity.id for entity in entities if getattr(entity, attr_name) == value]
+
+
+@pytest.mark.parametrize("collection_class", (ImageCollection, SqlImageCollection))
+def test_image_indexes_follow_changes(data, collection_class):
+    images = collection_class(data["images"])
+    assert images.get_by_file_name(data["images"][4]["file_name"])[0].id == 5
+    for license in (1, 2, 3):
+        assert [image.id for image in images.get_all_by("license", license)] == by(images, "license", license)
+    changed = images.get_by_id(5)[0]
+    changed.file_name, changed.license = "renamed.jpg", 7
+    images.update(changed)
+    images.delete(6)
+    images.insert(0, Image(id=100, file_name="new.jpg", width=1, height=1, license=7))
+    assert images.get_by_file_name(data["images"][4]["file_name"])[0] is None
+    assert images.get_by_file_name("renamed.jpg")[0].id == 5
+    assert images.get_by_file_name(data["images"][5]["file_name"])[0] is None
+    assert [image.id for image in images.get_all_by("license", 7)] == [100, 5]
+
+
+@pytest.mark.parametrize("collection_class", (AnnotationCollection, ColumnarAnnotationCollection, SqlAnnotationCollection))
+def test_annotation_indexes_follow_changes(data, collection_class):
+    annotations = collection_class(data["annotations"])
+    assert [annotation.id for annotation in annotations.get_all_by("image_id", 3)] == by(annotations, "image_id", 3)
+    annotations.create_index("iscrowd")
+    assert [annotation.id for annotation in annotations.get_all_by("iscrowd", 1)] == by(annotations, "iscrowd", 1)
+    annotations.append(Annotation(image_id=3, category_id=1, bbox=[0, 0, 1, 1], iscrowd=1))
+    del annotations[0]
+    annotations.delete(by(annotations, "image_id", 3)[0])
+    for attr_name, value in (("image_id", 3), ("iscrowd", 1), ("category_id", 2)):
+        assert [annotation.id for annotation in annotations.get_all_by(attr_name, value)] == by(annotations, attr_name, value)
+    assert annotations.get_by("image_id", 3).id == by(annotations, "image_id", 3)[0]
+    assert annotations.get_by("image_id", 1000) is None
+
+
+def test_unique_indexes_of_categories_and_licenses(data):
+    categories, licenses = CategoryCollection(data["categories"]), LicenseCollection(data["licenses"])
+    assert categories.get_by_name("category_3").id == 3
+    assert categories.get_by_name("missing") is None
+    assert licenses.get_by_name("license_2").id == 2 and licenses.get_by_url("http://license/3").id == 3
+    categories.delete(3)
+    assert categories.get_by_name("category_3") is None
+
+
+def test_shared_unique_values_resolve_in_collection_order(data):
+    images, reference = ImageCollection(data["images"]), list(ImageCollection(data["images"]))
+    images.get_by_file_name("x") # build the index
+    shared = data["images"][2]["file_name"]
+    for collection in (images, reference):
+        collection.insert(0, Image(id=100, file_name=shared, width=1, height=1))
+        collection[10:11] = [Image(id=101, file_name=shared, width=1, height=1)]
+    assert images.get_by_file_name(shared)[0].id == next(image for image in reference if image.file_name == shared).id == 100
+    images.delete(100)
+    assert images.get_by_file_name(shared)[0].id == 3
+
+
+def test_entities_are_removed_from_large_groups(data):
+    images = ImageCollection([dict(image, license=1) for image in data["images"]])
+    group = images.get_index("license").groups[1]
+    for id in (30, 1, 15):
+        images.delete(id)
+    assert [image.id for image in images.get_all_by("license", 1)] == [image.id for image in images]
+    assert images.get_index("license").groups[1] is group and len(group) == 27
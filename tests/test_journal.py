@@ -0,0 +1,77 @@
+import json
+import os
+
+import pytest
+
+from coco_orm import CocoDataset
+from coco_orm.dataset.journal import JOURNAL_SUFFIX
+from coco_orm.models import Annotation
+
+from .data import make_dict, write_json
+
+
+def change(dataset):
+    """Append, update and delete entities of a dataset, return the changed dataset as a dictionary."""
+    annotation = dataset.annotations.get_by_id(1).to_dict()
+    annotation["area"] = 1.5
+    dataset.annotations.update(Annotation.from_dict(annotation))
+    dataset.annotations.delete(2)
+    dataset.annotations.append(Annotation(id=1000, image_id=1, category_id=1, bbox=[1, 2, 3, 4], area=12.0))
+    dataset.categories.delete(5)
+    return dataset.to_dict()
+
+
+@pytest.mark.parametrize("options", [{}, {"columnar": True}, {"streaming": True, "lazy": True}])
+def test_journal_is_replayed(tmp_path, options):
+    filepath = write_json(tmp_path / "annotations.json", make_dict(num_annotations=50))
+    dataset = CocoDataset(filepath, journal=True, **options)
+    expected = change(dataset)
+    dataset.journal.close()
+    with open(filepath + JOURNAL_SUFFIX, "rb") as file:
+        assert len(file.readlines()) == 5
+    assert CocoDataset(filepath, journal=True, **options).to_dict() == expected
+    assert CocoDataset(filepath).to_dict() != expected
+
+
+def test_torn_last_line_is_truncated(tmp_path):
+    filepath = write_json(tmp_path / "annotations.json", make_dict(num_annotations=50))
+    dataset = CocoDataset(filepath, journal=True)
+    dataset.annotations.delete(3)
+    expected = dataset.to_dict()
+    dataset.annotations.delete(4)
+    dataset.journal.close()
+    journal_filepath = filepath + JOURNAL_SUFFIX
+    size = os.path.getsize(journal_filepath)
+    os.truncate(journal_filepath, size - 5)
+
+    reopened = CocoDataset(filepath, journal=True)
+    assert reopened.to_dict() == expected
+    with open(journal_filepath, "rb") as file:
+        lines = file.readlines()
+    assert len(lines) == 2 and all(line.endswith(b"\n") for line in lines)
+    reopened.annotations.delete(5)
+    reopened.journal.close()
+    assert [a["id"] for a in CocoDataset(filepath, journal=True).to_dict()["annotations"]][:4] == [1, 2, 4, 6]
+
+
+def test_compact_writes_the_file_and_empties_the_journal(tmp_path):
+    filepath = write_json(tmp_path / "annotations.json", make_dict(num_annotations=50))
+    dataset = CocoDataset(filepath, journal=True)
+    expected = change(dataset)
+    dataset.compact(indent=None)
+    with open(filepath + JOURNAL_SUFFIX, "rb") as file:
+        assert len(file.readlines()) == 1
+    assert CocoDataset(filepath).to_dict() == expected
+    assert CocoDataset(filepath, journal=True).to_dict() == expected
+
+
+def test_journal_of_another_file_version_is_not_replayed(tmp_path):
+    data = make_dict(num_annotations=50)
+    filepath = write_json(tmp_path / "annotations.json", data)
+    dataset = CocoDataset(filepath, journal=True)
+    dataset.annotations.delete(1)
+    dataset.journal.close()
+    data["annotations"] = data["annotations"][:40]
+    with open(filepath, "w") as file:
+        json.dump(data, file, indent=1)
+    assert len(CocoDataset(filepath, journal=True).annotations) == 40
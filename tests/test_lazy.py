@@ -0,0 +1,37 @@
+import pytest
+
+from coco_orm import CocoDataset
+from coco_orm.dataset.core import CocoDataset as CocoDatasetCls
+
+from .data import make_dict, write_json
+
+NAMES = ("images", "annotations", "categories", "licenses")
+
+
+def built(dataset):
+    return {name for name in NAMES if getattr(CocoDatasetCls, name).is_built(dataset)}
+
+
+@pytest.fixture
+def filepath(tmp_path):
+    return write_json(tmp_path / "annotations.json", make_dict())
+
+
+@pytest.mark.parametrize("options", [{}, {"streaming": True}, {"streaming": True, "columnar": True}])
+def test_collections_are_built_on_first_access(filepath, options):
+    expected = CocoDataset(filepath).to_dict()
+    dataset = CocoDataset(filepath, lazy=True, **options)
+    assert built(dataset) == set()
+    assert dataset.categories.get_by_name("category_2").id == 2
+    assert built(dataset) == {"categories"}
+    assert len(dataset.annotations) == len(expected["annotations"])
+    assert built(dataset) == {"categories", "annotations"}
+    assert dataset.to_dict() == expected
+    assert built(dataset) == set(NAMES)
+
+
+def test_changed_files_are_not_read_partially(filepath):
+    dataset = CocoDataset(filepath, streaming=True, lazy=True)
+    write_json(filepath, make_dict(num_annotations=10))
+    with pytest.raises(Exception):
+        dataset.annotations
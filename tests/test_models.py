@@ -0,0 +1,43 @@
+import pytest
+
+from coco_orm.models import Annotation, Category, Image, Info, License
+
+from .data import make_dict
+
+DATA = make_dict(num_images=3, num_annotations=3)
+
+FACTORIES = [
+    (Image, DATA["images"][0]),
+    (Annotation, DATA["annotations"][0]),
+    (Category, DATA["categories"][0]),
+    (License, DATA["licenses"][0]),
+    (Info, DATA["info"]),
+]
+
+
+@pytest.mark.parametrize("factory, data", FACTORIES)
+@pytest.mark.parametrize("trusted", [False, True])
+def test_models_round_trip(factory, data, trusted):
+    entity = factory.from_dict(dict(data), trusted=trusted)
+    assert entity.to_dict(drop_none=True) == data
+    assert factory.from_dict(entity.to_dict(), trusted=True).to_dict() == entity.to_dict()
+
+
+def test_untrusted_values_are_converted():
+    annotation = Annotation.from_dict({"id": "3", "image_id": "1", "category_id": 2.0, "bbox": ["1", 2, 3, 4], "iscrowd": None})
+    assert (annotation.id, annotation.image_id, annotation.category_id, annotation.iscrowd) == (3, 1, 2, 0)
+    assert annotation.bbox[1:] == [2, 3, 4]
+    image = Image.from_dict({"file_name": "a.jpg"})
+    assert image.id == 0 and image.width is None
+    with pytest.raises(KeyError):
+        Category.from_dict({"id": 1})
+
+
+@pytest.mark.parametrize("factory, data", FACTORIES)
+def test_models_have_slots(factory, data):
+    entity = factory.from_dict(dict(data))
+    assert not hasattr(entity, "__dict__")
+    with pytest.raises(AttributeError):
+        entity.unknown_field = 1
+    for name in data:
+        setattr(entity, name, getattr(entity, name))
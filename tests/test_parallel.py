@@ -0,0 +1,56 @@
+import pytest
+
+from coco_orm import CocoDataset
+from coco_orm.collections.columnar import Columns, Collection as ColumnarAnnotationCollection
+from coco_orm.collections.parallel import parse_entities, encode_columns
+from coco_orm.models import AnnotationFactory, ImageFactory
+
+from .data import make_dict, write_json
+
+
+def typed(dicts):
+    """Pair values of dictionaries with their types, so 1 and 1.0 differ."""
+    return [{key: (type(value), value) for key, value in d.items()} for d in dicts]
+
+
+@pytest.fixture
+def data():
+    data = make_dict(num_images=30, num_annotations=250)
+    # columns of mixed types are sent back as lists instead of arrays
+    data["annotations"][7]["area"] = 12
+    data["annotations"][131]["bbox"] = [1.5, 2, 3, 4]
+    return data
+
+
+@pytest.mark.parametrize("chunk_size", [16, 100, 1000])
+def test_entities_parsed_in_processes_equal_parsed_in_main_process(data, chunk_size):
+    data["annotations"][130]["id"] = 2 ** 70 # overflows an int64 array
+    for factory, records in ((ImageFactory, data["images"]), (AnnotationFactory, data["annotations"])):
+        expected = [factory.from_dict(record) for record in records]
+        entities = parse_entities(factory, records, processes=2, chunk_size=chunk_size)
+        assert [type(entity) for entity in entities] == [type(entity) for entity in expected]
+        assert typed(entity.to_dict() for entity in entities) == typed(entity.to_dict() for entity in expected)
+
+
+def test_values_passed_through_are_taken_from_records(data):
+    records = data["annotations"]
+    entities = parse_entities(AnnotationFactory, records, processes=2, chunk_size=50)
+    assert all(entity.segmentation is record["segmentation"] for entity, record in zip(entities, records))
+
+
+@pytest.mark.parametrize("chunk_size", [16, 1000])
+def test_columns_encoded_in_processes_equal_encoded_in_main_process(data, chunk_size):
+    records = data["annotations"]
+    columns = Columns()
+    columns.replace(0, 0, records)
+    expected = ColumnarAnnotationCollection.from_columns(columns).to_dict()
+    encoded = ColumnarAnnotationCollection.from_columns(encode_columns(records, processes=2, chunk_size=chunk_size))
+    assert typed(encoded.to_dict()) == typed(expected)
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_dataset_loaded_with_processes_equals_loaded_without(tmp_path, data, columnar):
+    filepath = write_json(tmp_path / "annotations.json", data)
+    expected = CocoDataset(filepath, columnar=columnar).to_dict()
+    assert CocoDataset(filepath, columnar=columnar, processes=2).to_dict() == expected
+    assert CocoDataset(filepath, columnar=columnar, processes=None).to_dict() == expected
@@ -0,0 +1,93 @@
+import pytest
+
+from coco_orm.collections import AnnotationCollection, ColumnarAnnotationCollection, SqlAnnotationCollection
+from coco_orm.filters import AnnotationFilters
+
+from .data import make_dict
+
+COLLECTIONS = (AnnotationCollection, ColumnarAnnotationCollection, SqlAnnotationCollection)
+
+FILTERS = [
+    (lambda: None, lambda record: True),
+    (lambda: AnnotationFilters().category_id(2), lambda record: record["category_id"] == 2),
+    (lambda: AnnotationFilters().category_ids([1, 3]).OR.area(40000, ">"), lambda record: record["category_id"] in (1, 3) or record["area"] > 40000),
+    (lambda: AnnotationFilters().category_id(10), lambda record: False),
+]
+
+ORDERS = [(), ("area",), ("category_id",), ("category_id", "area"), ("image_id", "category_id")]
+
+PAGES = [(0, None), (0, 10), (5, 10), (0, 0), (190, 50), (1000, None)]
+
+
+@pytest.fixture
+def records():
+    return make_dict(num_images=10, num_annotations=200, num_categories=4)["annotations"]
+
+
+def brute_force(records, predicate, order, reverse, offset, limit):
+    matches = [record for record in records if predicate(record)]
+    if order:
+        matches = sorted(matches, key=lambda record: tuple(record[name] for name in order), reverse=reverse)
+    stop = None if limit is None else offset + limit
+    return [record["id"] for record in matches[offset:stop]]
+
+
+def build(collection, filters, order, reverse, offset, limit):
+    query = collection.query(filters())
+    if order:
+        query.order_by(*order, reverse=reverse)
+    return query.offset(offset).limit(limit)
+
+
+@pytest.mark.parametrize("collection_class", COLLECTIONS)
+@pytest.mark.parametrize("filters,predicate", FILTERS)
+@pytest.mark.parametrize("order", ORDERS)
+@pytest.mark.parametrize("reverse", [False, True])
+def test_query_equals_brute_force(records, collection_class, filters, predicate, order, reverse):
+    collection = collection_class(records)
+    for offset, limit in PAGES:
+        expected = brute_force(records, predicate, order, reverse, offset, limit)
+        query = build(collection, filters, order, reverse, offset, limit)
+        assert query.ids() == expected
+        assert [entity.id for entity in query] == expected
+        assert [entity.id for entity in query.all()] == expected
+        assert type(query.all()) is collection_class
+        assert query.count() == len(expected)
+        assert query.exists() == bool(expected)
+        first = query.first()
+        assert (first.id if first is not None else None) == (expected[0] if expected else None)
+
+
+@pytest.mark.parametrize("collection_class", COLLECTIONS)
+def test_query_of_a_view(records, collection_class):
+    collection = collection_class(records)
+    view = collection.filter(AnnotationFilters().iscrowd(0))
+    query = view.query(AnnotationFilters().category_id(1)).order_by("area", reverse=True).limit(5)
+    expected = brute_force(records, lambda record: record["iscrowd"] == 0 and record["category_id"] == 1, ("area",), True, 0, 5)
+    assert query.ids() == expected
+
+
+@pytest.mark.parametrize("collection_class", COLLECTIONS)
+def test_query_follows_changes_of_the_collection(records, collection_class):
+    collection = collection_class(records)
+    query = collection.query(AnnotationFilters().category_id(2)).order_by("area")
+    first_id = query.first().id
+    collection.delete(first_id)
+    assert query.ids() == brute_force([record for record in records if record["id"] != first_id], lambda record: record["category_id"] == 2, ("area",), False, 0, None)
+
+
+@pytest.mark.parametrize("collection_class", (AnnotationCollection, SqlAnnotationCollection))
+def test_none_values_are_ordered_last(collection_class):
+    records = make_dict(num_annotations=20)["annotations"]
+    for record in records[::3]:
+        record["area"] = None
+    query = collection_class(records).query().order_by("area")
+    areas = [entity.area for entity in query]
+    assert areas[-7:] == [None] * 7 and areas[:-7] == sorted(record["area"] for record in records if record["area"] is not None)
+    assert [entity.area for entity in query.order_by("area", reverse=True)][:7] == [None] * 7
+
+
+@pytest.mark.parametrize("offset,limit", [(-1, None), (0, -1)])
+def test_negative_offset_and_limit_are_rejected(records, offset, limit):
+    with pytest.raises(Exception):
+        AnnotationCollection(records).query().offset(offset).limit(limit)
@@ -0,0 +1,44 @@
+import pytest
+
+from coco_orm import CocoDataset
+from coco_orm.models import Annotation
+
+from .data import make_dict, write_json
+
+
+@pytest.fixture
+def data():
+    return make_dict(num_images=30, num_annotations=200)
+
+
+def unique(values):
+    return list(dict.fromkeys(values))
+
+
+@pytest.mark.parametrize("options", [{}, {"columnar": True}])
+def test_relationships_match_scans(tmp_path, data, options):
+    dataset = CocoDataset(write_json(tmp_path / "annotations.json", data), **options)
+    annotations, images = data["annotations"], {image["id"]: image for image in data["images"]}
+    for image_id in (1, 7, 30):
+        assert [annotation.id for annotation in dataset.annotations_of(image_id)] == [record["id"] for record in annotations if record["image_id"] == image_id]
+        category_ids = unique(record["category_id"] for record in annotations if record["image_id"] == image_id)
+        assert [category.id for category in dataset.categories_of(image_id)] == category_ids
+    for category_id in (1, 3):
+        assert [annotation.id for annotation in dataset.annotations_with(category_id)] == [record["id"] for record in annotations if record["category_id"] == category_id]
+        image_ids = unique(record["image_id"] for record in annotations if record["category_id"] == category_id)
+        assert [image.id for image in dataset.images_with(category_id)] == image_ids
+    assert [image.id for image in dataset.images_under(2)] == [id for id, image in images.items() if image["license"] == 2]
+    assert dataset.annotations_of(1000) == [] and dataset.images_with(1000) == []
+
+
+def test_relationships_follow_changes(tmp_path, data):
+    dataset = CocoDataset(write_json(tmp_path / "annotations.json", data))
+    images = [image.id for image in dataset.images_with(2)]
+    missing = next(image["id"] for image in data["images"] if image["id"] not in images)
+    dataset.annotations.append(Annotation(image_id=missing, category_id=2, bbox=[0, 0, 1, 1]))
+    assert [image.id for image in dataset.images_with(2)] == images + [missing]
+    assert dataset.annotations_of(missing)[-1].category_id == 2
+    # a replaced collection is not confused with the previous one
+    dataset.images_with(3)
+    dataset.annotations = dataset.annotations([Annotation(id=1, image_id=1, category_id=3, bbox=[0, 0, 1, 1])])
+    assert [image.id for image in dataset.images_with(3)] == [1]
@@ -0,0 +1,115 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError, URLError
+
+import pytest
+
+from coco_orm.dataset.remote import download, download_paths
+
+
+class Server():
+    """A local HTTP server of a single file, answering conditional and range requests."""
+    def __init__(self):
+        self.body, self.etag, self.status, self.requests = b"", '"1"', None, []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                server.requests.append(dict(self.headers))
+                if server.status is not None:
+                    self.send_error(server.status)
+                    return
+                if self.headers.get("If-None-Match") == server.etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                body, status, ranged = server.body, 200, self.headers.get("Range")
+                if ranged and self.headers.get("If-Range") == server.etag:
+                    start = int(ranged[len("bytes="):-1])
+                    if start >= len(body):
+                        self.send_error(416)
+                        return
+                    body, status = body[start:], 206
+                self.send_response(status)
+                self.send_header("ETag", server.etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/annotations.json"
+        threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    server = Server()
+    server.body = json.dumps({"images": list(range(1000))}).encode()
+    yield server
+    server.close()
+
+
+def read(filepath):
+    with open(filepath, "rb") as file:
+        return file.read()
+
+
+def write_partial(server, cache_dir, size, etag):
+    paths = download_paths(server.url, str(cache_dir))
+    cache_dir.mkdir(exist_ok=True)
+    with open(paths["partial"], "wb") as file:
+        file.write(server.body[:size])
+    with open(paths["metadata"], "w") as file:
+        json.dump({"ETag": etag, "url": server.url, "complete": False}, file)
+
+
+def test_downloads_are_revalidated(server, tmp_path):
+    filepath = download(server.url, str(tmp_path))
+    assert read(filepath) == server.body
+    assert download(server.url, str(tmp_path)) == filepath
+    assert server.requests[-1]["If-None-Match"] == '"1"'
+    server.body, server.etag = b'{"images": []}', '"2"'
+    assert read(download(server.url, str(tmp_path))) == b'{"images": []}'
+
+
+def test_interrupted_downloads_are_resumed(server, tmp_path):
+    write_partial(server, tmp_path, 100, '"1"')
+    assert read(download(server.url, str(tmp_path))) == server.body
+    assert server.requests[-1]["Range"] == "bytes=100-"
+
+
+def test_changed_files_are_downloaded_again(server, tmp_path):
+    # If-Range doesn't match: the whole file is sent instead of the range
+    write_partial(server, tmp_path, 100, '"0"')
+    assert read(download(server.url, str(tmp_path))) == server.body
+
+
+def test_unsatisfiable_ranges_are_downloaded_again(server, tmp_path):
+    write_partial(server, tmp_path, len(server.body), '"1"')
+    assert read(download(server.url, str(tmp_path))) == server.body
+    assert len(server.requests) == 2 and "Range" not in server.requests[-1]
+
+
+def test_previous_downloads_are_used_offline(server, tmp_path):
+    filepath = download(server.url, str(tmp_path))
+    server.close()
+    assert download(server.url, str(tmp_path), timeout=5) == filepath
+    with pytest.raises(URLError):
+        download(server.url, str(tmp_path / "empty"), timeout=5)
+
+
+@pytest.mark.parametrize("status", [404, 410, 500])
+def test_error_responses_are_raised(server, tmp_path, status):
+    download(server.url, str(tmp_path))
+    server.status = status
+    with pytest.raises(HTTPError) as error:
+        download(server.url, str(tmp_path))
+    assert error.value.code == status
@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+from coco_orm import CocoDataset
+from coco_orm.dataset.shards import SHARDS_MANIFEST, read_manifest, write_shards
+
+from .data import make_dict, write_json
+
+
+def ids(dataset):
+    return tuple(sorted(entity.id for entity in collection) for collection in (dataset.images, dataset.annotations, dataset.categories, dataset.licenses))
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    return CocoDataset(write_json(tmp_path / "annotations.json", make_dict(num_images=30, num_annotations=200)))
+
+
+def test_shards_partition_images(dataset):
+    shards = dataset.shard(4)
+    assert len(shards) == 4
+    for index, shard in enumerate(shards):
+        assert all(image.id % 4 == index for image in shard.images)
+        assert {annotation.image_id for annotation in shard.annotations} <= {image.id for image in shard.images}
+        assert len(shard.categories) == len(dataset.categories)
+    assert sorted(image.id for shard in shards for image in shard.images) == ids(dataset)[0]
+    assert sum(len(shard.annotations) for shard in shards) == len(dataset.annotations)
+
+
+@pytest.mark.parametrize("options", [{}, {"columnar": True}])
+def test_saved_shards_are_loaded_back(dataset, tmp_path, options):
+    dataset.save_shards(str(tmp_path / "shards"), num_shards=3)
+    assert len(read_manifest(str(tmp_path / "shards"))["shards"]) == 3
+    loaded = CocoDataset(str(tmp_path / "shards"), **options)
+    assert ids(loaded) == ids(dataset)
+    # saving fewer shards removes shard files of the previous version
+    dataset.save_shards(str(tmp_path / "shards"), num_shards=2)
+    assert len([name for name in os.listdir(tmp_path / "shards") if name != SHARDS_MANIFEST]) == 2
+    assert ids(CocoDataset(str(tmp_path / "shards"), **options)) == ids(dataset)
+
+
+@pytest.mark.parametrize("num_shards", [0, -1])
+def test_invalid_numbers_of_shards_are_rejected(dataset, tmp_path, num_shards):
+    dataset.save_shards(str(tmp_path / "shards"), num_shards=2)
+    before = sorted(os.listdir(tmp_path / "shards"))
+    with pytest.raises(Exception):
+        dataset.save_shards(str(tmp_path / "shards"), num_shards=num_shards)
+    assert sorted(os.listdir(tmp_path / "shards")) == before
+    with pytest.raises(Exception):
+        dataset.shard(num_shards)
+    with pytest.raises(Exception):
+        write_shards(str(tmp_path / "other"), [])
+    assert not os.path.exists(tmp_path / "other")
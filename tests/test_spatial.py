@@ -0,0 +1,147 @@
+import random
+
+import numpy as np
+import pytest
+
+from coco_orm.collections import AnnotationCollection, ColumnarAnnotationCollection, SqlAnnotationCollection
+from coco_orm.collections.spatial import SpatialIndex, GRID_MIN_BOXES
+from coco_orm.filters import AnnotationFilters
+from coco_orm.filters.properties import BboxRegionProperty, BboxNearestProperty
+from coco_orm.operators.core import INTERSECTS, WITHIN
+
+COLLECTIONS = (AnnotationCollection, ColumnarAnnotationCollection, SqlAnnotationCollection)
+
+"""Image 1 holds enough bboxes for a grid, other images are checked as a whole."""
+CROWDED_BOXES = 400
+
+REGIONS = [
+    [100, 100, 64, 64],
+    [0, 0, 640, 480],
+    [300, 200, 0, 0],
+    [-50, -50, 60, 60],
+    [620, 460, 100, 100],
+    [250, 0, 20, 480],
+    [1000, 1000, 10, 10],
+]
+
+POINTS = [(160, 120, 1), (0, 0, 3), (320, 240, 10), (700, -20, 2), (320, 240, 1000)]
+
+
+@pytest.fixture(scope="module")
+def records():
+    rnd = random.Random(0)
+    records = []
+    for image_id in range(1, 101):
+        for _ in range(CROWDED_BOXES if image_id == 1 else rnd.randint(10, 30)):
+            kind = rnd.random()
+            if kind < 0.05: # covering many grid cells
+                x, y, w, h = rnd.randint(0, 200), rnd.randint(0, 200), rnd.randint(300, 440), rnd.randint(200, 280)
+            elif kind < 0.1: # degenerate
+                x, y, w, h = rnd.randint(0, 640), rnd.randint(0, 480), 0, rnd.choice([0, 5])
+            else:
+                x, y, w, h = rnd.randint(0, 620), rnd.randint(0, 460), rnd.randint(1, 40), rnd.randint(1, 40)
+            records.append({
+                "id": len(records) + 1, "image_id": image_id, "category_id": rnd.randint(1, 3), "segmentation": [],
+                "area": float(w * h), "bbox": [x, y, w, h], "iscrowd": 0,
+            })
+    return records
+
+
+def intersects(bbox, region):
+    x, y, w, h = bbox
+    rx, ry, rw, rh = region
+    return x < rx + rw and rx < x + w and y < ry + rh and ry < y + h
+
+
+def within(bbox, region):
+    x, y, w, h = bbox
+    rx, ry, rw, rh = region
+    return rx <= x and x + w <= rx + rw and ry <= y and y + h <= ry + rh
+
+
+def nearest(records, point, k):
+    px, py = point
+    by_image = {}
+    for position, record in enumerate(records):
+        x, y, w, h = record["bbox"]
+        dx, dy = max(x - px, px - x - w, 0), max(y - py, py - y - h, 0)
+        by_image.setdefault(record["image_id"], []).append((dx * dx + dy * dy, position, record["id"]))
+    return sorted(item[1:] for matches in by_image.values() for item in sorted(matches)[:k])
+
+
+def ids(collection):
+    return [entity.id for entity in collection]
+
+
+def test_crowded_image_uses_a_grid(records):
+    assert sum(record["image_id"] == 1 for record in records) >= GRID_MIN_BOXES
+    index = SpatialIndex(np.array([record["image_id"] for record in records]), np.array([record["bbox"] for record in records]))
+    index.search(BboxRegionProperty(REGIONS[0], INTERSECTS, name="bbox"), [1, 2])
+    assert list(index._grids) == [0] and index._grids[0].size > 1 and len(index._grids[0].large) > 0
+
+
+@pytest.mark.parametrize("region", REGIONS)
+@pytest.mark.parametrize("operator,check", [(INTERSECTS, intersects), (WITHIN, within)])
+@pytest.mark.parametrize("image_ids", [[1], [2, 3, 50], [1, 2, 1000], list(range(1, 101))])
+def test_index_search_equals_brute_force(records, region, operator, check, image_ids):
+    index = SpatialIndex(np.array([record["image_id"] for record in records]), np.array([record["bbox"] for record in records]))
+    positions = index.search(BboxRegionProperty(region, operator, name="bbox"), image_ids)
+    assert positions.tolist() == [i for i, record in enumerate(records) if record["image_id"] in image_ids and check(record["bbox"], region)]
+
+
+@pytest.mark.parametrize("x,y,k", POINTS)
+def test_index_nearest_equals_brute_force(records, x, y, k):
+    index = SpatialIndex(np.array([record["image_id"] for record in records]), np.array([record["bbox"] for record in records]))
+    assert index.nearest(BboxNearestProperty((x, y), k, name="bbox")).tolist() == [position for position, _ in nearest(records, (x, y), k)]
+    subset = [record for record in records if record["image_id"] in (1, 7)]
+    positions = {record["id"]: position for position, record in enumerate(records)}
+    expected = sorted(positions[id] for _, id in nearest(subset, (x, y), k))
+    assert index.nearest(BboxNearestProperty((x, y), k, name="bbox"), [1, 7]).tolist() == expected
+
+
+@pytest.mark.parametrize("collection_class", COLLECTIONS)
+@pytest.mark.parametrize("region", REGIONS)
+def test_region_filters_equal_brute_force(records, collection_class, region):
+    collection = collection_class(records)
+    for image_ids in ([1], [4, 5]):
+        for method, check in (("bbox_intersects", intersects), ("bbox_within", within)):
+            filters = getattr(AnnotationFilters().image_ids(image_ids), method)(region)
+            expected = [r["id"] for r in records if r["image_id"] in image_ids and check(r["bbox"], region)]
+            assert ids(collection.filter(filters)) == expected
+    if collection_class is not SqlAnnotationCollection: # SQL collections filter bboxes in the database
+        assert 0 in collection.spatial_index()._grids
+    # without image ids the collection is scanned
+    assert ids(collection.filter(AnnotationFilters().bbox_intersects(region).category_id(2))) == \
+        [r["id"] for r in records if r["category_id"] == 2 and intersects(r["bbox"], region)]
+    assert ids(collection.filter(AnnotationFilters().image_id(1).bbox_within(region).OR.category_id(3))) == \
+        [r["id"] for r in records if r["image_id"] == 1 and within(r["bbox"], region) or r["category_id"] == 3]
+
+
+@pytest.mark.parametrize("collection_class", COLLECTIONS)
+@pytest.mark.parametrize("x,y,k", POINTS)
+def test_nearest_filters_equal_brute_force(records, collection_class, x, y, k):
+    collection = collection_class(records)
+    assert ids(collection.filter(AnnotationFilters().bbox_nearest(x, y, k=k))) == [id for _, id in nearest(records, (x, y), k)]
+    subset = [record for record in records if record["image_id"] in (1, 9)]
+    expected = [id for _, id in nearest(subset, (x, y), k)]
+    assert sorted(ids(collection.filter(AnnotationFilters().image_ids([1, 9]).bbox_nearest(x, y, k=k)))) == sorted(expected)
+    categories = {record["id"]: record["category_id"] for record in subset}
+    expected = [id for id in expected if categories[id] == 1]
+    assert sorted(ids(collection.filter(AnnotationFilters().image_ids([1, 9]).bbox_nearest(x, y, k=k).category_id(1)))) == sorted(expected)
+
+
+@pytest.mark.parametrize("collection_class", (AnnotationCollection, ColumnarAnnotationCollection))
+def test_spatial_index_follows_changes_of_the_collection(records, collection_class):
+    collection = collection_class(records)
+    filters = AnnotationFilters().image_id(1).bbox_intersects([0, 0, 50, 50])
+    before = ids(collection.filter(filters))
+    collection.delete(before[0])
+    entity = collection.entity_factory.from_dict(dict(records[0], id=10 ** 6, image_id=1, bbox=[10, 10, 5, 5]))
+    collection.append(entity)
+    assert ids(collection.filter(filters)) == before[1:] + [10 ** 6]
+
+
+@pytest.mark.parametrize("region", [[0, 0, 1], [0, 0, -1, 5]])
+def test_invalid_regions_are_rejected(region):
+    with pytest.raises(Exception):
+        AnnotationFilters().bbox_intersects(region)
@@ -0,0 +1,80 @@
+import pytest
+
+from coco_orm.collections import AnnotationCollection, SqlAnnotationCollection, SqlImageCollection, ImageCollection
+from coco_orm.filters import AnnotationFilters, ImageFilters
+from coco_orm.models import Annotation
+
+from .data import make_dict
+
+
+@pytest.fixture
+def data():
+    return make_dict(num_annotations=40)
+
+
+def annotations(ids):
+    return [Annotation(id=id, image_id=1, category_id=1, bbox=[id, id, 2, 2]) for id in ids]
+
+
+def test_sql_filters_match_memory(data):
+    sql, memory = SqlAnnotationCollection(data["annotations"]), AnnotationCollection(data["annotations"])
+    for filters in (
+        AnnotationFilters().category_id(2),
+        AnnotationFilters().area(20000, ">").OR.iscrowd(1),
+        AnnotationFilters().image_ids([1, 2, 3]).category_ids([1, 2]),
+        AnnotationFilters().bbox_intersects([100, 100, 200, 200]),
+    ):
+        assert sql.filter(filters).to_dict() == memory.filter(filters).to_dict()
+    images = data["images"]
+    assert SqlImageCollection(images).filter(ImageFilters().licenses([1, 3])).to_dict() == ImageCollection(images).filter(ImageFilters().licenses([1, 3])).to_dict()
+
+
+def test_positional_changes_match_memory(data):
+    sql, memory = SqlAnnotationCollection(data["annotations"]), AnnotationCollection(data["annotations"])
+    for collection in (sql, memory):
+        collection.insert(3, annotations([100])[0])
+        del collection[10:12]
+        collection[0] = annotations([101])[0]
+        collection.delete(5)
+        collection.append(annotations([0])[0])
+    assert sql.to_dict() == memory.to_dict()
+    assert sql.get_by_id(101).to_dict() == memory.get_by_id(101).to_dict()
+    assert sql.last_id == memory.last_id
+
+
+@pytest.mark.parametrize("key", [slice(None, None, 2), slice(1, 30, 3), slice(None, None, -4), slice(35, 5, -7)])
+def test_extended_slices_match_lists(data, key):
+    records = data["annotations"]
+    sql, memory = SqlAnnotationCollection(records), AnnotationCollection(records)
+    size = len(range(*key.indices(len(records))))
+    sql[key] = annotations(range(1000, 1000 + size))
+    memory[key] = annotations(range(1000, 1000 + size))
+    assert sql.to_dict() == memory.to_dict()
+    del sql[key]
+    del memory[key]
+    assert sql.to_dict() == memory.to_dict()
+    assert len(sql) == len(memory) and sql[len(sql) - 1].to_dict() == memory[-1].to_dict()
+    with pytest.raises(ValueError):
+        sql[::2] = annotations([1])
+
+
+@pytest.mark.parametrize("times", [3, 1, 0, -1])
+def test_repeating_matches_lists(data, times):
+    records = data["annotations"][:5]
+    sql, memory = SqlAnnotationCollection(records), AnnotationCollection(records)
+    sql *= times
+    memory *= times
+    assert sql.to_dict() == memory.to_dict() and len(sql) == len(memory)
+
+
+def test_list_methods_read_rows(data):
+    records = data["annotations"]
+    collection = SqlAnnotationCollection(records)
+    entities = list(collection)
+    assert [entity.to_dict() for entity in collection.copy()] == records
+    assert collection.count(entities[3]) == 1 and entities[3] in collection
+    assert collection == SqlAnnotationCollection(records) and collection == AnnotationCollection(records)
+    assert collection != SqlAnnotationCollection(records[1:]) and collection != records
+    assert [entity.to_dict() for entity in collection + entities[:2]] == records + records[:2]
+    assert [entity.to_dict() for entity in entities[:2] + collection] == records[:2] + records
+    assert [entity.to_dict() for entity in 2 * collection] == records * 2
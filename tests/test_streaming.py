@@ -0,0 +1,75 @@
+import io
+import json
+
+import pytest
+
+from coco_orm.dataset.streaming import JsonStream, iter_json_items, index_json_items, read_json_range, write_json_items
+
+from .data import make_dict
+
+CHUNK_SIZES = list(range(1, 40)) + [64, 1000, 1 << 20]
+
+NUMBERS = {
+    "info": {"year": 2017, "ratio": -1.5e-3},
+    "annotations": [{"area": 1234.5, "bbox": [1.25, 2e3, 3E+2, -4.75]}, 3.25, 7, -0.0, 12345678901234567890, 1e-7],
+    "images": [],
+    "text": "a-b.c e+E ünïcode",
+}
+
+
+def items(data, keys, chunk_size):
+    pairs = list(iter_json_items(io.StringIO(json.dumps(data)), keys, chunk_size))
+    result = {}
+    for key, value in pairs:
+        if key in keys and isinstance(data[key], list):
+            result.setdefault(key, []).append(value)
+        else:
+            result[key] = value
+    return {key: result.get(key, []) for key in data}
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_numbers_split_between_chunks(chunk_size):
+    assert items(NUMBERS, {"annotations", "images"}, chunk_size) == NUMBERS
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_values_are_decoded_one_by_one(chunk_size):
+    stream = JsonStream(io.StringIO('12.5e1 -3 "x" 4.0E-1 true null [1.5, 2]'), chunk_size)
+    assert [stream.value() for _ in range(7)] == [125.0, -3, "x", 0.4, True, None, [1.5, 2]]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 20])
+@pytest.mark.parametrize("indent", [None, 4])
+def test_datasets_are_iterated_and_indexed(tmp_path, chunk_size, indent):
+    data = make_dict(num_annotations=50)
+    keys = {"images", "annotations"}
+    assert items(data, keys, chunk_size) == data
+    filepath = tmp_path / "annotations.json"
+    filepath.write_text(json.dumps(data, indent=indent, ensure_ascii=False), encoding="utf-8")
+    with open(filepath, encoding="utf-8", newline="") as file:
+        located = dict(index_json_items(file, keys, chunk_size))
+    for key in keys:
+        assert read_json_range(str(filepath), *located[key]) == data[key]
+    assert located["info"] == data["info"]
+
+
+def test_invalid_json_is_rejected():
+    with pytest.raises(Exception):
+        list(iter_json_items(io.StringIO('{"annotations": [1.]}'), {"annotations"}, 4))
+    with pytest.raises(Exception):
+        list(iter_json_items(io.StringIO('[1, 2]'), {"annotations"}))
+
+
+@pytest.mark.parametrize("indent", [None, 2, 4])
+def test_written_items_match_json_dump(indent):
+    data = make_dict(num_annotations=20)
+    data["info"]["description"] = "ünïcode"
+    data["empty"] = []
+    file = io.StringIO()
+    write_json_items(file, ((key, iter(value) if isinstance(value, list) else value) for key, value in data.items()), indent)
+    if indent is None:
+        assert file.getvalue() == json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    else:
+        assert file.getvalue() == json.dumps(data, ensure_ascii=False, indent=indent)
+    assert json.loads(file.getvalue()) == data
@@ -0,0 +1,65 @@
+import pytest
+
+from coco_orm.collections import AnnotationCollection, ImageCollection
+from coco_orm.collections.view import View
+from coco_orm.filters import AnnotationFilters, ImageFilters
+from coco_orm.models import Annotation
+
+from .data import make_dict
+
+
+@pytest.fixture
+def data():
+    return make_dict()
+
+
+def test_filters_return_views_of_the_parent(data):
+    collection = AnnotationCollection(data["annotations"])
+    view = collection.filter(AnnotationFilters().category_id(2))
+    assert isinstance(view, View) and isinstance(view, AnnotationCollection)
+    expected = [entity for entity in collection if entity.category_id == 2]
+    assert all(item is entity for item, entity in zip(view, expected)) and len(view) == len(expected)
+    # filtering a view composes positions, views never nest
+    narrowed = view.filter(AnnotationFilters().iscrowd(0))
+    assert narrowed._parent is collection
+    assert list(narrowed) == [entity for entity in expected if entity.iscrowd == 0]
+
+
+def test_views_are_materialized_by_changes(data):
+    collection = AnnotationCollection(data["annotations"])
+    view = collection.filter(AnnotationFilters().category_id(2))
+    expected = list(view)
+    view.append(Annotation(image_id=1, category_id=2, bbox=[0, 0, 1, 1]))
+    assert view._parent is None and len(view) == len(expected) + 1
+    assert len(collection) == len(data["annotations"])
+
+    view = collection.filter(AnnotationFilters().category_id(3))
+    expected = list(view)
+    collection.delete(expected[0].id)
+    # the parent change is not seen by the view, it was materialized before
+    assert view._parent is None and list(view) == expected
+
+
+def test_get_by_and_get_all_by_on_views(data):
+    collection = ImageCollection(data["images"])
+    view = collection.filter(ImageFilters().licenses([1, 2]))
+    images = [image for image in collection if image.license in (1, 2)]
+    assert view.get_by("file_name", images[1].file_name) is images[1]
+    assert view.get_all_by("license", 2) == [image for image in images if image.license == 2]
+    assert view.get_by("license", 3) is None
+    assert view.lookup("license", [1], selectivity=1) is None
+
+
+def test_list_methods_read_entities_of_views(data):
+    collection = AnnotationCollection(data["annotations"])
+    view = collection.filter(AnnotationFilters().category_id(2))
+    expected = [entity for entity in collection if entity.category_id == 2]
+    assert view.copy() == expected and type(view.copy()) is list
+    assert view.count(expected[0]) == 1
+    assert view == expected and not view != expected
+    assert view + expected[:1] == expected + expected[:1]
+    assert expected[:1] + view == expected[:1] + expected
+    assert view * 2 == expected * 2 and 2 * view == expected * 2
+    assert view._parent is collection
+    other = collection.filter(AnnotationFilters().category_id(2))
+    assert view == other and view <= other and not view < other